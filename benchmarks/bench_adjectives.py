@@ -0,0 +1,65 @@
+"""
+Resolving "shiny gold coin" among 50k coins made with copyThing.
+
+All but one of the coins are copies of a dull copper coin prototype, so the noun
+"coin" matches every one of them, and the adjectives have to narrow the
+candidates down to the single shiny gold coin.
+"""
+
+import time
+
+from intficpy.thing_base import Thing
+
+from .common import make_game, best_of, report
+
+
+def build(n_coins):
+    game = make_game()
+    room = game.me.location
+    dull = Thing(game, "coin")
+    dull.setAdjectives(["dull", "copper"])
+    room.addThing(dull)
+    for i in range(n_coins - 2):
+        room.addThing(dull.copyThing())
+    shiny = Thing(game, "coin")
+    shiny.setAdjectives(["shiny", "gold"])
+    room.addThing(shiny)
+    return game, shiny
+
+
+def main():
+    rows = []
+    for n in (1000, 10000, 50000):
+        start = time.perf_counter()
+        game, shiny = build(n)
+        build_time = time.perf_counter() - start
+
+        parser = game.parser
+        tokens = ["shiny", "gold", "coin"]
+        candidates = game.nouns["coin"]
+
+        def resolve():
+            thing = parser.checkAdjectives(
+                tokens, "coin", list(candidates), "near", False, None
+            )
+            assert thing is shiny
+
+        resolve_time = best_of(resolve, number=3)
+        turn_time = best_of(lambda: game.turnMain("x shiny gold coin"), number=3)
+        rows.append(
+            (
+                n,
+                f"{build_time:.2f}",
+                f"{resolve_time * 1e3:.2f}",
+                f"{turn_time * 1e3:.2f}",
+            )
+        )
+    report(
+        'Resolving "shiny gold coin"',
+        rows,
+        ("coins", "build (s)", "checkAdjectives (ms)", "full turn (ms)"),
+    )
+
+
+if __name__ == "__main__":
+    main()
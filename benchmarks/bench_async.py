@@ -0,0 +1,107 @@
+"""
+A load test of AsyncServer: thousands of simulated players, connected at once to a
+local server, in the same event loop, each playing TURNS_PER_PLAYER turns of the
+bench_server world.
+
+Each player connects, reads the opening, and then sends a command, reads the
+turn's events up to the END_OF_TURN line, and waits a random "think" time, up to
+MAX_THINK seconds, before the next command. "connect" is the time from opening the
+connection to reading the end of the opening, and "turn" the time from sending a
+command to reading the end of its turn; "p50" and "p99" are their percentiles, in
+milliseconds. "turns/s" is the number of turns played by all the players, over the
+time from the first connection to the last player leaving.
+"""
+
+import asyncio
+import random
+import time
+
+from intficpy.async_app import END_OF_TURN, AsyncServer
+
+from .bench_server import COMMANDS, build, percentile
+from .common import report
+
+PLAYERS = (100, 1000, 4000)
+TURNS_PER_PLAYER = 10
+MAX_THINK = 1.0
+
+
+async def read_turn(reader):
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("The server closed the connection")
+        if line.rstrip(b"\n") == END_OF_TURN.encode():
+            return
+
+
+async def player(port, connects, turns, think):
+    start = time.perf_counter()
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await read_turn(reader)
+    connects.append(time.perf_counter() - start)
+    try:
+        for turn in range(TURNS_PER_PLAYER):
+            if think:
+                await asyncio.sleep(random.uniform(0, think))
+            command = COMMANDS[turn % len(COMMANDS)]
+            start = time.perf_counter()
+            writer.write(command.encode() + b"\n")
+            await read_turn(reader)
+            turns.append(time.perf_counter() - start)
+        writer.write(b"quit\n")
+        await reader.read()
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def load_test(n_players, think):
+    server = AsyncServer(build)
+    listening = await server.start(backlog=n_players)
+    port = listening.sockets[0].getsockname()[1]
+    connects = []
+    turns = []
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(player(port, connects, turns, think) for i in range(n_players))
+        )
+    finally:
+        elapsed = time.perf_counter() - start
+        await server.stop()
+    return (
+        n_players,
+        think,
+        len(turns),
+        f"{len(turns) / elapsed:.0f}",
+        f"{percentile(connects, 50) * 1e3:.1f}",
+        f"{percentile(connects, 99) * 1e3:.1f}",
+        f"{percentile(turns, 50) * 1e3:.1f}",
+        f"{percentile(turns, 99) * 1e3:.1f}",
+    )
+
+
+def main():
+    rows = []
+    for n_players in PLAYERS:
+        for think in (0, MAX_THINK):
+            rows.append(asyncio.run(load_test(n_players, think)))
+    report(
+        "Simulated players on a local AsyncServer",
+        rows,
+        (
+            "players",
+            "think (s)",
+            "turns",
+            "turns/s",
+            "connect p50",
+            "connect p99",
+            "turn p50",
+            "turn p99",
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
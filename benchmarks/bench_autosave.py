@@ -0,0 +1,113 @@
+"""
+Time to bring a game back after a crash, by replaying 1,000 turns of autosave
+journal records, and by running the same 1,000 commands through turnMain again.
+Also the time autosave adds to each turn.
+
+The world has 200 rooms, each with a box holding 10 coins, and the player carries
+a bag. The player takes each coin from the box, puts it in the bag, takes it out,
+and puts it back in the box, one command a turn.
+"""
+
+import os
+import tempfile
+import time
+
+from intficpy.autosave import journal_path
+from intficpy.room import Room
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .common import make_game, report
+
+N_ROOMS = 200
+N_COINS = 10
+N_TURNS = 1000
+
+
+def make_world():
+    game = make_game()
+    rooms = []
+    for i in range(N_ROOMS):
+        room = Room(game, f"room {i}", "A plain room. ")
+        box = Container(game, "box")
+        box.has_lid = False
+        room.addThing(box)
+        for j in range(N_COINS):
+            coin = Thing(game, f"coin{j}")
+            coin.invItem = True
+            box.addThing(coin)
+        rooms.append(room)
+    game.me.location.removeThing(game.me)
+    rooms[0].addThing(game.me)
+    bag = Container(game, "bag")
+    bag.invItem = True
+    game.me.addThing(bag)
+    game.takeBaseline()
+    return game, bag
+
+
+def commands():
+    steps = ("get {}", "put {} in bag", "get {}", "put {} in box")
+    for i in range(N_TURNS):
+        coin = f"coin{i // len(steps) % N_COINS}"
+        yield steps[i % len(steps)].format(coin)
+
+
+def play(game):
+    start = time.perf_counter()
+    for command in commands():
+        game.turnMain(command)
+    return time.perf_counter() - start
+
+
+def time_autosave(autosave):
+    """
+    Time each call to autosave.endTurn. The total is kept in the returned list.
+    """
+    total = [0.0]
+    end_turn = autosave.endTurn
+
+    def timed_end_turn():
+        start = time.perf_counter()
+        end_turn()
+        total[0] += time.perf_counter() - start
+
+    autosave.endTurn = timed_end_turn
+    return total
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "auto.sav")
+
+        game, bag = make_world()
+        without = play(game)
+
+        game, bag = make_world()
+        game.enableAutosave(path, compact_every=N_TURNS + 1)
+        autosave_time = time_autosave(game.autosave)
+        play(game)
+        game.stopAutosave()
+        journal_size = os.path.getsize(journal_path(path))
+
+        recovered, recovered_bag = make_world()
+        start = time.perf_counter()
+        replayed = recovered.recoverAutosave(path)
+        recover = time.perf_counter() - start
+        assert replayed == N_TURNS, replayed
+        assert recovered_bag.contains.keys() == bag.contains.keys()
+
+    report(
+        f"{N_TURNS} turns, {len(game.ifp_objects)} objects (milliseconds)",
+        [
+            ("run commands again", f"{without * 1e3:.1f}"),
+            ("replay autosave journal", f"{recover * 1e3:.1f}"),
+            ("autosave time per turn", f"{autosave_time[0] / N_TURNS * 1e3:.3f}"),
+            ("journal size (KiB)", f"{journal_size / 1024:.1f}"),
+        ],
+        ("", "time"),
+    )
+
+
+if __name__ == "__main__":
+    main()
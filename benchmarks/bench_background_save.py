@@ -0,0 +1,65 @@
+"""
+Time the turn spends saving, when the file is written during the turn (SaveGame)
+and when only the copy of the game state is taken during the turn, and the file is
+written on a worker thread (game.saveInBackground). Both write the file atomically,
+with a flush to disk.
+
+The world is the 9,000 object world of bench_delta_save, after 20 turns of play.
+"""
+
+import os
+import tempfile
+import time
+
+from intficpy.serializer import SaveGame
+
+from .bench_delta_save import make_world, play
+from .common import best_of, report
+
+REPEAT = 5
+
+
+def time_background(game, path, delta):
+    """
+    The best time the turn spends in saveInBackground, and the best time until the
+    file has been written
+    """
+    in_turn = total = None
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        game.saveInBackground(path, delta=delta)
+        submitted = time.perf_counter()
+        game.saves.wait()
+        written = time.perf_counter()
+        in_turn = min(in_turn or submitted - start, submitted - start)
+        total = min(total or written - start, written - start)
+    return in_turn, total
+
+
+def main():
+    game, rooms = make_world()
+    play(game, rooms)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "game.sav")
+        for delta in (False, True):
+            sync = best_of(lambda: SaveGame(game, path, delta=delta), repeat=REPEAT)
+            in_turn, total = time_background(game, path, delta)
+            rows.append(
+                (
+                    "delta" if delta else "full",
+                    f"{sync * 1e3:.2f}",
+                    f"{in_turn * 1e3:.2f}",
+                    f"{total * 1e3:.2f}",
+                )
+            )
+        game.saves.close()
+    report(
+        f"Time spent saving, {len(game.ifp_objects)} objects (milliseconds)",
+        rows,
+        ("kind", "SaveGame", "background: in turn", "background: written"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Turns per second with change tracking off and on.
+
+"off" is a game that does not track changes, while no game does. "other" is the
+same game while another game in the process is tracking changes, which should
+cost it nothing, as only the tracking game's objects record their changes. "on"
+is a game that tracks its own changes.
+
+Each turn is one of GET WIDGET, DROP WIDGET, PUT WIDGET IN BOX, and LOOK, in a
+room holding 100 other Things. The cost of a single attribute set is measured
+separately.
+"""
+
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .common import make_game, best_of, report
+
+COMMANDS = ("get widget", "drop widget", "put widget in box", "look")
+N_THINGS = 100
+
+
+def make_world():
+    game = make_game()
+    room = game.me.location
+    widget = Thing(game, "widget")
+    widget.invItem = True
+    room.addThing(widget)
+    room.addThing(Container(game, "box"))
+    for i in range(N_THINGS):
+        thing = Thing(game, "pebble")
+        thing.setAdjectives([f"pebble{i}"])
+        room.addThing(thing)
+    return game
+
+
+def turns(game):
+    for command in COMMANDS:
+        game.turnMain(command)
+
+
+def set_attributes(thing):
+    for i in range(1000):
+        thing.counter = i
+
+
+def main():
+    game = make_world()
+    other = make_game()
+    widget = game.nouns["widget"][0]
+    rows = []
+    set_rows = []
+    for mode in ("off", "other", "on"):
+        if mode == "other":
+            other.trackChanges()
+        elif mode == "on":
+            other.stopTrackingChanges()
+            game.trackChanges()
+        per_turn = best_of(lambda: turns(game), repeat=7, number=50) / len(COMMANDS)
+        rows.append((mode, f"{per_turn * 1e6:.0f}", f"{1 / per_turn:.0f}"))
+        per_set = best_of(lambda: set_attributes(widget), repeat=7, number=20) / 1000
+        set_rows.append((mode, f"{per_set * 1e9:.0f}"))
+    game.stopTrackingChanges()
+    report(
+        "Change tracking",
+        rows,
+        ("tracking", "microseconds per turn", "turns per second"),
+    )
+    report("Change tracking", set_rows, ("tracking", "nanoseconds per set"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compression ratio and throughput of each save file compression codec, for both
+save formats, for the world of 10,000 objects used by bench_save_format. Every
+object is saved (delta=False).
+
+"ratio" is the size of the uncompressed file over the size of the compressed file.
+"write" and "read" are throughputs in MB of uncompressed save file per second:
+"write" covers serializing, encoding, compressing and writing the file, and "read"
+covers reading, decompressing and decoding it (LoadGame construction, with
+lazy=False). "peak" is the most memory allocated while the file was written.
+"""
+
+import os
+import tempfile
+import tracemalloc
+
+from intficpy.compression import LZMA, ZLIB
+from intficpy.serializer import SaveGame, LoadGame, BINARY, PICKLE
+
+from .bench_save_format import make_world, timed
+from .common import report
+
+CODECS = (None, ZLIB, LZMA)
+
+
+def peak_memory(func):
+    """The most memory allocated while calling func, in bytes"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    game = make_world()
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for save_format in (PICKLE, BINARY):
+            uncompressed = None
+            for codec in CODECS:
+                path = os.path.join(directory, f"{save_format}-{codec}.sav")
+                save = SaveGame(
+                    game,
+                    path,
+                    save_format=save_format,
+                    delta=False,
+                    write=False,
+                    compression=codec,
+                )
+                write, _ = timed(save.write)
+                size = os.path.getsize(path)
+                if uncompressed is None:
+                    uncompressed = size
+                read, _ = timed(lambda: LoadGame(game, path, lazy=False))
+                peak = peak_memory(save.write)
+                rows.append(
+                    (
+                        save_format,
+                        codec or "none",
+                        f"{size / 1024:.0f}",
+                        f"{uncompressed / size:.1f}",
+                        f"{uncompressed / write / 1e6:.1f}",
+                        f"{uncompressed / read / 1e6:.1f}",
+                        f"{peak / 2**20:.1f}",
+                    )
+                )
+    report(
+        f"Save file compression, {len(game.ifp_objects)} objects",
+        rows,
+        (
+            "format",
+            "codec",
+            "size (KiB)",
+            "ratio",
+            "write (MB/s)",
+            "read (MB/s)",
+            "peak (MiB)",
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Time to make many copies of a Thing with copyThing, as a game that builds a pile of
+coins or a shop's stock would.
+
+Each copy is added to the noun dictionary under the same words, so the time per
+copy should stay flat as the number of copies grows.
+"""
+
+import time
+
+from intficpy.thing_base import Thing
+
+from .common import make_game, report
+
+
+def copy_coins(n_coins):
+    game = make_game()
+    room = game.me.location
+    coin = Thing(game, "coin")
+    coin.addSynonym("money")
+    room.addThing(coin)
+    start = time.perf_counter()
+    for _ in range(n_coins):
+        coin.copyThing()
+    return time.perf_counter() - start
+
+
+def main():
+    rows = []
+    for n in (1000, 10000, 50000):
+        elapsed = copy_coins(n)
+        rows.append((n, f"{elapsed:.3f}", f"{elapsed / n * 1e6:.2f}"))
+    report("Copying a coin", rows, ("copies", "total (s)", "per copy (us)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Per turn cost of running daemons, with many daemons scheduled for later turns.
+
+Dormant daemons sit on the timer wheel until their turn comes round, so the time
+to run a turn's daemons should depend on the number of daemons due, not on the
+number scheduled.
+"""
+
+from intficpy.daemons import Daemon
+
+from .common import make_game, best_of, report
+
+
+def main():
+    rows = []
+    for n in (10, 100, 1000, 10000):
+        game = make_game()
+        for i in range(n):
+            game.daemons.runAfter(Daemon(game, lambda game: None), 1000000 + i)
+        game.daemons.add(Daemon(game, lambda game: None))
+
+        run = best_of(lambda: game.daemons.runAll(game), number=1000)
+        check = best_of(lambda: game.hints.pending_daemon in game.daemons, number=1000)
+        rows.append((n, f"{run * 1e6:.2f}", f"{check * 1e6:.3f}"))
+    report(
+        "Daemons (microseconds)",
+        rows,
+        ("dormant daemons", "run one turn", "membership check"),
+    )
+
+
+if __name__ == "__main__":
+    main()
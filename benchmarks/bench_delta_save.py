@@ -0,0 +1,88 @@
+"""
+File size, save time and load time of full and delta saves, for a world of 500
+rooms, each with its walls, floor and ceiling, and a box holding 10 coins: 9,000
+objects in all.
+
+The baseline is taken once the world is built. Then the player takes 20 turns,
+moving through 5 of the rooms and picking up a coin in each, before the game is
+saved. A full save (delta=False) stores every object; a delta save only stores
+what has changed since the baseline.
+"""
+
+import os
+import tempfile
+
+from intficpy.serializer import SaveGame, LoadGame
+from intficpy.room import Room
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .bench_save_format import timed
+from .common import make_game, report
+
+N_ROOMS = 500
+N_COINS = 10
+N_VISITED = 5
+
+
+def make_world():
+    game = make_game()
+    rooms = []
+    for i in range(N_ROOMS):
+        room = Room(game, f"room {i}", "A plain room. ")
+        box = Container(game, "box")
+        room.addThing(box)
+        for j in range(N_COINS):
+            box.addThing(Thing(game, "coin"))
+        rooms.append((room, box))
+    game.takeBaseline()
+    return game, rooms
+
+
+def play(game, rooms):
+    for room, box in rooms[:N_VISITED]:
+        game.me.location.removeThing(game.me)
+        room.addThing(game.me)
+        room.discovered = True
+        coin = next(iter(box.contains.values()))[0]
+        box.removeThing(coin)
+        game.me.addThing(coin)
+        for _ in range(20 // N_VISITED):
+            game.turnMain("look")
+
+
+def main():
+    game, rooms = make_world()
+    play(game, rooms)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for delta in (False, True):
+            path = os.path.join(directory, f"{delta}.sav")
+            save, _ = timed(lambda: SaveGame(game, path, delta=delta))
+            size = os.path.getsize(path)
+            repeat = 3 if delta else 1
+
+            def load():
+                l = LoadGame(game, path)
+                return l.is_valid() and l.load()
+
+            load_time, loaded = timed(load, repeat=repeat)
+            assert loaded
+            rows.append(
+                (
+                    "delta" if delta else "full",
+                    f"{size / 1024:.1f}",
+                    f"{save * 1e3:.1f}",
+                    f"{load_time * 1e3:.1f}",
+                )
+            )
+    report(
+        f"Full and delta saves, {len(game.ifp_objects)} objects "
+        "(times in milliseconds)",
+        rows,
+        ("kind", "size (KiB)", "save", "load"),
+    )
+
+
+if __name__ == "__main__":
+    main()
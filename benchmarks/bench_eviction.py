@@ -0,0 +1,131 @@
+"""
+The memory of a SessionManager that keeps MAX_RESIDENT games in memory, as the
+number of open sessions grows, against one that keeps every game, for the 20 room
+world of bench_server.
+
+Each session is opened and plays a turn, then TURNS turns are played on sessions
+chosen at random, most often the sessions opened first. Each row is measured in a
+process of its own. "rss" is the growth of the process's resident memory from
+before the first session was opened to the end, and "peak" the growth of its high
+water mark, from /proc/self/status (so on Linux only). "disk" is the size of the
+evicted games' files at the end. "hit rate" is the share of turns played on a game
+that was in memory, and "evict" and "rehydrate" are the 50th and 99th percentiles
+of the times to evict and rehydrate a game, in milliseconds, from
+SessionManager.metrics.
+"""
+
+import gc
+import multiprocessing
+import os
+import random
+import tempfile
+
+from intficpy.server import SessionManager
+
+from .bench_server import build
+from .common import report
+
+MAX_RESIDENT = 100
+SESSIONS = (1000, 10000, 100000)
+# the most sessions a SessionManager without a budget is measured with
+UNBOUNDED_SESSIONS = 10000
+TURNS = 10000
+COMMANDS = ("take coin", "look", "inventory", "drop coin", "x box")
+
+
+def process_memory():
+    """The resident memory of this process, and its high water mark, in bytes"""
+    out = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in ("VmRSS", "VmHWM"):
+                    out[name] = int(value.split()[0]) * 1024
+    except OSError:
+        return None
+    return out["VmRSS"], out["VmHWM"]
+
+
+def disk_usage(directory):
+    return sum(entry.stat().st_size for entry in os.scandir(directory))
+
+
+def run(n_sessions, max_resident):
+    random.seed(n_sessions)
+    with tempfile.TemporaryDirectory() as evict_dir:
+        sessions = SessionManager(build, max_resident=max_resident, evict_dir=evict_dir)
+        sessions.open()  # build the world
+        sessions.closeAll()
+        gc.collect()
+        before = process_memory()
+        ids = []
+        for i in range(n_sessions):
+            session_id, _ = sessions.open()
+            sessions.turn(session_id, "take coin")
+            ids.append(session_id)
+        for turn in range(TURNS):
+            # most turns are played on the sessions opened first
+            session_id = ids[int(n_sessions * random.random() ** 3)]
+            sessions.turn(session_id, COMMANDS[turn % len(COMMANDS)])
+        gc.collect()
+        after = process_memory()
+        disk = disk_usage(evict_dir)
+        metrics = sessions.metrics()
+        sessions.closeAll()
+
+    def ms(name):
+        value = metrics[name]
+        return "-" if value is None else f"{value:.2f}"
+
+    def mib(n):
+        return f"{n / 2**20:.1f}"
+
+    if before is None:
+        rss = peak = "-"
+    else:
+        rss = mib(after[0] - before[0])
+        peak = mib(after[1] - before[0])
+    return (
+        n_sessions,
+        max_resident or "all",
+        metrics["resident"],
+        rss,
+        peak,
+        mib(disk),
+        f"{metrics['hit_rate']:.2f}",
+        f"{ms('evict_ms_p50')}/{ms('evict_ms_p99')}",
+        f"{ms('rehydrate_ms_p50')}/{ms('rehydrate_ms_p99')}",
+    )
+
+
+def run_in_process(n_sessions, max_resident):
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run, (n_sessions, max_resident))
+
+
+def main():
+    rows = []
+    for n_sessions in SESSIONS:
+        if n_sessions <= UNBOUNDED_SESSIONS:
+            rows.append(run_in_process(n_sessions, None))
+        rows.append(run_in_process(n_sessions, MAX_RESIDENT))
+    report(
+        "Sessions of the bench_server world, with and without a budget of games",
+        rows,
+        (
+            "sessions",
+            "budget",
+            "resident",
+            "rss (MiB)",
+            "peak (MiB)",
+            "disk (MiB)",
+            "hit rate",
+            "evict p50/p99",
+            "rehydrate p50/p99",
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""
+Time to create many IFPGame instances, as a server hosting many sessions would.
+
+Every game shares the same read only base verb map, and keeps only its own
+additions in a small overlay, so building the verb map should no longer be part of
+the cost of creating a game. The "rebuilt verb map" column forces the base map to
+be rebuilt for every game, to show what construction used to cost.
+"""
+
+from intficpy import verb
+from intficpy.ifp_game import IFPGame
+
+from .common import BenchApp, best_of, report
+
+N_GAMES = 1000
+
+
+def create_games():
+    for _ in range(N_GAMES):
+        IFPGame(BenchApp(), main=__name__)
+
+
+def create_games_rebuilding_verbs():
+    for _ in range(N_GAMES):
+        verb._base_verbset = None
+        IFPGame(BenchApp(), main=__name__)
+
+
+def main():
+    shared = best_of(create_games, repeat=3)
+    rebuilt = best_of(create_games_rebuilding_verbs, repeat=3)
+    report(
+        f"Creating {N_GAMES} games (milliseconds)",
+        [(f"{shared * 1e3:.1f}", f"{rebuilt * 1e3:.1f}")],
+        ("shared verb map", "rebuilt verb map"),
+    )
+
+
+if __name__ == "__main__":
+    main()
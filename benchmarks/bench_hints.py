@@ -0,0 +1,49 @@
+"""
+Per turn cost of pending hint nodes.
+
+Each pending HintNode waits on an Achievement that has not been awarded. Pending
+nodes are only re-checked when something they depend on changes, so running the
+daemons on a turn where nothing changed should not grow with the number of pending
+nodes. Awarding one achievement should only re-check the node that depends on it.
+"""
+
+from intficpy.score import Achievement, Hint, HintNode
+
+from .common import make_game, best_of, report
+
+
+def setup(n_nodes):
+    game = make_game()
+    achievements = []
+    for i in range(n_nodes):
+        achievement = Achievement(game, 1, f"task {i}")
+        node = HintNode(game, [Hint(game, f"hint {i}")])
+        node.open_require_achievements = [achievement]
+        game.hints.addPending(game, node)
+        achievements.append(achievement)
+    # the first check of every newly pending node
+    game.daemons.runAll(game)
+    return game, achievements
+
+
+def main():
+    rows = []
+    for n in (10, 100, 1000, 5000):
+        game, achievements = setup(n)
+        idle = best_of(lambda: game.daemons.runAll(game), number=1000)
+
+        def award():
+            achievements.pop().award(game)
+            game.daemons.runAll(game)
+
+        awarded = best_of(award)
+        rows.append((n, f"{idle * 1e6:.2f}", f"{awarded * 1e6:.1f}"))
+    report(
+        "Pending hint nodes (microseconds per turn)",
+        rows,
+        ("pending nodes", "nothing changed", "one achievement awarded"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Cold import time of intficpy.ifp_game, measured with `python -X importtime`.
+
+Importing the game should not import the verbs, the serializer, or the travel
+helpers, which are loaded the first time they are needed. The benchmark exits with
+an error if the import takes longer than the budget, or if any of those modules is
+imported, so it can be used as a check in CI:
+
+    python -m benchmarks.bench_import_time
+"""
+
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+from .common import report
+
+MODULE = "intficpy.ifp_game"
+# cumulative import time, in milliseconds, with compiled bytecode already cached
+BUDGET_MS = 20
+LAZY_MODULES = (
+    "intficpy.verb",
+    "intficpy.serializer",
+    "intficpy.travel",
+    "intficpy.things",
+    "intficpy.actor",
+    "intficpy.room",
+)
+REPEAT = 7
+
+LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def import_times(env):
+    """
+    Import MODULE in a fresh interpreter, and return a dict of module name to
+    cumulative import time in microseconds
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def main():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+        env["PYTHONPYCACHEPREFIX"] = cache_dir
+
+        # the first run compiles and caches the bytecode
+        times = import_times(env)
+        runs = [import_times(env)[MODULE] for _ in range(REPEAT)]
+
+    best_ms = min(runs) / 1000
+    loaded = sorted(name for name in times if name.startswith("intficpy"))
+    report(
+        f"Cold import of {MODULE} (milliseconds)",
+        [(f"{best_ms:.1f}", f"{BUDGET_MS}")],
+        (f"best of {REPEAT}", "budget"),
+    )
+    print("intficpy modules imported: " + ", ".join(loaded))
+
+    errors = []
+    if best_ms > BUDGET_MS:
+        errors.append(f"import took {best_ms:.1f}ms, over the {BUDGET_MS}ms budget")
+    eager = [name for name in LAZY_MODULES if name in times]
+    if eager:
+        errors.append("imported eagerly: " + ", ".join(eager))
+    if errors:
+        sys.exit("; ".join(errors))
+
+
+if __name__ == "__main__":
+    main()
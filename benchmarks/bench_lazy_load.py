@@ -0,0 +1,118 @@
+"""
+Time to first prompt after loading a save, read eagerly (lazy=False) and lazily,
+for worlds of about 10,000, 50,000 and 100,000 objects. Each room has its walls,
+floor and ceiling, and a box holding 10 coins. Both full (delta=False) and delta
+saves are loaded.
+
+The save is made after the player has visited 5 of the rooms and taken a coin from
+each. It is loaded into a newly built copy of the world, as when a player resumes
+the game, and the time covers reading, checking and loading the save, and the
+first "look". "waiting" is the number of objects with saved attributes still
+waiting to be decoded by then, out of the number with saved attributes, when the
+save was read lazily. Saved values equal to those the world was built with are
+never left waiting.
+"""
+
+import os
+import tempfile
+import time
+
+from intficpy.actor import Player
+from intficpy.ifp_game import IFPGame
+from intficpy.serializer import SaveGame, LoadGame
+from intficpy.room import Room
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .common import BenchApp, report
+
+N_COINS = 10
+N_VISITED = 5
+WORLD_SIZES = (555, 2778, 5556)
+
+
+def make_world(n_rooms):
+    """
+    Build the world before calling initGame, as a game would. Boxes and coins have
+    names of their own, so that building the noun dictionary stays quick.
+    """
+    game = IFPGame(BenchApp(), main=__name__)
+    game.delta_saves = True
+    me = Player(game)
+    start = Room(game, "room", "desc")
+    start.addThing(me)
+    game.setPlayer(me)
+    rooms = []
+    for i in range(n_rooms):
+        room = Room(game, f"room {i}", "A plain room. ")
+        box = Container(game, f"box{i}")
+        room.addThing(box)
+        for j in range(N_COINS):
+            box.addThing(Thing(game, f"coin{i}x{j}"))
+        rooms.append((room, box))
+    game.initGame()
+    return game, rooms
+
+
+def play(game, rooms):
+    for room, box in rooms[:N_VISITED]:
+        game.me.location.removeThing(game.me)
+        room.addThing(game.me)
+        room.discovered = True
+        coin = next(iter(box.contains.values()))[0]
+        box.removeThing(coin)
+        game.me.addThing(coin)
+        game.turnMain("look")
+
+
+def first_prompt(n_rooms, path, lazy):
+    """The time from starting to load the save to the end of the first turn"""
+    game, rooms = make_world(n_rooms)
+    start = time.perf_counter()
+    l = LoadGame(game, path, lazy=lazy)
+    assert l.is_valid() and l.load()
+    game.turnMain("look")
+    elapsed = time.perf_counter() - start
+    save_map = l.save_map
+    if save_map is None:
+        return elapsed, None
+    saved = sum(1 for entry in save_map.entries.values() if save_map.shapes[entry[2]])
+    pending = len(game.deferred) if game.deferred is not None else 0
+    return elapsed, f"{pending}/{saved}"
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rooms in WORLD_SIZES:
+            game, rooms = make_world(n_rooms)
+            play(game, rooms)
+            n_objects = len(game.ifp_objects)
+            for delta in (False, True):
+                path = os.path.join(directory, f"{n_rooms}-{delta}.sav")
+                SaveGame(game, path, delta=delta)
+            del game, rooms
+
+            for delta in (False, True):
+                path = os.path.join(directory, f"{n_rooms}-{delta}.sav")
+                eager, _ = first_prompt(n_rooms, path, lazy=False)
+                lazy, waiting = first_prompt(n_rooms, path, lazy=True)
+                rows.append(
+                    (
+                        n_objects,
+                        "delta" if delta else "full",
+                        f"{os.path.getsize(path) / 2**20:.2f}",
+                        f"{eager * 1e3:.0f}",
+                        f"{lazy * 1e3:.0f}",
+                        waiting,
+                    )
+                )
+    report(
+        "Time to first prompt after loading a save (milliseconds)",
+        rows,
+        ("objects", "save", "size (MB)", "eager", "lazy", "waiting"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Time to check and load a full save (delta=False) of a world of 10,000 objects:
+500 rooms, each with its walls, floor and ceiling, and a box holding 10 coins.
+
+The save is loaded:
+
+- into the game as it was saved
+- after 20 more turns, in which the player visits 5 more rooms and takes a coin
+  from each
+- after every object in the world has been changed
+"""
+
+import os
+import tempfile
+import time
+
+from intficpy.serializer import SaveGame, LoadGame
+
+from .bench_delta_save import N_VISITED, make_world, play
+from .common import report
+
+REPEAT = 3
+
+
+def time_load(game, path, setup=None):
+    """The best time to check and load the save, after running setup each time"""
+    best = None
+    for _ in range(REPEAT):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        l = LoadGame(game, path)
+        assert l.is_valid() and l.load()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    game, rooms = make_world()
+    play(game, rooms)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "game.sav")
+        SaveGame(game, path, delta=False)
+
+        rows.append(("unchanged", time_load(game, path)))
+        rows.append(
+            (
+                "after 20 turns",
+                time_load(
+                    game, path, lambda: play(game, rooms[N_VISITED : N_VISITED * 2])
+                ),
+            )
+        )
+
+        def change_everything():
+            for obj in game.ifp_objects.values():
+                obj.loaded = False
+
+        rows.append(("every object changed", time_load(game, path, change_everything)))
+    report(
+        f"Loading a full save, {len(game.ifp_objects)} objects (milliseconds)",
+        [(name, f"{elapsed * 1e3:.0f}") for name, elapsed in rows],
+        ("game state before loading", "load"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+The time to start playing examples/testgame.py: in a new process, against in a
+worker of a WorkerPool, forked from a process that has already built the world.
+
+"cold start" runs a new Python process that imports IntFicPy, builds the world by
+running the game module, and calls initGame, the work a process that plays the
+game must do before the player's first turn. "pool start" is the time to create a
+WorkerPool of N_WORKERS workers, which builds the world once and forks the workers.
+"open" is the time for WorkerPool.open to return the opening events of a new
+session, and "first turn" the time for the session's first turn, both measured over
+N_SESSIONS sessions. All times are in milliseconds.
+
+On Linux, the memory of each worker is also reported, from /proc/<pid>/smaps_rollup:
+"shared" is the memory the worker shares with the parent and the other workers, and
+"private" the memory it has written to, once it has started, and after it has
+opened its share of the sessions.
+"""
+
+import os
+import runpy
+import subprocess
+import sys
+import time
+
+from intficpy.prefork import WorkerPool
+
+from .bench_prototype import TESTGAME
+from .bench_server import percentile
+from .common import report
+
+N_WORKERS = 4
+N_SESSIONS = 2000
+COLD_STARTS = 10
+COLD_START = f"""
+import runpy
+game = runpy.run_path({TESTGAME!r}, run_name="testgame")["game"]
+game.initGame()
+"""
+
+
+def build(app):
+    game = runpy.run_path(TESTGAME, run_name="testgame")["game"]
+    game.app = app
+    app.game = game
+    return game
+
+
+def cold_starts(n=COLD_STARTS):
+    times = []
+    for i in range(n):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", COLD_START], check=True, stdout=subprocess.DEVNULL
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def worker_memory(pid):
+    """The memory a process shares, and the memory it alone has written, in bytes"""
+    path = f"/proc/{pid}/smaps_rollup"
+    if not os.path.exists(path):
+        return None
+    fields = {}
+    with open(path) as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) * 1024
+    shared = fields.get("Shared_Clean", 0) + fields.get("Shared_Dirty", 0)
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return shared, private
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def ms(seconds):
+    return f"{seconds * 1e3:.2f}"
+
+
+def mib(n):
+    return f"{n / 2**20:.1f}"
+
+
+def main():
+    cold = cold_starts()
+
+    start = time.perf_counter()
+    pool = WorkerPool(build, workers=N_WORKERS)
+    pool_start = time.perf_counter() - start
+    try:
+        started = [worker_memory(worker.pid) for worker in pool.workers]
+        ids = [f"player-{i}" for i in range(N_SESSIONS)]
+        opens = [timed(pool.open, session_id) for session_id in ids]
+        first_turns = [timed(pool.turn, session_id, "look") for session_id in ids]
+        opened = [worker_memory(worker.pid) for worker in pool.workers]
+    finally:
+        pool.shutdown()
+
+    rows = [
+        ("cold start", len(cold), ms(percentile(cold, 50)), ms(max(cold))),
+        ("pool start", 1, ms(pool_start), ms(pool_start)),
+        ("open", len(opens), ms(percentile(opens, 50)), ms(percentile(opens, 99))),
+        (
+            "first turn",
+            len(first_turns),
+            ms(percentile(first_turns, 50)),
+            ms(percentile(first_turns, 99)),
+        ),
+    ]
+    report(
+        f"Starting examples/testgame.py ({N_WORKERS} workers)",
+        rows,
+        ("", "n", "p50 (ms)", "p99/max (ms)"),
+    )
+    if None not in started + opened:
+        rows = []
+        for when, memory in (("started", started), ("opened", opened)):
+            for i, (shared, private) in enumerate(memory):
+                rows.append((i, when, mib(shared), mib(private)))
+        report(
+            f"Worker memory, started and after opening "
+            f"{N_SESSIONS // N_WORKERS} sessions each",
+            rows,
+            ("worker", "", "shared (MiB)", "private (MiB)"),
+        )
+
+
+if __name__ == "__main__":
+    main()
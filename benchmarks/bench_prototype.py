@@ -0,0 +1,132 @@
+"""
+The memory, and open time, of each game played from one built world: by a copy of
+the whole world (IFPGame.fork) and by a copy on write game made from a Prototype.
+Two worlds are measured: the example game in examples/testgame.py, and the 20
+room world of bench_server.
+
+"fresh" is the memory allocated for each new game, and "played" the memory
+allocated for each game after it has played a few turns, both measured over the
+"games" opened at once: 10,000 games of testgame made from the prototype, and
+N_FORKED otherwise. "copied" is the number of objects each game has given its own
+attributes after playing, out of the objects in the world. "turn" is the time to
+play one of the commands.
+"""
+
+import os
+import runpy
+import time
+import tracemalloc
+
+from intficpy.prototype import Prototype, is_shell
+
+from . import bench_server
+from .common import BenchApp, report
+
+N_FORKED = 200
+N_SESSIONS = 10000
+TESTGAME = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    "examples",
+    "testgame.py",
+)
+TESTGAME_COMMANDS = ("look", "x bench", "look under bench", "u", "take key", "d")
+
+
+def testgame():
+    game = runpy.run_path(TESTGAME, run_name="testgame")["game"]
+    app = BenchApp()
+    game.app = app
+    app.game = game
+    return game
+
+
+def server_world():
+    return bench_server.build(BenchApp())
+
+
+def measure(make, commands, n):
+    """
+    :returns: the memory allocated for each new game, and for each game after
+        playing the commands, in bytes, and the games
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        games = [make() for i in range(n)]
+        fresh = tracemalloc.get_traced_memory()[0] - before
+        for game in games:
+            for command in commands:
+                game.turnMain(command)
+        played = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    return fresh / n, played / n, games
+
+
+def open_time(make, n):
+    start = time.perf_counter()
+    games = [make() for i in range(n)]
+    elapsed = time.perf_counter() - start
+    del games
+    return elapsed / n
+
+
+def turn_time(game, commands, repeat=20):
+    start = time.perf_counter()
+    for i in range(repeat):
+        for command in commands:
+            game.turnMain(command)
+    return (time.perf_counter() - start) / (repeat * len(commands))
+
+
+def main():
+    rows = []
+    worlds = (
+        ("testgame", testgame, TESTGAME_COMMANDS, N_SESSIONS),
+        ("server", server_world, bench_server.COMMANDS, N_FORKED),
+    )
+    for name, build, commands, n_sessions in worlds:
+        world = build()
+        world.initGame()
+        prototype = Prototype(world)
+        n_objects = len(prototype)
+        makes = (
+            ("fork", lambda: world.fork(BenchApp()), N_FORKED),
+            ("prototype", lambda: prototype.instantiate(BenchApp()), n_sessions),
+        )
+        for how, make, n in makes:
+            fresh, played, games = measure(make, commands, n)
+            copied = sum(
+                1 for obj in games[0].ifp_objects.values() if not is_shell(obj)
+            )
+            del games
+            rows.append(
+                (
+                    name,
+                    how,
+                    n,
+                    f"{open_time(make, n) * 1e3:.3f}",
+                    f"{fresh / 1024:.1f}",
+                    f"{played / 1024:.1f}",
+                    f"{copied}/{n_objects}",
+                    f"{turn_time(make(), commands) * 1e3:.3f}",
+                )
+            )
+    report(
+        "Games played from one built world",
+        rows,
+        (
+            "world",
+            "game",
+            "games",
+            "open (ms)",
+            "fresh (KiB)",
+            "played (KiB)",
+            "copied",
+            "turn (ms)",
+        ),
+    )
+
+
+if __name__ == "__main__":
+    main()
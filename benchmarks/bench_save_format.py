@@ -0,0 +1,94 @@
+"""
+File size, save time and load time of the binary and pickle save formats, for a
+world of 10,000 objects: 1,000 boxes in one room, holding 9,000 coins. Every
+object is saved (delta=False); see bench_delta_save for delta saves.
+
+"save" covers copying the game state and writing the file, and "encode" is the
+part of that spent serializing the copy and encoding it in the file format. "read"
+covers reading and decoding the file (LoadGame construction), and "decode" is the
+part of that spent decoding. "load" covers validating the data and applying it to
+the game.
+"""
+
+import os
+import tempfile
+import time
+
+from intficpy.save_format import paused_gc
+from intficpy.serializer import SaveGame, LoadGame, BINARY, PICKLE
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .common import make_game, report
+
+N_BOXES = 1000
+N_COINS = 9000
+
+
+def make_world():
+    game = make_game()
+    room = game.me.location
+    boxes = []
+    for i in range(N_BOXES):
+        box = Container(game, "box")
+        box.setAdjectives([f"box{i}", "wooden"])
+        room.addThing(box)
+        boxes.append(box)
+    for i in range(N_COINS):
+        coin = Thing(game, "coin")
+        coin.setAdjectives([f"coin{i}", "gold"])
+        boxes[i % N_BOXES].addThing(coin)
+    return game
+
+
+def paused(func):
+    """Call func with garbage collection paused, as SaveGame and LoadGame do"""
+    with paused_gc():
+        return func()
+
+
+def timed(func, repeat=3):
+    """Return the best time in seconds over `repeat` calls, and the last result"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    game = make_world()
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for save_format in (PICKLE, BINARY):
+            path = os.path.join(directory, f"{save_format}.sav")
+            save, s = timed(
+                lambda: SaveGame(game, path, save_format=save_format, delta=False)
+            )
+            encode, raw = timed(lambda: paused(lambda: b"".join(s.iter_encoded())))
+            size = os.path.getsize(path)
+            read, l = timed(lambda: LoadGame(game, path))
+            decode, _ = timed(lambda: paused(lambda: l.decode(raw)))
+            load, _ = timed(lambda: l.is_valid() and l.load(), repeat=1)
+            rows.append(
+                (
+                    save_format,
+                    f"{size / 1024:.0f}",
+                    f"{save * 1e3:.0f}",
+                    f"{encode * 1e3:.0f}",
+                    f"{read * 1e3:.0f}",
+                    f"{decode * 1e3:.0f}",
+                    f"{load * 1e3:.0f}",
+                )
+            )
+    report(
+        f"Save formats, {len(game.ifp_objects)} objects (times in milliseconds)",
+        rows,
+        ("format", "size (KiB)", "save", "encode", "read", "decode", "load"),
+    )
+
+
+if __name__ == "__main__":
+    main()
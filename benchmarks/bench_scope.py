@@ -0,0 +1,44 @@
+"""
+Parser latency for commands that match many candidate Things.
+
+A room is filled with N keys with distinct adjectives, plus N other Things, and
+the player examines one of the keys by its full name. Every key is a candidate
+for the noun, so each one goes through Parser.checkRange.
+"""
+
+from intficpy.thing_base import Thing
+
+from .common import make_game, best_of, report
+
+
+def build(n_items):
+    game = make_game()
+    room = game.me.location
+    for i in range(n_items):
+        key = Thing(game, "key")
+        key.setAdjectives([f"k{i}"])
+        key.moveTo(room)
+        Thing(game, "rock").moveTo(room)
+    return game
+
+
+def main():
+    rows = []
+    for n in (10, 100, 500, 2000):
+        game = build(n)
+        parser = game.parser
+        keys = game.nouns["key"]
+        command = f"x k{n // 2} key"
+
+        range_time = best_of(lambda: parser.checkRange(list(keys), "near"), number=5)
+        turn_time = best_of(lambda: game.turnMain(command), number=5)
+        rows.append((n, f"{range_time * 1e3:.2f}", f"{turn_time * 1e3:.2f}"))
+    report(
+        "Scope resolution with many candidates (milliseconds)",
+        rows,
+        ("candidates", "checkRange", "full turn"),
+    )
+
+
+if __name__ == "__main__":
+    main()
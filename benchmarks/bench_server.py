@@ -0,0 +1,142 @@
+"""
+Sustained turns per second, and turn latency, for 1,000 concurrent sessions played
+through a SessionManager by a local stand-in client. The world has 20 rooms, each
+with its walls, floor and ceiling, and a box holding 5 coins; the player starts in
+the first room with a coin.
+
+The client is a number of threads, each playing its share of the sessions in turn,
+so that every session is always waiting for its next command. Latency is measured
+from the call to SessionManager.turn to its return, and "p50" and "p99" are its
+percentiles, in milliseconds. "open" is the time to open a session, and "memory"
+the memory allocated for each open session, measured over 50 sessions.
+"""
+
+import threading
+import time
+import tracemalloc
+
+from intficpy.actor import Player
+from intficpy.ifp_game import IFPGame
+from intficpy.room import Room
+from intficpy.server import SessionManager
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .common import report
+
+N_SESSIONS = 1000
+N_ROOMS = 20
+N_COINS = 5
+TURNS_PER_SESSION = 20
+CLIENT_THREADS = (1, 8, 32)
+COMMANDS = ("look", "take coin", "look in box", "drop coin", "inventory", "x box")
+
+
+def build(app):
+    game = IFPGame(app, main=__name__)
+    me = Player(game)
+    rooms = []
+    for i in range(N_ROOMS):
+        room = Room(game, f"room {i}", "A plain room. ")
+        box = Container(game, "box")
+        room.addThing(box)
+        for j in range(N_COINS):
+            coin = Thing(game, "coin")
+            coin.invItem = True
+            box.addThing(coin)
+        rooms.append(room)
+    rooms[0].addThing(me)
+    game.setPlayer(me)
+    coin = Thing(game, "coin")
+    coin.invItem = True
+    me.addThing(coin)
+    return game
+
+
+def open_sessions(sessions, n):
+    start = time.perf_counter()
+    ids = [sessions.open()[0] for i in range(n)]
+    return ids, (time.perf_counter() - start) / n
+
+
+def session_memory(sessions, n=50):
+    """The memory allocated for each of n sessions, in bytes"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        ids, _ = open_sessions(sessions, n)
+        return (tracemalloc.get_traced_memory()[0] - before) / n
+    finally:
+        tracemalloc.stop()
+        for session_id in ids:
+            sessions.close(session_id)
+
+
+def play(sessions, ids, n_clients):
+    """
+    Play TURNS_PER_SESSION turns on every session from n_clients threads
+
+    :returns: the wall clock time taken, and the latency of each turn
+    """
+    latencies = []
+    shares = [ids[i::n_clients] for i in range(n_clients)]
+
+    def client(share):
+        mine = []
+        for turn in range(TURNS_PER_SESSION):
+            command = COMMANDS[turn % len(COMMANDS)]
+            for session_id in share:
+                start = time.perf_counter()
+                sessions.turn(session_id, command)
+                mine.append(time.perf_counter() - start)
+        latencies.extend(mine)
+
+    threads = [threading.Thread(target=client, args=(share,)) for share in shares]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def main():
+    sessions = SessionManager(build)
+    sessions.open()  # build the world
+    sessions.closeAll()
+
+    memory = session_memory(sessions)
+    ids, open_time = open_sessions(sessions, N_SESSIONS)
+    n_objects = len(sessions.session(ids[0]).game.ifp_objects)
+
+    rows = []
+    for n_clients in CLIENT_THREADS:
+        elapsed, latencies = play(sessions, ids, n_clients)
+        rows.append(
+            (
+                n_clients,
+                len(latencies),
+                f"{len(latencies) / elapsed:.0f}",
+                f"{percentile(latencies, 50) * 1e3:.2f}",
+                f"{percentile(latencies, 99) * 1e3:.2f}",
+            )
+        )
+    sessions.closeAll()
+    print(
+        f"{N_SESSIONS} sessions of {n_objects} objects: "
+        f"open {open_time * 1e3:.2f} ms, memory {memory / 1024:.0f} KiB per session"
+    )
+    report(
+        "Turns played through a SessionManager",
+        rows,
+        ("clients", "turns", "turns/s", "p50 (ms)", "p99 (ms)"),
+    )
+
+
+if __name__ == "__main__":
+    main()
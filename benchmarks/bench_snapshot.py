@@ -0,0 +1,122 @@
+"""
+Time to take and restore an in memory snapshot, against saving and loading a delta
+save, and time to fork the game, for worlds of about 1,000, 10,000 and 50,000
+objects. Each room has its walls, floor and ceiling, and a box holding 10 coins.
+The world is built before calling initGame, as a game would, and undo is on.
+
+Between snapshots the player moves to the next room and picks up a coin, so a turn
+changes the same handful of objects whatever the size of the world. "first" is the
+first snapshot taken, which shares the copies of the objects that have not changed
+since the baseline. "snapshot" and "restore" are the times for later snapshots, and
+for putting the game back one turn.
+"""
+
+import os
+import tempfile
+import time
+
+from intficpy.actor import Player
+from intficpy.ifp_game import IFPGame
+from intficpy.room import Room
+from intficpy.serializer import SaveGame, LoadGame
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .common import BenchApp, best_of, report
+
+N_COINS = 10
+WORLD_SIZES = (55, 555, 2778)
+
+
+def make_world(n_rooms):
+    game = IFPGame(BenchApp(), main=__name__)
+    me = Player(game)
+    start = Room(game, "room", "desc")
+    start.addThing(me)
+    game.setPlayer(me)
+    rooms = []
+    for i in range(n_rooms):
+        room = Room(game, f"room {i}", "A plain room. ")
+        box = Container(game, f"box{i}")
+        room.addThing(box)
+        for j in range(N_COINS):
+            box.addThing(Thing(game, f"coin{i}x{j}"))
+        rooms.append((room, box))
+    game.undo_turns = 20
+    game.initGame()
+    return game, rooms
+
+
+def take_turn(game, rooms, i):
+    room, box = rooms[i % len(rooms)]
+    game.me.location.removeThing(game.me)
+    room.addThing(game.me)
+    coins = [things[0] for things in box.contains.values()]
+    if coins:
+        box.removeThing(coins[0])
+        game.me.addThing(coins[0])
+    game.turnMain("look")
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rooms in WORLD_SIZES:
+            game, rooms = make_world(n_rooms)
+            n_objects = len(game.ifp_objects)
+
+            start = time.perf_counter()
+            snapshot = game.snapshot()
+            first = time.perf_counter() - start
+
+            turns = iter(range(1, 1000))
+
+            def snapshot_turn():
+                nonlocal snapshot
+                take_turn(game, rooms, next(turns))
+                start = time.perf_counter()
+                snapshot = game.snapshot()
+                return time.perf_counter() - start
+
+            later = min(snapshot_turn() for _ in range(5))
+
+            def restore_turn():
+                before = game.snapshot()
+                take_turn(game, rooms, next(turns))
+                start = time.perf_counter()
+                game.restore(before)
+                return time.perf_counter() - start
+
+            restore = min(restore_turn() for _ in range(5))
+
+            path = os.path.join(directory, f"{n_rooms}.sav")
+            save = best_of(lambda: SaveGame(game, path), repeat=3)
+
+            def load():
+                l = LoadGame(game, path)
+                assert l.is_valid() and l.load()
+                if game.deferred is not None:
+                    game.deferred.decodeAll()
+
+            load_time = best_of(load, repeat=3)
+            fork = best_of(lambda: game.fork(BenchApp()), repeat=3)
+            rows.append(
+                (
+                    n_objects,
+                    f"{first * 1e3:.1f}",
+                    f"{later * 1e3:.2f}",
+                    f"{restore * 1e3:.2f}",
+                    f"{save * 1e3:.1f}",
+                    f"{load_time * 1e3:.1f}",
+                    f"{fork * 1e3:.0f}",
+                )
+            )
+    report(
+        "In memory snapshots (milliseconds)",
+        rows,
+        ("objects", "first", "snapshot", "restore", "save", "load", "fork"),
+    )
+
+
+if __name__ == "__main__":
+    main()
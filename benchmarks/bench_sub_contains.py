@@ -0,0 +1,45 @@
+"""
+Scope checks against a room with a growing number of nested items.
+
+Each Container holds 9 Things, so a room with N nested items holds N / 10
+Containers. With the maintained sub_contains index, a room range check should
+cost roughly the same regardless of N.
+"""
+
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .common import make_game, best_of, report
+
+
+def build(n_items):
+    game = make_game()
+    room = game.me.location
+    target = None
+    for i in range(n_items // 10):
+        box = Container(game, "box")
+        box.moveTo(room)
+        for j in range(9):
+            target = Thing(game, "widget")
+            target.moveTo(box)
+    return game, target
+
+
+def main():
+    rows = []
+    for n in (10, 100, 1000, 10000):
+        game, target = build(n)
+        parser = game.parser
+        room = game.me.location
+        range_check = best_of(lambda: parser.roomRangeCheck(target), number=200)
+        contains = best_of(lambda: room.containsItem(target), number=200)
+        rows.append((n, f"{range_check * 1e6:.1f}", f"{contains * 1e6:.1f}"))
+    report(
+        "Room scope checks (microseconds per call)",
+        rows,
+        ("nested items", "roomRangeCheck", "containsItem"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Time to undo one turn, against restoring the same turn by saving the game before
+it and loading that save afterwards, for worlds of 100 to 2,000 rooms, each with a
+box holding 10 coins.
+
+Each turn the player moves to the next room and picks up a coin, so a turn
+changes the same handful of objects whatever the size of the world. Undo only
+puts back what the turn changed; a full save and load walks every object.
+"""
+
+import os
+import tempfile
+
+from intficpy.serializer import SaveGame, LoadGame
+from intficpy.room import Room
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .common import best_of, make_game, report
+
+SIZES = (100, 500, 2000)
+N_COINS = 10
+
+
+def make_world(n_rooms):
+    game = make_game()
+    rooms = []
+    for i in range(n_rooms):
+        room = Room(game, f"room {i}", "A plain room. ")
+        box = Container(game, "box")
+        room.addThing(box)
+        for j in range(N_COINS):
+            box.addThing(Thing(game, "coin"))
+        rooms.append((room, box))
+    game.takeBaseline()
+    game.enableUndo()
+    return game, rooms
+
+
+def take_turn(game, room, box):
+    game.me.location.removeThing(game.me)
+    room.addThing(game.me)
+    coin = next(iter(box.contains.values()))[0]
+    box.removeThing(coin)
+    game.me.addThing(coin)
+    game.turnMain("look")
+
+
+def time_undo(game, rooms):
+    room, box = rooms[1]
+
+    def turn_and_undo():
+        take_turn(game, room, box)
+        game.undo()
+        game.turnMain("look")
+
+    return best_of(turn_and_undo, repeat=5)
+
+
+def time_save_load(game, rooms, path):
+    room, box = rooms[1]
+
+    def turn_and_reload():
+        SaveGame(game, path, delta=False)
+        take_turn(game, room, box)
+        l = LoadGame(game, path)
+        assert l.is_valid() and l.load()
+
+    return best_of(turn_and_reload, repeat=1)
+
+
+def main():
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for n_rooms in SIZES:
+            game, rooms = make_world(n_rooms)
+            game.turnMain("look")
+            undo = time_undo(game, rooms)
+            path = os.path.join(directory, f"{n_rooms}.sav")
+            reload = time_save_load(game, rooms, path)
+            rows.append(
+                (
+                    len(game.ifp_objects),
+                    f"{undo * 1e3:.2f}",
+                    f"{reload * 1e3:.1f}",
+                )
+            )
+    report(
+        "Restoring the previous turn (times in milliseconds, including the turn)",
+        rows,
+        ("objects", "undo", "save + load"),
+    )
+
+
+if __name__ == "__main__":
+    main()
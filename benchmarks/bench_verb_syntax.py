@@ -0,0 +1,52 @@
+"""
+Verb matching time as an author adds more and more synonyms to a verb.
+
+The author verb is registered under "get", like the built in GetVerb, and has one
+syntax form for each of its synonyms. Parsing "get widget" only needs the forms
+that contain "get" or "widget", so the time to match should not grow with the
+number of synonyms.
+"""
+
+from intficpy.thing_base import Thing
+from intficpy.verb import GetVerb
+
+from .common import make_game, best_of, report
+
+
+def make_verb(n_synonyms):
+    synonyms = [f"snatch{i}" for i in range(n_synonyms)]
+
+    class SnatchVerb(GetVerb):
+        word = "get"
+        syntax = [["get", "<dobj>", "quickly"]] + [
+            [word, "<dobj>"] for word in synonyms
+        ]
+
+    SnatchVerb.synonyms = synonyms
+    return SnatchVerb
+
+
+def main():
+    rows = []
+    for n in (0, 10, 100, 1000, 5000):
+        game = make_game()
+        game.addVerb(make_verb(n))
+        Thing(game, "widget").moveTo(game.me.location)
+        parser = game.parser
+        tokens = ["get", "widget"]
+
+        def match():
+            parser.syntax_index.match(game.verbs["get"], game.verbs["get"], tokens)
+
+        match_time = best_of(match, number=200)
+        turn_time = best_of(lambda: game.turnMain("get widget"), number=20)
+        rows.append((n, f"{match_time * 1e6:.1f}", f"{turn_time * 1e6:.1f}"))
+    report(
+        "Verb syntax matching (microseconds)",
+        rows,
+        ("author synonyms", "syntax match", "full turn"),
+    )
+
+
+if __name__ == "__main__":
+    main()
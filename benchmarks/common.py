@@ -0,0 +1,57 @@
+##############################################################
+# COMMON.PY - shared setup for the IntFicPy benchmarks
+# Run a benchmark from the repository root, for instance:
+#     python -m benchmarks.bench_sub_contains
+##############################################################
+import time
+
+from intficpy.actor import Player
+from intficpy.room import Room
+from intficpy.ifp_game import IFPGame
+
+
+class BenchApp:
+    """A minimal app that discards printed text"""
+
+    def __init__(self):
+        self.print_stack = []
+
+    def printEventText(self, event):
+        self.print_stack.extend(event.text)
+
+
+def make_game():
+    """Create a game with a Player in a single Room, ready to take turns"""
+    app = BenchApp()
+    game = IFPGame(app, main=__name__)
+    me = Player(game)
+    room = Room(game, "room", "desc")
+    room.addThing(me)
+    game.setPlayer(me)
+    game.initGame()
+    return game
+
+
+def best_of(func, repeat=5, number=1):
+    """Return the best per-call time in seconds over `repeat` runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = (time.perf_counter() - start) / number
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def report(title, rows, headers):
+    """Print a simple aligned table"""
+    print(title)
+    widths = [
+        max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)
+    ]
+    print("  ".join(str(h).rjust(w) for h, w in zip(headers, widths)))
+    for row in rows:
+        print("  ".join(str(c).rjust(w) for c, w in zip(row, widths)))
+    print()
@@ -100,15 +100,17 @@ shack_concept.setAdjectives(["one", "room"])
 shack_concept.makeKnown(me)
 
 
+# Functions like this one are called with the game being played. To find the objects
+# created in this file, use game.getObject, so that the function also works for
+# copies of the game, such as the sessions of a SessionManager (intficpy.server)
 def takeOpalFunc(game):
+    me = game.me
     if not me.opaltaken:
         game.addText(
             "As you hold the opal in your hand, you're half-sure you can feel the air cooling around you. A shiver runs down your spine. Something is not right here.",
         )
         me.opaltaken = True
-        opalAchievement.award(game)
-        print(opal.ix)
-        print(opal.ix in me.knows_about)
+        game.getObject(opalAchievement).award(game)
 
 
 opal.getVerbDobj = takeOpalFunc
@@ -150,7 +152,7 @@ beach = OutdoorRoom(
 
 
 def beachArrival(game):
-    freeEnding.endGame(game)
+    game.getObject(freeEnding).endGame(game)
 
 
 beach.arriveFunc = beachArrival
@@ -206,15 +208,16 @@ def sarahOpalFunc(game, dobj):
     Return True to skip the verb's normal behaviour after evaluating, or False to continue
     as normal.
     """
-    if not sarah.threwkey and dobj == sarah:
+    actor = game.getObject(sarah)
+    if not actor.threwkey and dobj == actor:
         game.addText(
             '"Fine!" she cries. "Fine! Take the key and leave! "'
             '"Just get that thing away from me!" ',
         )
         game.addText("Sarah flings a rusty key at you. You catch it.")
-        rustykey.moveTo(me)
-        keyAchievement.award(game)
-        sarah.threwkey = True
+        game.getObject(rustykey).moveTo(game.me)
+        game.getObject(keyAchievement).award(game)
+        actor.threwkey = True
         return True
 
 
@@ -243,9 +246,10 @@ howgethere = SpecialTopic(
 
 
 def sarahDefault(game):
-    game.addText(sarah.default_topic)
-    storm_concept.makeKnown(me)
-    sarah.addSpecialTopic(howgethere)
+    actor = game.getObject(sarah)
+    game.addText(actor.default_topic)
+    game.getObject(storm_concept).makeKnown(game.me)
+    actor.addSpecialTopic(game.getObject(howgethere))
 
 
 sarah.defaultTopic = sarahDefault
@@ -295,4 +299,5 @@ me.opaltaken = False
 sarah.threwkey = False
 
 # now that all our objects are set up, run the game
-ex.runGame()
+if __name__ == "__main__":
+    ex.runGame()
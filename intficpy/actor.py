@@ -174,10 +174,12 @@ class Actor(Thing):
         """
         if item.location:
             item.location.removeThing(item)
+        self._recordChange("wearing")
         if item.ix in self.wearing:
             self.wearing[item.ix].append(item)
-            return
-        self.wearing[item.ix] = [item]
+        else:
+            self.wearing[item.ix] = [item]
+        self.game.containment_epoch += 1
 
     def removeWearing(self, item):
         """
@@ -188,10 +190,12 @@ class Actor(Thing):
         """
         if not item.ix in self.wearing:
             return
+        self._recordChange("wearing")
         self.wearing[item.ix].remove(item)
         if not self.wearing[item.ix]:
             del self.wearing[item.ix]
         item.location = None
+        self.game.containment_epoch += 1
 
     def setHiTopics(self, hi_topic, return_hi_topic):
         """Set the hi topics for this Actor. Sets both the initial greeting, and the
@@ -254,12 +258,16 @@ class Actor(Thing):
         """
         topic.owner = self
         if "ask" in ask_tell_give_show or ask_tell_give_show == "all":
+            self._recordChange("ask_topics")
             self.ask_topics[thing.ix] = topic
         if "tell" in ask_tell_give_show or ask_tell_give_show == "all":
+            self._recordChange("tell_topics")
             self.tell_topics[thing.ix] = topic
         if "give" in ask_tell_give_show or ask_tell_give_show == "all":
+            self._recordChange("give_topics")
             self.give_topics[thing.ix] = topic
         if "show" in ask_tell_give_show or ask_tell_give_show == "all":
+            self._recordChange("show_topics")
             self.show_topics[thing.ix] = topic
 
     def addSpecialTopic(self, topic):
@@ -270,6 +278,8 @@ class Actor(Thing):
         :type topic: SpecialTopic
         """
         topic.owner = self
+        self._recordChange("special_topics")
+        self._recordChange("special_topics_alternate_keys")
         self.special_topics[topic.suggestion] = topic
         for x in topic.alternate_phrasings:
             self.special_topics_alternate_keys[x] = topic
@@ -281,6 +291,8 @@ class Actor(Thing):
         :param topic: the SpecialTopic to remove
         :type topic: SpecialTopic
         """
+        self._recordChange("special_topics")
+        self._recordChange("special_topics_alternate_keys")
         if topic.suggestion in self.special_topics:
             del self.special_topics[topic.suggestion]
         for x in topic.alternate_phrasings:
@@ -350,6 +362,7 @@ class Actor(Thing):
         :type stock: int or True
         """
         if item.ix not in self.for_sale:
+            self._recordChange("for_sale")
             self.for_sale[item.ix] = SaleItem(self.game, item, currency, price, stock)
 
     def addWillBuy(self, item, currency, price, max_wanted):
@@ -367,6 +380,7 @@ class Actor(Thing):
         :type max_wanted: int or True
         """
         if item.ix not in self.will_buy:
+            self._recordChange("will_buy")
             self.will_buy[item.ix] = SaleItem(
                 self.game, item, currency, price, max_wanted
             )
@@ -733,6 +747,7 @@ class SpecialTopic(Topic):
         :param phrasing: the alternate phrasing to add
         :type phrasing: str
         """
+        self._recordChange("alternate_phrasings")
         self.alternate_phrasings.append(phrasing)
 
 
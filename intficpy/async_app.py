@@ -0,0 +1,307 @@
+import asyncio
+import functools
+
+from .server import SessionManager
+
+##############################################################
+# ASYNC_APP.PY - IntFicPy games played from an asyncio event loop
+# Defines AsyncApp, an app whose game's turns are awaited, and AsyncServer, which
+# serves a game to many connections from one event loop
+##############################################################
+#
+# IFPGame.turnMain, and the verbs it calls, are synchronous, and the save, load and
+# record verbs ask the app for a file name in the middle of a turn. AsyncApp plays
+# each turn in an executor, so that the event loop is free while it is played, and
+# the file prompts a turn makes are passed back to the loop, as coroutines to await.
+# Loading and saving the game read and write the file in the executor, too.
+#
+#     app = AsyncApp()
+#     game = IFPGame(app, main=game_module)
+#     ...build the world...
+#     opening = await app.start()
+#     events = await app.turn("take umbrella")
+#     async for event in app.stream("open umbrella"):
+#         ...
+#
+# Turns on one game are played one at a time, in the order they are awaited. Any
+# number of games can be played from the same loop.
+
+# the line an AsyncServer sends after the events of each turn
+END_OF_TURN = ">"
+# the commands that close an AsyncServer connection
+QUIT_COMMANDS = ("quit", "q")
+
+# put on the queue of a stream after the turn's last event
+_END = object()
+
+
+class AsyncApp:
+    """
+    The app for a game played from an asyncio event loop. Turns are played with
+    `turn`, or `stream`, in `executor` (the loop's default executor if this is
+    None).
+
+    The events printed outside a turn, such as the events of the opening turn when
+    the game is made by a SessionManager, are kept until they are taken with
+    `takeEvents`.
+
+    The save, load and record verbs ask for a file name with saveFilePromptAsync
+    and openFilePromptAsync, which are awaited on the loop. By default they return
+    None, and the verbs are turned away; override them to ask the player.
+    """
+
+    def __init__(self, executor=None):
+        self.game = None  # set by the game
+        self.executor = executor
+        self.events = []
+        # turns are played one at a time, holding the lock
+        self.lock = asyncio.Lock()
+        # the loop, and the queue of the stream, of the turn being played
+        self._loop = None
+        self._queue = None
+
+    def printEventText(self, event):
+        if self._queue is None:
+            self.events.append(event)
+        else:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    def takeEvents(self):
+        """
+        Return the events printed outside a turn since this was last called, and
+        forget them
+
+        :rtype: list
+        """
+        events = self.events
+        self.events = []
+        return events
+
+    async def saveFilePromptAsync(self, extension, filetype_desc, msg):
+        """
+        Ask the player for a file to save to
+
+        :returns: the path of the file, or None
+        :rtype: str or None
+        """
+        return None
+
+    async def openFilePromptAsync(self, extension, filetype_desc, msg):
+        """
+        Ask the player for a file to open
+
+        :returns: the path of the file, or None
+        :rtype: str or None
+        """
+        return None
+
+    def saveFilePrompt(self, extension, filetype_desc, msg):
+        return self._awaitOnLoop(
+            self.saveFilePromptAsync(extension, filetype_desc, msg)
+        )
+
+    def openFilePrompt(self, extension, filetype_desc, msg):
+        return self._awaitOnLoop(
+            self.openFilePromptAsync(extension, filetype_desc, msg)
+        )
+
+    def _awaitOnLoop(self, coro):
+        """
+        Await a coroutine on the loop from the executor, and return its result.
+        Raises RuntimeError if no turn is being played in the executor.
+        """
+        loop = self._loop
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if loop is None or running is loop:
+            coro.close()
+            raise RuntimeError(
+                "The file prompts of an AsyncApp can only be used in a turn played "
+                "with AsyncApp.turn or AsyncApp.stream"
+            )
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def _run(self, func, *args):
+        """Call func in the executor, holding the lock, and return its events"""
+        async with self.lock:
+            return [event async for event in self._stream(func, *args)]
+
+    async def _stream(self, func, *args):
+        """
+        Call func in the executor, and yield each event it prints as it is printed.
+        The caller must hold the lock.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        self._loop = loop
+        self._queue = queue
+
+        def run():
+            try:
+                func(*args)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _END)
+
+        future = loop.run_in_executor(self.executor, run)
+        try:
+            while True:
+                event = await queue.get()
+                if event is _END:
+                    break
+                yield event
+        finally:
+            # a stream closed early still waits for the turn to finish
+            try:
+                await asyncio.shield(future)
+            finally:
+                self._loop = None
+                self._queue = None
+
+    async def start(self):
+        """
+        Call the game's initGame, and return the events of its opening turn
+
+        :rtype: list
+        """
+        return await self._run(self.game.initGame)
+
+    async def turn(self, text):
+        """
+        Play a turn, and return its events
+
+        :param text: the player's command
+        :type text: str
+        :rtype: list of IFPEvent
+        """
+        return await self._run(self.game.turnMain, text)
+
+    async def stream(self, text):
+        """
+        Play a turn, yielding each of its events as it is printed. The game's next
+        turn waits until the iterator is exhausted, or closed with aclose.
+
+        :param text: the player's command
+        :type text: str
+        """
+        async with self.lock:
+            events = self._stream(self.game.turnMain, text)
+            try:
+                async for event in events:
+                    yield event
+            finally:
+                await events.aclose()
+
+    async def save(self, filename, **kwargs):
+        """
+        Save the game. Its state is copied between turns, and the file is written in
+        the executor. Keyword arguments are passed on to SaveGame.
+        """
+        from .serializer import SaveGame
+
+        async with self.lock:
+            save = SaveGame(self.game, filename, write=False, **kwargs)
+        await asyncio.get_running_loop().run_in_executor(self.executor, save.write)
+
+    async def load(self, filename, **kwargs):
+        """
+        Load a saved game, in the executor. Keyword arguments are passed on to
+        LoadGame.
+
+        :returns: False if the file is not a valid save of the game
+        :rtype: bool
+        """
+        from .serializer import LoadGame
+
+        def load():
+            if self.game.saves:
+                # the file may still be being written
+                self.game.saves.wait()
+            l = LoadGame(self.game, filename, **kwargs)
+            if not l.is_valid():
+                return False
+            l.load()
+            return True
+
+        async with self.lock:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, load)
+
+
+class AsyncServer:
+    """
+    Serves a game over TCP from an asyncio event loop. Each connection is given a
+    session of a SessionManager, played through an AsyncApp.
+
+    The client sends one command per line. The server sends the text of each event,
+    one line for each string, as soon as it is printed, and a line holding only
+    END_OF_TURN after the events of the opening, and of each turn. A connection is
+    closed when the client closes it, or sends one of QUIT_COMMANDS.
+
+    :param build: called with an app, to build a game and its world (see
+        SessionManager)
+    :type build: callable
+    :param app_class: called to create the app for each connection. Must create an
+        AsyncApp
+    :type app_class: callable
+    :param executor: the executor each app plays its turns in, if app_class is
+        AsyncApp
+    """
+
+    def __init__(self, build, app_class=None, executor=None):
+        if app_class is None:
+            app_class = functools.partial(AsyncApp, executor)
+        self.sessions = SessionManager(build, app_class)
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=0, **kwargs):
+        """
+        Build the world, in the executor, and start listening for connections.
+        Keyword arguments, such as `backlog`, are passed on to asyncio.start_server.
+
+        :returns: the asyncio Server, whose `sockets` give the port if `port` is 0
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.sessions.getPrototype)
+        self.server = await asyncio.start_server(self._serve, host, port, **kwargs)
+        return self.server
+
+    async def stop(self):
+        """Stop listening, and end every open session"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.sessions.closeAll)
+
+    @staticmethod
+    def _write(writer, events):
+        lines = [t for event in events for t in event.text]
+        lines.append(END_OF_TURN)
+        writer.write(("\n".join(lines) + "\n").encode())
+
+    async def _serve(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        session_id, events = await loop.run_in_executor(None, self.sessions.open)
+        app = self.sessions.session(session_id).app
+        try:
+            self._write(writer, events)
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                text = line.decode(errors="replace").strip()
+                if text.lower() in QUIT_COMMANDS:
+                    break
+                async for event in app.stream(text):
+                    writer.write(("\n".join(event.text) + "\n").encode())
+                writer.write((END_OF_TURN + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            try:
+                await loop.run_in_executor(None, self.sessions.close, session_id)
+            finally:
+                writer.close()
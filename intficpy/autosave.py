@@ -0,0 +1,580 @@
+import os
+import struct
+import tempfile
+import time
+import zlib
+
+from . import save_format as binary_save
+from .baseline import copy_value
+from .serializer import (
+    BINARY,
+    SKIPPED_ATTRIBUTES,
+    LoadGame,
+    SaveGame,
+    sync_directory,
+)
+from .exceptions import DeserializationError, Unserializable
+
+##############################################################
+# AUTOSAVE.PY - autosave and crash recovery for IntFicPy
+# Defines the Autosave class, which keeps a snapshot of the game and a journal
+# of what has changed since, and the recover function, which puts them back
+##############################################################
+
+# the start of every journal file
+JOURNAL_MAGIC = b"IFPJ"
+JOURNAL_VERSION = 1
+# after the magic and version, the crc32 and size of the snapshot the journal
+# follows on from
+JOURNAL_HEADER = struct.Struct("<IQ")
+# before each record, the length and crc32 of the record
+RECORD_HEADER = struct.Struct("<II")
+
+# the number of journal records written before the journal is compacted into a new
+# snapshot
+COMPACT_EVERY = 100
+
+
+def journal_path(snapshot_path):
+    """
+    The journal file that goes with an autosave snapshot
+    """
+    return os.path.splitext(snapshot_path)[0] + ".journal"
+
+
+def snapshot_id(raw):
+    """
+    Identify a snapshot file from its contents, so that a journal can be matched to
+    the snapshot it follows on from
+    """
+    return JOURNAL_HEADER.pack(zlib.crc32(raw), len(raw))
+
+
+class JournalRecord(SaveGame):
+    """
+    The attributes and locations that have changed over one or more turns, to be
+    appended to an autosave journal. Only ever saved in the binary format.
+
+    Locations are stored as the contents tree of each outermost location whose
+    contents changed, as in a save file. Attributes that have been deleted are
+    stored under "deleted".
+
+    As for a SaveGame created with `write=False`, the changed state is copied when
+    the record is created, and serialized, encoded and appended to the journal by
+    `write`, which can be called from the game's SaveWriter thread.
+    """
+
+    def __init__(self, autosave, changes):
+        """
+        :param autosave: the Autosave whose journal the record is appended to
+        :type autosave: Autosave
+        :param changes: the (object, attribute name) pairs to store, from
+            ChangeTracker.sinceCheckpoint
+        :type changes: set
+        """
+        self.autosave = autosave
+        self.changes = changes
+        # attributes that have been deleted, by object ix
+        self.deleted = {}
+        super().__init__(
+            autosave.game, autosave.filename, BINARY, delta=False, write=False
+        )
+
+    def copy_ifp_objects(self):
+        """
+        Copy the changed attributes
+
+        :returns: a dict mapping the ix of each object to a copy of its changed
+            attributes
+        :rtype: dict
+        """
+        objects = {}
+        for obj, attr in self.changes:
+            if attr == "contains" or attr in SKIPPED_ATTRIBUTES:
+                continue
+            ix = self.serialize_string(obj.ix)
+            attributes = obj.__dict__
+            if attr not in attributes:
+                # an attribute waiting to be decoded has not been deleted
+                obj._decodeDeferred()
+            if attr not in attributes:
+                self.deleted.setdefault(ix, {})[self.serialize_string(attr)] = None
+                continue
+            objects.setdefault(ix, {})[attr] = copy_value(attributes[attr])
+        return objects
+
+    def save_locations(self):
+        """
+        Serialize the contents tree of each outermost location whose contents
+        changed
+        """
+        roots = {}
+        for obj, attr in self.changes:
+            if attr == "contains":
+                root = obj.getOutermostLocation() or obj
+                if root.is_top_level_location:
+                    roots[root.ix] = root
+        return {ix: self.serialize_contains(root) for ix, root in roots.items()}
+
+    def iter_encoded(self):
+        """
+        Serialize the copied attributes, and encode the record
+
+        :rtype: iterator of bytes
+        """
+        self.data = {
+            "ifp_objects": self.save_ifp_objects(),
+            "deleted": self.deleted,
+            "locations": self.locations,
+            "active_sequence": self.active_sequence,
+        }
+        yield self.encode()
+
+    def write(self):
+        """
+        Append the record to the autosave journal
+        """
+        with binary_save.paused_gc():
+            encoded = b"".join(self.iter_encoded())
+        self.autosave.append(encoded)
+
+
+class AutosaveSnapshot(SaveGame):
+    """
+    A new autosave snapshot, which starts a new journal once it has been written
+    """
+
+    def __init__(self, autosave):
+        """
+        :param autosave: the Autosave the snapshot is taken for
+        :type autosave: Autosave
+        """
+        self.autosave = autosave
+        super().__init__(autosave.game, autosave.filename, write=False)
+
+    def write(self):
+        try:
+            super().write()
+        except BaseException:
+            # the records that follow must not be appended to the old journal
+            self.autosave.closeJournal()
+            raise
+        self.autosave.startJournal()
+
+
+class LoadedSnapshot:
+    """
+    A save file that has just been loaded, linked beside the autosave snapshot, to
+    be moved over it as the new snapshot, which starts a new journal. Written by
+    the game's SaveWriter, like an AutosaveSnapshot.
+    """
+
+    def __init__(self, autosave, path):
+        """
+        :param autosave: the Autosave the snapshot is taken for
+        :type autosave: Autosave
+        :param path: the link to the save file
+        :type path: str
+        """
+        self.autosave = autosave
+        self.path = path
+
+    def write(self):
+        try:
+            os.replace(self.path, self.autosave.filename)
+            sync_directory(os.path.dirname(self.autosave.filename))
+        except BaseException:
+            self.autosave.closeJournal()
+            raise
+        finally:
+            # left behind if the save file loaded was the snapshot itself
+            _remove(self.path)
+        self.autosave.startJournal()
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class JournalReplay(LoadGame):
+    """
+    Load the JournalRecords of an autosave journal onto the game.
+
+    The records are merged before anything is loaded, keeping the last value of
+    each attribute, and the last contents tree of each location, so that loading
+    takes time in proportion to what the records changed, rather than to the number
+    of records. Merging stops at the first record that cannot be loaded.
+    """
+
+    allowed_keys = [*LoadGame.allowed_keys, "deleted"]
+
+    def __init__(self, game, records):
+        """
+        :param records: the encoded records, from read_journal
+        :type records: list of bytes
+        """
+        self.game = game
+        self.filename = None
+        self.save_format = BINARY
+        # the number of records merged
+        self.records = 0
+        objects = {}
+        deleted = {}
+        locations = {}
+        sequence = None
+        with binary_save.paused_gc():
+            for raw in records:
+                try:
+                    record = self.read_record(raw)
+                except DeserializationError:
+                    break
+                record_objects, record_deleted, record_locations, sequence = record
+                for ix, attributes in record_objects.items():
+                    objects.setdefault(ix, {}).update(attributes)
+                    for attr in deleted.get(ix, ()):
+                        if attr in attributes:
+                            del deleted[ix][attr]
+                for ix, attributes in record_deleted.items():
+                    for attr in attributes:
+                        objects.get(ix, {}).pop(attr, None)
+                        deleted.setdefault(ix, {})[attr] = None
+                locations.update(record_locations)
+                self.records += 1
+        # the merged values have already been deserialized
+        self.validated_data = {
+            "ifp_objects": objects,
+            "deleted": deleted,
+            "locations": locations,
+            "active_sequence": sequence,
+        }
+
+    def read_record(self, raw):
+        """
+        Decode and check one record, and deserialize its attribute values.
+        Raises DeserializationError if the record cannot be loaded.
+
+        :returns: the attributes, deleted attributes, locations and active sequence
+            of the record
+        :rtype: tuple
+        """
+        data = self.decode(raw)
+        try:
+            staged = self.stage(data)
+            return (
+                staged["ifp_objects"],
+                staged["deleted"],
+                data["locations"],
+                staged["active_sequence"],
+            )
+        except (KeyError, TypeError, AttributeError):
+            raise DeserializationError
+
+    def _load(self):
+        for ix, attributes in self.validated_data["ifp_objects"].items():
+            obj = self.game.ifp_objects[ix]
+            for attr, value in attributes.items():
+                setattr(obj, attr, value)
+        for ix, attributes in self.validated_data["deleted"].items():
+            obj = self.game.ifp_objects[ix]
+            obj._decodeDeferred()
+            for attr in attributes:
+                obj.__dict__.pop(attr, None)
+        self.load_locations()
+        self.rebuild_sub_contains()
+        if any(
+            "adjectives" in attributes
+            for attributes in self.validated_data["ifp_objects"].values()
+        ):
+            self.rebuild_adjective_index()
+        self.game.parser.previous_command.sequence = self.validated_data[
+            "active_sequence"
+        ]
+        return True
+
+
+class Autosave:
+    """
+    Saves the game as it is played, so that it can be recovered after a crash.
+
+    A snapshot of the game is saved to `filename`, and the changes made each turn
+    are appended to a journal alongside it (see journal_path). Changes are written
+    every `turns` turns, or once a turn ends `seconds` seconds after they were
+    last written, whichever comes first. Either can be None. After
+    `compact_every` journal records, a new snapshot is saved and the journal is
+    started again.
+
+    Each journal record only stores what has changed since the last one, so
+    recovering the game with `recover` is much faster than playing the turns again.
+    Journal records are flushed when they are written; pass `sync=True` to also
+    flush them to disk, so that they survive the machine crashing, as well as the
+    game.
+
+    The turn only copies what has changed. Snapshots and journal records are
+    serialized and written, in order, by the game's SaveWriter thread (see
+    save_writer.py). If one cannot be written, a new snapshot is saved at the end
+    of the next turn.
+
+    Uses the game's ChangeTracker. Created by IFPGame.enableAutosave.
+    """
+
+    def __init__(
+        self,
+        game,
+        filename,
+        turns=1,
+        seconds=None,
+        compact_every=COMPACT_EVERY,
+        sync=False,
+    ):
+        self.game = game
+        self.filename = SaveGame.create_save_file_path(filename)
+        self.journal_path = journal_path(self.filename)
+        self.turns = turns
+        self.seconds = seconds
+        self.compact_every = compact_every
+        self.sync = sync
+        # the open journal file. Only used by the SaveWriter thread
+        self.journal = None
+        # the last error writing a snapshot or journal record, if any
+        self.error = None
+        # set when the changes since the last record cannot be found from the
+        # ChangeTracker, such as after a save is loaded, or when the last record
+        # could not be written
+        self.needs_snapshot = False
+        # the link to the save file last loaded, the checkpoint taken once it was
+        # loaded, and the ChangeTracker's generation, until the next snapshot
+        self.loaded_from = None
+        self.snapshot()
+
+    def snapshot(self):
+        """
+        Save a new snapshot of the game, and start a new journal
+        """
+        self.game.trackChanges()
+        changes = self.game.changes
+        loaded, self.loaded_from = self.loaded_from, None
+        if loaded is not None and changes.isCurrent(loaded[1], loaded[2]):
+            # the save file is the state of the game at the checkpoint, so saving
+            # does not decode the attributes of a lazily loaded save
+            save = LoadedSnapshot(self, loaded[0])
+            since = changes.sinceCheckpoint(loaded[1])
+        else:
+            if loaded is not None:
+                _remove(loaded[0])
+            save = AutosaveSnapshot(self)
+            since = None
+        # the changes after the checkpoint go in the new journal
+        self.checkpoint = changes.checkpoint()
+        self._submit(save)
+        self.records = 0
+        self.turn = self.game.daemons.turn
+        self.written_at = time.monotonic()
+        self.needs_snapshot = False
+        if since:
+            # the changes made since the save was loaded
+            self._submit(JournalRecord(self, since))
+            self.records += 1
+        return save
+
+    def loaded(self, load):
+        """
+        Called by LoadGame once a save has been loaded. If the save file was read
+        lazily, it is linked beside the snapshot, to become the next snapshot.
+        Otherwise, or if it cannot be linked, the game is saved.
+
+        :param load: the LoadGame
+        :type load: LoadGame
+        """
+        self.needs_snapshot = True
+        if self.loaded_from is not None:
+            _remove(self.loaded_from[0])
+            self.loaded_from = None
+        if load.save_map is None:
+            return
+        directory, name = os.path.split(self.filename)
+        path = os.path.join(directory, f".{name}.loaded")
+        try:
+            _remove(path)
+            os.link(load.filename, path)
+        except OSError:
+            # such as a save file on another file system
+            return
+        changes = self.game.changes
+        self.loaded_from = (path, changes.checkpoint(), changes.generation)
+
+    def endTurn(self):
+        """
+        Write the changes made since the last record, if it is time to. Called by
+        the game at the end of each turn.
+        """
+        turn = self.game.daemons.turn
+        changes = self.game.changes
+        # every turn moves the game on a turn, except one that undoes turns. The
+        # tracker may also have forgotten the changes since the last record
+        if (
+            self.needs_snapshot
+            or changes is None
+            or turn <= self.turn
+            or self.checkpoint[0] + 1 < changes.start
+        ):
+            self.snapshot()
+            return
+        due = (self.turns is not None and turn - self.turn >= self.turns) or (
+            self.seconds is not None
+            and time.monotonic() - self.written_at >= self.seconds
+        )
+        if not due:
+            return
+        self.write(changes.sinceCheckpoint(self.checkpoint))
+
+    def write(self, changes):
+        """
+        Copy a record of changes to be appended to the journal, or save a new
+        snapshot if the journal is due to be compacted
+
+        :param changes: the (object, attribute name) pairs that have changed
+        :type changes: set
+        """
+        if self.records >= self.compact_every:
+            self.snapshot()
+            return
+        self.checkpoint = self.game.changes.checkpoint()
+        self.turn = self.game.daemons.turn
+        self.written_at = time.monotonic()
+        if not changes:
+            return
+        self._submit(JournalRecord(self, changes))
+        self.records += 1
+
+    def _submit(self, save):
+        # waits for room in the queue, rather than dropping a record
+        self.game.saveWriter().submit(save, self._written, block=True)
+
+    def _written(self, save, error):
+        """
+        Called on the SaveWriter thread once a snapshot or record has been written
+        """
+        if error is not None:
+            self.error = error
+            self.needs_snapshot = True
+
+    def startJournal(self):
+        """
+        Start a new journal, following on from the snapshot on disk. Called on the
+        SaveWriter thread once a snapshot has been written.
+        """
+        self.closeJournal()
+        with open(self.filename, "rb") as f:
+            header = JOURNAL_MAGIC + bytes([JOURNAL_VERSION]) + snapshot_id(f.read())
+        # the new journal replaces the old atomically, so that the journal on disk
+        # always follows on from the snapshot on disk, or is ignored
+        directory, name = os.path.split(self.journal_path)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", dir=directory)
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.journal_path)
+        sync_directory(directory)
+        self.journal = open(self.journal_path, "ab")
+
+    def append(self, encoded):
+        """
+        Append an encoded record to the journal. Called on the SaveWriter thread.
+        If the record cannot be written, the journal is closed, so that no more
+        records follow on from it.
+        """
+        if self.journal is None:
+            raise OSError("The autosave journal is not open")
+        try:
+            self.journal.write(
+                RECORD_HEADER.pack(len(encoded), zlib.crc32(encoded)) + encoded
+            )
+            self.journal.flush()
+            if self.sync:
+                os.fsync(self.journal.fileno())
+        except BaseException:
+            self.closeJournal()
+            raise
+
+    def closeJournal(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+
+    def wait(self):
+        """
+        Wait until the snapshots and records copied so far have been written
+        """
+        if self.game.saves is not None:
+            self.game.saves.wait()
+
+    def close(self):
+        self.wait()
+        self.closeJournal()
+        if self.loaded_from is not None:
+            _remove(self.loaded_from[0])
+            self.loaded_from = None
+
+
+def read_journal(path, snapshot_raw):
+    """
+    Read the records of a journal that follows on from a snapshot. A journal that
+    follows on from a different snapshot has no records. Reading stops at a record
+    that was not completely written.
+
+    :returns: the encoded records
+    :rtype: list of bytes
+    """
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return []
+    header = JOURNAL_MAGIC + bytes([JOURNAL_VERSION]) + snapshot_id(snapshot_raw)
+    if raw[: len(header)] != header:
+        return []
+    records = []
+    pos = len(header)
+    while pos + RECORD_HEADER.size <= len(raw):
+        length, crc = RECORD_HEADER.unpack_from(raw, pos)
+        pos += RECORD_HEADER.size
+        record = raw[pos : pos + length]
+        if len(record) < length or zlib.crc32(record) != crc:
+            break
+        records.append(record)
+        pos += length
+    return records
+
+
+def recover(game, filename):
+    """
+    Load the autosave snapshot saved to `filename`, and replay the journal that
+    follows on from it. Call after initGame, and before enableAutosave, which starts
+    a new snapshot.
+
+    Replay stops at the first journal record that cannot be loaded, such as one
+    that was only partly written when the game crashed.
+
+    :returns: the number of journal records replayed, or None if there is no valid
+        autosave snapshot
+    :rtype: int or None
+    """
+    filename = SaveGame.create_save_file_path(filename)
+    try:
+        with open(filename, "rb") as f:
+            snapshot_raw = f.read()
+    except FileNotFoundError:
+        return None
+    snapshot = LoadGame(game, filename)
+    if not snapshot.is_valid():
+        return None
+    snapshot.load()
+
+    replay = JournalReplay(game, read_journal(journal_path(filename), snapshot_raw))
+    if replay.records:
+        replay.load()
+    return replay.records
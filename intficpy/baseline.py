@@ -0,0 +1,149 @@
+##############################################################
+# BASELINE.PY - the state of the game world when play begins
+# Defines the Baseline class, used by the serializer to save only the state that
+# has changed since the world was constructed
+##############################################################
+
+# the value of an attribute an object does not have
+_MISSING = object()
+
+
+def copy_value(value):
+    """
+    Copy the lists, dicts and sets in an attribute value, so that later changes to
+    the live value can be detected. IFPObjects and other values are not copied.
+    """
+    kind = type(value)
+    if kind is list:
+        return [copy_value(sub_value) for sub_value in value]
+    if kind is dict:
+        return {key: copy_value(sub_value) for key, sub_value in value.items()}
+    if kind is set:
+        return set(value)
+    return value
+
+
+class Baseline:
+    """
+    A snapshot of the attributes of every IFPObject in the game, and of the contents
+    of every top level location, taken by IFPGame.initGame once the world has been
+    built.
+
+    The serializer compares the game against the baseline to write delta saves,
+    which only store the objects, attributes and locations that have changed, and
+    uses it to put unchanged state back when a delta save is loaded.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        if game.deferred is not None:
+            game.deferred.decodeAll()
+        # maps the ix of each object to a copy of its __dict__
+        self.attributes = {
+            ix: self.copy_attributes(obj) for ix, obj in game.ifp_objects.items()
+        }
+        # maps the ix of each top level location to its contents tree
+        self.locations = {
+            ix: self.contents_tree(obj)
+            for ix, obj in game.ifp_objects.items()
+            if obj.is_top_level_location
+        }
+
+    def __len__(self):
+        return len(self.attributes)
+
+    @staticmethod
+    def copy_attributes(obj):
+        return {attr: copy_value(value) for attr, value in obj.__dict__.items()}
+
+    def contents_tree(self, obj):
+        """
+        The contents of a location, as a list of (item, contents tree of item) pairs
+        """
+        return [
+            (item, self.contents_tree(item))
+            for sublist in obj.contains.values()
+            for item in sublist
+        ]
+
+    def changed_objects(self):
+        """
+        Find the objects whose attributes or contents differ from the baseline,
+        including objects created since the baseline was taken
+
+        :returns: a dict mapping the ix of each changed object to the object
+        :rtype: dict
+        """
+        attributes = self.attributes
+        return {
+            ix: obj
+            for ix, obj in self.game.ifp_objects.items()
+            if obj.__dict__ != attributes.get(ix)
+        }
+
+    def changed_attributes(self, obj):
+        """
+        The attributes of an object that differ from the baseline. For an object
+        created since the baseline was taken, this is all of its attributes.
+
+        :rtype: dict
+        """
+        base = self.attributes.get(obj.ix)
+        if base is None:
+            return obj.__dict__
+        return {
+            attr: value
+            for attr, value in obj.__dict__.items()
+            if attr not in base
+            or not (
+                value is base[attr]
+                or (type(value) is type(base[attr]) and value == base[attr])
+            )
+        }
+
+    def changed_locations(self, changed):
+        """
+        Find the top level locations whose contents trees differ from the baseline
+
+        :param changed: the changed objects, from `changed_objects`
+        :type changed: iterable of IFPObject
+        :returns: a dict mapping the ix of each changed location to the location
+        :rtype: dict
+        """
+        out = {}
+        for obj in changed:
+            contains = getattr(obj, "contains", None)
+            if contains is None:
+                continue
+            base = self.attributes.get(obj.ix)
+            if base is not None and contains == base.get("contains"):
+                continue
+            root = obj if obj.is_top_level_location else obj.getOutermostLocation()
+            if root is not None and root.is_top_level_location:
+                out[root.ix] = root
+        return out
+
+    def restore_attributes(self, obj, skip=()):
+        """
+        Set the attributes of an object back to their values in the baseline, and
+        remove attributes that have been added since
+
+        :param skip: the names of attributes to leave as they are
+        :type skip: collection of str
+        """
+        base = self.attributes.get(obj.ix)
+        if base is None:
+            return
+        for attr in [attr for attr in obj.__dict__ if attr not in base]:
+            if attr not in skip:
+                delattr(obj, attr)
+        current = obj.__dict__
+        for attr, value in base.items():
+            if attr in skip:
+                continue
+            # attributes that are already as they were are left alone, so that they
+            # are not recorded as changed
+            old = current.get(attr, _MISSING)
+            if old is value or (type(old) is type(value) and old == value):
+                continue
+            setattr(obj, attr, copy_value(value))
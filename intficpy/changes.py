@@ -0,0 +1,312 @@
+from contextlib import contextmanager
+
+##############################################################
+# CHANGES.PY - write tracking for IntFicPy
+# Defines the ChangeTracker class, which records the attributes of IFPObjects
+# that are set during each turn
+##############################################################
+
+# Setting an attribute is only recorded for the objects of a game that is tracking
+# changes. Each of its objects is given a subclass of its class, with the same name,
+# whose __setattr__ and __delattr__ record the change (see tracked_class), and is
+# given back its class when the game stops tracking. Objects of other games, in the
+# same process, set their attributes as usual, at no extra cost.
+
+# maps each IFPObject class to its tracked subclass
+_tracked_classes = {}
+# the tracked subclasses
+_tracked_types = set()
+
+_object_setattr = object.__setattr__
+_object_delattr = object.__delattr__
+
+
+def _tracked_setattr(obj, name, value):
+    """
+    __setattr__ of the objects of a game that is tracking changes
+    """
+    try:
+        changes = obj.game.changes
+    except AttributeError:
+        # an attribute set before IFPObject.__init__ has set game
+        changes = None
+    if changes is not None:
+        journal = changes.journal
+        if journal is not None and obj not in journal.objects:
+            journal.touch(obj)
+        changes._current.add((obj, name))
+    _object_setattr(obj, name, value)
+
+
+def _tracked_delattr(obj, name):
+    """
+    __delattr__ of the objects of a game that is tracking changes
+    """
+    changes = obj.game.changes
+    if changes is not None:
+        changes.record(obj, name)
+    _object_delattr(obj, name)
+
+
+def tracked_class(cls):
+    """
+    The subclass the objects of a game tracking changes are given, which records
+    the attributes set. It has the same name as `cls`.
+    """
+    try:
+        return _tracked_classes[cls]
+    except KeyError:
+        pass
+    out = type(
+        cls.__name__,
+        (cls,),
+        {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "_untracked_class": cls,
+            "__setattr__": _tracked_setattr,
+            "__delattr__": _tracked_delattr,
+        },
+    )
+    # games can start tracking on any thread, so keep the first class made
+    out = _tracked_classes.setdefault(cls, out)
+    _tracked_types.add(out)
+    return out
+
+
+def untracked_class(cls):
+    """
+    The class an object of a game tracking changes has, when the game is not
+    tracking changes
+    """
+    if cls in _tracked_types:
+        return cls._untracked_class
+    return cls
+
+
+class ChangeTracker:
+    """
+    Records each (object, attribute name) pair that is set or deleted on an
+    IFPObject, by turn.
+    Changes to the contents of a PhysicalEntity are recorded as changes to its
+    `contains` attribute.
+
+    Turns are numbered as by the game's DaemonManager. Changes made after turn N
+    has ended, up to the end of turn N + 1, are recorded under turn N. Changes are
+    kept for the game's `change_turns` turns, or as many turns as can be undone, if
+    more, and forgotten after.
+
+    If the game has undo enabled, the tracker also fills in the game's UndoJournal
+    (see undo.py), which keeps the values from before each change.
+
+    Created by IFPGame.trackChanges.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.turn = game.daemons.turn
+        # the turn tracking started on
+        self.start = self.turn
+        # maps each turn number to the (object, attribute name) pairs set after that
+        # turn ended, as a list of sets, split at each checkpoint
+        self.turns = {}
+        self._newSet()
+        # the UndoJournal, if undo is enabled
+        self.journal = None
+        # True if turns have been undone during the current turn
+        self.undone = False
+        # incremented whenever recorded changes are discarded by `reset` or `undo`,
+        # so that checkpoints taken before can be recognised as out of date
+        self.generation = 0
+        # the number of index entry changes recorded by `recordIndex`
+        self.index_changes = 0
+        for obj in self._objects():
+            self.track(obj)
+
+    def reset(self):
+        """
+        Forget every change recorded, and start recording from the game's current
+        turn. Called when a save is loaded, which can move the game to a different
+        turn.
+        """
+        self.turn = self.start = self.game.daemons.turn
+        self.turns = {}
+        self.generation += 1
+        self._newSet()
+
+    def _newSet(self):
+        self._current = set()
+        self.turns.setdefault(self.turn, []).append(self._current)
+
+    def _objects(self):
+        """
+        The game's objects, and the copies of its Things, which are only found in
+        the noun dictionary
+        """
+        yield from self.game.ifp_objects.values()
+        for things in self.game.nouns.values():
+            yield from things
+
+    def track(self, obj):
+        """
+        Start recording the attributes set on an object of the game. Called for
+        each object the game has when tracking starts, and for each object created
+        after.
+        """
+        cls = type(obj)
+        # a copy on write object is given its class back, and tracked, by
+        # prototype.materialize when it is first changed
+        if cls not in _tracked_types and "_ifp_class" not in cls.__dict__:
+            _object_setattr(obj, "__class__", tracked_class(cls))
+
+    def stop(self):
+        """
+        Stop tracking changes. Each object is given back its own class.
+        """
+        for obj in self._objects():
+            cls = type(obj)
+            if cls in _tracked_types:
+                _object_setattr(obj, "__class__", cls._untracked_class)
+
+    def record(self, obj, attr):
+        """
+        Record a change that is not made by setting an attribute, such as an item
+        being added to a dict. Call before making the change.
+        """
+        if self.journal is not None:
+            self.journal.touch(obj)
+        self._current.add((obj, attr))
+
+    def recordIndex(self, index, key):
+        """
+        Record a change to an entry of one of the game's indexes, such as
+        game.nouns. Call before making the change. Index changes are kept for undo,
+        but are not returned by `since`.
+        """
+        self.index_changes += 1
+        if self.journal is not None:
+            self.journal.touchIndex(index, key)
+
+    def endTurn(self):
+        """
+        Start recording changes for the next turn. Called by the game at the end of
+        each turn.
+        """
+        self.turn = self.game.daemons.turn
+        self._newSet()
+        if self.undone:
+            # the changes made since the undo belong to the next turn
+            self.undone = False
+        elif self.journal is not None:
+            self.journal.endTurn(self.game.parser)
+        keep = self.game.change_turns
+        if self.journal is not None:
+            keep = max(keep, self.journal.max_turns)
+        if self.turn - keep > self.start:
+            self.forget(self.turn - keep)
+
+    def undo(self, turns=1):
+        """
+        Undo the changes made so far this turn, and in the last `turns` turns. See
+        UndoJournal.undo.
+
+        :returns: the number of completed turns undone
+        :rtype: int
+        """
+        undone = self.journal.undo(self.game, turns)
+        self.undone = True
+        self.generation += 1
+        # the changes recorded since the end of the turn the game is now at have
+        # been undone
+        self.turn = self.game.daemons.turn
+        for recorded in [t for t in self.turns if t >= self.turn]:
+            del self.turns[recorded]
+        self._newSet()
+        return undone
+
+    @contextmanager
+    def withoutUndo(self):
+        """
+        Make changes that cannot be undone, such as loading a save file. The undo
+        journal is cleared, unless the changes fail with an error, in which case they
+        must leave the game as it was.
+        """
+        journal = self.journal
+        self.journal = None
+        try:
+            yield
+        except BaseException:
+            self.journal = journal
+            raise
+        if journal is not None:
+            journal.clear()
+            self.journal = journal
+
+    def since(self, turn):
+        """
+        Find the attributes that have been set since the end of a turn
+
+        Raises ValueError if changes were not being tracked at the end of the turn
+
+        :param turn: the turn number
+        :type turn: int
+        :returns: the (object, attribute name) pairs set since the end of the turn
+        :rtype: set
+        """
+        if turn < self.start:
+            raise ValueError(f"Changes were not tracked at the end of turn {turn}")
+        out = set()
+        for recorded, sets in self.turns.items():
+            if recorded >= turn:
+                for changes in sets:
+                    out |= changes
+        return out
+
+    def checkpoint(self):
+        """
+        Mark the changes recorded so far, so that `sinceCheckpoint` can find the
+        changes made after them, even part way through a turn
+
+        :returns: the checkpoint
+        :rtype: tuple
+        """
+        self._newSet()
+        return (self.turn, len(self.turns[self.turn]) - 1)
+
+    def isCurrent(self, checkpoint, generation):
+        """
+        Return True if every change made since a checkpoint can still be found with
+        `sinceCheckpoint`: no changes have been undone, forgotten or reset since.
+
+        :param generation: the tracker's `generation` when the checkpoint was taken
+        :type generation: int
+        """
+        return generation == self.generation and checkpoint[0] >= self.start
+
+    def sinceCheckpoint(self, checkpoint):
+        """
+        Find the attributes that have been set since a checkpoint. Changes that have
+        been undone, or forgotten, since the checkpoint are not returned.
+
+        :param checkpoint: the checkpoint, from `checkpoint`
+        :type checkpoint: tuple
+        :returns: the (object, attribute name) pairs set since the checkpoint
+        :rtype: set
+        """
+        turn, part = checkpoint
+        out = set()
+        for changes in self.turns.get(turn, [])[part:]:
+            out |= changes
+        if turn + 1 >= self.start:
+            out |= self.since(turn + 1)
+        return out
+
+    def forget(self, turn):
+        """
+        Discard the changes recorded before the end of a turn. `since` can no
+        longer be called for earlier turns.
+        """
+        turn = min(turn, self.turn)
+        for recorded in [t for t in self.turns if t < turn]:
+            del self.turns[recorded]
+        self.start = max(self.start, turn)
@@ -41,6 +41,10 @@ class TerminalApp:
 
         return file_path
 
+    def saveFinished(self, filename, error):
+        if error is not None:
+            print(f"Could not save game to {filename}: {error}")
+
     def openFilePrompt(self, extension, filetype_desc, msg):
         cur_dir = os.getcwd()
         print(f"Enter a save file (.sav) to open (current directory: {cur_dir})")
@@ -71,4 +75,7 @@ class TerminalApp:
                 break
             self.game.turnMain(self.command)
 
+        if self.game.saves:
+            # finish writing any saves still in progress
+            self.game.saves.close()
         print("Goodbye.")
@@ -0,0 +1,106 @@
+import lzma
+import zlib
+
+from .exceptions import DeserializationError
+
+##############################################################
+# COMPRESSION.PY - compressed save files for IntFicPy
+# Compresses save files, in either save format, as they are written, and
+# decompresses them as they are read
+##############################################################
+#
+# A compressed save file is laid out as
+#
+#   MAGIC   6 bytes
+#   CODEC   1 byte, the id of the codec in CODEC_IDS
+#   stream  the contents of a binary or pickle save file, compressed with the codec
+#
+# The stream is written as the save file is encoded, so the uncompressed file is
+# never held in memory all at once.
+
+ZLIB = "zlib"
+LZMA = "lzma"
+CODECS = (ZLIB, LZMA)
+
+MAGIC = b"IFPSVZ"
+CODEC_IDS = {ZLIB: 1, LZMA: 2}
+HEADER_SIZE = len(MAGIC) + 1
+
+# the number of bytes read from a compressed file at a time
+READ_SIZE = 1 << 16
+
+
+def is_compressed_save(header):
+    """
+    Return True if `header`, the first bytes of a save file, marks it as a
+    compressed save file
+    """
+    return header[: len(MAGIC)] == MAGIC
+
+
+def _compressor(codec):
+    if codec == ZLIB:
+        return zlib.compressobj()
+    return lzma.LZMACompressor()
+
+
+def _decompressor(codec):
+    if codec == ZLIB:
+        return zlib.decompressobj()
+    return lzma.LZMADecompressor()
+
+
+class CompressedWriter:
+    """
+    A file-like object that compresses what is written to it, and writes it to
+    `f`, after the header for `codec`. Call `close` to write the end of the stream;
+    `f` is left open.
+    """
+
+    def __init__(self, f, codec):
+        if codec not in CODEC_IDS:
+            raise ValueError(f"Unknown compression {codec}")
+        self.f = f
+        self.compressor = _compressor(codec)
+        f.write(MAGIC + bytes([CODEC_IDS[codec]]))
+
+    def write(self, data):
+        compressed = self.compressor.compress(data)
+        if compressed:
+            self.f.write(compressed)
+        return len(data)
+
+    def close(self):
+        self.f.write(self.compressor.flush())
+
+
+def read_compressed(f):
+    """
+    Read and decompress a compressed save file.
+    Raises DeserializationError if the file is damaged, or was cut short.
+
+    :param f: the file, opened in binary mode, at its start
+    :returns: the codec, and the contents of the save file it holds
+    :rtype: tuple
+    """
+    header = f.read(HEADER_SIZE)
+    if not is_compressed_save(header) or len(header) < HEADER_SIZE:
+        raise DeserializationError("Not a compressed save file")
+    for codec, codec_id in CODEC_IDS.items():
+        if header[-1] == codec_id:
+            break
+    else:
+        raise DeserializationError(f"Unknown save file compression {header[-1]}")
+    decompressor = _decompressor(codec)
+    out = []
+    try:
+        while True:
+            chunk = f.read(READ_SIZE)
+            if not chunk:
+                break
+            out.append(decompressor.decompress(chunk))
+    except (zlib.error, lzma.LZMAError) as e:
+        raise DeserializationError("Save file is damaged") from e
+    if not decompressor.eof or decompressor.unused_data:
+        raise DeserializationError("Save file is damaged")
+    return codec, b"".join(out)
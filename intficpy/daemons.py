@@ -2,27 +2,175 @@ from intficpy.ifp_object import IFPObject
 
 
 class DaemonManager(IFPObject):
+    """
+    Runs the game's daemons at the end of each turn.
+
+    Daemons are kept on a timer wheel: a map from each turn number to the daemons due
+    to run on that turn. A daemon that is not due costs nothing until its turn comes
+    round. Daemons can be added to run every turn (the default), every N turns, once
+    at a given turn, once after a delay, or whenever a condition is met.
+
+    Daemons due on the same turn run in the order they were added.
+    """
+
     def __init__(self, game):
         super().__init__(game)
-        self.active = []
+        # the number of turns the daemons have been run for
+        self.turn = 0
+        self._next_order = 0
+        # maps the ix of each scheduled daemon to the daemon
+        self._daemons = {}
+        # maps the ix of each scheduled daemon to the order it was added in
+        self._order = {}
+        # maps the ix of each scheduled daemon to the turn it is next due
+        self._due = {}
+        # the timer wheel: maps a turn number to the ix of the daemons due then
+        self._wheel = {}
+
+    def __contains__(self, daemon):
+        return daemon.ix in self._daemons
+
+    def __len__(self):
+        return len(self._daemons)
+
+    @property
+    def active(self):
+        """
+        A list of the scheduled daemons, in the order they were added
+        """
+        return sorted(self._daemons.values(), key=lambda d: self._order[d.ix])
+
+    @active.setter
+    def active(self, daemons):
+        # save files from older versions store a list of daemons that run every turn
+        for daemon in list(self._daemons.values()):
+            self.remove(daemon)
+        for daemon in daemons:
+            self.add(daemon)
 
     def runAll(self, game):
-        for daemon in self.active:
-            daemon.func(game)
+        self.turn += 1
+        self._recordChange("_wheel")
+        # skip daemons that have been removed or rescheduled since they were put on
+        # the wheel
+        due = sorted(
+            {
+                ix
+                for ix in self._wheel.pop(self.turn, [])
+                if self._due.get(ix) == self.turn
+            },
+            key=lambda ix: self._order[ix],
+        )
+        for ix in due:
+            daemon = self._daemons.get(ix)
+            if daemon is None or self._due[ix] != self.turn:
+                # removed or rescheduled by a daemon that ran earlier this turn
+                continue
+            one_off = not daemon.interval
+            if one_off:
+                # one off daemons may schedule themselves again when they run
+                self._unschedule(daemon)
+            else:
+                self._schedule(daemon, self.turn + daemon.interval)
+            if not daemon.condition or daemon.condition(game):
+                daemon.func(game)
+            if one_off and daemon not in self:
+                daemon.onRemove()
+
+    def add(self, daemon, every=1, condition=None):
+        """
+        Run the daemon at the end of this turn, and every `every` turns after that
 
-    def add(self, daemon):
-        self.active.append(daemon)
-        daemon.onAdd()
+        :param daemon: the daemon to run
+        :type daemon: Daemon
+        :param every: the number of turns between runs
+        :type every: int
+        :param condition: if given, the daemon's func is only called on the turns
+            when condition(game) returns True
+        :type condition: callable, or None
+        """
+        if every < 1:
+            raise ValueError(f"Cannot run {daemon} every {every} turns")
+        daemon.interval = every
+        daemon.condition = condition
+        self._add(daemon, self.turn + 1)
+
+    def addWhen(self, daemon, condition):
+        """
+        Run the daemon at the end of every turn where condition(game) returns True
+
+        :param daemon: the daemon to run
+        :type daemon: Daemon
+        :param condition: called at the end of each turn
+        :type condition: callable
+        """
+        self.add(daemon, condition=condition)
+
+    def runAt(self, daemon, turn):
+        """
+        Run the daemon once, at the end of the given turn. Turns are counted by
+        `self.turn`, which goes up by one each time the daemons are run.
+
+        :param daemon: the daemon to run
+        :type daemon: Daemon
+        :param turn: the turn to run on
+        :type turn: int
+        """
+        if turn <= self.turn:
+            raise ValueError(f"Cannot run {daemon} at turn {turn}, which has passed")
+        daemon.interval = None
+        daemon.condition = None
+        self._add(daemon, turn)
+
+    def runAfter(self, daemon, turns):
+        """
+        Run the daemon once, `turns` turns from now. A delay of 1 runs the daemon at
+        the end of this turn.
+
+        :param daemon: the daemon to run
+        :type daemon: Daemon
+        :param turns: the delay
+        :type turns: int
+        """
+        self.runAt(daemon, self.turn + turns)
 
     def remove(self, daemon):
-        if daemon in self.active:
-            self.active.remove(daemon)
+        if daemon in self:
+            self._unschedule(daemon)
             daemon.onRemove()
 
+    def _add(self, daemon, turn):
+        is_new = daemon not in self
+        if is_new:
+            self._recordChange("_daemons")
+            self._recordChange("_order")
+            self._daemons[daemon.ix] = daemon
+            self._order[daemon.ix] = self._next_order
+            self._next_order += 1
+        self._schedule(daemon, turn)
+        if is_new:
+            daemon.onAdd()
+
+    def _schedule(self, daemon, turn):
+        self._recordChange("_wheel")
+        self._recordChange("_due")
+        self._due[daemon.ix] = turn
+        self._wheel.setdefault(turn, []).append(daemon.ix)
+
+    def _unschedule(self, daemon):
+        # the daemon's entry on the wheel is skipped when its turn comes round
+        self._recordChange("_daemons")
+        self._recordChange("_order")
+        self._recordChange("_due")
+        del self._daemons[daemon.ix]
+        del self._order[daemon.ix]
+        del self._due[daemon.ix]
+
 
 class Daemon(IFPObject):
     """
-    While active, a Daemon's func is run every turn.
+    While active, a Daemon's func is run every turn, or on the turns it has been
+    scheduled for (see DaemonManager).
     Properties added to a Daemon object will be saved/loaded, provided they are
     serializable, and can be added so a Daemon can track its own state.
     """
@@ -30,6 +178,9 @@ class Daemon(IFPObject):
     def __init__(self, game, func):
         super().__init__(game)
         self.func = func
+        # turns between runs, or None to run once
+        self.interval = 1
+        self.condition = None
 
     def onRemove(self):
         pass
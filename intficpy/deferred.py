@@ -0,0 +1,89 @@
+from .save_format import paused_gc
+
+##############################################################
+# DEFERRED.PY - lazily decoded save files for IntFicPy
+# Defines the DeferredAttributes class, which keeps track of the objects whose
+# saved attributes have not been decoded yet, after a save file has been loaded
+##############################################################
+
+
+class DeferredAttributes:
+    """
+    The objects with saved attributes that have not been decoded yet, after a save
+    file has been loaded lazily (see LoadGame).
+
+    The attributes waiting are missing from each object's __dict__, so the first
+    time one of them is used, IFPObject.__getattr__ asks for the object to be
+    decoded, and LoadGame.apply_deferred sets every attribute waiting. The object
+    keeps its class throughout. Attributes the object's class defines are never
+    left waiting, as the class attribute would be found instead.
+
+    The values waiting have already been read from the save file, which is closed
+    once loading has finished. Code that uses an object's __dict__ directly must
+    call `decode` first.
+
+    Created by LoadGame as game.deferred.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        # maps each object with attributes waiting to the LoadGame that loaded it,
+        # and the values of the attributes waiting, as read from the save file
+        self.pending = {}
+
+    def __len__(self):
+        return len(self.pending)
+
+    def __contains__(self, obj):
+        return obj in self.pending
+
+    def defer(self, obj, load, values):
+        """
+        Leave the saved attributes of an object to be decoded when they are needed.
+        The attributes must not be in the object's __dict__.
+
+        :param load: the LoadGame loading the object
+        :type load: LoadGame
+        :param values: the values of the attributes, as read from the save file
+        :type values: dict
+        """
+        self.pending[obj] = (load, values)
+
+    def decode(self, obj):
+        """
+        Decode the attributes waiting for an object, if there are any, and set them
+        on the object. Attributes that have been set since the save was loaded are
+        kept.
+
+        :returns: True if the object had attributes waiting
+        :rtype: bool
+        """
+        entry = self.pending.pop(obj, None)
+        if entry is None:
+            return False
+        load, values = entry
+        with paused_gc():
+            load.apply_deferred(obj, values)
+        return True
+
+    def decodeAll(self):
+        """
+        Decode every object still waiting to be decoded, for instance before the game
+        is saved
+        """
+        while self.pending:
+            self.decode(next(iter(self.pending)))
+
+    def cancel(self, load, previous=None):
+        """
+        Forget the objects loaded by a LoadGame, without decoding them, and put
+        back the entries from earlier saves it replaced. Used when loading fails.
+
+        :param previous: the entries replaced, mapping each object to its entry
+        :type previous: dict or None
+        """
+        self.pending = {
+            obj: entry for obj, entry in self.pending.items() if entry[0] is not load
+        }
+        if previous:
+            self.pending.update(previous)
@@ -0,0 +1,130 @@
+import os
+import pickle
+
+from .ifp_object import IFPObject
+from .save_format import paused_gc
+from .serializer import LoadGame, SaveGame
+from .snapshot import GAME_ATTRIBUTES, PARSER_ATTRIBUTES
+
+##############################################################
+# EVICTION.PY - idle games written to disk, and made again when they are next played
+# Defines the evict_game and rehydrate_game functions, which a SessionManager uses
+# to keep only its most recently played games in memory
+##############################################################
+#
+# An evicted game is written as two files:
+#
+# - a delta save (see serializer.py) of what has changed in the game since its
+#   prototype's baseline, written as SaveGame writes it, but without the temporary
+#   file and fsync, as it only needs to outlive the game in memory, not a crash
+# - its turn state: the parser's current and previous commands, which hold the
+#   state of a question the player is being asked, such as which of two things
+#   they meant, and the game's other turn by turn state (see GAME_ATTRIBUTES and
+#   PARSER_ATTRIBUTES in snapshot.py), pickled with each IFPObject stored by its ix
+#
+# Rehydrating makes a new game from the prototype, loads the save onto it and puts
+# back the turn state. The state of each Sequence, including the position of the
+# active one, is kept with the Sequence's attributes. As after loading a save, the
+# undo history is not kept.
+
+# the extension of the turn state file that goes with an evicted game's save file
+STATE_EXTENSION = ".state"
+
+
+def state_path(save_path):
+    """
+    The turn state file that goes with an evicted game's save file
+    """
+    return os.path.splitext(save_path)[0] + STATE_EXTENSION
+
+
+class _StatePickler(pickle.Pickler):
+    def __init__(self, file, game):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.game = game
+
+    def persistent_id(self, obj):
+        if isinstance(obj, IFPObject):
+            return obj.ix
+        if obj is self.game:
+            return "game"
+        return None
+
+
+class _StateUnpickler(pickle.Unpickler):
+    def __init__(self, file, game):
+        super().__init__(file)
+        self.game = game
+
+    def persistent_load(self, pid):
+        if pid == "game":
+            return self.game
+        return self.game.ifp_objects[pid]
+
+
+def evict_game(game, path):
+    """
+    Write a game made from a prototype to disk, so that it can be dropped from
+    memory, and made again with rehydrate_game
+
+    :param game: the game
+    :type game: IFPGame
+    :param path: the path of the save file, ending in .sav. The turn state is
+        written beside it (see state_path)
+    :type path: str
+    """
+    if game.saves is not None:
+        # finish writing the game's own saves first
+        game.saves.close()
+    save = SaveGame(game, path, write=False)
+    with paused_gc():
+        with open(path, "wb") as f:
+            for chunk in save.iter_encoded():
+                f.write(chunk)
+        state = {
+            "game": {attr: getattr(game, attr) for attr in GAME_ATTRIBUTES},
+            "parser": {attr: getattr(game.parser, attr) for attr in PARSER_ATTRIBUTES},
+        }
+        with open(state_path(path), "wb") as f:
+            _StatePickler(f, game).dump(state)
+
+
+def rehydrate_game(prototype, app, path):
+    """
+    Make a game evicted by evict_game again, and remove its files
+
+    :param prototype: the prototype the game was made from
+    :type prototype: Prototype
+    :param app: the app for the game
+    :param path: the path of the game's save file
+    :type path: str
+    :rtype: IFPGame
+    """
+    game = prototype.instantiate(app)
+    # read lazily, so that the game's indexes are only rebuilt if the save changes
+    # them
+    l = LoadGame(game, path)
+    if not l.is_valid():
+        raise ValueError(f"Cannot load evicted game {path}")
+    l.load()
+    with open(state_path(path), "rb") as f:
+        with paused_gc():
+            state = _StateUnpickler(f, game).load()
+    for attr, value in state["game"].items():
+        setattr(game, attr, value)
+    for attr, value in state["parser"].items():
+        setattr(game.parser, attr, value)
+    game.parser.scope.invalidate()
+    remove_evicted(path)
+    return game
+
+
+def remove_evicted(path):
+    """
+    Remove the files of an evicted game
+    """
+    for name in (path, state_path(path)):
+        try:
+            os.remove(name)
+        except FileNotFoundError:
+            pass
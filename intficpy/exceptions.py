@@ -78,3 +78,20 @@ class NoMatchingSuggestion(Exception):
 
 class IFPError(Exception):
     pass
+
+
+class UnknownSession(KeyError):
+    """
+    There is no open session with the given id
+    """
+
+    pass
+
+
+class WorkerError(Exception):
+    """
+    A worker process of a WorkerPool has stopped, or could not return the result of
+    a request
+    """
+
+    pass
@@ -55,3 +55,91 @@ class Command(object):
     @property
     def has_sticky_sequence(self):
         return self.has_active_sequence and self.sequence.sticky
+
+
+class VerbSyntaxIndex(object):
+    """
+    A compiled index of verb syntax forms, used by the parser to find the forms that
+    could match a command without testing every form of every candidate verb.
+
+    For each primary verb token, the forms of all verbs registered under that token
+    are indexed by the literal (non-tag) words they contain. Matching a command
+    counts, for each distinct word in the command, the forms that contain it. A form
+    matches when every one of its literal words has been counted. Forms that share
+    no words with the command are never visited.
+
+    Each game's parser has an index of its own, which compiles the forms of each
+    token on first use, keyed on the verbs registered under the token, so a game that
+    adds a verb gets a fresh index for the affected tokens. A token's index is also
+    compiled again if the syntax list of one of its verbs is replaced, or has forms
+    added or removed. Call `invalidate` after editing a form in place.
+    """
+
+    def __init__(self):
+        self._compiled = {}
+
+    def invalidate(self):
+        """
+        Forget the compiled indexes, so that they are compiled again on next use
+        """
+        self._compiled = {}
+
+    @staticmethod
+    def _signature(verbs):
+        return tuple((id(verb.syntax), len(verb.syntax)) for verb in verbs)
+
+    def _compile(self, verbs):
+        literal_index = {}
+        forms = []
+        untagged = []
+        for verb in dict.fromkeys(verbs):
+            for verb_form in verb.syntax:
+                literals = set(word for word in verb_form if word[0] != "<")
+                form_ix = len(forms)
+                forms.append((verb, verb_form, len(literals)))
+                if not literals:
+                    untagged.append(form_ix)
+                for word in literals:
+                    if word in literal_index:
+                        literal_index[word].append(form_ix)
+                    else:
+                        literal_index[word] = [form_ix]
+        return literal_index, forms, untagged
+
+    def match(self, verbs, candidates, tokens):
+        """
+        Find the syntax forms whose literal words all appear in the command
+
+        Takes arguments verbs, the verbs registered under the primary verb token,
+        candidates, the verbs (a subsequence of verbs) still in consideration, and
+        tokens, the command tokens
+        Returns a list of (verb, verb_form) pairs, ordered by candidate, then by the
+        verb's syntax
+        """
+        verbs = tuple(verbs)
+        signature = self._signature(verbs)
+        entry = self._compiled.get(verbs)
+        if entry is None or entry[0] != signature:
+            entry = (signature, self._compile(verbs))
+            self._compiled[verbs] = entry
+        literal_index, forms, untagged = entry[1]
+
+        counts = dict.fromkeys(untagged, 0)
+        for word in set(tokens):
+            for form_ix in literal_index.get(word, ()):
+                counts[form_ix] = counts.get(form_ix, 0) + 1
+
+        matched = {}
+        for form_ix in sorted(counts):
+            verb, verb_form, n_literals = forms[form_ix]
+            if counts[form_ix] == n_literals:
+                if verb in matched:
+                    matched[verb].append(verb_form)
+                else:
+                    matched[verb] = [verb_form]
+
+        return [
+            (verb, verb_form)
+            for verb in candidates
+            for verb_form in matched.get(verb, ())
+        ]
@@ -1,8 +1,9 @@
+from collections import deque
+
 from .parser import Parser
 from .daemons import DaemonManager
 from .score import AbstractScore, HintSystem
 from .event import IFPEvent
-from .verb import get_base_verbset
 
 
 class GameInfo:
@@ -95,17 +96,63 @@ class GameInfo:
 
 
 class IFPGame:
+    # the number of turns the player can undo. Undo is off unless this is set before
+    # calling initGame, or enableUndo is called
+    undo_turns = 0
+    # the most attribute values the undo journal keeps, across all turns
+    undo_size = 100000
+    # the number of turns changesSince can look back over, while changes are tracked
+    change_turns = 100
+    # save only what has changed since the world was built. The baseline this needs
+    # keeps a copy of the attributes of every object, so delta saves are off unless
+    # this is set before calling initGame, or takeBaseline is called
+    delta_saves = False
+
     def __init__(self, app, main="__main__"):
         # Track the game objects and their vocublary
         self.ifp_objects = {}
         self.next_obj_ix = 0
         self.nouns = {}
-        self.verbs = get_base_verbset()
+        # maps each adjective to the set of Things it describes
+        self.adjectives = {}
+        # incremented whenever a Thing moves, is revealed or hidden, or is worn
+        self.containment_epoch = 0
+        # incremented whenever a Thing is added to the player's knows_about
+        self.knowledge_epoch = 0
+        # built on first use, so that importing the game does not import the verbs
+        self._verbs = None
+        # maps (class, attribute name) to whether the class defines the attribute,
+        # for the verbs' lookups of the overrides on their objects
+        self._dispatch_cache = {}
+        # the state of the world when play begins, taken by initGame if delta_saves
+        # is set
+        self.baseline = None
+        # records the attributes set each turn, while tracking is on
+        self.changes = None
+        # writes saves in the background, created by the first saveInBackground
+        self.saves = None
+        # (filename, error) for each background save that could not be written,
+        # until it is reported at the end of the next turn. Filled in by the save
+        # writer's thread
+        self.failed_saves = deque()
+        # saves the game as it is played, while autosave is on
+        self.autosave = None
+        # the objects whose saved attributes are waiting to be decoded, after a save
+        # has been loaded lazily
+        self.deferred = None
+        # a weak reference to the last snapshot taken or restored, which the next
+        # snapshot shares the copies of unchanged objects with
+        self._last_snapshot = None
+        # the Prototype the game was made from, and the game's copies of its objects,
+        # for a game made by Prototype.instantiate
+        self.prototype = None
 
         self.app = app
         app.game = self
 
-        self.main = __import__(main)
+        # the module <<name>> replacements in text are looked up in. Given either
+        # as a module name, or as the module (or any other object) itself
+        self.main = __import__(main) if isinstance(main, str) else main
         self.aboutGame = GameInfo()
 
         self.daemons = DaemonManager(self)
@@ -125,6 +172,92 @@ class IFPGame:
         self.score = AbstractScore(self)
         self.hints = HintSystem(self)
 
+    def takeBaseline(self):
+        """
+        Snapshot the state of the world. Saves only store what has changed since the
+        snapshot was taken. Called by initGame once the world has been built, if
+        `delta_saves` is set.
+        """
+        from .baseline import Baseline
+
+        self.baseline = Baseline(self)
+
+    def saveInBackground(self, filename, **kwargs):
+        """
+        Save the game without waiting for the file to be written. The state of the
+        game is copied now, and written to the file on a worker thread (see
+        save_writer.py). Keyword arguments are passed on to SaveGame.
+
+        When the file has been written, or writing it has failed, the app's
+        saveFinished(filename, error) method is called, if it has one, from the
+        worker thread. error is None if the save succeeded. A save that fails is
+        also reported to the player at the end of the next turn.
+
+        :returns: False if the save was turned away because too many saves are
+            waiting to be written
+        :rtype: bool
+        """
+        from .serializer import SaveGame
+
+        save = SaveGame(self, filename, write=False, **kwargs)
+        return self.saveWriter().submit(save, self._saveFinished)
+
+    def saveWriter(self):
+        """
+        The SaveWriter that writes the game's saves and autosaves in the background,
+        created the first time it is needed
+
+        :rtype: SaveWriter
+        """
+        from .save_writer import SaveWriter
+
+        if self.saves is None:
+            self.saves = SaveWriter()
+        return self.saves
+
+    def enableAutosave(self, filename, turns=1, seconds=None, **kwargs):
+        """
+        Start saving the game as it is played, so that it can be recovered with
+        recoverAutosave after a crash. A snapshot of the game is saved now, and the
+        changes made since are written to a journal every `turns` turns, or after
+        `seconds` seconds. Keyword arguments are passed on to Autosave (see
+        autosave.py). Turns on change tracking.
+        """
+        from .autosave import Autosave
+
+        self.stopAutosave()
+        self.autosave = Autosave(self, filename, turns, seconds, **kwargs)
+
+    def stopAutosave(self):
+        if self.autosave is not None:
+            self.autosave.close()
+            self.autosave = None
+
+    def recoverAutosave(self, filename):
+        """
+        Load the game saved by autosave to `filename`, as it was when the journal
+        was last written. Call after initGame, and before enableAutosave.
+
+        :returns: the number of journal records replayed, or None if there is no
+            autosave to recover
+        :rtype: int or None
+        """
+        from .autosave import recover
+
+        return recover(self, filename)
+
+    def _saveFinished(self, save, error):
+        if error is not None:
+            self.failed_saves.append((save.filename, error))
+        callback = getattr(self.app, "saveFinished", None)
+        if callback is not None:
+            callback(save.filename, error)
+
+    def _reportFailedSaves(self):
+        while self.failed_saves:
+            filename, error = self.failed_saves.popleft()
+            self.addTextToEvent("turn", f"Could not save game to {filename}: {error}")
+
     def runTurnEvents(self):
         events = sorted(
             [
@@ -156,11 +289,18 @@ class IFPGame:
         self.reflexive.addSynonym("themselves")
         self.reflexive.makeKnown(self.me)
 
+        if self.delta_saves:
+            self.takeBaseline()
+
         self.addEvent("turn", 5, style=self.turn_event_style)
         self.gameOpening(self)
         self.parser.roomDescribe()
         self.daemons.runAll(self)
         self.runTurnEvents()
+        self._endTurnChanges()
+
+        if self.undo_turns:
+            self.enableUndo(self.undo_turns, self.undo_size)
 
     def turnMain(self, input_string):
         """
@@ -173,8 +313,141 @@ class IFPGame:
             return 0
         # parse string
         self.parser.parseInput(input_string)
-        self.daemons.runAll(self)
+        # a command that undoes earlier turns does not take a turn itself
+        if not (self.changes and self.changes.undone):
+            self.daemons.runAll(self)
+        self._reportFailedSaves()
         self.runTurnEvents()
+        self._endTurnChanges()
+        if self.autosave is not None:
+            self.autosave.endTurn()
+
+    def trackChanges(self):
+        """
+        Start recording the attributes of IFPObjects that are set each turn. See
+        changesSince. Only this game's objects record their changes (see
+        changes.py), so other games in the process are not slowed down.
+        """
+        from .changes import ChangeTracker
+
+        if self.changes is None:
+            self.changes = ChangeTracker(self)
+
+    def stopTrackingChanges(self):
+        if self.changes is not None:
+            self.changes.stop()
+            self.changes = None
+
+    def changesSince(self, turn):
+        """
+        Find the attributes of IFPObjects that have been set since the end of a turn.
+        Turns are numbered by `self.daemons.turn`. Changes to the contents of a
+        location are returned as changes to its `contains` attribute.
+
+        Raises ValueError if changes were not being tracked at the end of the turn,
+        or if the turn is more than `change_turns` turns ago
+
+        :param turn: the turn number
+        :type turn: int
+        :returns: the (object, attribute name) pairs set since the end of the turn
+        :rtype: set
+        """
+        if self.changes is None:
+            raise ValueError("Changes are not being tracked. Call trackChanges.")
+        return self.changes.since(turn)
+
+    def enableUndo(self, turns=None, size=None):
+        """
+        Start keeping what each turn changes, so that turns can be undone. Called by
+        initGame if `undo_turns` is set. Turns on change tracking.
+
+        :param turns: the number of turns that can be undone
+        :type turns: int
+        :param size: the most attribute values to keep, across all turns
+        :type size: int
+        """
+        from .undo import UNDO_TURNS, UndoJournal
+
+        self.trackChanges()
+        journal = UndoJournal(
+            turns or self.undo_turns or UNDO_TURNS, size or self.undo_size
+        )
+        journal.keepParser(self.parser)
+        self.changes.journal = journal
+
+    def undo(self, turns=1):
+        """
+        Undo the changes made so far this turn, and in the last `turns` turns.
+        Raises ValueError if undo is not enabled
+
+        :returns: the number of turns undone, which is less than `turns` if there
+            are fewer turns that can be undone
+        :rtype: int
+        """
+        if self.changes is None or self.changes.journal is None:
+            raise ValueError("Undo is not enabled. Call enableUndo.")
+        return self.changes.undo(turns)
+
+    def snapshot(self):
+        """
+        Take a snapshot of the state of the game, in memory, that can be put back
+        with `restore`. See snapshot.py.
+
+        :rtype: Snapshot
+        """
+        from .snapshot import Snapshot
+
+        return Snapshot(self)
+
+    def restore(self, snapshot):
+        """
+        Put the game back in the state it was in when a snapshot was taken. Like
+        loading a save, this cannot be undone.
+        Raises ValueError if the snapshot was taken from another game.
+
+        :param snapshot: the snapshot, from `snapshot`
+        :type snapshot: Snapshot
+        """
+        if snapshot.game is not self:
+            raise ValueError("Cannot restore a snapshot taken from another game")
+        snapshot.restore()
+
+    def fork(self, app):
+        """
+        Create a new game, with its own copy of the world and state of this one,
+        that can be played without affecting this game. The new game tracks changes,
+        and keeps undo history, if this one does, but starts with no undo history,
+        autosave or background saves of its own.
+
+        Raises ValueError if the game was made from a Prototype. Make another game
+        from the prototype instead.
+
+        :param app: the app for the new game
+        :rtype: IFPGame
+        """
+        from .snapshot import fork
+
+        if self.prototype is not None:
+            raise ValueError("Cannot fork a game made from a prototype")
+        return fork(self, app)
+
+    def getObject(self, obj):
+        """
+        Find this game's own copy of an object of the world it was copied from, by
+        fork or from a Prototype. For the game that built the world, this is the
+        object itself. Callbacks that refer to objects by their names in the game
+        module, rather than through the game they are passed, should look them up
+        with this, so that they can be used by every copy of the game.
+
+        :param obj: an object of this game, or of the game it was copied from
+        :type obj: IFPObject
+        :rtype: IFPObject
+        """
+        return self.ifp_objects.get(obj.ix, obj)
+
+    def _endTurnChanges(self):
+        if self.changes is not None:
+            self.changes.endTurn()
 
     def addEvent(self, name, priority, text=None, style=None):
         """
@@ -279,9 +552,51 @@ class IFPGame:
         self.me = player
         self.me.setPlayer()
 
+    @property
+    def verbs(self):
+        """
+        The map of verb words to verb classes for this game. The verb module is
+        imported the first time this is used.
+        """
+        if self._verbs is None:
+            from .verb import VerbMap, get_base_verbset
+
+            self._verbs = VerbMap(get_base_verbset())
+        return self._verbs
+
+    @verbs.setter
+    def verbs(self, value):
+        self._verbs = value
+
+    def addNoun(self, word, thing, new=False):
+        """
+        Add a Thing to the noun dictionary under `word`, if it is not already there
+
+        :param new: the Thing has just been created, so it cannot be there yet, and
+            the list of Things under `word` is not searched
+        :type new: bool
+        """
+        if not new and thing in self.nouns.get(word, ()):
+            return
+        if self.changes is not None:
+            self.changes.recordIndex(self.nouns, word)
+        self.nouns.setdefault(word, []).append(thing)
+
+    def removeNoun(self, word, thing):
+        """
+        Remove a Thing from the noun dictionary under `word`
+        """
+        if thing not in self.nouns.get(word, ()):
+            return
+        if self.changes is not None:
+            self.changes.recordIndex(self.nouns, word)
+        self.nouns[word].remove(thing)
+        if not self.nouns[word]:
+            del self.nouns[word]
+
     def addVerb(self, verb):
+        """
+        Add a verb to this game only. The shared base verb set is not modified.
+        """
         for key in [verb.word, *verb.synonyms]:
-            if key in self.verbs:
-                self.verbs[key].append(verb)
-            else:
-                self.verbs[key] = [verb]
+            self.verbs[key] = list(self.verbs.get(key, ())) + [verb]
@@ -1,6 +1,8 @@
 class IFPObject:
     def __init__(self, game):
         self.game = game
+        if game.changes is not None:
+            game.changes.track(self)
         self.registerNewIndex()
         self.is_top_level_location = False
 
@@ -8,4 +10,39 @@ class IFPObject:
         ix = f"{type(self).__name__}__{self.game.next_obj_ix}"
         self.ix = ix
         self.game.next_obj_ix += 1
+        if self.game.changes is not None:
+            self.game.changes.recordIndex(self.game.ifp_objects, ix)
         self.game.ifp_objects[ix] = self
+
+    def _recordChange(self, attr):
+        """
+        Record that an attribute is about to be changed in place (for instance, by
+        adding an item to a list), so that change tracking and undo see the change.
+        Attributes that are set are recorded automatically.
+        """
+        changes = self.game.changes
+        if changes is not None:
+            changes.record(self, attr)
+
+    def __getattr__(self, name):
+        # only called for attributes the object does not have. Its saved attributes
+        # may be waiting to be decoded, if it was loaded lazily (see deferred.py)
+        try:
+            deferred = object.__getattribute__(self, "game").deferred
+        except AttributeError:
+            # an attribute used before IFPObject.__init__ has set game
+            deferred = None
+        if deferred is not None and deferred.decode(self):
+            return object.__getattribute__(self, name)
+        raise AttributeError(
+            f"{type(self).__name__!r} object has no attribute {name!r}"
+        )
+
+    def _decodeDeferred(self):
+        """
+        Decode any saved attributes of the object that are still waiting, before
+        its __dict__ is used directly (see deferred.py)
+        """
+        deferred = self.game.deferred
+        if deferred is not None:
+            deferred.decode(self)
@@ -3,20 +3,8 @@ import string
 import re
 
 from .vocab import english
-from .grammar import Command, GrammarObject
-from .verb import (
-    ScoreVerb,
-    FullScoreVerb,
-    HelpVerbVerb,
-    GetVerb,
-    StandUpVerb,
-    DropVerb,
-    RemoveFromVerb,
-)
-from .thing_base import Thing
-from .things import Container, Surface, UnderSpace, Liquid
-from .room import Room
-from .travel import directionDict
+from .grammar import Command, GrammarObject, VerbSyntaxIndex
+from .scope import ScopeResolver
 from .tokenizer import cleanInput, tokenize, removeArticles
 from .exceptions import (
     NoMatchingSuggestion,
@@ -43,6 +31,8 @@ class Parser:
         self.previous_command.dobj = GrammarObject()
         self.previous_command.iobj = GrammarObject()
         self.turns = 0
+        self.scope = ScopeResolver(game)
+        self.syntax_index = VerbSyntaxIndex()
 
     def recordInput(self, input_string):
         self.game.turn_list.append(input_string)
@@ -96,6 +86,8 @@ class Parser:
         Called every turn by self.parseInput
         Raises AbortTurn on discovering & executing a travel command
         """
+        from .travel import directionDict
+
         d = self.command.tokens[0]
         if d in directionDict and len(self.command.tokens) == 1:
             if self.previous_command.ambiguous:
@@ -159,20 +151,14 @@ class Parser:
         """
         self.checkForConvCommand()
 
-        match_pairs = []
-        for cur_verb in self.command.verb_matches:
-            for verb_form in cur_verb.syntax:
-                i = len(verb_form)
-                for word in verb_form:
-                    if word[0] != "<":
-                        if word not in self.command.tokens:
-                            break
-                        else:
-                            i = i - 1
-                    else:
-                        i = i - 1
-                if i == 0:
-                    match_pairs.append([cur_verb, verb_form])
+        match_pairs = [
+            [cur_verb, verb_form]
+            for cur_verb, verb_form in self.syntax_index.match(
+                self.game.verbs[self.command.primary_verb_token],
+                self.command.verb_matches,
+                self.command.tokens,
+            )
+        ]
 
         removeMatch = []
         for pair in match_pairs:
@@ -476,7 +462,9 @@ class Parser:
             and not self.command.dobj.tokens
             and self.command.verb.impDobj
         ):
-            self.command.dobj.target = self.command.verb().getImpDobj(self.game)
+            self.command.dobj.target = self.command.verb.instance().getImpDobj(
+                self.game
+            )
             if not self.command.dobj.target:
                 implicit_get_failed = True
 
@@ -485,7 +473,9 @@ class Parser:
             and not self.command.iobj.tokens
             and self.command.verb.impIobj
         ):
-            self.command.iobj.target = self.command.verb().getImpIobj(self.game)
+            self.command.iobj.target = self.command.verb.instance().getImpIobj(
+                self.game
+            )
             if not self.command.iobj.target:
                 implicit_get_failed = True
 
@@ -573,12 +563,7 @@ class Parser:
         Takes arguments self.game.me, pointing to the Player, and thing, a Thing
         Returns True if within range, False otherwise
         """
-        if thing.ix not in self.game.me.wearing:
-            return False
-        elif thing not in self.game.me.wearing[thing.ix]:
-            return False
-        else:
-            return True
+        return self.scope.isWorn(thing)
 
     def roomRangeCheck(self, thing):
         """
@@ -586,22 +571,7 @@ class Parser:
         Takes arguments self.game.me, pointing to the Player, and thing, a Thing
         Returns True if within range, False otherwise
         """
-        out_loc = self.game.me.getOutermostLocation()
-        if not out_loc.resolveDarkness(self.game):
-            return False
-        if thing.ix in self.game.me.contains:
-            if thing in self.game.me.contains[thing.ix]:
-                return False
-        if thing.ix in self.game.me.sub_contains:
-            if thing in self.game.me.sub_contains[thing.ix]:
-                return False
-        if thing.ix in out_loc.contains:
-            if thing in out_loc.contains[thing.ix]:
-                return True
-        if thing.ix in out_loc.sub_contains:
-            if thing in out_loc.sub_contains[thing.ix]:
-                return True
-        return False
+        return self.scope.inRoom(thing)
 
     def knowsRangeCheck(self, thing):
         """
@@ -609,10 +579,7 @@ class Parser:
         Takes arguments self.game.me, pointing to the Player, and thing, a Thing
         Returns True if within range, False otherwise
         """
-        if not thing.known_ix in self.game.me.knows_about:
-            return False
-        else:
-            return True
+        return self.scope.isKnown(thing)
 
     def nearRangeCheck(self, thing):
         """
@@ -620,34 +587,7 @@ class Parser:
         Takes arguments self.game.me, pointing to the Player, and thing, a Thing
         Returns True if within range, False otherwise
         """
-        out_loc = self.game.me.getOutermostLocation()
-        too_dark = not out_loc.resolveDarkness(self.game)
-        found = False
-        if thing.ix in out_loc.contains:
-            if thing not in out_loc.contains[thing.ix]:
-                pass
-            elif too_dark:
-                pass
-            else:
-                found = True
-        if thing.ix in out_loc.sub_contains:
-            if thing not in out_loc.sub_contains[thing.ix]:
-                pass
-            elif too_dark:
-                pass
-            else:
-                found = True
-        if thing.ix in self.game.me.contains:
-            if thing not in self.game.me.contains[thing.ix]:
-                pass
-            else:
-                found = True
-        if thing.ix in self.game.me.sub_contains:
-            if thing not in self.game.me.sub_contains[thing.ix]:
-                pass
-            else:
-                found = True
-        return found
+        return self.scope.isNear(thing)
 
     def invRangeCheck(self, thing):
         """
@@ -655,19 +595,11 @@ class Parser:
         Takes arguments self.game.me, pointing to the Player, and thing, a Thing
         Returns True if within range, False otherwise
         """
-        if thing.ix in self.game.me.contains:
-            if thing not in self.game.me.contains[thing.ix]:
-                pass
-            else:
-                return True
-        if thing.ix in self.game.me.sub_contains:
-            if thing not in self.game.me.sub_contains[thing.ix]:
-                return False
-            else:
-                return True
-        return False
+        return self.scope.inInventory(thing)
 
     def directionRangeCheck(self, obj):
+        from .travel import directionDict
+
         if isinstance(obj, list):
             if len(obj) > 1:
                 return False
@@ -704,51 +636,44 @@ class Parser:
         the verb
         Returns a list of Thing objects, or an empty list
         """
-        out_range = []
+        from .verb import DropVerb
+
         if scope == "wearing":
-            for thing in things:
-                if not self.wearRangeCheck(thing):
-                    out_range.append(thing)
+            things = [thing for thing in things if self.wearRangeCheck(thing)]
         elif scope == "room":
+            in_range = []
             for thing in things:
-                if not self.roomRangeCheck(thing) and self.invRangeCheck(thing):
+                if self.roomRangeCheck(thing):
+                    in_range.append(thing)
+                elif self.invRangeCheck(thing):
                     # implicit drop
-                    DropVerb().verbFunc(self.game, thing)
-                    pass
-                elif not self.roomRangeCheck(thing):
-                    out_range.append(thing)
+                    DropVerb.instance().verbFunc(self.game, thing)
+                    in_range.append(thing)
+            things = in_range
         elif scope == "knows":
             things = self.getUniqueConcepts(things)
-            for thing in things:
-                if not self.knowsRangeCheck(thing):
-                    out_range.append(thing)
+            things = [thing for thing in things if self.knowsRangeCheck(thing)]
         elif scope == "near" or scope == "roomflex":
-            for thing in things:
-                if not self.nearRangeCheck(thing):
-                    out_range.append(thing)
+            things = [thing for thing in things if self.nearRangeCheck(thing)]
         elif scope == "inv" or scope == "invflex":
-            for thing in things:
-                if self.roomRangeCheck(thing):
-                    pass
-                elif not self.invRangeCheck(thing):
-                    out_range.append(thing)
+            things = [
+                thing
+                for thing in things
+                if self.roomRangeCheck(thing) or self.invRangeCheck(thing)
+            ]
         else:
             raise VerbDefinitionError(f"Unrecognized object scope {scope}")
         # remove items that require implicit actions in the event of ambiguity
-        for thing in out_range:
-            things.remove(thing)
-        things2 = list(things)
-        out_range = []
         if len(things) > 1:
-            for thing in things:
-                if scope in ["room", "roomflex"] and not self.roomRangeCheck(thing):
-                    out_range.append(thing)
-                elif scope in ["inv", "invflex"] and not self.invRangeCheck(thing):
-                    out_range.append(thing)
-                elif thing.ignore_if_ambiguous:
-                    out_range.append(thing)
-            for thing in out_range:
-                things2.remove(thing)
+            things2 = [
+                thing
+                for thing in things
+                if not (
+                    (scope in ["room", "roomflex"] and not self.roomRangeCheck(thing))
+                    or (scope in ["inv", "invflex"] and not self.invRangeCheck(thing))
+                    or thing.ignore_if_ambiguous
+                )
+            ]
             if len(things2) > 0:
                 return things2
         return things
@@ -894,6 +819,8 @@ class Parser:
         return ", "
 
     def _itemWithDisambigIndex(self, item, ix, location=None):
+        from .room import Room
+
         msg = item.lowNameArticle(True)
         if isinstance(location, Room):
             location = location.floor
@@ -987,15 +914,10 @@ class Parser:
             adj_i = noun_adj_arr.index(noun) - 1
         else:
             adj_i = len(noun_adj_arr) - 1
-        not_match = []
         while adj_i >= 0 and len(things) > 1:
             # check preceding word as an adjective
-            for thing in things:
-                if noun_adj_arr[adj_i] not in thing.adjectives:
-                    not_match.append(thing)
-            for item in not_match:
-                if item in things:
-                    things.remove(item)
+            described = self.game.adjectives.get(noun_adj_arr[adj_i], ())
+            things = [thing for thing in things if thing in described]
             adj_i = adj_i - 1
         things = self.checkRange(things, scope)
         if len(things) == 1 and things[0].far_away and not far_obj:
@@ -1006,23 +928,17 @@ class Parser:
             )
             return False
         elif len(things) > 1 and not far_obj:
-            remove_far = []
-            for item in things:
-                if item.far_away:
-                    remove_far.append(item)
-            if len(things) > len(remove_far):
-                for item in remove_far:
-                    things.remove(item)
+            near = [item for item in things if not item.far_away]
+            if near:
+                things = near
         if len(things) > 1 and obj_direction:
-            remove_wrong = []
-            for item in things:
-                if item.direction:
-                    if item.direction != obj_direction:
-                        remove_wrong.append(item)
-            if len(things) > len(remove_wrong):
-                for item in remove_wrong:
-                    if item in things:
-                        things.remove(item)
+            right_direction = [
+                item
+                for item in things
+                if not item.direction or item.direction == obj_direction
+            ]
+            if right_direction:
+                things = right_direction
         if len(things) > 1:
             remove_child = []
             for item in things:
@@ -1071,12 +987,14 @@ class Parser:
         Returns a Boolean, True if a verb function is successfully called, False
         otherwise
         """
+        from .verb import StandUpVerb
+
         if self.command.verb.hasDobj and self.command.verb.hasIobj:
             if (
                 self.command.verb.dscope != "inv" or self.command.verb.iscope != "inv"
             ) and self.game.me.position != "standing":
-                StandUpVerb().verbFunc(self.game)
-            self.command.verb().verbFunc(
+                StandUpVerb.instance().verbFunc(self.game)
+            self.command.verb.instance().verbFunc(
                 self.game, self.command.dobj.target, self.command.iobj.target
             )
         elif self.command.verb.hasDobj:
@@ -1085,18 +1003,18 @@ class Parser:
                 and self.command.verb.dscope != "invflex"
                 and self.game.me.position != "standing"
             ):
-                StandUpVerb().verbFunc(self.game)
-            self.command.verb().verbFunc(self.game, self.command.dobj.target)
+                StandUpVerb.instance().verbFunc(self.game)
+            self.command.verb.instance().verbFunc(self.game, self.command.dobj.target)
         elif self.command.verb.hasIobj:
             if (
                 self.command.verb.iscope != "inv"
                 and self.command.verb.iscope != "invflex"
                 and self.game.me.position != "standing"
             ):
-                StandUpVerb().verbFunc(self.game)
-            self.command.verb().verbFunc(self.game, self.command.iobj.target)
+                StandUpVerb.instance().verbFunc(self.game)
+            self.command.verb.instance().verbFunc(self.game, self.command.iobj.target)
         else:
-            self.command.verb().verbFunc(self.game)
+            self.command.verb.instance().verbFunc(self.game)
         return True
 
     def disambig(self):
@@ -1149,6 +1067,7 @@ class Parser:
 
         Raises TypeError if passed an invalid parameter for which_obj
         """
+        from .things import Container, Surface, UnderSpace
 
         COMPONENT_CLASSES = {
             "Container": {"class": Container, "component_holder": "child_Containers"},
@@ -1191,6 +1110,8 @@ class Parser:
         return obj
 
     def implicitRemoveNestedInventory(self):
+        from .verb import RemoveFromVerb
+
         if self.command.dobj and not self.command.verb.dscope in ["text", "direction"]:
             if (
                 self.command.dobj.target
@@ -1212,7 +1133,7 @@ class Parser:
                     + self.command.dobj.target.location.verbose_name
                     + ")",
                 )
-                success = RemoveFromVerb().verbFunc(
+                success = RemoveFromVerb.instance().verbFunc(
                     self.game,
                     self.command.dobj.target,
                     self.command.dobj.target.location,
@@ -1258,6 +1179,8 @@ class Parser:
                     )
 
     def _liquidContainerRedirect(self, which_obj, obj):
+        from .things import Liquid
+
         scope = getattr(self.command.verb, f"{which_obj[:1]}scope")
 
         if scope in ("text", "direction") or not obj or not obj.location:
@@ -1289,6 +1212,8 @@ class Parser:
             )
 
     def _resolveTargetLocation(self, obj, scope):
+        from .verb import DropVerb, GetVerb
+
         if scope == "text":
             return " ".join(obj)
 
@@ -1301,7 +1226,7 @@ class Parser:
             return obj
 
         if scope == "room" and self.invRangeCheck(obj):
-            DropVerb().verbFunc(self.game, obj)
+            DropVerb.instance().verbFunc(self.game, obj)
         elif (
             scope in ("inv", "invflex")
             and obj is not self.game.me
@@ -1315,7 +1240,7 @@ class Parser:
                 + obj.verbose_name
                 + ") ",
             )
-            success = GetVerb().verbFunc(self.game, obj)
+            success = GetVerb.instance().verbFunc(self.game, obj)
             if not success:
                 raise AbortTurn(f"Implicit take failed. Could not take {obj}")
 
@@ -1430,6 +1355,8 @@ class Parser:
         raise AbortTurn("Input handled by current Sequence")
 
     def runTurnCommand(self):
+        from .verb import HelpVerbVerb
+
         if len(self.command.tokens) == 0:
             self.command.err = True
             return
@@ -1438,7 +1365,7 @@ class Parser:
             self.command.tokens[0:2] == ["help", "verb"]
             or self.command.tokens[0:2] == ["verb", "help"]
         ) and len(self.command.tokens) > 2:
-            HelpVerbVerb().verbFunc(self.game, self.command.tokens[2:])
+            HelpVerbVerb.instance().verbFunc(self.game, self.command.tokens[2:])
             return
         elif self.command.tokens[0:2] == ["help", "verb"] or self.command.tokens[
             0:2
@@ -1490,12 +1417,14 @@ class Parser:
                 pass
             return
 
+        from .verb import ScoreVerb, FullScoreVerb
+
         if self.command.tokens == ["full", "score"]:
-            FullScoreVerb().verbFunc(self.game)
+            FullScoreVerb.instance().verbFunc(self.game)
         elif self.command.tokens == ["score"]:
-            ScoreVerb().verbFunc(self.game)
+            ScoreVerb.instance().verbFunc(self.game)
         elif self.command.tokens == ["fullscore"]:
-            FullScoreVerb().verbFunc(self.game)
+            FullScoreVerb.instance().verbFunc(self.game)
         elif self.command.tokens == ["about"]:
             self.game.aboutGame.printAbout(self.game)
         else:
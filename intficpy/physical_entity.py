@@ -9,7 +9,28 @@ class PhysicalEntity(IFPObject):
 
         # CONTENTS
         self.contains = {}
-        self.revealed = True
+        # index of revealed nested contents, maintained as contents are added and
+        # removed, and as Things are revealed or hidden
+        self._sub_contains = {}
+        # number of lit LightSources among the contents and revealed nested contents
+        self._lit_count = 0
+        self._revealed = True
+
+    @property
+    def revealed(self):
+        return self._revealed
+
+    @revealed.setter
+    def revealed(self, value):
+        if value == self._revealed:
+            return
+        self.game.containment_epoch += 1
+        if value:
+            self._revealed = value
+            self._updateAncestorIndex(self._visibleNestedContents(), add=True)
+        else:
+            self._updateAncestorIndex(self._visibleNestedContents(), add=False)
+            self._revealed = value
 
     def containsItem(self, item):
         """Returns True if item is in the contains or sub_contains dictionary """
@@ -41,11 +62,20 @@ class PhysicalEntity(IFPObject):
         return True
 
     def addTopLevelContains(self, item):
+        self._recordChange("contains")
         if item.ix in self.contains:
             self.contains[item.ix].append(item)
         else:
             self.contains[item.ix] = [item]
         item.location = self
+        self.game.containment_epoch += 1
+        if getattr(item, "is_lit", False):
+            self._lit_count += 1
+
+        nested = item.visible_nested_contents
+        self._indexSubContents(nested, add=True)
+        if self.revealed:
+            self._updateAncestorIndex([item] + nested, add=True)
 
     def removeThing(self, item):
         if not self.containsItem(item):
@@ -69,10 +99,19 @@ class PhysicalEntity(IFPObject):
         loc = self
 
         if self.topLevelContainsItem(item):
+            self._recordChange("contains")
             self.contains[item.ix].remove(item)
             if not self.contains[item.ix]:
                 del self.contains[item.ix]
             item.location = None
+            self.game.containment_epoch += 1
+            if getattr(item, "is_lit", False):
+                self._lit_count -= 1
+
+            nested = item.visible_nested_contents
+            self._indexSubContents(nested, add=False)
+            if self.revealed:
+                self._updateAncestorIndex([item] + nested, add=False)
             return True
 
         if self.subLevelContainsItem(item):
@@ -117,26 +156,96 @@ class PhysicalEntity(IFPObject):
         """
         return True
 
+    def _indexSubContents(self, items, add=True):
+        """
+        Add items to, or remove items from, the sub_contains index of this entity only
+        """
+        index = self._sub_contains
+        for item in items:
+            if add:
+                if item.ix in index:
+                    index[item.ix].append(item)
+                else:
+                    index[item.ix] = [item]
+                if getattr(item, "is_lit", False):
+                    self._lit_count += 1
+            elif item.ix in index and item in index[item.ix]:
+                index[item.ix].remove(item)
+                if not index[item.ix]:
+                    del index[item.ix]
+                if getattr(item, "is_lit", False):
+                    self._lit_count -= 1
+
+    def _updateAncestorIndex(self, items, add=True):
+        """
+        Items have become visible (or stopped being visible) among the nested
+        contents of this entity. Update the sub_contains index of each location
+        above us, stopping at the first one that hides its contents.
+        """
+        entity = self
+        parent = entity.location
+        while parent is not None and parent is not entity:
+            parent._indexSubContents(items, add=add)
+            if not parent.revealed:
+                break
+            entity = parent
+            parent = entity.location
+
+    def _updateLitCount(self, delta):
+        """
+        This entity has been lit or put out. Update the lit count of each location
+        above us that can see it, stopping after the first one that hides its
+        contents.
+        """
+        entity = self.location
+        while entity is not None:
+            entity._lit_count += delta
+            parent = entity.location
+            if not entity.revealed or parent is entity:
+                break
+            entity = parent
+
+    def _rebuildSubContains(self):
+        """
+        Recompute the sub_contains index and lit count from scratch for this entity
+        and everything it contains. Used when contents have been set without going
+        through addTopLevelContains/removeContains, for instance when loading a save
+        file.
+        """
+        self._sub_contains = {}
+        self._lit_count = 0
+        for item in self.topLevelContentsList:
+            if getattr(item, "is_lit", False):
+                self._lit_count += 1
+            item._rebuildSubContains()
+            self._indexSubContents(item.visible_nested_contents, add=True)
+
+    def _visibleNestedContents(self):
+        return self.topLevelContentsList + self.subLevelContentsList
+
     @property
     def visible_nested_contents(self):
         if not self.revealed:
             return []
-        ret = self.topLevelContentsList
-        for item in self.topLevelContentsList:
-            ret += item.visible_nested_contents
-        return ret
+        return self._visibleNestedContents()
 
     @property
     def sub_contains(self):
-        ret = {}
-        for item in self.topLevelContentsList:
-            flat = item.visible_nested_contents
-            for sub in flat:
-                if sub.ix in ret:
-                    ret[sub.ix].append(sub)
-                else:
-                    ret[sub.ix] = [sub]
-        return ret
+        """
+        The revealed nested contents of this entity, excluding the top level, in the
+        same dictionary format as `contains`. This is kept up to date as items are
+        moved, and should not be modified directly.
+        """
+        return self._sub_contains
+
+    @property
+    def lit_count(self):
+        """
+        The number of lit LightSources among the contents and revealed nested
+        contents of this entity. This is kept up to date as items are moved, lit and
+        put out, and should not be modified directly.
+        """
+        return self._lit_count
 
     @property
     def topLevelContentsList(self):
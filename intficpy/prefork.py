@@ -0,0 +1,232 @@
+import gc
+import os
+import secrets
+import threading
+import traceback
+import zlib
+from multiprocessing import Pipe
+
+from .exceptions import WorkerError
+from .server import SessionApp, SessionManager
+
+##############################################################
+# PREFORK.PY - IntFicPy sessions played in a pool of worker processes
+# Defines the WorkerPool class, which builds the world once, then forks worker
+# processes that each play a share of the sessions
+##############################################################
+#
+# Building a world runs the game module from top to bottom, which is paid for by
+# every process that plays the game. A WorkerPool pays for it once: the parent
+# process builds the world and makes it into a Prototype (see server.py and
+# prototype.py), then forks the workers. Each worker starts with the built world
+# already in memory, in pages it shares with the parent and the other workers until
+# it writes to them, and opens sessions from it as a SessionManager does.
+#
+#     pool = WorkerPool(build, workers=4)
+#     session_id, events = pool.open()
+#     events = pool.turn(session_id, "take umbrella")
+#     pool.shutdown()
+#
+# Each session is played by one worker, chosen from its id, so turns on sessions in
+# different workers are played at the same time, on different cores. Requests are
+# sent to the workers, and events returned, through pipes, so session ids, commands
+# and events must be picklable; the events of the default SessionApp are.
+#
+# The pool needs os.fork, so it is not available on Windows. Create the pool before
+# the process starts any threads of its own, as threads are not copied to the
+# workers.
+
+# the number of workers if none is given
+DEFAULT_WORKERS = os.cpu_count() or 1
+
+
+class _Worker:
+    """A worker process, and the parent's end of its pipe"""
+
+    def __init__(self, pid, conn):
+        self.pid = pid
+        self.conn = conn
+        # requests to a worker are sent, and their results received, one at a time
+        self.lock = threading.Lock()
+        self.stopped = False
+
+
+class WorkerPool:
+    """
+    Plays sessions in a pool of worker processes forked from a process that has
+    built the world once. The pool's methods are those of SessionManager, and can
+    be called from many threads.
+
+    The world is built, and the workers started, when the pool is created. Call
+    `shutdown` to stop the workers.
+
+    :param build: called with an app, to build a game and its world (see
+        SessionManager)
+    :type build: callable
+    :param workers: the number of worker processes
+    :type workers: int
+    :param app_class: called in the worker to create the app for each session
+    :type app_class: callable
+    """
+
+    def __init__(self, build, workers=DEFAULT_WORKERS, app_class=SessionApp):
+        if not hasattr(os, "fork"):
+            raise NotImplementedError("WorkerPool needs os.fork")
+        if workers < 1:
+            raise ValueError("A WorkerPool needs at least one worker")
+        self.sessions = SessionManager(build, app_class)
+        self.workers = []
+        gc_enabled = gc.isenabled()
+        # the collector would write to the world's objects in each worker, copying
+        # the pages that hold them, so they are moved to the permanent generation,
+        # which is never collected, before forking
+        gc.disable()
+        try:
+            self.sessions.getPrototype()
+            gc.freeze()
+            for i in range(workers):
+                self.workers.append(self._fork())
+        finally:
+            gc.unfreeze()
+            if gc_enabled:
+                gc.enable()
+
+    def _fork(self):
+        conn, child_conn = Pipe()
+        pid = os.fork()
+        if pid:
+            child_conn.close()
+            return _Worker(pid, conn)
+        # the worker
+        status = 1
+        try:
+            conn.close()
+            for worker in self.workers:
+                worker.conn.close()
+            gc.enable()
+            _serve(self.sessions, child_conn)
+            status = 0
+        finally:
+            # skip the parent's exit handlers and buffered output
+            os._exit(status)
+
+    def workerFor(self, session_id):
+        """
+        The worker that plays a session
+
+        :param session_id: the session's id
+        :type session_id: str
+        :rtype: int
+        """
+        return zlib.crc32(session_id.encode()) % len(self.workers)
+
+    def _call(self, worker, method, *args):
+        """
+        Call a method of the worker's SessionManager, and return the result.
+        Raises the error raised by the method, or WorkerError if the worker has
+        stopped.
+        """
+        with worker.lock:
+            if worker.stopped:
+                raise WorkerError(f"Worker {worker.pid} has been shut down")
+            try:
+                worker.conn.send((method, args))
+                ok, result = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                raise WorkerError(f"Worker {worker.pid} has stopped") from e
+        if not ok:
+            raise result
+        return result
+
+    def open(self, session_id=None):
+        """
+        Start a new game for a player, in the session's worker.
+        Raises ValueError if the session id is already in use.
+
+        :param session_id: the id of the new session. A random id is chosen if this
+            is None
+        :type session_id: str or None
+        :returns: the session id, and the events of the game's opening turn
+        :rtype: tuple
+        """
+        if session_id is None:
+            session_id = secrets.token_hex(16)
+        worker = self.workers[self.workerFor(session_id)]
+        return self._call(worker, "open", session_id)
+
+    def turn(self, session_id, text):
+        """
+        Play a turn of a session's game.
+        Raises UnknownSession if there is no open session with the id.
+
+        :param session_id: the id of the session
+        :type session_id: str
+        :param text: the player's command
+        :type text: str
+        :returns: the events of the turn
+        :rtype: list
+        """
+        worker = self.workers[self.workerFor(session_id)]
+        return self._call(worker, "turn", session_id, text)
+
+    def close(self, session_id):
+        """
+        End a session.
+        Raises UnknownSession if there is no open session with the id.
+        """
+        worker = self.workers[self.workerFor(session_id)]
+        self._call(worker, "close", session_id)
+
+    def closeAll(self):
+        """End every open session"""
+        for worker in self.workers:
+            self._call(worker, "closeAll")
+
+    def shutdown(self):
+        """
+        End every open session, and stop the workers. Workers that have already
+        stopped are skipped.
+        """
+        for worker in self.workers:
+            with worker.lock:
+                if worker.stopped:
+                    continue
+                worker.stopped = True
+                try:
+                    worker.conn.send(("closeAll", ()))
+                    worker.conn.recv()
+                    worker.conn.send(None)
+                except (EOFError, OSError):
+                    pass
+                worker.conn.close()
+                try:
+                    os.waitpid(worker.pid, 0)
+                except ChildProcessError:
+                    # already reaped
+                    pass
+
+
+def _serve(sessions, conn):
+    """
+    The worker's loop: call the methods of its SessionManager that the parent
+    asks for, and send back the results, until it is sent None
+    """
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            # the parent has gone
+            return
+        if request is None:
+            return
+        method, args = request
+        try:
+            result = getattr(sessions, method)(*args)
+        except Exception as e:
+            try:
+                conn.send((False, e))
+            except Exception:
+                # the error could not be pickled
+                conn.send((False, WorkerError(traceback.format_exc())))
+        else:
+            conn.send((True, result))
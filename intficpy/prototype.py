@@ -0,0 +1,349 @@
+from collections import deque
+from collections.abc import Mapping
+
+from .baseline import Baseline
+from .changes import untracked_class
+from .save_format import paused_gc
+from .snapshot import UNFORKED_ATTRIBUTES, fork_value, _ATOMIC_TYPES
+
+##############################################################
+# PROTOTYPE.PY - a world shared, copy on write, by many IntFicPy games
+# Defines the Prototype class, a built world that games can be made from, and the
+# copy on write objects each game made from it is given
+##############################################################
+#
+# A Prototype is made from a game whose world has been built, and whose initGame has
+# been called. Each game made from it with `Prototype.instantiate` has an object in
+# place of each of the prototype's objects, with the same class and ix, but with
+# nothing of its own. Reading an attribute of one of these objects reads the
+# attribute of the prototype's object. Lists, dicts and sets are copied for the game
+# the first time they are read, with the game's objects in place of the
+# prototype's, so that the game can change them in place.
+#
+# The first time any attribute of an object is set or deleted, or an attribute is
+# about to be changed in place (IFPObject._recordChange), or the object's __dict__
+# is used, the rest of the prototype object's attributes are copied to it, and it
+# becomes an ordinary object of its class. Until then, it takes only a few hundred
+# bytes, whatever the size of the prototype object. Reading the attributes of these
+# objects is slower than reading those of ordinary objects, so an object that is
+# read READ_LIMIT times is given its own copy too: the objects near the player, that
+# are read every turn, soon become ordinary objects, and the rest of the world stays
+# shared.
+#
+# The prototype's game is never played, and must not be changed once the prototype
+# has been made.
+
+# maps each IFPObject class to its copy on write subclass
+_shell_classes = {}
+# the copy on write subclasses
+_shell_types = set()
+
+_object_getattribute = object.__getattribute__
+_object_setattr = object.__setattr__
+
+# attributes of the prototype's game that are not copied to the games made from it
+UNCOPIED_ATTRIBUTES = UNFORKED_ATTRIBUTES.union(["baseline", "prototype"])
+# the number of times the attributes of a copy on write object can be read before it
+# is given its own copy of its prototype's attributes
+READ_LIMIT = 32
+
+
+def is_shell(obj):
+    """
+    Return True if `obj` is a copy on write object that has not been given its own
+    copy of its prototype's attributes yet
+    """
+    return type(obj) in _shell_types
+
+
+def _shell_getattribute(obj, name):
+    attributes = _object_getattribute(obj, "__dict__")
+    reads = attributes["_prototype_reads"] = attributes["_prototype_reads"] + 1
+    if reads > READ_LIMIT:
+        materialize(obj)
+        return _object_getattribute(obj, name)
+    try:
+        return attributes[name]
+    except KeyError:
+        pass
+    if name == "__dict__":
+        materialize(obj)
+        return attributes
+    shared = attributes["_prototype"].__dict__
+    if name in shared:
+        value = shared[name]
+        if type(value) in _ATOMIC_TYPES:
+            return value
+        # the game's own copy, which it can change in place
+        value = attributes[name] = fork_value(value, attributes["game"].prototype.memo)
+        return value
+    return type(obj)._ifp_class.__getattribute__(obj, name)
+
+
+def _shell_setattr(obj, name, value):
+    materialize(obj)
+    setattr(obj, name, value)
+
+
+def _shell_delattr(obj, name):
+    materialize(obj)
+    delattr(obj, name)
+
+
+def _shell_reduce_ex(obj, protocol):
+    # copy.copy finds __reduce_ex__ on the class, so copying an object gives it its
+    # own attributes first
+    materialize(obj)
+    return obj.__reduce_ex__(protocol)
+
+
+def _shell_record_change(obj, attr):
+    materialize(obj)
+    obj._recordChange(attr)
+
+
+def shell_class(cls):
+    """
+    The subclass an object of a game made from a prototype is given, until it has
+    its own copy of its prototype's attributes. It has the same name as `cls`.
+    """
+    try:
+        return _shell_classes[cls]
+    except KeyError:
+        pass
+    out = _shell_classes[cls] = type(
+        cls.__name__,
+        (cls,),
+        {
+            "__module__": cls.__module__,
+            "__qualname__": cls.__qualname__,
+            "_ifp_class": cls,
+            "__getattribute__": _shell_getattribute,
+            "__setattr__": _shell_setattr,
+            "__delattr__": _shell_delattr,
+            "__reduce_ex__": _shell_reduce_ex,
+            "_recordChange": _shell_record_change,
+        },
+    )
+    _shell_types.add(out)
+    return out
+
+
+def materialize(obj):
+    """
+    Give a copy on write object its own copy of its prototype's attributes, and put
+    back its class, or its tracked class, if the game is tracking changes. Attributes
+    the object already has a copy of are kept.
+    """
+    attributes = _object_getattribute(obj, "__dict__")
+    prototype = attributes.pop("_prototype")
+    del attributes["_prototype_reads"]
+    memo = attributes["game"].prototype.memo
+    own = dict(attributes)
+    attributes.clear()
+    for attr, value in prototype.__dict__.items():
+        if attr in own:
+            attributes[attr] = own.pop(attr)
+        else:
+            attributes[attr] = fork_value(value, memo)
+    attributes.update(own)
+    _object_setattr(obj, "__class__", type(obj)._ifp_class)
+    changes = attributes["game"].changes
+    if changes is not None:
+        changes.track(obj)
+
+
+class _Memo(dict):
+    """
+    The memo values are copied from the prototype with, by fork_value and
+    copy.deepcopy. The prototype's objects are looked up by id, and mapped to the
+    game's objects, without being added to the memo.
+    """
+
+    def __init__(self, positions, objects, items):
+        super().__init__(items)
+        self.positions = positions
+        self.objects = objects
+
+    def get(self, key, default=None):
+        out = dict.get(self, key, self)
+        if out is not self:
+            return out
+        position = self.positions.get(key)
+        if position is None:
+            return default
+        return self.objects[position]
+
+
+class Prototype:
+    """
+    A built world that many games can be made from, sharing the attributes of the
+    objects they have not changed. See the top of this module.
+
+    :param game: the game to make the prototype from. Its world must be built, and
+        its initGame called. It must not be played, or changed, once the prototype
+        has been made. Its baseline is taken, if it does not have one.
+    :type game: IFPGame
+    """
+
+    def __init__(self, game):
+        if game.prototype is not None:
+            raise ValueError("Cannot make a prototype from a game made from one")
+        if game.deferred is not None:
+            game.deferred.decodeAll()
+        if game.baseline is None:
+            # the games made from the prototype make delta saves, which evicted
+            # games are written as (see eviction.py). Only the prototype's game
+            # keeps the copy of the world the baseline takes
+            game.takeBaseline()
+        self.game = game
+        self.objects = list(game.ifp_objects.values())
+        # maps the id of each object to its position in self.objects
+        self.positions = {id(obj): i for i, obj in enumerate(self.objects)}
+        # the ixs of the objects that have changed since the baseline was taken, for
+        # instance in the game's opening turn
+        self.changed = frozenset(
+            game.baseline.changed_objects() if game.baseline is not None else ()
+        )
+
+    def __len__(self):
+        return len(self.objects)
+
+    def instantiate(self, app):
+        """
+        Make a new game from the prototype, with its own copy on write objects, that
+        can be played without affecting the prototype or any other game made from
+        it. The game tracks changes, and keeps undo history, if the prototype's game
+        does.
+
+        :param app: the app for the new game
+        :rtype: IFPGame
+        """
+        world = self.game
+        game = object.__new__(type(world))
+        objects = []
+        memo = _Memo(
+            self.positions,
+            objects,
+            {id(world): game, id(world.app): app, id(world.main): world.main},
+        )
+        if world._verbs is not None:
+            # the base verb set is shared by every game
+            memo[id(world._verbs._base)] = world._verbs._base
+        with paused_gc():
+            for obj in self.objects:
+                shell = object.__new__(shell_class(untracked_class(type(obj))))
+                _object_setattr(
+                    shell,
+                    "__dict__",
+                    {"game": game, "_prototype": obj, "_prototype_reads": 0},
+                )
+                objects.append(shell)
+            game.__dict__.update(
+                fork_value(
+                    {
+                        attr: value
+                        for attr, value in world.__dict__.items()
+                        if attr not in UNCOPIED_ATTRIBUTES
+                    },
+                    memo,
+                )
+            )
+        game.app = app
+        app.game = game
+        game.main = world.main
+        game.changes = None
+        game.saves = None
+        game.failed_saves = deque()
+        game.autosave = None
+        game.deferred = None
+        game._last_snapshot = None
+        game.prototype = PrototypeCopy(self, game, objects, memo)
+        game.baseline = PrototypeBaseline(game) if world.baseline is not None else None
+        game.parser.scope.invalidate()
+        if world.changes is not None:
+            journal = world.changes.journal
+            if journal is not None:
+                game.enableUndo(journal.max_turns, journal.max_size)
+            else:
+                game.trackChanges()
+        return game
+
+
+class PrototypeCopy:
+    """
+    A game's copy of a Prototype: the game's objects in place of the prototype's,
+    and the memo values are copied from the prototype with.
+
+    Created by Prototype.instantiate as game.prototype.
+    """
+
+    def __init__(self, prototype, game, objects, memo):
+        self.prototype = prototype
+        self.game = game
+        # the game's object in place of each of the prototype's objects
+        self.objects = objects
+        self.memo = memo
+
+    def materialized(self):
+        """
+        The number of the game's objects that have their own copy of their
+        prototype's attributes
+        """
+        return sum(1 for obj in self.objects if not is_shell(obj))
+
+    def materializeAll(self):
+        """Give every object its own copy of its prototype's attributes"""
+        for obj in self.objects:
+            if is_shell(obj):
+                materialize(obj)
+
+
+class _CopiedMap(Mapping):
+    """
+    A map from the prototype's baseline, whose values are copied for the game each
+    time they are looked up
+    """
+
+    def __init__(self, base, memo):
+        self.base = base
+        self.memo = memo
+
+    def __getitem__(self, key):
+        return fork_value(self.base[key], self.memo)
+
+    def __iter__(self):
+        return iter(self.base)
+
+    def __len__(self):
+        return len(self.base)
+
+
+class PrototypeBaseline(Baseline):
+    """
+    The baseline of a game made from a prototype: the prototype's baseline, with the
+    game's objects in place of the prototype's. Nothing is copied until it is
+    looked up, and the objects that have not been given their own attributes are
+    compared with the baseline through the prototype.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        base = game.prototype.prototype.game.baseline
+        memo = game.prototype.memo
+        self.attributes = _CopiedMap(base.attributes, memo)
+        self.locations = _CopiedMap(base.locations, memo)
+
+    def changed_objects(self):
+        attributes = self.attributes
+        # an object that has not been given its own attributes is as its prototype
+        # is
+        changed = self.game.prototype.prototype.changed
+        out = {}
+        for ix, obj in self.game.ifp_objects.items():
+            if is_shell(obj):
+                if ix in changed:
+                    out[ix] = obj
+            elif obj.__dict__ != attributes.get(ix):
+                out[ix] = obj
+        return out
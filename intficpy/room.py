@@ -1,7 +1,7 @@
 from .physical_entity import PhysicalEntity
 from .ifp_object import IFPObject
 from .thing_base import Thing
-from .things import Container, LightSource, Unremarkable
+from .things import Container, Unremarkable
 
 ##############################################################
 # ROOM.PY - verbs for IntFicPy
@@ -174,29 +174,15 @@ class Room(PhysicalEntity):
     def resolveDarkness(self, game):
         """
         Determine if the player can see, based on this Room's `dark` attribute, and
-        whether there is a lit LightSource present
+        whether there is a lit LightSource present in the Room or carried by the
+        player, including inside open or transparent containers
 
         :param game: the current game
         :type game: IFPGame
         """
-        can_see = True
-        if self.dark:
-            lightsource = None
-            for key in self.contains:
-                for item in self.contains[key]:
-                    if isinstance(item, LightSource):
-                        if item.is_lit:
-                            lightsource = item
-                            break
-            for key in game.me.contains:
-                for item in game.me.contains[key]:
-                    if isinstance(item, LightSource):
-                        if item.is_lit:
-                            lightsource = item
-                            break
-            if not lightsource:
-                can_see = False
-        return can_see
+        if not self.dark:
+            return True
+        return bool(self.lit_count or game.me.lit_count)
 
     def describeDark(self, game):
         """
@@ -214,23 +200,13 @@ class Room(PhysicalEntity):
         if not self.dark:
             return False
 
-        lightsource = (
-            (
-                [
-                    item
-                    for key, sublist in self.contains.items()
-                    for item in sublist
-                    if getattr(item, "is_lit", False)
-                ]
-                + [
-                    item
-                    for key, sublist in game.me.contains.items()
-                    for item in sublist
-                    if getattr(item, "is_lit", False)
-                ]
+        lightsource = None
+        if self.resolveDarkness(game):
+            lightsource = next(
+                item
+                for item in self.contentsList + game.me.contentsList
+                if getattr(item, "is_lit", False)
             )
-            or [None]
-        )[0]
 
         if lightsource:
             game.addTextToEvent("turn", lightsource.room_lit_msg)
@@ -507,6 +483,7 @@ class RoomGroup(IFPObject):
         :param member: the Room or OutdoorRoom to add to this RoomGroup
         :type member: Room
         """
+        self._recordChange("members")
         self.members.append(member)
         if self.ceiling:
             member.ceiling.setFromPrototype(self.ceiling)
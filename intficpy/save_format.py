@@ -0,0 +1,303 @@
+import gc
+import marshal
+import mmap
+import struct
+import zlib
+from contextlib import contextmanager
+
+from .exceptions import DeserializationError
+
+##############################################################
+# SAVE_FORMAT.PY - the compact binary save file format for IntFicPy
+# Encodes and decodes the data built by SaveGame, and read by LoadGame
+##############################################################
+#
+# A binary save file is laid out as
+#
+#   MAGIC         6 bytes
+#   VERSION       1 byte
+#   blocks        the saved attributes of each object, one after another
+#   index         marshal (version 4) encoding of a tuple
+#                 (object_ixs, shapes, entries, data)
+#   INDEX_TRAILER the offset and length of the index, and the crc32 of the blocks
+#                 and index
+#
+# The trailer comes last so that the file can be written in one pass, one block at
+# a time, as the objects are serialized (see `iter_encode`), even into a
+# compressed stream (see compression.py).
+#
+# object_ixs is a list of the ix of every IFPObject in the game when it was saved.
+# Each block is the marshal encoding of the list of an object's saved attribute
+# values (from the "ifp_objects" section of the save data), and can be decoded on
+# its own. The names of the attributes are stored once in the index, in shapes,
+# since objects of the same class usually have the same attribute names. entries
+# maps the ix of each object to (offset, length, shape, eager) for its block, where
+# shape is the position of its attribute names in shapes, and eager holds the
+# attributes that are stored in the index itself, rather than in the block (see
+# `encode`), or is None. The rest of the save data is stored in the index as data.
+#
+# A reference to an IFPObject is stored as a tuple holding the object's integer
+# id, its index in object_ixs. The serializer never produces tuples otherwise.
+# Strings are interned by the serializer before encoding, so each distinct string
+# (attribute names, nouns, descriptions) is written once in each block, and once in
+# the index, and referred to by index in marshal's reference table after that.
+# Lists, dicts, numbers, booleans and None use marshal's own typed encodings.
+#
+# marshal is implemented in C, so this is much quicker to write and read than the
+# ASCII pickle format, and unlike pickle, loading it can never run code. Since the
+# index says where each block is, LoadGame can read the index of a large save
+# through mmap, and leave each block until the object's attributes are needed.
+
+MAGIC = b"IFPSAV"
+VERSION = 3
+MARSHAL_VERSION = 4
+HEADER_SIZE = len(MAGIC) + 1
+INDEX_TRAILER = struct.Struct("<QQI")
+
+# the other values, besides lists, dicts, strings and object references, that can be
+# stored in a binary save file
+STORABLE_TYPES = (int, float, complex, bool, type(None))
+
+
+@contextmanager
+def paused_gc():
+    """
+    Pause the cyclic garbage collector while building or decoding save data.
+    Creating many containers at once otherwise triggers repeated full
+    collections, which can take longer than the work itself.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def is_binary_save(header):
+    """
+    Return True if `header`, the first bytes of a save file, marks it as a binary
+    save file
+    """
+    return header[: len(MAGIC)] == MAGIC
+
+
+def is_current_save(header):
+    """
+    Return True if `header`, the first bytes of a save file, marks it as a binary
+    save file of the current version, whose blocks can be decoded one at a time
+    """
+    version = header[len(MAGIC) : len(MAGIC) + 1]
+    return is_binary_save(header) and version == bytes([VERSION])
+
+
+def encode(data, object_ixs, eager=()):
+    """
+    Encode save data as bytes
+
+    :param data: the save data, with references to IFPObjects stored as integer id
+        tuples
+    :param object_ixs: the ix of each object, in integer id order
+    :type object_ixs: list of str
+    :param eager: the names of attributes to store in the index, rather than in
+        each object's block, so that they can be read without decoding the block
+    :type eager: frozenset of str
+    :rtype: bytes
+    """
+    return b"".join(iter_encode(data, object_ixs, eager))
+
+
+def iter_encode(data, object_ixs, eager=(), objects=None):
+    """
+    Encode save data in pieces: the header, then each object's block as it is
+    encoded, then the index and trailer. The whole file is never held in memory.
+
+    :param objects: the (ix, attributes) pairs for the "ifp_objects" section, if
+        they are to be serialized as they are encoded, rather than taken from
+        `data`. References to IFPObjects found while serializing them can still be
+        added to `object_ixs`, since it is encoded last.
+    :type objects: iterable of tuple
+    :returns: the encoded file, in pieces
+    :rtype: iterator of bytes
+    """
+    yield MAGIC + bytes([VERSION])
+    crc = 0
+    shapes = []
+    entries = None
+    offset = HEADER_SIZE
+    if objects is None and isinstance(data, dict) and "ifp_objects" in data:
+        objects = data["ifp_objects"].items()
+    if objects is not None:
+        shape_ids = {}
+        entries = {}
+        for ix, attrs in objects:
+            eager_attrs = None
+            if eager and not eager.isdisjoint(attrs):
+                eager_attrs = {}
+                block_attrs = {}
+                for attr, value in attrs.items():
+                    if attr in eager:
+                        eager_attrs[attr] = value
+                    else:
+                        block_attrs[attr] = value
+                attrs = block_attrs
+            names = tuple(attrs)
+            shape = shape_ids.get(names)
+            if shape is None:
+                shape = shape_ids[names] = len(shapes)
+                shapes.append(names)
+            block = marshal.dumps(list(attrs.values()), MARSHAL_VERSION)
+            entries[ix] = (offset, len(block), shape, eager_attrs)
+            offset += len(block)
+            crc = zlib.crc32(block, crc)
+            yield block
+        # the object blocks are stored in place of the "ifp_objects" section
+        data = dict(data, ifp_objects=None)
+    index = marshal.dumps((object_ixs, shapes, entries, data), MARSHAL_VERSION)
+    yield index
+    yield INDEX_TRAILER.pack(offset, len(index), zlib.crc32(index, crc))
+
+
+def decode(raw):
+    """
+    Decode save data encoded by `encode`, including every object's block
+
+    :param raw: the contents of the save file
+    :type raw: bytes
+    :returns: the object ixs, and the save data
+    :rtype: tuple
+    """
+    if not is_binary_save(raw):
+        raise DeserializationError("Not a binary save file")
+    version = raw[len(MAGIC)] if len(raw) > len(MAGIC) else None
+    if version != VERSION:
+        raise DeserializationError(f"Unsupported save file version {version}")
+    check(raw)
+    object_ixs, shapes, entries, data = read_index(raw)
+    if entries is not None:
+        data["ifp_objects"] = {
+            ix: read_block(raw, entry, shapes) for ix, entry in entries.items()
+        }
+    return object_ixs, data
+
+
+def check(raw):
+    """
+    Check the crc32 of an indexed save file, so that damage to a block is found
+    before the block is needed. Raises DeserializationError if the file is damaged.
+
+    :param raw: the contents of the save file, or a mmap of it
+    """
+    crc = _read_trailer(raw)[2]
+    with memoryview(raw) as view, view[HEADER_SIZE : -INDEX_TRAILER.size] as body:
+        if zlib.crc32(body) != crc:
+            raise DeserializationError("Save file is damaged")
+
+
+def _read_trailer(raw):
+    end = len(raw) - INDEX_TRAILER.size
+    if end < HEADER_SIZE:
+        raise DeserializationError("Save file is damaged")
+    offset, length, crc = INDEX_TRAILER.unpack_from(raw, end)
+    if offset < HEADER_SIZE or offset + length != end:
+        raise DeserializationError("Save file is damaged")
+    return offset, length, crc
+
+
+def read_index(raw):
+    """
+    Decode the index of an indexed save file
+
+    :param raw: the contents of the save file, or a mmap of it
+    :returns: the object ixs, attribute names, block entries and save data
+    :rtype: tuple
+    """
+    offset, length, crc = _read_trailer(raw)
+    try:
+        object_ixs, shapes, entries, data = marshal.loads(raw[offset : offset + length])
+    except (EOFError, ValueError, TypeError) as e:
+        raise DeserializationError("Save file is damaged") from e
+    return object_ixs, shapes, entries, data
+
+
+def read_block(raw, entry, shapes):
+    """
+    Decode the block holding one object's attributes
+
+    :param raw: the contents of the save file, or a mmap of it
+    :param entry: the object's entry in the index
+    :type entry: tuple
+    :param shapes: the attribute names from the index
+    :rtype: dict
+    """
+    offset, length, shape, eager = entry
+    try:
+        attributes = dict(
+            zip(shapes[shape], marshal.loads(raw[offset : offset + length]))
+        )
+    except (EOFError, ValueError, TypeError, IndexError) as e:
+        raise DeserializationError("Save file is damaged") from e
+    if eager:
+        attributes.update(eager)
+    return attributes
+
+
+class SaveFileMap:
+    """
+    An indexed binary save file, read through mmap. The index is decoded when the
+    file is opened, and each object's block is only read from the file, and decoded,
+    by `read`. If the contents of the file have already been read, for instance
+    from a compressed save file, pass them as `raw`, and the file is not opened.
+
+    Raises DeserializationError if the file is not a binary save file of the
+    current version, or its index is damaged.
+    """
+
+    def __init__(self, path, raw=None):
+        if raw is not None:
+            self.map = raw
+        else:
+            with open(path, "rb") as f:
+                try:
+                    self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError as e:
+                    # an empty file cannot be mapped
+                    raise DeserializationError("Save file is damaged") from e
+        try:
+            if not is_current_save(self.map[:HEADER_SIZE]):
+                raise DeserializationError("Not a binary save file of this version")
+            self.object_ixs, self.shapes, self.entries, self.data = read_index(
+                self.map
+            )
+        except DeserializationError:
+            self.close()
+            raise
+
+    def check(self):
+        """
+        Check that no part of the file is damaged. See `check`.
+        """
+        check(self.map)
+
+    def names(self, ix):
+        """
+        The names of the attributes stored in an object's block
+
+        :rtype: tuple of str
+        """
+        return self.shapes[self.entries[ix][2]]
+
+    def read(self, ix):
+        """
+        Decode the attributes saved for an object, leaving out the ones stored in the
+        index
+
+        :rtype: dict
+        """
+        offset, length, shape, eager = self.entries[ix]
+        return read_block(self.map, (offset, length, shape, None), self.shapes)
+
+    def close(self):
+        if isinstance(self.map, mmap.mmap):
+            self.map.close()
@@ -0,0 +1,99 @@
+import queue
+import threading
+import traceback
+
+##############################################################
+# SAVE_WRITER.PY - background saving for IntFicPy
+# Defines the SaveWriter class, which writes save files on a worker thread, so
+# that saving does not hold up the next turn
+##############################################################
+
+# the number of saves that can wait to be written
+SAVE_QUEUE_SIZE = 2
+
+
+class SaveWriter:
+    """
+    Writes SaveGames on a worker thread.
+
+    The game copies its state into a SaveGame created with `write=False` during the
+    turn, which is quick, and submits it. The worker encodes the copy, writes it to
+    a temporary file, flushes it to disk, and moves it over the save file.
+
+    At most `max_pending` saves can wait to be written. `submit` turns away saves
+    beyond that, rather than letting them pile up behind a slow disk.
+
+    Created by IFPGame.saveInBackground.
+    """
+
+    def __init__(self, max_pending=SAVE_QUEUE_SIZE):
+        self.queue = queue.Queue(max_pending)
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, save, callback=None, block=False):
+        """
+        Queue a save to be written
+
+        :param save: the save, created with `write=False`
+        :type save: SaveGame
+        :param callback: called on the worker thread once the save has been written,
+            as callback(save, error), where error is the exception that stopped the
+            save being written, or None
+        :param block: wait for room in the queue, rather than turning the save away
+        :type block: bool
+        :returns: False if too many saves are already waiting to be written
+        :rtype: bool
+        """
+        with self._lock:
+            if self.thread is None:
+                # a daemon thread, so that a save in progress does not keep the
+                # interpreter running. An interrupted save leaves the previous file.
+                self.thread = threading.Thread(
+                    target=self._run, name="intficpy-save-writer", daemon=True
+                )
+                self.thread.start()
+        try:
+            self.queue.put((save, callback), block=block)
+        except queue.Full:
+            return False
+        return True
+
+    def wait(self):
+        """
+        Wait until every queued save has been written
+        """
+        self.queue.join()
+
+    def close(self):
+        """
+        Write the queued saves, and stop the worker thread
+        """
+        with self._lock:
+            thread = self.thread
+            self.thread = None
+        if thread is None:
+            return
+        self.queue.put((None, None))
+        thread.join()
+
+    def _run(self):
+        while True:
+            save, callback = self.queue.get()
+            try:
+                if save is None:
+                    return
+                try:
+                    save.write()
+                except Exception as e:
+                    error = e
+                else:
+                    error = None
+                if callback is not None:
+                    try:
+                        callback(save, error)
+                    except Exception:
+                        # keep the worker running for the saves that follow
+                        traceback.print_exc()
+            finally:
+                self.queue.task_done()
@@ -0,0 +1,121 @@
+##############################################################
+# SCOPE.PY - object scope resolution for IntFicPy
+# Defines the ScopeResolver class, used by the parser to answer range questions
+##############################################################
+
+
+class ScopeResolver:
+    """
+    Caches what the player can reach, so the parser can check the range of many
+    candidate Things cheaply.
+
+    The room, inventory, worn and known sets are computed at most once per turn, and
+    recomputed whenever the game's `containment_epoch` changes (any time a Thing is
+    moved, revealed, hidden, or worn), or its `knowledge_epoch` changes (any time a
+    Thing is made known). Code that edits the player's `knows_about` list in place,
+    rather than through Thing.makeKnown, must increment `game.knowledge_epoch`.
+    Darkness is not cached, since authors may change a Room's `dark` attribute at
+    any time.
+
+    :param game: the current game
+    :type game: IFPGame
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self._key = None
+        self._out_loc = None
+        self._room = frozenset()
+        self._inventory = frozenset()
+        self._worn = frozenset()
+        self._known = frozenset()
+
+    def invalidate(self):
+        """
+        Force the sets to be recomputed on next use
+        """
+        self._key = None
+
+    def _refresh(self):
+        me = self.game.me
+        key = (
+            self.game.containment_epoch,
+            self.game.parser.turns,
+            self.game.knowledge_epoch,
+            id(me),
+            id(me.knows_about),
+        )
+        if key == self._key:
+            return
+        self._key = key
+
+        self._out_loc = me.getOutermostLocation()
+        self._inventory = self._idSet(me)
+        self._room = self._idSet(self._out_loc) if self._out_loc else frozenset()
+        self._worn = frozenset(
+            id(item) for sublist in me.wearing.values() for item in sublist
+        )
+        self._known = frozenset(me.knows_about)
+
+    @staticmethod
+    def _idSet(entity):
+        return frozenset(
+            [id(item) for sublist in entity.contains.values() for item in sublist]
+            + [id(item) for sublist in entity.sub_contains.values() for item in sublist]
+        )
+
+    @property
+    def out_loc(self):
+        """
+        The outermost location of the player
+        """
+        self._refresh()
+        return self._out_loc
+
+    def canSee(self):
+        """
+        Return True if the player's outermost location is not dark
+        """
+        self._refresh()
+        return bool(self._out_loc) and self._out_loc.resolveDarkness(self.game)
+
+    def inRoom(self, thing):
+        """
+        Return True if the Thing is visible in the current room, but not carried
+        """
+        self._refresh()
+        return (
+            id(thing) in self._room
+            and id(thing) not in self._inventory
+            and self.canSee()
+        )
+
+    def isNear(self, thing):
+        """
+        Return True if the Thing is carried, or visible in the current room
+        """
+        self._refresh()
+        if id(thing) in self._inventory:
+            return True
+        return id(thing) in self._room and self.canSee()
+
+    def inInventory(self, thing):
+        """
+        Return True if the Thing is carried by the player, at any level
+        """
+        self._refresh()
+        return id(thing) in self._inventory
+
+    def isWorn(self, thing):
+        """
+        Return True if the Thing is being worn by the player
+        """
+        self._refresh()
+        return id(thing) in self._worn
+
+    def isKnown(self, thing):
+        """
+        Return True if the player knows about the Thing
+        """
+        self._refresh()
+        return thing.known_ix in self._known
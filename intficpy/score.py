@@ -26,8 +26,10 @@ class Achievement(IFPObject):
                 + " points for "
                 + self.desc,
             )
+            self.game.score._recordChange("achievements")
             self.game.score.achievements.append(self)
             self.game.score.total += self.points
+            self.game.hints.requirementChanged(self)
 
 
 class AbstractScore(IFPObject):
@@ -76,41 +78,95 @@ class Ending(IFPObject):
 
 
 class HintSystem(IFPObject):
+    """
+    Tracks the current hint node, and the pending nodes that will open once their
+    requirements are met.
+
+    Pending nodes are not polled. Each pending node is registered as a dependent of
+    the nodes and achievements it requires, and is only re-checked (by the pending
+    daemon, at the end of the turn) when one of those is completed or awarded. The
+    pending daemon is only active while there are nodes to re-check.
+    """
+
     def __init__(self, game):
         super().__init__(game)
         self.cur_node = None
         self.stack = []
         self.pending = []
-        self.has_pending_daemon = False
+        # pending nodes to re-check at the end of the turn
+        self.changed = []
+        # maps the ix of each required HintNode or Achievement to the pending nodes
+        # that depend on it
+        self.dependents = {}
         self.pending_daemon = Daemon(self.game, self.checkPending)
 
     def addPending(self, game, node):
-        if node not in self.pending:
-            self.pending.append(node)
-        if self.pending and not self.has_pending_daemon:
-
-            self.has_pending_daemon = True
-            if not self.pending_daemon in game.daemons.active:
-                game.daemons.add(self.pending_daemon)
+        """
+        Add a node to open as soon as its requirements are met. The node is checked
+        at the end of the current turn, and after that, only when one of its
+        requirements changes.
+        """
+        self._wait(node)
+        self._markChanged(node)
+
+    def requirementChanged(self, requirement):
+        """
+        A HintNode has been completed (or reopened), or an Achievement awarded.
+        Re-check the pending nodes that depend on it at the end of the turn.
+
+        :param requirement: the node or achievement that changed
+        :type requirement: HintNode or Achievement
+        """
+        for node in self.dependents.get(requirement.ix, ()):
+            self._markChanged(node)
 
     def checkPending(self, game):
-        if self.pending:
-            remove_nodes = []
-            for node in self.pending:
-                if not node.checkRequiredIncomplete():
-                    remove_nodes.append(node)
-                    node.complete = True  # not sure about this
-                elif self.setNode(game, node):
-                    remove_nodes.append(node)
-            for node in remove_nodes:
-                self.pending.remove(node)
+        changed = self.changed
+        self.changed = []
+        for node in changed:
+            if node not in self.pending:
+                continue
+            if not node.checkRequiredIncomplete():
+                self._stopWaiting(node)
+                node.complete = True  # not sure about this
+            elif node.checkRequiredComplete():
+                self._stopWaiting(node)
+                self.setNode(game, node)
+        if not self.changed:
+            game.daemons.remove(self.pending_daemon)
+
+    def _wait(self, node):
+        if node in self.pending:
+            return
+        self._recordChange("pending")
+        self._recordChange("dependents")
+        self.pending.append(node)
+        for requirement in node.requirements:
+            self.dependents.setdefault(requirement.ix, []).append(node)
+
+    def _stopWaiting(self, node):
+        self._recordChange("pending")
+        self._recordChange("dependents")
+        self.pending.remove(node)
+        for requirement in node.requirements:
+            waiting = self.dependents.get(requirement.ix, [])
+            if node in waiting:
+                waiting.remove(node)
+            if not waiting:
+                self.dependents.pop(requirement.ix, None)
+
+    def _markChanged(self, node):
+        if node not in self.changed:
+            self._recordChange("changed")
+            self.changed.append(node)
+        if self.pending_daemon not in self.game.daemons:
+            self.game.daemons.add(self.pending_daemon)
 
     def setNextNodeFrom(self, game, node):
         x = node
         if not x:
             return False
-        nodes_checked = []  # record checked nodes to prevent an infinite loop
-        nodes_checked.append(x)
+        nodes_checked = {x}  # record checked nodes to prevent an infinite loop
         while x:
             if not isinstance(x, HintNode):
                 raise ValueError(f"{x} is not a HintNode - cannot use as current hint ")
@@ -118,20 +174,22 @@ class HintSystem(IFPObject):
                 if not x.checkRequiredIncomplete():
                     x.complete = True  # not sure
                     if x in self.stack:
+                        self._recordChange("stack")
                         self.stack.remove(x)
                     return False
                 if not x.checkRequiredComplete():
-                    self.addPending(game, x)
+                    self._wait(x)
                     return False
                 else:
                     if x not in self.stack:
+                        self._recordChange("stack")
                         self.stack.append(x)
                     self.cur_node = x
                     return True
             x = x.next_node
             if x in nodes_checked:
                 break
-            nodes_checked.append(x)
+            nodes_checked.add(x)
         return False
 
     def setNode(self, game, node):
@@ -146,6 +204,7 @@ class HintSystem(IFPObject):
     def closeNode(self, game, node):
         node.complete = True
         if node in self.stack:
+            self._recordChange("stack")
             self.stack.remove(node)
         return self.setNode(game, node)
 
@@ -177,7 +236,7 @@ class HintNode(IFPObject):
         self.cur_hint = 0
         self.hints = []
         self.next_node = None
-        self.complete = False
+        self._complete = False
         for x in hints:
             if not isinstance(x, Hint):
                 raise ValueError(f"{x} is not a HintNode - cannot add to HintNode")
@@ -185,14 +244,42 @@ class HintNode(IFPObject):
         # nodes that must be complete/incomplete in order to open node
         self.open_require_nodes_complete = []
         self.open_require_nodes_incomplete = []
+        # achievements that must be awarded in order to open node
+        self.open_require_achievements = []
+
+    @property
+    def complete(self):
+        return self._complete
+
+    @complete.setter
+    def complete(self, value):
+        changed = bool(value) != bool(self._complete)
+        self._complete = value
+        if changed:
+            self.game.hints.requirementChanged(self)
+
+    @property
+    def requirements(self):
+        """
+        The nodes and achievements that this node depends on to open
+        """
+        return (
+            self.open_require_nodes_complete
+            + self.open_require_nodes_incomplete
+            + self.open_require_achievements
+        )
 
     def checkRequiredComplete(self):
         if self.open_require_nodes_complete:
             nodes_complete = [
                 item.complete for item in self.open_require_nodes_complete
             ]
-            return all(nodes_complete)
-        return True
+            if not all(nodes_complete):
+                return False
+        return all(
+            achievement in self.game.score.achievements
+            for achievement in self.open_require_achievements
+        )
 
     def checkRequiredIncomplete(self):
         if self.open_require_nodes_incomplete:
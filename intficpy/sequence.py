@@ -73,6 +73,7 @@ class Sequence(IFPObject):
             self.sequence.play()
 
         def submit(self):
+            self.sequence._recordChange("data")
             self.sequence.data[self.save_key] = self.answer
             self._submitted = True
             self.sequence.play()
@@ -100,6 +101,7 @@ class Sequence(IFPObject):
             self.sequence = None
 
         def read(self, *args, **kwargs):
+            self.sequence._recordChange("data")
             self.sequence.data[self.save_key] = self.value
 
     class Label(ControlItem):
@@ -186,6 +188,7 @@ class Sequence(IFPObject):
             # self.next(event)
             return self.handle_node_complete(event)
 
+        self._recordChange("position")
         self.position[-1] += 1
 
         return self.play(event)
@@ -240,6 +243,7 @@ class Sequence(IFPObject):
                 ix = int(tokens[0]) - 1
             except ValueError:
                 pass
+        self._recordChange("position")
         if ix is not None and ix < len(self.options):
             self.position += [self.options[ix], 0]
         else:
@@ -315,6 +319,7 @@ class Sequence(IFPObject):
     def _iterate(self):
         if self.node_ended:
             return self._NodeComplete()
+        self._recordChange("position")
         self.position[-1] += 1
 
     def _parse_template_node(self, node, stack=None):
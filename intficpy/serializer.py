@@ -1,8 +1,14 @@
 import os
 import pickle
+import tempfile
 import types
 
+from . import save_format as binary_save
+from .compression import CODECS, CompressedWriter, is_compressed_save, read_compressed
+from .baseline import copy_value
 from .ifp_object import IFPObject
+from .physical_entity import PhysicalEntity
+from .prototype import is_shell, materialize
 from .exceptions import DeserializationError, Unserializable
 
 ##############################################################
@@ -12,37 +18,227 @@ from .exceptions import DeserializationError, Unserializable
 # TODO: do not load bad save files. create a back up of game state before attempting to load, and restore in the event of an error AT ANY POINT during loading
 
 
+BINARY = "binary"
+PICKLE = "pickle"
+SAVE_FORMATS = (BINARY, PICKLE)
+
+# attributes that are not saved. contains is handled in the location section, and
+# the indexes are rebuilt on load
+SKIPPED_ATTRIBUTES = frozenset(
+    ["contains", "sub_contains", "_sub_contains", "_lit_count"]
+)
+# attributes stored in the index of a binary save file, rather than with the rest
+# of an object's attributes, so that they are loaded straight away when the rest
+# are decoded lazily. The adjective index, and nested contents and lit counts, are
+# built from them
+EAGER_ATTRIBUTES = frozenset(["adjectives", "_revealed", "_is_lit"])
+# types that are saved as they are
+UNCHANGED_TYPES = frozenset([int, float, bool, type(None)])
+# the value of an attribute an object does not have
+_MISSING = object()
+
+
+def sync_directory(directory):
+    """
+    Flush a directory entry to disk, so that a file moved into it survives a crash.
+    Not all platforms support this; where they do not, this does nothing.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 class SaveGame:
-    def __init__(self, game, filename):
+    """
+    Save the game to a file.
+
+    By default, games are saved in the compact binary format defined in
+    save_format.py. Pass `save_format=PICKLE` to write the older pickle based
+    format instead. LoadGame can read either.
+
+    If the game has a baseline (see IFPGame.takeBaseline), only the objects,
+    attributes and locations that have changed since the baseline was taken are
+    saved. Pass `delta=False` to save everything.
+
+    The state of the game is copied when the SaveGame is created, and serialized
+    and written by `write`. Pass `write=False` to only take the copy, and call
+    `write` later, for instance from a SaveWriter thread (see save_writer.py). The
+    file is replaced atomically, so a save that fails part way through leaves the
+    previous file as it was.
+
+    Pass `compression=ZLIB` or `compression=LZMA` to compress the file as it is
+    written (see compression.py). LoadGame detects compressed files.
+    """
+
+    def __init__(
+        self,
+        game,
+        filename,
+        save_format=BINARY,
+        delta=True,
+        write=True,
+        compression=None,
+    ):
+        if save_format not in SAVE_FORMATS:
+            raise ValueError(f"Unknown save format {save_format}")
+        if compression is not None and compression not in CODECS:
+            raise ValueError(f"Unknown compression {compression}")
         self.game = game
         self.filename = self.create_save_file_path(filename)
-        self.data = {
-            "ifp_objects": self.save_ifp_objects(),
-            "locations": self.save_locations(),
-            "active_sequence": self.serialize_attribute(
+        self.save_format = save_format
+        self.compression = compression
+        self.baseline = game.baseline if delta else None
+        if save_format == BINARY:
+            # integer object ids, and interned strings, for the binary format
+            self.object_ixs = []
+            self.references = {}
+            self.strings = {}
+        with binary_save.paused_gc():
+            # copy the state of the game. Serializing the copy is left to write
+            self.attributes = self.copy_ifp_objects()
+            self.locations = self.save_locations()
+            self.active_sequence = self.serialize_attribute(
                 game.parser.previous_command.sequence
-            ),
+            )
+        if write:
+            self.write()
+
+    def write(self):
+        """
+        Serialize and encode the copy of the game state, and write it to the save
+        file. Does not use the game, so can be called from another thread once the
+        SaveGame has been created.
+
+        In the binary format, each object is serialized and encoded as it is
+        written, so the serialized save data is never held in memory all at once.
+
+        The data is written to a temporary file in the same directory, flushed to
+        disk, then moved over the save file.
+        """
+        directory, name = os.path.split(self.filename)
+        fd, temp_path = tempfile.mkstemp(prefix=f".{name}.", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                out = f
+                if self.compression is not None:
+                    out = CompressedWriter(f, self.compression)
+                with binary_save.paused_gc():
+                    for chunk in self.iter_encoded():
+                        out.write(chunk)
+                if out is not f:
+                    out.close()
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.filename)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        sync_directory(directory)
+
+    def iter_encoded(self):
+        """
+        Serialize the copy of the game state, and encode it in the chosen save
+        format, in pieces
+
+        :rtype: iterator of bytes
+        """
+        data = {
+            "ifp_objects": None,
+            "locations": self.locations,
+            "active_sequence": self.active_sequence,
+        }
+        if self.baseline is not None:
+            # the number of objects in the baseline the save is relative to
+            data["baseline"] = len(self.baseline)
+        if self.save_format == PICKLE:
+            data["ifp_objects"] = self.save_ifp_objects()
+            self.data = data
+            yield self.encode()
+            return
+        yield from binary_save.iter_encode(
+            data, self.object_ixs, EAGER_ATTRIBUTES, objects=self.iter_ifp_objects()
+        )
+
+    def encode(self):
+        """
+        Encode the save data in `data` in the chosen save format
+
+        :rtype: bytes
+        """
+        if self.save_format == PICKLE:
+            return pickle.dumps(self.data, 0)
+        return binary_save.encode(self.data, self.object_ixs, EAGER_ATTRIBUTES)
+
+    def copy_ifp_objects(self):
+        """
+        Copy the attributes to be saved: all attributes of every object, or for a
+        delta save, the attributes that have changed since the baseline
+
+        :returns: a dict mapping the ix of each object to a copy of its attributes
+        :rtype: dict
+        """
+        if self.game.deferred is not None:
+            # attributes still waiting to be decoded from a lazily loaded save
+            self.game.deferred.decodeAll()
+        if self.baseline is None:
+            objects = (
+                (ix, obj.__dict__) for ix, obj in self.game.ifp_objects.items()
+            )
+        else:
+            self.changed = self.baseline.changed_objects()
+            objects = (
+                (ix, self.baseline.changed_attributes(obj))
+                for ix, obj in self.changed.items()
+            )
+        return {
+            ix: {
+                attr: copy_value(value)
+                for attr, value in attributes.items()
+                if attr not in SKIPPED_ATTRIBUTES
+            }
+            for ix, attributes in objects
         }
-        self.file = open(self.filename, "wb+")
-        pickle.dump(self.data, self.file, 0)
-        self.file.close()
 
     def save_ifp_objects(self):
-        out = {}
-        for ix, obj in self.game.ifp_objects.items():
-            out[ix] = self.serialize_ifp_object(obj)
-        return out
+        return dict(self.iter_ifp_objects())
+
+    def iter_ifp_objects(self):
+        """
+        Serialize the copied attributes of each object, one object at a time
+
+        :returns: the ix and serialized attributes of each object
+        :rtype: iterator of tuple
+        """
+        for ix, attributes in self.attributes.items():
+            attributes = self.serialize_ifp_object(None, attributes)
+            if attributes or self.baseline is None:
+                yield self.serialize_string(ix), attributes
 
-    def serialize_ifp_object(self, obj):
+    def serialize_ifp_object(self, obj, attributes=None):
+        """
+        Serialize the attributes of an object. If `attributes` is given, only
+        those attributes are serialized.
+        """
         out = {}
+        if attributes is None:
+            attributes = obj.__dict__
 
-        for attr, value in obj.__dict__.items():
-            if attr in ["contains", "sub_contains"]:
-                # contains is handled in the location section
+        for attr, value in attributes.items():
+            if attr in SKIPPED_ATTRIBUTES:
                 continue
 
             try:
-                out[attr] = self.serialize_attribute(value)
+                out[self.serialize_string(attr)] = self.serialize_attribute(value)
             except Unserializable:
                 pass
 
@@ -53,15 +249,26 @@ class SaveGame:
         Recursively serialize an attribute
         Raises Unserializable in the event of unserializable attribute
         """
+        # fast paths for the most common types
+        kind = type(value)
+        if kind is str:
+            return self.serialize_string(value)
+        if kind in UNCHANGED_TYPES:
+            return value
+        if kind is list:
+            return [self.serialize_attribute(sub_value) for sub_value in value]
+
         if isinstance(value, IFPObject):
-            return f"<IFP>{value.ix}"
+            return self.serialize_reference(value)
 
         if isinstance(value, str):
-            return value
+            return self.serialize_string(value)
 
         try:
             out = {}
             for sub_attr, sub_value in value.items():
+                if isinstance(sub_attr, str):
+                    sub_attr = self.serialize_string(sub_attr)
                 out[sub_attr] = self.serialize_attribute(sub_value)
             return out
 
@@ -84,14 +291,46 @@ class SaveGame:
         ):
             raise Unserializable("Cannot serialize attribute.")
 
+        if self.save_format == BINARY and not isinstance(
+            value, binary_save.STORABLE_TYPES
+        ):
+            raise Unserializable("Cannot serialize attribute.")
+
         return value
 
+    def serialize_reference(self, obj):
+        """
+        A reference to an IFPObject: an "<IFP>ix" string in the pickle format, or
+        a tuple holding the object's integer id in the binary format
+        """
+        if self.save_format == PICKLE:
+            return f"<IFP>{obj.ix}"
+        reference = self.references.get(obj.ix)
+        if reference is None:
+            reference = self.references[obj.ix] = (len(self.object_ixs),)
+            self.object_ixs.append(self.serialize_string(obj.ix))
+        return reference
+
+    def serialize_string(self, value):
+        """
+        Strings are interned for the binary format, so that each distinct string is
+        only written once
+        """
+        if self.save_format == PICKLE:
+            return value
+        return self.strings.setdefault(value, value)
+
     def save_locations(self):
-        top_level_locations = [
-            obj
-            for key, obj in self.game.ifp_objects.items()
-            if obj.is_top_level_location
-        ]
+        if self.baseline is None:
+            top_level_locations = [
+                obj
+                for key, obj in self.game.ifp_objects.items()
+                if obj.is_top_level_location
+            ]
+        else:
+            top_level_locations = self.baseline.changed_locations(
+                self.changed.values()
+            ).values()
         out = {}
         for obj in top_level_locations:
             out[obj.ix] = self.serialize_contains(obj)
@@ -101,13 +340,19 @@ class SaveGame:
         serialized_contents = {}
 
         for key, sublist in obj.contains.items():
+            key = self.serialize_string(key)
             serialized_contents[key] = []
             for item in sublist:
                 serialized_contents[key].append(self.serialize_contains(item))
 
-        return {"ix": obj.ix, "contains": serialized_contents, "placed": False}
+        return {
+            "ix": self.serialize_string(obj.ix),
+            "contains": serialized_contents,
+            "placed": False,
+        }
 
-    def create_save_file_path(self, filename):
+    @staticmethod
+    def create_save_file_path(filename):
         # check if we have a full path
         directory = os.path.join(*os.path.split(filename)[:-1])
 
@@ -126,83 +371,515 @@ class SaveGame:
 
 
 class LoadGame:
-    single_object_keys = ["active_sequence"]
-    allowed_keys = ["ifp_objects", "locations", "active_sequence"]
+    """
+    Load a game from a file saved by SaveGame.
+
+    A delta save is loaded relative to the game's baseline: state the save does not
+    store is set back to its value in the baseline.
+
+    Binary save files are read lazily, unless `lazy=False` is passed: the file is
+    mapped into memory (or, if it is compressed, decompressed), and only its index
+    is decoded until the save is loaded. Loading places everything in its saved
+    location, and sets the attributes in EAGER_ATTRIBUTES, and the attributes each
+    object's class defines, but leaves the rest of each object's saved attributes
+    to be deserialized the first time one of them is used (see deferred.py), so
+    that the time taken to load depends on how much of the world has moved, rather
+    than on its size. The file is closed once the save has been loaded. Saving the
+    game decodes everything still waiting.
+    """
 
-    def __init__(self, game, filename):
+    single_object_keys = ["active_sequence"]
+    allowed_keys = ["ifp_objects", "locations", "active_sequence", "baseline"]
+    # the game's baseline, while a delta save is being loaded
+    baseline = None
+    # the save file, mapped into memory, when it is read lazily. Closed once the
+    # save has been loaded
+    save_map = None
+    # True while the save is being loaded
+    loading = False
+    # the codec the save file was compressed with, if it was
+    compression = None
+
+    def __init__(self, game, filename, lazy=True):
         self.game = game
         self.filename = filename
-        self.file = open(self.filename, "rb")
-        self.data = pickle.load(self.file)
-        self.file.close()
+        with open(self.filename, "rb") as f:
+            raw = f.read(binary_save.HEADER_SIZE)
+            if is_compressed_save(raw):
+                f.seek(0)
+                self.compression, raw = read_compressed(f)
+            elif not (lazy and binary_save.is_current_save(raw)):
+                raw += f.read()
+        if lazy and binary_save.is_current_save(raw):
+            self.save_format = BINARY
+            with binary_save.paused_gc():
+                # an uncompressed file is mapped into memory, rather than read
+                self.save_map = binary_save.SaveFileMap(
+                    self.filename, raw if self.compression else None
+                )
+                self.data = self.decode_index()
+            return
+        self.save_format = BINARY if binary_save.is_binary_save(raw) else PICKLE
+        with binary_save.paused_gc():
+            self.data = self.decode(raw)
+
+    def decode(self, raw):
+        """
+        Decode the contents of a save file, in the format detected from its header
+        """
+        if self.save_format == PICKLE:
+            return pickle.loads(raw)
+        object_ixs, data = binary_save.decode(raw)
+        # the objects referred to by integer id in the save file
+        self.references = [self.game.ifp_objects.get(ix) for ix in object_ixs]
+        return data
+
+    def decode_index(self):
+        """
+        Use the index of a lazily read save file as the save data. The ifp_objects
+        section holds only the attributes stored in the index.
+        """
+        save_map = self.save_map
+        self.references = [self.game.ifp_objects.get(ix) for ix in save_map.object_ixs]
+        data = save_map.data
+        if save_map.entries is not None:
+            data["ifp_objects"] = {
+                ix: entry[3] or {} for ix, entry in save_map.entries.items()
+            }
+        return data
 
     def is_valid(self):
         """
-        Try deserializing the data.
+        Check the save data, deserializing it as it is checked. The deserialized
+        attributes are kept in `staged`, for `load`, so that nothing is
+        deserialized twice.
         On success, return True, and set load_file.validated_data
-        On failure, delete the temporary objects, and return False
+        On failure, return False
+        """
+        try:
+            if self.save_map is not None:
+                # the attribute blocks are not decoded until they are needed, so
+                # the whole file is checked, and every object the blocks refer to
+                # must be in the game
+                self.save_map.check()
+                if None in self.references:
+                    raise DeserializationError("Save refers to an unknown object")
+            with binary_save.paused_gc():
+                self.staged = self.stage(self.data)
+        except (DeserializationError, KeyError, TypeError, AttributeError):
+            return False
+        self.validated_data = self.data
+        return True
+
+    def stage(self, data):
+        """
+        Check and deserialize save data. Locations are only checked, as they refer
+        to objects by ix. Raises DeserializationError if the data cannot be loaded.
+
+        :returns: the deserialized value of each single object key, and the
+            deserialized attributes of each object, by ix, for each other key
+        :rtype: dict
         """
-        for key, subdict in self.data.items():
+        ifp_objects = self.game.ifp_objects
+        deserialize = self.deserialize_attribute
+        staged = {}
+        for key, section in data.items():
             if not key in self.allowed_keys:
-                return False
+                raise DeserializationError(f"Unknown section {key}")
+            if key == "baseline":
+                # a delta save can only be loaded by a game built the same way
+                if self.game.baseline is None or section != len(self.game.baseline):
+                    raise DeserializationError("Save is for a different baseline")
+                continue
             if key in self.single_object_keys:
-                try:
-                    self.deserialize_attribute(value)
-                except DeserializationError:
-                    return False
+                staged[key] = deserialize(section)
+                continue
+            if key == "locations":
+                for ix, tree in section.items():
+                    if not ix in ifp_objects:
+                        raise DeserializationError(f"Unknown object {ix}")
+                    self.check_contains(tree["contains"])
                 continue
 
-            for ix, obj in subdict.items():
-                if not ix in self.game.ifp_objects:
-                    return False
-
-                for attr, value in obj.items():
-                    try:
-                        self.deserialize_attribute(value)
-                    except DeserializationError:
-                        return False
+            staged_section = staged[key] = {}
+            for ix, attributes in section.items():
+                if not ix in ifp_objects:
+                    raise DeserializationError(f"Unknown object {ix}")
+                staged_section[ix] = {
+                    attr: deserialize(value) for attr, value in attributes.items()
+                }
+        return staged
 
-        self.validated_data = self.data
-        return True
+    def check_contains(self, contains):
+        """
+        Check that every object in a saved contents tree is in the game
+        """
+        for ix, trees in contains.items():
+            if not ix in self.game.ifp_objects:
+                raise DeserializationError(f"Unknown object {ix}")
+            for tree in trees:
+                self.check_contains(tree["contains"])
 
     def load(self):
+        """
+        Load the validated save onto the game. Loading is all or nothing: if it
+        fails part way through, the game is put back as it was, and the error is
+        raised.
+        """
         if not hasattr(self, "validated_data"):
             raise DeserializationError("Call is_valid before loading game.")
+        from .undo import UndoJournal
+
+        game = self.game
+        tracking = game.changes is not None
+        game.trackChanges()
+        changes = game.changes
+        adjectives = game.adjectives
+        # the entries of objects with attributes still waiting from an earlier save
+        # that this save replaces, to be put back if loading fails
+        self.previous = {}
+        # the attributes removed from objects to be left waiting, with their values
+        # from before loading
+        self.removed = []
+        self.loading = True
+        try:
+            # loading cannot be undone
+            with changes.withoutUndo():
+                # keep the state of everything loading changes, to put it back if
+                # loading fails
+                changes.journal = UndoJournal()
+                try:
+                    with binary_save.paused_gc():
+                        loaded = self._load()
+                except BaseException:
+                    if game.deferred is not None:
+                        game.deferred.cancel(self, self.previous)
+                    changes.journal.undo(game, 0)
+                    for obj, attributes in self.removed:
+                        obj.__dict__.update(attributes)
+                    game.adjectives = adjectives
+                    raise
+                finally:
+                    changes.journal = None
+        finally:
+            self.loading = False
+            self.previous = None
+            self.removed = None
+            if not tracking:
+                game.stopTrackingChanges()
+            if self.save_map is not None:
+                # the attributes left waiting have already been read
+                self.save_map.close()
+        if tracking:
+            # the changes recorded before loading no longer describe the game
+            changes.reset()
+        if game.autosave is not None:
+            game.autosave.loaded(self)
+        return loaded
+
+    def _load(self):
+        self.baseline = None
+        if "baseline" in self.validated_data:
+            # find what has changed since the baseline before anything is loaded
+            self.baseline = self.game.baseline
+            self.changed = self.baseline.changed_objects()
+            # objects with attributes waiting from an earlier save are put back as
+            # they are in the baseline, unless this save stores them
+            if self.game.deferred is not None:
+                ifp_objects = self.game.ifp_objects
+                for obj in self.game.deferred.pending:
+                    if ifp_objects.get(obj.ix) is obj:
+                        self.changed[obj.ix] = obj
+            self.changed_locations = self.baseline.changed_locations(
+                self.changed.values()
+            )
+        # locations are checked against the save before anything is loaded, while
+        # no objects are waiting to be decoded
+        matched = self.match_locations()
+        self.adjectives_changed = False
         self.load_ifp_objects()
-        self.load_locations()
-        self.game.parser.previous_command.sequence = self.deserialize_attribute(
-            self.validated_data["active_sequence"]
-        )
+        self.load_locations(matched)
+        self.rebuild_sub_contains()
+        if self.save_map is None or self.adjectives_changed:
+            self.rebuild_adjective_index()
+        self.game.parser.previous_command.sequence = self.staged["active_sequence"]
         return True
 
     def load_ifp_objects(self):
         if not hasattr(self, "validated_data"):
             raise DeserializationError("Call is_valid before loading game.")
 
-        for ix, obj_data in self.validated_data["ifp_objects"].items():
-            obj = self.game.ifp_objects[ix]
+        saved = self.staged["ifp_objects"]
+        save_map = self.save_map
+        if self.baseline is not None:
+            for ix, obj in self.changed.items():
+                skip = SKIPPED_ATTRIBUTES.union(saved.get(ix, ()))
+                if save_map is not None and ix in save_map.entries:
+                    skip = skip.union(save_map.names(ix))
+                adjectives = obj.__dict__.get("adjectives")
+                self.supersede(obj)
+                self.baseline.restore_attributes(obj, skip)
+                if obj.__dict__.get("adjectives") != adjectives:
+                    self.adjectives_changed = True
+
+        ifp_objects = self.game.ifp_objects
+        if save_map is None:
+            for ix, attributes in saved.items():
+                self.set_attributes(ifp_objects[ix], attributes)
+        else:
+            self.load_deferred_objects()
+
+    def supersede(self, obj):
+        """
+        Forget the attributes of an object still waiting from an earlier save, as
+        the object is about to be given the attributes of this one. They are put
+        back if loading fails.
+        """
+        deferred = self.game.deferred
+        if deferred is not None:
+            entry = deferred.pending.pop(obj, None)
+            if entry is not None:
+                self.previous[obj] = entry
 
-            for attr, value in obj_data.items():
-                setattr(obj, attr, self.deserialize_attribute(value))
+    def load_deferred_objects(self):
+        """
+        Load the objects of a lazily read save file. Saved values that are equal to
+        the object's current values are left alone. Otherwise the attributes stored
+        in the index, and those the object's class defines, are set now, and the
+        rest are removed from the object, and left to be deserialized when they are
+        needed (see deferred.py).
+        """
+        from .deferred import DeferredAttributes
+
+        if self.game.deferred is None:
+            self.game.deferred = DeferredAttributes(self.game)
+        defer = self.game.deferred.defer
+        set_attributes = self.set_attributes
+        deserialize = self.deserialize_attribute
+        ifp_objects = self.game.ifp_objects
+        saved = self.staged["ifp_objects"]
+        save_map = self.save_map
+        shapes = save_map.shapes
+        # the names in each shape, and whether the class defines them, by class
+        names = {}
+        for ix, entry in save_map.entries.items():
+            obj = ifp_objects[ix]
+            if is_shell(obj):
+                # a copy on write object is given its own attributes first
+                materialize(obj)
+            # a save stores every attribute of each object it stores, unless it is a
+            # delta save, which has put the object back as it is in the baseline
+            self.supersede(obj)
+            attributes = saved[ix]
+            key = (type(obj), entry[2])
+            shape = names.get(key)
+            if shape is None:
+                shape = names[key] = self.split_shape(type(obj), shapes[entry[2]])
+            waiting = None
+            if shape:
+                attributes = dict(attributes)
+                current = obj.__dict__
+                for (attr, defined), value in zip(shape, save_map.read(ix).values()):
+                    # most attributes are as the object was built. A saved value
+                    # equal to the current one, with no references to objects in it,
+                    # is left alone without being deserialized
+                    old = current.get(attr, _MISSING)
+                    if value is old or (
+                        type(value) is type(old)
+                        and value == old
+                        and (type(value) is not str or value[:5] != "<IFP>")
+                    ):
+                        continue
+                    if defined:
+                        attributes[attr] = deserialize(value)
+                    elif waiting is None:
+                        waiting = {attr: value}
+                    else:
+                        waiting[attr] = value
+            if attributes:
+                set_attributes(obj, attributes)
+            if waiting:
+                current = obj.__dict__
+                removed = {
+                    attr: current.pop(attr) for attr in waiting if attr in current
+                }
+                if removed:
+                    self.removed.append((obj, removed))
+                defer(obj, self, waiting)
+
+    @staticmethod
+    def split_shape(cls, names):
+        """
+        Find which of the attribute names of a block the object's class defines.
+        Those must be set when the object is loaded, as the class attribute would
+        be found instead of one left waiting.
+
+        :returns: a (name, defined by the class) pair for each name
+        :rtype: tuple
+        """
+        return tuple((attr, hasattr(cls, attr)) for attr in names)
+
+    def set_attributes(self, obj, attributes):
+        """
+        Set the saved attributes of an object
+        """
+        current = obj.__dict__
+        for attr, value in attributes.items():
+            # attributes that already have the saved value are left alone, so
+            # that objects loading does not change are not copied for rollback
+            old = current.get(attr, _MISSING)
+            if value is old or (type(value) is type(old) and value == old):
+                continue
+            if attr == "adjectives":
+                self.adjectives_changed = True
+            setattr(obj, attr, value)
+
+    def apply_deferred(self, obj, values):
+        """
+        Deserialize the attributes of an object that were left waiting when the
+        save was loaded lazily, and set them on the object, except those that have
+        been set since. Called by DeferredAttributes.
+
+        Once the save has been loaded, the attributes are the state of the game as
+        loaded, so are set without being recorded as changes, or kept for undo.
+        """
+        deserialize = self.deserialize_attribute
+        current = obj.__dict__
+        attributes = {
+            attr: deserialize(value)
+            for attr, value in values.items()
+            if attr not in current
+        }
+        if self.loading:
+            self.set_attributes(obj, attributes)
+        else:
+            current.update(attributes)
+
+    def match_locations(self):
+        """
+        Find the saved locations whose contents are not already as saved. Locations
+        whose contents are already as saved are left alone by load_locations.
 
-    def load_locations(self):
-        self.placed_things = []
+        :returns: the ixs of the originals already in their saved places, and the
+            saved contents of each of the other locations, by ix
+        :rtype: tuple
+        """
+        self.placed_things = set()
+        saved = {
+            ix: obj_data
+            for ix, obj_data in self.validated_data["locations"].items()
+            if not self.contains_matches(
+                self.game.ifp_objects[ix], obj_data["contains"]
+            )
+        }
+        placed = self.placed_things
+        del self.placed_things
+        return placed, saved
 
+    def load_locations(self, matched=None):
+        """
+        :param matched: the result of match_locations, if it has already been called
+        :type matched: tuple
+        """
         if not hasattr(self, "validated_data"):
             raise DeserializationError("Call is_valid before loading game.")
 
-        for ix, obj_data in self.validated_data["locations"].items():
-            obj = self.game.ifp_objects[ix]
-            self.empty_contains(obj)
-            self.populate_contains(obj, obj_data["contains"])
+        if matched is None:
+            matched = self.match_locations()
+        # the ixs of the originals placed so far, and the locations to load
+        self.placed_things, saved = matched
+
+        restored = []
+        if self.baseline is not None:
+            # locations that have changed since the save was made, but are the
+            # same as the baseline in the save
+            restored = [
+                ix
+                for ix in self.changed_locations
+                if ix not in self.validated_data["locations"]
+            ]
+
+        for ix in [*saved, *restored]:
+            self.empty_contains(self.game.ifp_objects[ix])
+        for ix in restored:
+            self.restore_contains(
+                self.game.ifp_objects[ix], self.baseline.locations.get(ix, [])
+            )
+        for ix, obj_data in saved.items():
+            self.populate_contains(self.game.ifp_objects[ix], obj_data["contains"])
 
         del self.placed_things
 
+    def contains_matches(self, obj, contains):
+        """
+        Check whether the contents of a location are already as saved, holding the
+        original of each saved Thing, and no copies. If they are, the Things are
+        added to placed_things.
+
+        :param contains: the saved contents of the location
+        :type contains: dict
+        :rtype: bool
+        """
+        current = obj.contains
+        if current.keys() != contains.keys():
+            return False
+        ifp_objects = self.game.ifp_objects
+        placed = []
+        for ix, trees in contains.items():
+            items = current[ix]
+            if len(trees) != 1 or len(items) != 1 or items[0] is not ifp_objects[ix]:
+                return False
+            item = items[0]
+            saved = trees[0]["contains"]
+            # most Things contain nothing, and match without a call
+            if (saved or item.contains) and not self.contains_matches(item, saved):
+                return False
+            placed.append(ix)
+        self.placed_things.update(placed)
+        return True
+
+    def rebuild_sub_contains(self):
+        """
+        Loading sets attributes such as `location` and `revealed` directly, so the
+        nested contents index is rebuilt from each outermost location once the
+        contents are in place. While `load` is running, only the outermost
+        locations of the objects loading has changed are rebuilt.
+        """
+        changes = self.game.changes
+        if changes is not None and changes.journal is not None:
+            roots = {
+                obj.getOutermostLocation() or obj
+                for obj in changes.journal.objects
+                if isinstance(obj, PhysicalEntity)
+            }
+        else:
+            roots = [
+                obj
+                for obj in self.game.ifp_objects.values()
+                if isinstance(obj, PhysicalEntity) and not obj.location
+            ]
+        for root in roots:
+            root._rebuildSubContains()
+        self.game.containment_epoch += 1
+
+    def rebuild_adjective_index(self):
+        """
+        Loading sets `adjectives` directly, so the game's adjective index is rebuilt
+        from every Thing in the noun dictionary, including copies
+        """
+        self.game.adjectives = {}
+        for word, things in self.game.nouns.items():
+            for thing in things:
+                thing._indexAdjectives()
+
     def empty_contains(self, obj):
         contains = [item for ix, sublist in obj.contains.items() for item in sublist]
+        # empty every Thing before removing any, as removing a Thing also removes
+        # its lock and children
+        for item in contains:
+            self.empty_contains(item)
         for item in contains:
             if obj.containsItem(item):
-                self.empty_contains(item)
                 obj.removeThing(item)
 
     def add_thing_by_ix(self, destination, ix):
@@ -211,19 +888,45 @@ class LoadGame:
         the specified index has already been placed.
         destination is a PhysicalEntity subclass instance
         """
-        if ix in self.placed_things:
-            item = self.game.ifp_objects[ix].copyThing()
+        item = self.game.ifp_objects[ix]
+        if ix not in self.placed_things and destination.topLevelContainsItem(item):
+            # added along with the Thing it belongs to, as its lock or a child
+            self.placed_things.add(ix)
+            return item
+        # when loading a delta save, an original that is already in place is in a
+        # location the save does not store
+        if ix in self.placed_things or (
+            self.baseline is not None
+            and item.location is not None
+            and item.location.topLevelContainsItem(item)
+        ):
+            item = item.copyThing()
         else:
-            self.placed_things.append(ix)
-            item = self.game.ifp_objects[ix]
+            self.placed_things.add(ix)
+        return self.add_thing(destination, item)
+
+    def add_thing(self, destination, item):
+        """
+        Adds a Thing to a location, and makes sure its synonyms are in the noun
+        dictionary
+        """
         for word in item.synonyms:
-            if not word in self.game.nouns:
-                self.game.nouns[word] = [item]
-            elif not item in self.game.nouns[word]:
-                self.game.nouns[word].append(item)
+            self.game.addNoun(word, item)
         destination.addThing(item)
         return item
 
+    def restore_contains(self, root_obj, tree):
+        """
+        Put back the contents of a location as they were in the baseline
+        tree is a contents tree from Baseline.contents_tree
+        """
+        for item, item_tree in tree:
+            # a lock or child is added along with the Thing it belongs to
+            if not root_obj.topLevelContainsItem(item):
+                self.add_thing(root_obj, item)
+            self.empty_contains(item)
+            self.restore_contains(item, item_tree)
+
     def populate_contains(self, root_obj, dict_in):
         """
         Uses a recursive depth first search to place all items in the correct location
@@ -243,6 +946,28 @@ class LoadGame:
         Raises DeserializationError in the event of an attribute
         that cannot be deseriliazed
         """
+        # fast paths for the most common types
+        kind = type(value)
+        if kind in UNCHANGED_TYPES:
+            return value
+        if kind is list:
+            return [self.deserialize_attribute(sub_value) for sub_value in value]
+        if kind is dict:
+            return {
+                sub_attr: self.deserialize_attribute(sub_value)
+                for sub_attr, sub_value in value.items()
+            }
+
+        if isinstance(value, tuple):
+            # binary save files store references as an integer object id
+            try:
+                obj = self.references[value[0]]
+            except (IndexError, TypeError, AttributeError):
+                raise DeserializationError
+            if obj is None:
+                raise DeserializationError
+            return obj
+
         if isinstance(value, str) and value[:5] == "<IFP>":
             ix = value[5:]
             if not ix in self.game.ifp_objects:
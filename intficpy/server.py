@@ -0,0 +1,462 @@
+import itertools
+import os
+import secrets
+import shutil
+import tempfile
+import threading
+import time
+import traceback
+import weakref
+from collections import OrderedDict, deque
+
+from .eviction import evict_game, rehydrate_game, remove_evicted
+from .exceptions import UnknownSession
+from .prototype import Prototype
+
+##############################################################
+# SERVER.PY - many concurrent IntFicPy games in one process
+# Defines the SessionManager, which keeps a game for each player session and plays
+# turns on them, and SessionApp, the app each session's game prints to
+##############################################################
+#
+# The world is built once, by a build function, and made into a Prototype. Each new
+# session is given a game made from the prototype, which shares the attributes of
+# every object it has not changed (see prototype.py), rather than running the game
+# module again.
+#
+#     def build(app):
+#         game = IFPGame(app, main=game_module)
+#         ...build the world...
+#         return game
+#
+#     sessions = SessionManager(build)
+#     session_id, events = sessions.open()
+#     events = sessions.turn(session_id, "take umbrella")
+#
+# Every session plays its own copy of the world, but anything else the build
+# function creates, such as the module's globals, is shared between sessions.
+# Callbacks such as gameOpening, daemons and verb functions should reach the world
+# through the game they are passed, rather than through module globals, or look up
+# the session's copy of an object with IFPGame.getObject.
+#
+# A SessionManager can be given a budget of games to keep in memory, `max_resident`.
+# When there are more, the games played least recently are written to disk (see
+# eviction.py), and made again from the prototype when they are next played.
+#
+# To play sessions on more than one core, see WorkerPool, in prefork.py, which plays
+# them in worker processes forked from a process that has built the world.
+
+
+class SessionApp:
+    """
+    The app for a game played through a SessionManager. Rather than printing the
+    text of each event, it keeps the events of the current turn, to be returned by
+    SessionManager.turn. Events are kept as dicts with the event's "style", and its
+    "text", a list of strings.
+
+    To return events in another form, subclass SessionApp and override
+    formatEvent, or pass any object with printEventText and takeEvents methods as
+    the app for a session.
+
+    There is no player at a terminal to ask for file names, so the save, load and
+    record verbs are turned away.
+    """
+
+    def __init__(self):
+        self.game = None  # set by the game
+        self.events = []
+
+    def printEventText(self, event):
+        self.events.append(self.formatEvent(event))
+
+    def formatEvent(self, event):
+        return {"style": event.style, "text": event.text}
+
+    def takeEvents(self):
+        """
+        Return the events kept since this was last called, and forget them
+
+        :rtype: list
+        """
+        events = self.events
+        self.events = []
+        return events
+
+    def saveFilePrompt(self, extension, filetype_desc, msg):
+        return None
+
+    def openFilePrompt(self, extension, filetype_desc, msg):
+        return None
+
+
+# the number of recent eviction and rehydration times kept by SessionStats
+RECENT_TIMES = 1000
+
+
+class Session:
+    """
+    A player's game, played through a SessionManager. Turns are played on the
+    game one at a time, holding `lock`.
+
+    While the game is evicted, `game` is None, and `evicted` is the path of its save
+    file. Use SessionManager.getGame to make it again.
+    """
+
+    def __init__(self, session_id, game):
+        self.id = session_id
+        self.game = game
+        self.app = game.app
+        self.lock = threading.Lock()
+        self.closed = False
+        self.evicted = None
+
+
+class SessionStats:
+    """
+    Counts of how often a SessionManager's games were found in memory, and the
+    times taken to evict and rehydrate them
+
+    - hits: the games used while they were in memory
+    - misses: the games used while they were evicted, which had to be rehydrated
+    - evictions: the games written to disk
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # the most recent times, in seconds
+        self.evict_times = deque(maxlen=RECENT_TIMES)
+        self.rehydrate_times = deque(maxlen=RECENT_TIMES)
+        self._lock = threading.Lock()
+
+    def hit(self):
+        with self._lock:
+            self.hits += 1
+
+    def miss(self, seconds):
+        with self._lock:
+            self.misses += 1
+            self.rehydrate_times.append(seconds)
+
+    def evicted(self, seconds):
+        with self._lock:
+            self.evictions += 1
+            self.evict_times.append(seconds)
+
+    @staticmethod
+    def _percentiles(times):
+        """The 50th and 99th percentiles, and the maximum, of times, in ms"""
+        times = sorted(times)
+        if not times:
+            return None, None, None
+        last = len(times) - 1
+        return tuple(
+            times[min(last, int(len(times) * p / 100))] * 1e3 for p in (50, 99, 100)
+        )
+
+    def asDict(self):
+        """
+        The counts, the hit rate, and the 50th and 99th percentiles, and the
+        maximum, of the recent eviction and rehydration times, in milliseconds
+
+        :rtype: dict
+        """
+        with self._lock:
+            out = {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+            used = self.hits + self.misses
+            out["hit_rate"] = self.hits / used if used else None
+            evict = self._percentiles(self.evict_times)
+            rehydrate = self._percentiles(self.rehydrate_times)
+        for name, values in (("evict", evict), ("rehydrate", rehydrate)):
+            for stat, value in zip(("p50", "p99", "max"), values):
+                out[f"{name}_ms_{stat}"] = value
+        return out
+
+
+class SessionManager:
+    """
+    Keeps a game for each open session, mapped by session id, and plays turns on
+    them. Turns on different sessions can be played at the same time, from
+    different threads; turns on the same session are played one at a time.
+
+    :param build: called with an app, to build a game and its world. The game is
+        built once, the first time a session is opened, and initGame is called on
+        it; each session is given a game made from it (see Prototype).
+    :type build: callable
+    :param app_class: called to create the app for each session, unless one is
+        passed to `open`
+    :type app_class: callable
+    :param max_resident: the most games to keep in memory, or None to keep every
+        game in memory. The games played least recently are evicted to disk
+    :type max_resident: int or None
+    :param evict_dir: the directory to write evicted games to. If this is None, a
+        temporary directory is made, and removed with the SessionManager
+    :type evict_dir: str or None
+    """
+
+    def __init__(self, build, app_class=SessionApp, max_resident=None, evict_dir=None):
+        if max_resident is not None and max_resident < 1:
+            raise ValueError("max_resident must be at least 1")
+        self.build = build
+        self.app_class = app_class
+        self.sessions = {}
+        # the sessions whose games are in memory, least recently used first
+        self.resident = OrderedDict()
+        self.max_resident = max_resident
+        self.evict_dir = evict_dir
+        self.stats = SessionStats()
+        self._evictions = itertools.count()
+        # guards self.sessions and self.resident. Each session's game is guarded by
+        # its own lock
+        self._lock = threading.Lock()
+        # the prototype each session's game is made from, and the events of its
+        # opening turn
+        self.prototype = None
+        self._opening = None
+        self._prototype_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self.sessions
+
+    def getPrototype(self):
+        """
+        Build the game each session's game is made from, play its opening turn, and
+        make it into a Prototype, the first time this is called
+
+        :rtype: Prototype
+        """
+        with self._prototype_lock:
+            if self.prototype is None:
+                app = _OpeningRecorder()
+                game = self.build(app)
+                game.initGame()
+                self._opening = app.events
+                self.prototype = Prototype(game)
+            return self.prototype
+
+    def open(self, session_id=None, app=None):
+        """
+        Start a new game for a player.
+        Raises ValueError if the session id is already in use.
+
+        :param session_id: the id of the new session. A random id is chosen if this
+            is None
+        :type session_id: str or None
+        :param app: the app for the session's game. If this is None, one is created
+            by `app_class`
+        :returns: the session id, and the events of the game's opening turn
+        :rtype: tuple
+        """
+        prototype = self.getPrototype()
+        if app is None:
+            app = self.app_class()
+        game = prototype.instantiate(app)
+        game.echo_on = getattr(app, "echo_on", True)
+        for event in self._opening:
+            app.printEventText(event)
+        with self._lock:
+            if session_id is None:
+                session_id = secrets.token_hex(16)
+                while session_id in self.sessions:
+                    session_id = secrets.token_hex(16)
+            elif session_id in self.sessions:
+                raise ValueError(f"Session {session_id} is already open")
+            session = self.sessions[session_id] = Session(session_id, game)
+        self._used(session)
+        return session_id, app.takeEvents()
+
+    def session(self, session_id):
+        """
+        Find an open session.
+        Raises UnknownSession if there is no open session with the id.
+
+        :rtype: Session
+        """
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise UnknownSession(session_id)
+        return session
+
+    def turn(self, session_id, text):
+        """
+        Play a turn of a session's game.
+        Raises UnknownSession if there is no open session with the id.
+
+        :param session_id: the id of the session
+        :type session_id: str
+        :param text: the player's command
+        :type text: str
+        :returns: the events of the turn, from the session's app
+        :rtype: list
+        """
+        session = self.session(session_id)
+        with session.lock:
+            game = self._resident(session)
+            app = session.app
+            try:
+                game.turnMain(text)
+            finally:
+                events = app.takeEvents()
+        self._used(session)
+        return events
+
+    def getGame(self, session_id):
+        """
+        Find the game of an open session, rehydrating it if it has been evicted.
+        Raises UnknownSession if there is no open session with the id.
+
+        :rtype: IFPGame
+        """
+        session = self.session(session_id)
+        with session.lock:
+            game = self._resident(session)
+        self._used(session)
+        return game
+
+    def metrics(self):
+        """
+        The number of open sessions, and of games in memory, with the counts and
+        times from `stats` (see SessionStats.asDict)
+
+        :rtype: dict
+        """
+        out = {"sessions": len(self.sessions), "resident": len(self.resident)}
+        out.update(self.stats.asDict())
+        return out
+
+    def _resident(self, session):
+        """
+        Return the session's game, rehydrating it if it has been evicted. The caller
+        must hold the session's lock.
+        """
+        if session.closed:
+            raise UnknownSession(session.id)
+        if session.game is not None:
+            self.stats.hit()
+            return session.game
+        start = time.perf_counter()
+        app = session.app
+        game = rehydrate_game(self.prototype, app, session.evicted)
+        game.echo_on = getattr(app, "echo_on", True)
+        session.game = game
+        session.evicted = None
+        self.stats.miss(time.perf_counter() - start)
+        return game
+
+    def _used(self, session):
+        """
+        Mark a session's game as the most recently used, and evict the games used
+        least recently, if there are more than max_resident in memory
+        """
+        with self._lock:
+            if session.closed or session.game is None:
+                # evicted since its turn ended
+                return
+            self.resident[session.id] = session
+            self.resident.move_to_end(session.id)
+            if self.max_resident is None:
+                return
+            victims = []
+            while len(self.resident) > self.max_resident:
+                victims.append(self.resident.popitem(last=False)[1])
+        for victim in victims:
+            self._evict(victim)
+
+    def _evict(self, session):
+        """
+        Write a session's game to disk, and drop it from memory. A game that is
+        being played is left alone; it becomes the most recently used once its
+        turn is over. So is a game that has been played again since it was chosen
+        to be evicted.
+
+        If the game cannot be written, the error is printed, and the game is kept in
+        memory, as the least recently used.
+        """
+        if not session.lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                if (
+                    session.closed
+                    or session.game is None
+                    or self.resident.get(session.id) is session
+                ):
+                    return
+            start = time.perf_counter()
+            path = os.path.join(self._evictDir(), f"{next(self._evictions)}.sav")
+            try:
+                evict_game(session.game, path)
+            except Exception:
+                traceback.print_exc()
+                remove_evicted(path)
+                with self._lock:
+                    if not session.closed and session.id not in self.resident:
+                        self.resident[session.id] = session
+                        self.resident.move_to_end(session.id, last=False)
+                return
+            session.game = None
+            # the app is kept for the rehydrated game
+            session.app.game = None
+            session.evicted = path
+            with self._lock:
+                # added back by a turn that ended just before the game was evicted
+                if self.resident.get(session.id) is session:
+                    del self.resident[session.id]
+            self.stats.evicted(time.perf_counter() - start)
+        finally:
+            session.lock.release()
+
+    def _evictDir(self):
+        with self._lock:
+            if self.evict_dir is None:
+                self.evict_dir = tempfile.mkdtemp(prefix="intficpy-sessions-")
+                weakref.finalize(self, shutil.rmtree, self.evict_dir, True)
+            return self.evict_dir
+
+    def close(self, session_id):
+        """
+        End a session. Any saves still being written are finished first.
+        Raises UnknownSession if there is no open session with the id.
+        """
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+            self.resident.pop(session_id, None)
+        if session is None:
+            raise UnknownSession(session_id)
+        with session.lock:
+            session.closed = True
+            game = session.game
+            if game is None:
+                remove_evicted(session.evicted)
+                return
+            game.stopAutosave()
+            if game.saves is not None:
+                game.saves.close()
+
+    def closeAll(self):
+        """End every open session"""
+        for session_id in list(self.sessions):
+            try:
+                self.close(session_id)
+            except UnknownSession:
+                # closed by another thread
+                pass
+
+
+class _OpeningRecorder:
+    """The app for the template game, which keeps the events of its opening turn"""
+
+    def __init__(self):
+        self.game = None
+        self.events = []
+
+    def printEventText(self, event):
+        self.events.append(event)
@@ -0,0 +1,408 @@
+import copy
+import weakref
+from collections import deque
+from contextlib import nullcontext
+
+from .baseline import Baseline, copy_value
+from .changes import untracked_class
+from .grammar import Command, GrammarObject
+from .physical_entity import PhysicalEntity
+from .save_format import paused_gc
+
+##############################################################
+# SNAPSHOT.PY - in memory snapshots of a running IntFicPy game
+# Defines the Snapshot class, which keeps the state of a game so that it can be
+# put back, and the fork function, which copies a game
+##############################################################
+
+# attributes of the game itself that are kept in a snapshot
+GAME_ATTRIBUTES = ("next_obj_ix", "ended", "me", "turn_list", "back")
+# attributes of the parser that are kept in a snapshot
+PARSER_ATTRIBUTES = ("command", "previous_command", "turns")
+# attributes of the game that a fork does not copy. A fork starts with no undo
+# history, background saves, autosave or snapshots of its own
+UNFORKED_ATTRIBUTES = frozenset(
+    [
+        "app",
+        "main",
+        "changes",
+        "saves",
+        "failed_saves",
+        "autosave",
+        "deferred",
+        "_last_snapshot",
+    ]
+)
+
+_ATOMIC_TYPES = frozenset([str, int, float, bool, type(None)])
+
+
+def copy_parser_value(value):
+    """
+    Copy an attribute of the parser, including the Commands and GrammarObjects it
+    holds. IFPObjects are not copied.
+    """
+    if isinstance(value, (Command, GrammarObject)):
+        out = copy.copy(value)
+        out.__dict__ = {
+            attr: copy_parser_value(sub_value)
+            for attr, sub_value in value.__dict__.items()
+        }
+        return out
+    kind = type(value)
+    if kind is list:
+        return [copy_parser_value(sub_value) for sub_value in value]
+    if kind is dict:
+        return {key: copy_parser_value(sub_value) for key, sub_value in value.items()}
+    return value
+
+
+class Snapshot:
+    """
+    The state of a game, kept in memory, so that the game can be put back as it was
+    with `restore`:
+
+    - a copy of the attributes of every IFPObject, including the contents of each
+      location, the daemons' schedule, and the state of each Sequence
+    - the game's indexes: game.ifp_objects, game.nouns and game.adjectives
+    - the player, the parser's current and previous commands, and the game's
+      other turn by turn state (see GAME_ATTRIBUTES and PARSER_ATTRIBUTES)
+
+    Snapshots share the copy of each object that has not changed since the last
+    snapshot taken or restored, while that snapshot is still in use, or otherwise
+    since the game's baseline. When the game is tracking changes (see
+    IFPGame.trackChanges, which undo turns on), the changed objects are found from
+    the ChangeTracker, so taking a snapshot, or restoring one, takes time in
+    proportion to what has changed, rather than to the size of the world.
+    Otherwise every object is compared with its shared copy. Attributes changed in
+    place must be recorded with `_recordChange`, as for undo.
+
+    Created by IFPGame.snapshot. A snapshot can only be restored to the game it was
+    taken from.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        pending = _pending(game)
+        with paused_gc():
+            last = _last_snapshot(game)
+            changed = last.changedObjects() if last is not None else None
+            if changed is not None:
+                # objects decoded since are copied again
+                changed.update(_changedPending(last.deferred, pending))
+            self.objects = self._shareObjects(last, changed)
+            # the attributes of objects loaded lazily that are still waiting to be
+            # decoded (see deferred.py), which are not in the copies of the objects
+            self.deferred = dict(pending)
+            if changed is not None and last.index_changes == game.changes.index_changes:
+                # no index entries have changed since the last snapshot
+                self.ifp_objects = last.ifp_objects
+                self.nouns = last.nouns
+                self.adjectives = last.adjectives
+            else:
+                self.ifp_objects = dict(game.ifp_objects)
+                self.nouns = {word: list(things) for word, things in game.nouns.items()}
+                self.adjectives = {
+                    word: set(things) for word, things in game.adjectives.items()
+                }
+            self.attributes = {
+                attr: copy_value(getattr(game, attr)) for attr in GAME_ATTRIBUTES
+            }
+            self.parser = {
+                attr: copy_parser_value(getattr(game.parser, attr))
+                for attr in PARSER_ATTRIBUTES
+            }
+        self._mark()
+
+    def _mark(self):
+        """
+        Remember that the game is in the state of this snapshot now, so that the
+        changes made from now on can be found from the game's ChangeTracker
+        """
+        changes = self.game.changes
+        self.changes = changes
+        if changes is not None:
+            self.generation = changes.generation
+            self.index_changes = changes.index_changes
+            self.checkpoint = changes.checkpoint()
+        self.game._last_snapshot = weakref.ref(self)
+
+    def changedObjects(self):
+        """
+        Find the objects that have changed since the game was last in the state of
+        this snapshot, from the game's ChangeTracker. Includes objects created since.
+
+        :returns: the changed objects, or None if the ChangeTracker cannot tell
+        :rtype: set or None
+        """
+        changes = self.game.changes
+        if (
+            changes is None
+            or changes is not self.changes
+            or not changes.isCurrent(self.checkpoint, self.generation)
+        ):
+            return None
+        return {obj for obj, attr in changes.sinceCheckpoint(self.checkpoint)}
+
+    def _shareObjects(self, last, changed):
+        """
+        Copy the attributes of each object, sharing the copies of objects that have
+        not changed since the last snapshot, or since the baseline
+
+        :param last: the last snapshot taken or restored, if it is still in use
+        :type last: Snapshot or None
+        :param changed: the objects changed since, from `last.changedObjects`
+        :type changed: set or None
+        """
+        game = self.game
+        ifp_objects = game.ifp_objects
+        if changed is not None:
+            objects = dict(last.objects)
+            for obj in changed:
+                if ifp_objects.get(obj.ix) is obj:
+                    objects[obj] = Baseline.copy_attributes(obj)
+            if len(objects) == len(ifp_objects):
+                return objects
+            # objects have been dropped from the game
+            return {
+                obj: objects.get(obj) or Baseline.copy_attributes(obj)
+                for obj in ifp_objects.values()
+            }
+
+        if last is not None:
+            shared = last.objects.get
+        elif game.baseline is not None:
+            baseline = game.baseline.attributes
+            shared = lambda obj: baseline.get(obj.ix)
+        else:
+            shared = lambda obj: None
+        objects = {}
+        for obj in ifp_objects.values():
+            attributes = shared(obj)
+            if attributes is None or obj.__dict__ != attributes:
+                attributes = Baseline.copy_attributes(obj)
+            objects[obj] = attributes
+        return objects
+
+    def _differingObjects(self, last, changed):
+        """
+        Find the objects that may differ from this snapshot, including objects
+        created since it was taken, and objects dropped from the game since
+
+        :param last: the last snapshot taken or restored, if it is still in use
+        :type last: Snapshot or None
+        :param changed: the objects changed since, from `last.changedObjects`
+        :type changed: set or None
+        """
+        game = self.game
+        if changed is not None:
+            if last is not self:
+                # objects whose copies are shared are in the same state in both
+                # snapshots
+                objects = last.objects
+                changed.update(
+                    obj
+                    for obj, attributes in self.objects.items()
+                    if objects.get(obj) is not attributes
+                )
+                changed.update(obj for obj in objects if obj not in self.objects)
+            return changed
+        ifp_objects = game.ifp_objects
+        objects = self.objects
+        changed = {
+            obj for obj in ifp_objects.values() if obj.__dict__ != objects.get(obj)
+        }
+        changed.update(obj for obj in objects if ifp_objects.get(obj.ix) is not obj)
+        return changed
+
+    def restore(self):
+        """
+        Put the game back in the state it was in when the snapshot was taken.
+        Objects created since are dropped from the game's indexes, and left as they
+        are.
+
+        Like loading a save, restoring a snapshot cannot be undone, and clears the
+        undo history.
+        """
+        game = self.game
+        changes = game.changes
+        pending = _pending(game)
+        with paused_gc():
+            last = _last_snapshot(game)
+            changed = last.changedObjects() if last is not None else None
+            # the indexes are already as they were if no index entries have changed
+            # since a snapshot that shares them with this one
+            indexes_changed = not (
+                changed is not None
+                and last.index_changes == changes.index_changes
+                and last.nouns is self.nouns
+                and last.adjectives is self.adjectives
+                and last.ifp_objects is self.ifp_objects
+            )
+            changed = self._differingObjects(last, changed)
+            changed.update(_changedPending(self.deferred, pending))
+            # the outermost locations whose nested contents indexes need rebuilding,
+            # before and after the objects are put back
+            roots = set()
+            for obj in changed:
+                if isinstance(obj, PhysicalEntity):
+                    roots.add(obj.getOutermostLocation() or obj)
+            with changes.withoutUndo() if changes is not None else nullcontext():
+                for obj in changed:
+                    saved = self.objects.get(obj)
+                    if saved is None:
+                        continue
+                    attributes = obj.__dict__
+                    attributes.clear()
+                    attributes.update(
+                        (attr, copy_value(value)) for attr, value in saved.items()
+                    )
+                    entry = self.deferred.get(obj)
+                    if entry is not None:
+                        pending[obj] = entry
+                    else:
+                        pending.pop(obj, None)
+                if indexes_changed:
+                    for index, saved in (
+                        (game.ifp_objects, self.ifp_objects),
+                        (game.nouns, self.nouns),
+                        (game.adjectives, self.adjectives),
+                    ):
+                        index.clear()
+                        index.update(
+                            (key, copy_value(value)) for key, value in saved.items()
+                        )
+                for attr, value in self.attributes.items():
+                    setattr(game, attr, copy_value(value))
+                for attr, value in self.parser.items():
+                    setattr(game.parser, attr, copy_parser_value(value))
+            for obj in changed:
+                if obj in self.objects and isinstance(obj, PhysicalEntity):
+                    roots.add(obj.getOutermostLocation() or obj)
+            for root in roots:
+                if root in self.objects:
+                    root._rebuildSubContains()
+        game.containment_epoch += 1
+        game.parser.scope.invalidate()
+        if changes is not None:
+            # the changes recorded before no longer describe the game
+            changes.reset()
+        if game.autosave is not None:
+            game.autosave.needs_snapshot = True
+        self._mark()
+
+
+def _last_snapshot(game):
+    ref = game._last_snapshot
+    return ref() if ref is not None else None
+
+
+def _pending(game):
+    """
+    The objects of a game with attributes waiting to be decoded, mapped to their
+    entries (see deferred.py)
+    """
+    return game.deferred.pending if game.deferred is not None else {}
+
+
+def _changedPending(deferred, pending):
+    """
+    Find the objects whose attributes waiting to be decoded differ between two
+    mappings of objects to their entries, such as a snapshot's and the game's
+    """
+    changed = {obj for obj, entry in pending.items() if deferred.get(obj) is not entry}
+    changed.update(obj for obj in deferred if obj not in pending)
+    return changed
+
+
+def fork_value(value, memo):
+    """
+    Copy an attribute value for a forked game. Lists, dicts, sets and tuples are
+    copied, references to objects already in `memo` are replaced by their copies,
+    and anything else is deep copied.
+    """
+    kind = type(value)
+    if kind in _ATOMIC_TYPES:
+        return value
+    # strings and numbers are returned as they are without a call, as most of the
+    # values in a world are
+    if kind is dict:
+        out = {}
+        for key, sub_value in value.items():
+            if type(key) not in _ATOMIC_TYPES:
+                key = fork_value(key, memo)
+            if type(sub_value) not in _ATOMIC_TYPES:
+                sub_value = fork_value(sub_value, memo)
+            out[key] = sub_value
+        return out
+    if kind is list:
+        return [
+            (
+                sub_value
+                if type(sub_value) in _ATOMIC_TYPES
+                else fork_value(sub_value, memo)
+            )
+            for sub_value in value
+        ]
+    if kind is set:
+        return {fork_value(sub_value, memo) for sub_value in value}
+    if kind is tuple:
+        return tuple(fork_value(sub_value, memo) for sub_value in value)
+    out = memo.get(id(value))
+    if out is not None:
+        return out
+    return copy.deepcopy(value, memo)
+
+
+def fork(game, app):
+    """
+    Create a new game with a copy of the world and state of `game`, that can be
+    played on its own. See IFPGame.fork.
+    """
+    if game.deferred is not None:
+        game.deferred.decodeAll()
+    with paused_gc():
+        new_game = object.__new__(type(game))
+        memo = {id(game): new_game, id(game.app): app, id(game.main): game.main}
+        if game._verbs is not None:
+            # the base verb set is shared by every game
+            memo[id(game._verbs._base)] = game._verbs._base
+        # every object is created before any is filled in, so that the objects are
+        # not copied by following references from one to the next
+        copies = []
+        for obj in game.ifp_objects.values():
+            new_obj = object.__new__(untracked_class(type(obj)))
+            memo[id(obj)] = new_obj
+            copies.append((obj, new_obj))
+        if game.baseline is not None:
+            memo[id(game.baseline)] = object.__new__(Baseline)
+            copies.append((game.baseline, memo[id(game.baseline)]))
+        for obj, new_obj in copies:
+            new_obj.__dict__.update(fork_value(obj.__dict__, memo))
+        new_game.__dict__.update(
+            fork_value(
+                {
+                    attr: value
+                    for attr, value in game.__dict__.items()
+                    if attr not in UNFORKED_ATTRIBUTES
+                },
+                memo,
+            )
+        )
+    new_game.app = app
+    app.game = new_game
+    new_game.main = game.main
+    new_game.changes = None
+    new_game.saves = None
+    new_game.failed_saves = deque()
+    new_game.autosave = None
+    new_game.deferred = None
+    new_game._last_snapshot = None
+    new_game.parser.scope.invalidate()
+    if game.changes is not None:
+        journal = game.changes.journal
+        if journal is not None:
+            new_game.enableUndo(journal.max_turns, journal.max_size)
+        else:
+            new_game.trackChanges()
+    return new_game
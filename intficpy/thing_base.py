@@ -123,10 +123,7 @@ class Thing(PhysicalEntity):
         )
 
         # add name to list of nouns
-        if name in self.game.nouns:
-            self.game.nouns[name].append(self)
-        else:
-            self.game.nouns[name] = [self]
+        self.game.addNoun(name, self, new=True)
 
     @property
     def verb_to_be(self):
@@ -285,34 +282,54 @@ class Thing(PhysicalEntity):
 
     def makeKnown(self, me):
         if self.known_ix and (not self.known_ix in me.knows_about):
+            me._recordChange("knows_about")
             me.knows_about.append(self.known_ix)
+            self.game.knowledge_epoch += 1
 
     def addSynonym(self, word):
         """Adds a synonym (noun) that can be used to refer to a Thing
         Takes argument word, a string, which should be a single noun """
+        self._recordChange("synonyms")
         self.synonyms.append(word)
-        if word in self.game.nouns:
-            if self not in self.game.nouns[word]:
-                self.game.nouns[word].append(self)
-        else:
-            self.game.nouns[word] = [self]
+        self.game.addNoun(word, self)
 
     def removeSynonym(self, word):
         """Adds a synonym (noun) that can be used to refer to a Thing
         Takes argument word, a string, which should be a single noun """
         if word in self.synonyms:
+            self._recordChange("synonyms")
             self.synonyms.remove(word)
-        if word in self.game.nouns:
-            if self in self.game.nouns[word]:
-                self.game.nouns[word].remove(self)
-            if self.game.nouns[word] == []:
-                del self.game.nouns[word]
+        self.game.removeNoun(word, self)
 
     def setAdjectives(self, adj_list):
         """Sets adjectives for a Thing
         Takes arguments adj_list, a list of one word strings (adjectives), and update_desc, a Boolean defaulting to True
         Game creators should set update_desc to False if using a custom desc or xdesc for a Thing """
+        self._unindexAdjectives()
         self.adjectives = adj_list
+        self._indexAdjectives()
+
+    def _indexAdjectives(self):
+        """Add this Thing to the game's adjective index under each of its adjectives """
+        changes = self.game.changes
+        for word in self.adjectives:
+            if changes is not None:
+                changes.recordIndex(self.game.adjectives, word)
+            if word in self.game.adjectives:
+                self.game.adjectives[word].add(self)
+            else:
+                self.game.adjectives[word] = {self}
+
+    def _unindexAdjectives(self):
+        """Remove this Thing from the game's adjective index """
+        changes = self.game.changes
+        for word in self.adjectives:
+            if word in self.game.adjectives:
+                if changes is not None:
+                    changes.recordIndex(self.game.adjectives, word)
+                self.game.adjectives[word].discard(self)
+                if not self.game.adjectives[word]:
+                    del self.game.adjectives[word]
 
     def capNameArticle(self, definite=False):
         out = self.getArticle(definite) + self.verbose_name
@@ -360,13 +377,16 @@ class Thing(PhysicalEntity):
         Copy a Thing, keeping the index of the original.
         Safe to use for dynamic item duplication.
         """
+        self._decodeDeferred()
         out = copy.copy(self)
-        self.game.nouns[out.name].append(out)
+        self.game.addNoun(out.name, out, new=True)
         out.setAdjectives(out.adjectives)
         for synonym in out.synonyms:
-            self.game.nouns[synonym].append(out)
+            self.game.addNoun(synonym, out, new=True)
         out.full_name = self.full_name
         out.contains = {}
+        out._sub_contains = {}
+        out._lit_count = 0
         return out
 
     def copyThingUniqueIx(self):
@@ -376,14 +396,17 @@ class Thing(PhysicalEntity):
         Player knowledge (me.knows_about dictionary).
         To override this behaviour, manually set the copy's known_ix to its own ix property.
         """
+        self._decodeDeferred()
         out = copy.copy(self)
         self.registerNewIndex()
-        self.game.nouns[out.name].append(out)
+        self.game.addNoun(out.name, out, new=True)
         out.setAdjectives(out.adjectives)
         for synonym in out.synonyms:
-            self.game.nouns[synonym].append(out)
+            self.game.addNoun(synonym, out, new=True)
         out.full_name = self.full_name
         out.contains = {}
+        out._sub_contains = {}
+        out._lit_count = 0
         return out
 
     def setFromPrototype(self, item):
@@ -395,29 +418,22 @@ class Thing(PhysicalEntity):
             )
             return False
         else:
-            if self.name in self.game.nouns:
-                if self in self.game.nouns[self.name]:
-                    self.game.nouns[self.name].remove(self)
-                    if self.game.nouns[self.name] == []:
-                        del self.game.nouns[self.name]
+            self.game.removeNoun(self.name, self)
             for synonym in self.synonyms:
-                if self in self.game.nouns[synonym]:
-                    if self in self.game.nouns[synonym]:
-                        self.game.nouns[synonym].remove(self)
-                        if self.game.nouns[synonym] == []:
-                            del self.game.nouns[synonym]
+                self.game.removeNoun(synonym, self)
+            self._unindexAdjectives()
+            was_lit = getattr(self, "is_lit", False)
+            item._decodeDeferred()
             for attr, value in item.__dict__.items():
-                if attr != "ix":
+                if attr not in ("ix", "_sub_contains", "_lit_count"):
                     setattr(self, attr, value)
-            if self.name in self.game.nouns:
-                self.game.nouns[self.name].append(self)
-            else:
-                self.game.nouns[self.name] = [self]
+            if getattr(self, "is_lit", False) != was_lit:
+                self._updateLitCount(-1 if was_lit else 1)
+            self._rebuildSubContains()
+            self._indexAdjectives()
+            self.game.addNoun(self.name, self)
             for synonym in self.synonyms:
-                if synonym in self.game.nouns:
-                    self.game.nouns[synonym].append(self)
-                else:
-                    self.game.nouns[synonym] = [self]
+                self.game.addNoun(synonym, self)
             return True
 
     def describeThing(self, description):
@@ -430,14 +446,19 @@ class Thing(PhysicalEntity):
         self.is_composite = True
         item.parent_obj = self
 
+        self._recordChange("children")
         self.children.append(item)
         if item.contains_on:
+            self._recordChange("child_Surfaces")
             self.child_Surfaces.append(item)
         elif item.contains_in:
+            self._recordChange("child_Containers")
             self.child_Containers.append(item)
         elif item.contains_under:
+            self._recordChange("child_UnderSpaces")
             self.child_UnderSpaces.append(item)
         elif isinstance(item, Thing):
+            self._recordChange("child_Things")
             self.child_Things.append(item)
 
         if self.location:
@@ -291,6 +291,7 @@ class Container(Holder, Openable):
         if self.location:
             self.location.addThing(lock_obj)
         lock_obj.setAdjectives(lock_obj.adjectives + self.adjectives + [self.name])
+        self._recordChange("state_descriptors")
         self.state_descriptors.append(lock_obj.IS_LOCKED_DESC_KEY)
 
     def giveLid(self):
@@ -298,6 +299,7 @@ class Container(Holder, Openable):
         self.is_open = False
         self.revealed = False
         if not self.IS_OPEN_DESC_KEY in self.state_descriptors:
+            self._recordChange("state_descriptors")
             self.state_descriptors.append(self.IS_OPEN_DESC_KEY)
 
     def makeOpen(self):
@@ -367,11 +369,13 @@ class LightSource(Thing):
 
     IS_LIT_DESC_KEY = "is_lit_desc"
 
-    is_lit = False
+    _is_lit = False
     player_can_light = True
     player_can_extinguish = True
     consumable = False
     turns_left = 20
+    # the daemon turn when turns_left was last brought up to date
+    burning_since = 0
 
     room_lit_msg = None
     light_msg = None
@@ -415,6 +419,20 @@ class LightSource(Thing):
 
         self.state_descriptors.append(self.IS_LIT_DESC_KEY)
 
+    @property
+    def is_lit(self):
+        """
+        Whether the light source is lit. Setting this updates the lit count of the
+        locations that can see the light source.
+        """
+        return self._is_lit
+
+    @is_lit.setter
+    def is_lit(self, value):
+        if bool(value) != bool(self._is_lit):
+            self._updateLitCount(1 if value else -1)
+        self._is_lit = value
+
     @property
     def is_lit_desc(self):
         """
@@ -433,7 +451,10 @@ class LightSource(Thing):
             return False
 
         if self.consumable:
-            game.daemons.add(self.consumeLightSourceDaemon)
+            self.burning_since = game.daemons.turn
+            game.daemons.runAfter(
+                self.consumeLightSourceDaemon, self._turnsToNextWarning()
+            )
 
         self.is_lit = True
         return True
@@ -443,44 +464,55 @@ class LightSource(Thing):
             game.addTextToEvent("turn", self.already_extinguished_msg)
             return True
 
-        if self.consumable and self.consumeLightSourceDaemon in game.daemons.active:
+        if self.consumable and self.consumeLightSourceDaemon in game.daemons:
+            self.turns_left -= game.daemons.turn - self.burning_since
             game.daemons.remove(self.consumeLightSourceDaemon)
         self.is_lit = False
         return True
 
+    def _turnsToNextWarning(self):
+        """
+        The number of turns until the light source next warns that it is running
+        out (every 5 turns, then every turn for the last 5), or burns out
+        """
+        if self.turns_left <= 5:
+            return 1
+        return (self.turns_left - 1) % 5 + 1
+
     def consumeLightSourceDaemonFunc(self, game):
         """
-        Runs every turn while a consumable light source is active, to keep track of
-        time left.
+        Scheduled while a consumable light source is lit, to run when it next warns
+        that it is running out, or burns out. `turns_left` is brought up to date
+        each time this runs.
         """
-        from .verb import helpVerb, helpVerbVerb, aboutVerb
+        from .verb import HelpVerb, HelpVerbVerb, AboutVerb
 
-        if not (
-            game.parser.previous_command.verb == helpVerb
-            or game.parser.previous_command.verb == helpVerbVerb
-            or game.parser.previous_command.verb == aboutVerb
+        if (
+            game.parser.previous_command.verb == HelpVerb
+            or game.parser.previous_command.verb == HelpVerbVerb
+            or game.parser.previous_command.verb == AboutVerb
             or game.parser.previous_command.ambiguous
             or game.parser.previous_command.err
         ):
-            self.turns_left = self.turns_left - 1
-            if self.turns_left == 0:
-                if game.me.getOutermostLocation() == self.getOutermostLocation():
-                    game.addTextToEvent("turn", self.extinguishing_expired_msg)
-                self.is_lit = False
-
-                if self.consumeLightSourceDaemon in game.daemons.active:
-                    game.daemons.remove(self.consumeLightSourceDaemon)
-            elif game.me.getOutermostLocation() == self.getOutermostLocation():
-                if self.turns_left < 5:
-                    game.addTextToEvent(
-                        "turn",
-                        self.expiry_warning + str(self.turns_left) + " turns left. ",
-                    )
-                elif (self.turns_left % 5) == 0:
-                    game.addTextToEvent(
-                        "turn",
-                        self.expiry_warning + str(self.turns_left) + " turns left. ",
-                    )
+            # this turn does not count
+            self.burning_since += 1
+            game.daemons.runAfter(self.consumeLightSourceDaemon, 1)
+            return
+
+        self.turns_left -= game.daemons.turn - self.burning_since
+        self.burning_since = game.daemons.turn
+        if self.turns_left <= 0:
+            self.turns_left = 0
+            if game.me.getOutermostLocation() == self.getOutermostLocation():
+                game.addTextToEvent("turn", self.extinguishing_expired_msg)
+            self.is_lit = False
+            return
+
+        if game.me.getOutermostLocation() == self.getOutermostLocation():
+            game.addTextToEvent(
+                "turn", self.expiry_warning + str(self.turns_left) + " turns left. ",
+            )
+        game.daemons.runAfter(self.consumeLightSourceDaemon, self._turnsToNextWarning())
 
 
 class AbstractClimbable(Thing):
@@ -587,7 +619,6 @@ class UnderSpace(Holder):
     contains_preposition = "under"
     contains_under = True
     contains_preposition_inverse = "out"
-    revealed = False
 
     does_not_fit_msg = (
         "The {item.verbose_name} is too big to fit under the {self.verbose_name}. "
@@ -2,7 +2,6 @@ from .exceptions import IFPError
 from .ifp_object import IFPObject
 from .thing_base import Thing
 from .things import Door, Lock, AbstractClimbable, Surface
-from .verb import OpenVerb, StandUpVerb
 from .room import Room
 
 ##############################################################
@@ -96,11 +95,9 @@ class TravelConnector(IFPObject):
         for x in range(0, 2):
             print(x)
             for synonym in self.interactables[x].synonyms:
-                if synonym in self.game.nouns:
-                    if self.interactables[x] in self.game.nouns[synonym]:
-                        self.game.nouns[synonym].remove(self.interactables[x])
-                        if self.game.nouns[synonym] == []:
-                            del self.game.nouns[synonym]
+                self.game.removeNoun(synonym, self.interactables[x])
+            self.interactables[x]._unindexAdjectives()
+            self.interactables[x]._recordChange("adjectives")
             for adj in self.interactables[x].adjectives:
                 remove_list = []
                 if adj not in directionDict and adj != "upward" and adj != "downward":
@@ -116,7 +113,9 @@ class TravelConnector(IFPObject):
                         and adj not in self.interactables[x].adjectives
                     ):
                         self.interactables[x].adjectives.append(adj)
+            self.interactables[x]._indexAdjectives()
 
+            connector.interactables[x]._decodeDeferred()
             for attr, value in connector.interactables[x].__dict__.items():
                 if attr == "direction" or attr == "adjectives" or attr == "ix":
                     pass
@@ -125,11 +124,7 @@ class TravelConnector(IFPObject):
 
             add = self.interactables[x].synonyms + [self.interactables[x].name]
             for noun in add:
-                if noun in self.game.nouns:
-                    if self.interactables[x] not in self.game.nouns[noun]:
-                        self.game.nouns[noun].append(self.interactables[x])
-                else:
-                    self.game.nouns[noun] = [self.interactables[x]]
+                self.game.addNoun(noun, self.interactables[x])
             x = x + 1
 
     def _prepareToCross(self, entrance):
@@ -217,7 +212,9 @@ class DoorConnector(TravelConnector):
 
     def _prepareToCross(self, entrance):
         if not entrance.is_open:
-            opened = OpenVerb().verbFunc(self.game, entrance)
+            from .verb import OpenVerb
+
+            opened = OpenVerb.instance().verbFunc(self.game, entrance)
             if not opened:
                 return False
         return True
@@ -318,7 +315,7 @@ def preRemovePlayer(game):
 
     x = game.me.location
     while isinstance(game.me.location, Thing):
-        ExitVerb().verbFunc(game)
+        ExitVerb.instance().verbFunc(game)
 
 
 def getDirectionFromString(loc, input_string):
@@ -354,7 +351,9 @@ def travelDirection(game, direction):
 
     loc = game.me.getOutermostLocation()
     if game.me.position != "standing":
-        StandUpVerb().verbFunc(game)
+        from .verb import StandUpVerb
+
+        StandUpVerb.instance().verbFunc(game)
     if not loc.resolveDarkness(game) and (short not in loc.dark_visible_exits):
         game.addTextToEvent("turn", loc.dark_msg)
 
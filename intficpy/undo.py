@@ -0,0 +1,186 @@
+from collections import deque
+
+from .baseline import copy_value
+from .physical_entity import PhysicalEntity
+from .snapshot import PARSER_ATTRIBUTES, copy_parser_value
+
+##############################################################
+# UNDO.PY - multi-level undo for IntFicPy
+# Defines the UndoJournal class, which keeps what each turn changed, so that
+# turns can be undone
+##############################################################
+
+# the number of turns that can be undone
+UNDO_TURNS = 20
+# the most attribute values and index entries kept, across all turns
+UNDO_SIZE = 100000
+
+# the old value of an index entry that did not exist
+_MISSING = object()
+
+
+class UndoJournal:
+    """
+    Keeps the state of everything each turn changes, as it was before the turn's
+    first change to it:
+
+    - for each IFPObject, a copy of its attributes
+    - for each entry changed in one of the game's indexes (game.nouns,
+      game.adjectives, game.ifp_objects), a copy of the entry
+    - the parser's turn state (see snapshot.PARSER_ATTRIBUTES), such as a question
+      about which of two things the player meant
+
+    so that undoing a turn takes time in proportion to what it changed, rather than
+    to the size of the world.
+
+    Journals are kept for the last `max_turns` turns, and the oldest are dropped
+    when the journals hold more than `max_size` attribute values and index entries
+    in all.
+
+    Filled in by the game's ChangeTracker. Created by IFPGame.enableUndo.
+    """
+
+    def __init__(self, max_turns=UNDO_TURNS, max_size=UNDO_SIZE):
+        self.max_turns = max_turns
+        self.max_size = max_size
+        # the journals of completed turns, oldest first, as tuples of
+        # (objects, indexes, size, parser)
+        self.turns = deque()
+        # the size of the completed turn journals
+        self.size = 0
+        # the parser's turn state at the start of the current turn, if known
+        self.parser = None
+        self._newTurn()
+
+    def __len__(self):
+        """
+        The number of completed turns that can be undone
+        """
+        return len(self.turns)
+
+    def _newTurn(self):
+        # maps each object changed this turn to a copy of its attributes from
+        # before the change
+        self.objects = {}
+        # maps (id(index), key) to (index, key, old entry) for each index entry
+        # changed this turn
+        self.indexes = {}
+        self.current_size = 0
+
+    def touch(self, obj):
+        """
+        Keep the attributes of an object that is about to change, if it has not
+        already changed this turn
+        """
+        if obj in self.objects:
+            return
+        # the attributes of an object loaded lazily are decoded first, so that they
+        # are kept. While a save is being loaded, decoding touches the object itself
+        obj._decodeDeferred()
+        if obj in self.objects:
+            return
+        snapshot = {attr: copy_value(value) for attr, value in obj.__dict__.items()}
+        self.objects[obj] = snapshot
+        self.current_size += len(snapshot)
+
+    def touchIndex(self, index, key):
+        """
+        Keep an index entry that is about to change, if it has not already changed
+        this turn
+        """
+        token = (id(index), key)
+        if token in self.indexes:
+            return
+        self.indexes[token] = (index, key, copy_value(index.get(key, _MISSING)))
+        self.current_size += 1
+
+    def keepParser(self, parser):
+        """
+        Keep the parser's turn state, as the state to put back when the current turn
+        is undone
+        """
+        self.parser = {
+            attr: copy_parser_value(getattr(parser, attr)) for attr in PARSER_ATTRIBUTES
+        }
+
+    def endTurn(self, parser):
+        """
+        Close the journal for the turn that has just ended
+
+        :param parser: the game's parser, whose turn state is kept for the next turn
+        :type parser: Parser
+        """
+        self.turns.append((self.objects, self.indexes, self.current_size, self.parser))
+        self.size += self.current_size
+        self._newTurn()
+        self.keepParser(parser)
+        while self.turns and (
+            len(self.turns) > self.max_turns or self.size > self.max_size
+        ):
+            self.size -= self.turns.popleft()[2]
+
+    def clear(self):
+        """
+        Forget every turn
+        """
+        self.turns.clear()
+        self.size = 0
+        self.parser = None
+        self._newTurn()
+
+    def undo(self, game, turns=1):
+        """
+        Undo the changes made so far this turn, and in the last `turns` completed
+        turns, or as many as there are.
+
+        :returns: the number of completed turns undone
+        :rtype: int
+        """
+        undone = min(turns, len(self.turns))
+        journals = [(self.objects, self.indexes)]
+        parser = self.parser
+        for _ in range(undone):
+            objects, indexes, size, parser = self.turns.pop()
+            self.size -= size
+            journals.append((objects, indexes))
+        self._newTurn()
+
+        # objects created in the turns being undone are dropped from the game's
+        # indexes, and left as they are
+        created = set()
+        for objects, indexes in journals:
+            for index, key, entry in indexes.values():
+                if index is game.ifp_objects and entry is _MISSING and key in index:
+                    created.add(index[key])
+
+        # the outermost locations whose nested contents indexes need rebuilding
+        roots = set()
+        for objects, indexes in journals:
+            for obj, snapshot in objects.items():
+                if obj in created:
+                    continue
+                if isinstance(obj, PhysicalEntity):
+                    roots.add(obj.getOutermostLocation() or obj)
+                attributes = obj.__dict__
+                attributes.clear()
+                attributes.update(snapshot)
+            for index, key, entry in indexes.values():
+                if entry is _MISSING:
+                    index.pop(key, None)
+                else:
+                    index[key] = entry
+        for objects, indexes in journals:
+            for obj in objects:
+                if obj not in created and isinstance(obj, PhysicalEntity):
+                    roots.add(obj.getOutermostLocation() or obj)
+        for root in roots:
+            root._rebuildSubContains()
+        game.containment_epoch += 1
+
+        # the parser's state from the start of the oldest turn undone, so that the
+        # next command follows on from the turn the game is now at
+        self.parser = parser
+        if parser is not None:
+            for attr, value in parser.items():
+                setattr(game.parser, attr, copy_parser_value(value))
+        return undone
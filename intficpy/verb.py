@@ -1,4 +1,6 @@
 from abc import ABC
+from collections.abc import MutableMapping
+from types import MappingProxyType
 
 from .actor import Actor
 from .thing_base import Thing
@@ -19,7 +21,7 @@ from .things import (
     Pressable,
 )
 from .room import Room
-from .serializer import SaveGame, LoadGame
+from .prototype import is_shell
 
 ##############################################################
 # VERB.PY - verbs for IntFicPy
@@ -29,6 +31,35 @@ from .serializer import SaveGame, LoadGame
 # currently importing from travel inside functions as a workaround
 # move the most common implicit verbs into their own module?
 
+_object_getattribute = object.__getattribute__
+
+
+class VerbRegistry:
+    """
+    Holds a single shared instance of each verb class.
+
+    Verbs do not keep any state between calls, so the parser, and implicit actions,
+    reuse one instance per class rather than creating a new one every time a verb
+    is called. Use Verb.instance() to get the shared instance of a verb class.
+
+    Each instance is kept on its own class, rather than in the registry, so that a
+    verb class defined by a game, and its instance, are freed with the game.
+    """
+
+    def instance(self, verb_class):
+        """
+        Get the shared instance of verb_class, creating it on first use
+        """
+        # looked up in the class's own __dict__, as a subclass has its own instance
+        verb = verb_class.__dict__.get("_shared_instance")
+        if verb is None:
+            verb = verb_class()
+            verb_class._shared_instance = verb
+        return verb
+
+
+registry = VerbRegistry()
+
 
 class Verb(ABC):
     """Verb objects represent actions the player can take """
@@ -62,6 +93,53 @@ class Verb(ABC):
 
     failure_msg = "You cannot do that"
 
+    def __init__(self):
+        # names of the Dobj/Iobj override methods, in the form wordVerbDobj
+        name = self.__class__.__name__
+        name = name[:1].lower() + name[1:]
+        self.dobj_override_name = f"{name}Dobj"
+        self.iobj_override_name = f"{name}Iobj"
+
+    @classmethod
+    def instance(cls):
+        """
+        Get the shared instance of this verb from the verb registry
+        """
+        return registry.instance(cls)
+
+    @staticmethod
+    def _getTargetAttr(game, target, name):
+        """
+        Equivalent to getattr(target, name, None), for looking up verb overrides and
+        pre/main funcs on a grammatical object.
+
+        Whether the target's class defines the attribute is cached in the game, per
+        class, so the lookup is skipped entirely for the common case where no
+        override exists. Overrides set directly on an instance are always found. The
+        instance's attributes are checked without using its __dict__ attribute, so
+        that naming an object does not give a copy on write object its own copy of
+        its prototype's attributes (see prototype.py).
+        """
+        try:
+            attributes = _object_getattribute(target, "__dict__")
+        except AttributeError:
+            # a string object, for verbs that take text
+            attributes = None
+        if attributes:
+            if name in attributes:
+                return attributes[name]
+            if is_shell(target) and name in attributes["_prototype"].__dict__:
+                return getattr(target, name)
+        cache = game._dispatch_cache
+        key = (type(target), name)
+        try:
+            defined = cache[key]
+        except KeyError:
+            defined = cache[key] = hasattr(type(target), name)
+        if not defined:
+            return None
+        return getattr(target, name, None)
+
     def verbFunc(self, game, skip=False):
         """
         The default verb function
@@ -190,18 +268,18 @@ class DirectObjectVerb(Verb):
         # TODO(#126): API for verbFunc overrides causing main verb func to evaluate vs
         #             immediately return is unclear & arbitrary. refactor
 
-        pre = getattr(dobj, self.pre_func_name, None) if self.pre_func_name else None
+        pre = (
+            self._getTargetAttr(game, dobj, self.pre_func_name)
+            if self.pre_func_name
+            else None
+        )
 
         if pre and not pre(event="turn"):
             return False
 
         if not skip:
             abort_main_verb_func = False
-            dfunc = getattr(
-                dobj,
-                f"{self.__class__.__name__[:1].lower() + self.__class__.__name__[1:]}Dobj",
-                None,
-            )
+            dfunc = self._getTargetAttr(game, dobj, self.dobj_override_name)
             if dfunc:
                 abort_main_verb_func = dfunc(game)
             if abort_main_verb_func:
@@ -217,7 +295,7 @@ class DirectObjectVerb(Verb):
         if not self.main_func_name:
             return
 
-        func = getattr(dobj, self.main_func_name, None)
+        func = self._getTargetAttr(game, dobj, self.main_func_name)
 
         if not func:
             game.addTextToEvent("turn", self.failure_msg.format(dobj=dobj))
@@ -260,12 +338,16 @@ class IndirectObjectVerb(DirectObjectVerb):
         """
         if self.iobj_target:
             pre = (
-                getattr(iobj, self.pre_func_name, None) if self.pre_func_name else None
+                self._getTargetAttr(game, iobj, self.pre_func_name)
+                if self.pre_func_name
+                else None
             )
             item = dobj
         else:
             pre = (
-                getattr(dobj, self.pre_func_name, None) if self.pre_func_name else None
+                self._getTargetAttr(game, dobj, self.pre_func_name)
+                if self.pre_func_name
+                else None
             )
             item = iobj
 
@@ -273,16 +355,8 @@ class IndirectObjectVerb(DirectObjectVerb):
             return False
         if not skip:
             abort_main_verb_func = False
-            dfunc = getattr(
-                dobj,
-                f"{self.__class__.__name__[:1].lower() + self.__class__.__name__[1:]}Dobj",
-                None,
-            )
-            ifunc = getattr(
-                iobj,
-                f"{self.__class__.__name__[:1].lower() + self.__class__.__name__[1:]}Iobj",
-                None,
-            )
+            dfunc = self._getTargetAttr(game, dobj, self.dobj_override_name)
+            ifunc = self._getTargetAttr(game, iobj, self.iobj_override_name)
             if dfunc:
                 abort_main_verb_func = dfunc(game, iobj)
             if ifunc:
@@ -307,9 +381,9 @@ class IndirectObjectVerb(DirectObjectVerb):
             return
 
         if self.iobj_target:
-            func = getattr(iobj, self.main_func_name, None)
+            func = self._getTargetAttr(game, iobj, self.main_func_name)
         else:
-            func = getattr(dobj, self.main_func_name, None)
+            func = self._getTargetAttr(game, dobj, self.main_func_name)
 
         if not func:
             game.addTextToEvent("turn", self.failure_msg.format(dobj=dobj, iobj=iobj))
@@ -383,7 +457,7 @@ class GetAllVerb(Verb):
             if game.me.containsItem(item):
                 items_already += 1
             else:
-                GetVerb().verbFunc(game, item)
+                GetVerb.instance().verbFunc(game, item)
 
         if len(items_found) == items_already:
             game.addTextToEvent("turn", "There are no obvious items here to take. ")
@@ -429,7 +503,7 @@ class RemoveFromVerb(IndirectObjectVerb):
             game.addTextToEvent(
                 "turn", f"(First trying to open {iobj.lowNameArticle(True)})"
             )
-            success = OpenVerb().verbFunc(game, iobj)
+            success = OpenVerb.instance().verbFunc(game, iobj)
             if not success:
                 return False
         if not dobj.invItem:
@@ -530,7 +604,7 @@ class DropAllVerb(Verb):
 
         for item in inv:
             if game.me.containsItem(item):
-                part = DropVerb()
+                part = DropVerb.instance()
                 part.verbFunc(game, item)
                 dropped = dropped + 1
         if dropped == 0:
@@ -1149,7 +1223,7 @@ class LieDownVerb(Verb):
             game.addTextToEvent("turn", "You are already lying down. ")
             return True
 
-        climb_out = ClimbOutVerb()
+        climb_out = ClimbOutVerb.instance()
 
         while (
             isinstance(game.me.location, Thing)
@@ -1208,7 +1282,7 @@ class SitDownVerb(Verb):
             game.addTextToEvent("turn", "You are already sitting. ")
             return True
 
-        climb_out = ClimbOutVerb()
+        climb_out = ClimbOutVerb.instance()
 
         while (
             isinstance(game.me.location, Thing)
@@ -1285,10 +1359,8 @@ class StandOnVerb(DirectObjectVerb):
                 "turn",
                 "You stand on " + dobj.getArticle(True) + dobj.verbose_name + ". ",
             )
-            if game.me in game.me.location.contains[game.me.ix]:
-                game.me.location.contains[game.me.ix].remove(game.me)
-                if game.me.location.contains[game.me.ix] == []:
-                    del game.me.location.contains[game.me.ix]
+            if game.me.location.topLevelContainsItem(game.me):
+                game.me.location.removeContains(game.me)
             dobj.addThing(game.me)
             game.me.makeStanding()
         else:
@@ -1362,10 +1434,8 @@ class SitOnVerb(DirectObjectVerb):
             game.addTextToEvent(
                 "turn", "You sit on " + dobj.getArticle(True) + dobj.verbose_name + ". "
             )
-            if game.me in game.me.location.contains[game.me.ix]:
-                game.me.location.contains[game.me.ix].remove(game.me)
-                if game.me.location.contains[game.me.ix] == []:
-                    del game.me.location.contains[game.me.ix]
+            if game.me.location.topLevelContainsItem(game.me):
+                game.me.location.removeContains(game.me)
             dobj.addThing(game.me)
             game.me.makeSitting()
         else:
@@ -1444,10 +1514,8 @@ class LieOnVerb(DirectObjectVerb):
             game.addTextToEvent(
                 "turn", "You lie on " + dobj.getArticle(True) + dobj.verbose_name + ". "
             )
-            if game.me in game.me.location.contains[game.me.ix]:
-                game.me.location.contains[game.me.ix].remove(game.me)
-                if game.me.location.contains[game.me.ix] == []:
-                    del game.me.location.contains[game.me.ix]
+            if game.me.location.topLevelContainsItem(game.me):
+                game.me.location.removeContains(game.me)
             dobj.addThing(game.me)
             game.me.makeLying()
             return True
@@ -1494,10 +1562,8 @@ class SitInVerb(DirectObjectVerb):
             game.addTextToEvent(
                 "turn", "You sit in " + dobj.getArticle(True) + dobj.verbose_name + ". "
             )
-            if game.me in game.me.location.contains[game.me.ix]:
-                game.me.location.contains[game.me.ix].remove(game.me)
-                if game.me.location.contains[game.me.ix] == []:
-                    del game.me.location.contains[game.me.ix]
+            if game.me.location.topLevelContainsItem(game.me):
+                game.me.location.removeContains(game.me)
             dobj.addThing(game.me)
             game.me.makeSitting()
         else:
@@ -1544,10 +1610,8 @@ class StandInVerb(DirectObjectVerb):
                 "turn",
                 "You stand in " + dobj.getArticle(True) + dobj.verbose_name + ". ",
             )
-            if game.me in game.me.location.contains[game.me.ix]:
-                game.me.location.contains[game.me.ix].remove(game.me)
-                if game.me.location.contains[game.me.ix] == []:
-                    del game.me.location.contains[game.me.ix]
+            if game.me.location.topLevelContainsItem(game.me):
+                game.me.location.removeContains(game.me)
             dobj.addThing(game.me)
             game.me.makeStanding()
             return True
@@ -1603,10 +1667,8 @@ class LieInVerb(DirectObjectVerb):
             game.addTextToEvent(
                 "turn", "You lie in " + dobj.getArticle(True) + dobj.verbose_name + ". "
             )
-            if game.me in game.me.location.contains[game.me.ix]:
-                game.me.location.contains[game.me.ix].remove(game.me)
-                if game.me.location.contains[game.me.ix] == []:
-                    del game.me.location.contains[game.me.ix]
+            if game.me.location.topLevelContainsItem(game.me):
+                game.me.location.removeContains(game.me)
             dobj.addThing(game.me)
             game.me.makeLying()
             return True
@@ -1651,15 +1713,15 @@ class ClimbOnVerb(DirectObjectVerb):
                 game.addTextToEvent("turn", "You can't climb up that. ")
                 return False
         elif isinstance(dobj, Surface) and dobj.can_contain_standing_player:
-            redirect = StandOnVerb()
+            redirect = StandOnVerb.instance()
             redirect.verbFunc(game, dobj)
             return True
         elif isinstance(dobj, Surface) and dobj.can_contain_sitting_player:
-            redirect = SitOnVerb()
+            redirect = SitOnVerb.instance()
             redirect.verbFunc(game, dobj)
             return True
         elif isinstance(dobj, Surface) and dobj.can_contain_lying_player:
-            redirect = LieOnVerb()
+            redirect = LieOnVerb.instance()
             redirect.verbFunc(game, dobj)
             return True
 
@@ -1853,15 +1915,15 @@ class ClimbInVerb(DirectObjectVerb):
                 return False
 
             if dobj.can_contain_standing_player:
-                redirect = StandInVerb()
+                redirect = StandInVerb.instance()
                 return redirect.verbFunc(game, dobj)
 
             elif dobj.can_contain_sitting_player:
-                redirect = SitInVerb()
+                redirect = SitInVerb.instance()
                 return redirect.verbFunc(game, dobj)
 
             elif dobj.can_contain_lying_player:
-                redirect = LieInVerb()
+                redirect = LieInVerb.instance()
                 return redirect.verbFunc(game, dobj)
 
         game.addTextToEvent(
@@ -1996,7 +2058,7 @@ class OpenVerb(DirectObjectVerb):
             )
             dobj.makeOpen()
             if isinstance(dobj, Container):
-                after = LookInVerb()
+                after = LookInVerb.instance()
                 after.verbFunc(game, dobj)
             return True
 
@@ -2074,9 +2136,9 @@ class ExitVerb(Verb):
 
         out_loc = game.me.getOutermostLocation()
         if isinstance(game.me.location, Container) or isinstance(game.me, UnderSpace):
-            ClimbOutOfVerb().verbFunc(game, game.me.location)
+            ClimbOutOfVerb.instance().verbFunc(game, game.me.location)
         if isinstance(game.me.location, Surface):
-            ClimbDownFromVerb().verbFunc(game, game.me.location)
+            ClimbDownFromVerb.instance().verbFunc(game, game.me.location)
         elif out_loc.exit:
             travelOut(game)
         else:
@@ -2143,7 +2205,7 @@ class UnlockVerb(DirectObjectVerb):
                                 )
                                 # dobj.lock_obj.key_obj.location.removeThing(dobj.lock_obj.key_obj)
                                 # game.me.addThing(dobj.lock_obj.key_obj)
-                                before = RemoveFromVerb()
+                                before = RemoveFromVerb.instance()
                                 before.verbFunc(
                                     game.me,
                                     game.app,
@@ -2203,7 +2265,7 @@ class UnlockVerb(DirectObjectVerb):
                             )
                             # dobj.key_obj.location.removeThing(dobj.key_obj)
                             # game.me.addThing(dobj.key_obj)
-                            before = RemoveFromVerb()
+                            before = RemoveFromVerb.instance()
                             before.verbFunc(game, dobj.key_obj, dobj.key_obj.location)
                         game.addTextToEvent(
                             "turn",
@@ -2257,7 +2319,7 @@ class LockVerb(DirectObjectVerb):
 
         if isinstance(dobj, Container) or isinstance(dobj, Door):
             if dobj.is_open:
-                if not CloseVerb().verbFunc(game, dobj):
+                if not CloseVerb.instance().verbFunc(game, dobj):
                     game.addTextToEvent(
                         "turn", "Could not close " + dobj.verbose_name + ". "
                     )
@@ -2286,7 +2348,7 @@ class LockVerb(DirectObjectVerb):
                                 )
                                 # dobj.lock_obj.key_obj.location.removeThing(dobj.lock_obj.key_obj)
                                 # game.me.addThing(dobj.lock_obj.key_obj)
-                                before = RemoveFromVerb()
+                                before = RemoveFromVerb.instance()
                                 before.verbFunc(
                                     game.me,
                                     game.app,
@@ -2352,7 +2414,7 @@ class LockVerb(DirectObjectVerb):
                             )
                             # dobj.key_obj.location.removeThing(dobj.key_obj)
                             # game.me.addThing(dobj.key_obj)
-                            before = RemoveFromVerb()
+                            before = RemoveFromVerb.instance()
                             before.verbFunc(game, dobj.key_obj, dobj.key_obj.location)
                         game.addTextToEvent(
                             "turn",
@@ -2751,7 +2813,7 @@ class UseVerb(DirectObjectVerb):
             return ret
 
         if isinstance(dobj, LightSource):
-            redirect = LightVerb()
+            redirect = LightVerb.instance()
             return redirect(game, dobj)
 
         elif isinstance(dobj, Key):
@@ -2763,7 +2825,7 @@ class UseVerb(DirectObjectVerb):
             game.parser.command.ambiguous = True
 
         elif isinstance(dobj, Transparent):
-            redirect = LookThroughVerb()
+            redirect = LookThroughVerb.instance()
             return redirect.verbFunc(game, dobj)
 
         elif dobj.connection:
@@ -2886,7 +2948,7 @@ class BuyVerb(DirectObjectVerb):
         elif len(people) == 0:
             return False
 
-        redirect = BuyFromVerb()
+        redirect = BuyFromVerb.instance()
 
         return redirect.verbFunc(game, dobj, people[0])
 
@@ -2974,7 +3036,7 @@ class SellVerb(DirectObjectVerb):
         if len(people) == 1:
             # ask the only actor in the room
             iobj = people[0]
-            redirect = SellToVerb()
+            redirect = SellToVerb.instance()
             return redirect.verbFunc(game, dobj, iobj)
 
         if len(people) > 1:
@@ -3101,12 +3163,18 @@ class SaveVerb(Verb):
     def verbFunc(self, game):
         f = game.app.saveFilePrompt(".sav", "Save files", "Enter a file to save to")
 
-        if f:
-            SaveGame(game, f)
-            game.addTextToEvent("turn", "Game saved.")
-            return True
-        game.addTextToEvent("turn", "Could not save game.")
-        return False
+        if not f:
+            game.addTextToEvent("turn", "Could not save game.")
+            return False
+        # the file is written in the background. The app's saveFinished method is
+        # called once it has been, and a failure is reported on the next turn
+        if not game.saveInBackground(f):
+            game.addTextToEvent(
+                "turn", "Still saving an earlier game. Try again in a moment."
+            )
+            return False
+        game.addTextToEvent("turn", "Saving game.")
+        return True
 
 
 # LOAD
@@ -3117,17 +3185,26 @@ class LoadVerb(Verb):
     allow_in_sequence = True
 
     def verbFunc(self, game):
+        from .exceptions import DeserializationError
+        from .serializer import LoadGame
+
         f = game.app.openFilePrompt(".sav", "Save files", "Enter a file to load")
 
         if not f:
             game.addTextToEvent("turn", "Choose a valid save file to load a game.")
             return False
 
+        if game.saves:
+            # the file may still be being written
+            game.saves.wait()
         try:
             l = LoadGame(game, f)
         except FileNotFoundError:
             game.addTextToEvent("turn", f"File {f} does not exist.")
             return False
+        except DeserializationError:
+            game.addTextToEvent("turn", "Cannot load game file.")
+            return False
 
         if not l.is_valid():
             game.addTextToEvent("turn", "Cannot load game file.")
@@ -3138,6 +3215,61 @@ class LoadVerb(Verb):
         return True
 
 
+# UNDO
+# intransitive verb
+class UndoVerb(Verb):
+    word = "undo"
+    syntax = [["undo"]]
+
+    allow_in_sequence = True
+
+    def verbFunc(self, game, turns=1):
+        """
+        Undo the last turn, or the last `turns` turns
+        """
+        if game.changes is None or game.changes.journal is None:
+            game.addTextToEvent("turn", "Undo is not available in this game. ")
+            return False
+
+        undone = game.undo(turns)
+        if not undone:
+            game.addTextToEvent("turn", "There is nothing to undo. ")
+            return False
+        if undone == 1:
+            game.addTextToEvent("turn", "Previous turn undone. ")
+        else:
+            game.addTextToEvent("turn", f"{undone} turns undone. ")
+        game.me.getOutermostLocation().describe(game)
+        return True
+
+
+# UNDO N
+# transitive verb, number as direct object
+class UndoTurnsVerb(DirectObjectVerb):
+    word = "undo"
+    list_by_default = False
+    syntax = [["undo", "<dobj>"]]
+    hasStrDobj = True
+    dscope = "text"
+
+    allow_in_sequence = True
+
+    def verbFunc(self, game, dobj):
+        """
+        Undo a number of turns
+        """
+        try:
+            turns = int(dobj)
+        except ValueError:
+            turns = 0
+        if turns < 1:
+            game.addTextToEvent(
+                "turn", "Give a number of turns to undo, for instance UNDO 3. "
+            )
+            return False
+        return UndoVerb.instance().verbFunc(game, turns)
+
+
 # BREAK
 # transitive verb, no indirect object
 class BreakVerb(DirectObjectVerb):
@@ -3317,7 +3449,7 @@ class PushVerb(DirectObjectVerb):
             return ret
 
         if isinstance(dobj, Pressable):
-            redirect = PressVerb()
+            redirect = PressVerb.instance()
             redirect.verbFunc(game, dobj)
         else:
             game.addTextToEvent(
@@ -3543,7 +3675,7 @@ class FillFromVerb(IndirectObjectVerb):
             game.addTextToEvent(
                 "turn", "(First attempting to empty " + dobj.lowNameArticle(True) + ")",
             )
-            success = PourOutVerb().verbFunc(game, dobj)
+            success = PourOutVerb.instance().verbFunc(game, dobj)
 
             if not success:
                 return False
@@ -3594,22 +3726,97 @@ class FillFromVerb(IndirectObjectVerb):
         return liquid.fillVessel(dobj)
 
 
+class VerbMap(MutableMapping):
+    """
+    The map from verb words to verb classes for a single game.
+
+    Reads fall through to the shared base verb set, which is built once per process
+    and never modified. Writes (including IFPGame.addVerb) go to an overlay owned by
+    this game only, so verbs added by one game never leak into another.
+
+    The first time a word is read, the game is given its own list of the word's
+    verbs from the base verb set, in the overlay, so the list can be changed in
+    place, as with `game.verbs[word].append(MyVerb)`.
+
+    :param base: the shared base verb set
+    :type base: mapping of str to tuple
+    """
+
+    def __init__(self, base):
+        self._base = base
+        self._overlay = {}
+        self._removed = set()
+
+    def __getitem__(self, key):
+        try:
+            return self._overlay[key]
+        except KeyError:
+            pass
+        if key in self._removed:
+            raise KeyError(key)
+        value = self._overlay[key] = list(self._base[key])
+        return value
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+        self._removed.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._overlay.pop(key, None)
+        if key in self._base:
+            self._removed.add(key)
+
+    def __contains__(self, key):
+        if key in self._overlay:
+            return True
+        return key in self._base and key not in self._removed
+
+    def __iter__(self):
+        yield from self._overlay
+        for key in self._base:
+            if key not in self._overlay and key not in self._removed:
+                yield key
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+
+_base_verbset = None
+_base_verb_classes = None
+
+
 def get_base_verbset():
-    verbs = [
-        v
-        for v in (
-            Verb.__subclasses__()
-            + DirectObjectVerb.__subclasses__()
-            + IndirectObjectVerb.__subclasses__()
-        )
-        if v.word
-    ]
+    """
+    Get the shared, read only map of verb words to the built in verb classes.
+
+    The map is built the first time it is needed, and rebuilt only if new direct
+    subclasses of Verb, DirectObjectVerb or IndirectObjectVerb have been defined
+    since.
+    """
+    global _base_verbset, _base_verb_classes
+
+    classes = tuple(
+        Verb.__subclasses__()
+        + DirectObjectVerb.__subclasses__()
+        + IndirectObjectVerb.__subclasses__()
+    )
+    if _base_verbset is not None and classes == _base_verb_classes:
+        return _base_verbset
 
     verb_map = {}
-    for v in verbs:
+    for v in classes:
+        if not v.word:
+            continue
         for key in [v.word, *v.synonyms]:
             if key in verb_map:
                 verb_map[key].append(v)
             else:
                 verb_map[key] = [v]
-    return verb_map
+
+    _base_verbset = MappingProxyType(
+        {key: tuple(verbs) for key, verbs in verb_map.items()}
+    )
+    _base_verb_classes = classes
+    return _base_verbset
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import uuid
+from unittest import IsolatedAsyncioTestCase
+
+from intficpy.async_app import END_OF_TURN, AsyncApp, AsyncServer
+
+from .test_server import build
+
+
+def text(events):
+    return [t for event in events for t in event.text]
+
+
+class PromptApp(AsyncApp):
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.prompts = []
+
+    async def saveFilePromptAsync(self, extension, filetype_desc, msg):
+        await asyncio.sleep(0)
+        self.prompts.append(msg)
+        return self.path
+
+    async def openFilePromptAsync(self, extension, filetype_desc, msg):
+        await asyncio.sleep(0)
+        self.prompts.append(msg)
+        return self.path
+
+
+class TestAsyncApp(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            f"_ifp_tests_saveload__{uuid.uuid4()}.sav",
+        )
+        self.addCleanup(lambda: os.path.exists(self.path) and os.remove(self.path))
+        self.app = PromptApp(self.path)
+        self.game = build(self.app)
+        self.opening = await self.app.start()
+
+    def _coin(self):
+        return self.game.nouns["coin"][0]
+
+    async def test_start_returns_opening_events(self):
+        self.assertIn("Welcome. ", text(self.opening))
+
+    async def test_turn_returns_events(self):
+        events = await self.app.turn("take coin")
+
+        self.assertIn("You take the coin. ", text(events))
+        self.assertIs(self._coin().location, self.game.me)
+
+    async def test_stream_yields_events_of_turn(self):
+        events = []
+        async for event in self.app.stream("take coin"):
+            events.append(event)
+
+        self.assertIn("You take the coin. ", text(events))
+        self.assertEqual(self.app.takeEvents(), [])
+
+    async def test_closing_stream_early_finishes_turn(self):
+        stream = self.app.stream("take coin")
+        await stream.__anext__()
+        await stream.aclose()
+
+        self.assertFalse(self.app.lock.locked())
+        self.assertIs(self._coin().location, self.game.me)
+
+    async def test_turns_are_played_one_at_a_time(self):
+        start = self.game.daemons.turn
+
+        results = await asyncio.gather(*(self.app.turn("look") for i in range(10)))
+
+        self.assertEqual(self.game.daemons.turn, start + 10)
+        for events in results:
+            self.assertIn("A plain room. ", "".join(text(events)))
+
+    async def test_file_prompts_are_awaited(self):
+        await self.app.turn("take coin")
+        events = await self.app.turn("save")
+        self.assertIn("Saving game.", text(events))
+        self.game.saves.wait()
+        await self.app.turn("drop coin")
+
+        events = await self.app.turn("load")
+
+        self.assertIn("Game loaded.", text(events))
+        self.assertEqual(len(self.app.prompts), 2)
+        self.assertIs(self._coin().location, self.game.me)
+
+    async def test_file_prompt_outside_turn_raises(self):
+        with self.assertRaises(RuntimeError):
+            self.app.saveFilePrompt(".sav", "Save files", "Enter a file to save to")
+
+    async def test_save_and_load(self):
+        await self.app.turn("take coin")
+        await self.app.save(self.path)
+        await self.app.turn("drop coin")
+
+        self.assertTrue(await self.app.load(self.path))
+
+        self.assertIs(self._coin().location, self.game.me)
+
+
+class TestAsyncServer(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = AsyncServer(build)
+        listening = await self.server.start()
+        self.port = listening.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def _read_turn(self, reader):
+        lines = []
+        while True:
+            line = (await reader.readline()).decode().rstrip("\n")
+            if line == END_OF_TURN:
+                return lines
+            lines.append(line)
+
+    async def test_play_over_connection(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+
+        self.assertIn("Welcome. ", await self._read_turn(reader))
+        writer.write(b"take coin\n")
+        self.assertIn("You take the coin. ", await self._read_turn(reader))
+        self.assertEqual(len(self.server.sessions), 1)
+
+        writer.write(b"quit\n")
+        self.assertEqual(await reader.read(), b"")
+        writer.close()
+        await writer.wait_closed()
+        self.assertEqual(len(self.server.sessions), 0)
+
+    async def test_connections_play_their_own_games(self):
+        first = await asyncio.open_connection("127.0.0.1", self.port)
+        second = await asyncio.open_connection("127.0.0.1", self.port)
+        for reader, writer in (first, second):
+            await self._read_turn(reader)
+
+        for reader, writer in (first, second):
+            writer.write(b"take coin\n")
+            self.assertIn("You take the coin. ", await self._read_turn(reader))
+
+        for reader, writer in (first, second):
+            writer.close()
+            await writer.wait_closed()
@@ -0,0 +1,242 @@
+import os
+import uuid
+
+from intficpy.actor import Player
+from intficpy.autosave import journal_path, read_journal
+from intficpy.ifp_game import IFPGame
+from intficpy.room import Room
+from intficpy.serializer import SaveGame, LoadGame
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from . import helpers
+from .helpers import IFPTestCase
+
+
+def build_game():
+    """
+    Build a small world: a room, holding the player, a box, and a widget
+    """
+    app = helpers.TestApp()
+    game = IFPGame(app, main=__name__)
+    me = Player(game)
+    room = Room(game, "room", "desc")
+    room.addThing(me)
+    game.setPlayer(me)
+    box = Container(game, "box")
+    room.addThing(box)
+    widget = Thing(game, "widget")
+    widget.invItem = True
+    room.addThing(widget)
+    game.initGame()
+    return game, room, box, widget
+
+
+class TestAutosave(IFPTestCase):
+    def setUp(self):
+        self.game, self.room, self.box, self.widget = build_game()
+        self.me = self.game.me
+        self.path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            f"_ifp_tests_autosave__{uuid.uuid4()}.sav",
+        )
+        self.addCleanup(self._remove)
+
+    def _remove(self):
+        self.game.stopAutosave()
+        for path in (self.path, journal_path(self.path)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _wait(self):
+        if self.game.autosave is not None:
+            self.game.autosave.wait()
+
+    def _records(self):
+        self._wait()
+        with open(self.path, "rb") as f:
+            return read_journal(journal_path(self.path), f.read())
+
+    def _recover(self):
+        self._wait()
+        game, room, box, widget = build_game()
+        replayed = game.recoverAutosave(self.path)
+        return game, replayed
+
+    def test_recover_replays_changes(self):
+        self.game.enableAutosave(self.path)
+        self.game.turnMain("get widget")
+        self.widget.colour = "red"
+        self.game.turnMain("look")
+
+        game, replayed = self._recover()
+
+        self.assertEqual(replayed, 2)
+        widget = game.ifp_objects[self.widget.ix]
+        self.assertIs(widget.location, game.me)
+        self.assertItemExactlyOnceIn(widget, game.me.contains, "widget")
+        self.assertItemNotIn(widget, game.ifp_objects[self.room.ix].contains, "room")
+        self.assertItemIn(widget, game.ifp_objects[self.room.ix].sub_contains, "room")
+        self.assertEqual(widget.colour, "red")
+        self.assertEqual(game.daemons.turn, self.game.daemons.turn)
+
+    def test_recover_replays_deleted_attribute(self):
+        self.widget.colour = "red"
+        self.game.enableAutosave(self.path)
+        del self.widget.colour
+        self.widget.description = "A widget. "
+        self.game.turnMain("look")
+
+        game, replayed = self._recover()
+
+        self.assertEqual(replayed, 1)
+        self.assertNotIn("colour", game.ifp_objects[self.widget.ix].__dict__)
+
+    def test_records_written_every_n_turns(self):
+        self.game.enableAutosave(self.path, turns=3)
+        for i in range(7):
+            self.widget.colour = f"colour {i}"
+            self.game.turnMain("look")
+
+        self.assertEqual(len(self._records()), 2)
+        game, replayed = self._recover()
+        self.assertEqual(game.ifp_objects[self.widget.ix].colour, "colour 5")
+
+    def test_changes_forgotten_by_the_tracker_save_new_snapshot(self):
+        self.game.change_turns = 2
+        self.game.enableAutosave(self.path, turns=5)
+        self.game.turnMain("get widget")
+        for i in range(4):
+            self.game.turnMain("look")
+
+        self.assertEqual(self._records(), [])
+        game, replayed = self._recover()
+        self.assertIs(game.ifp_objects[self.widget.ix].location, game.me)
+
+    def test_journal_compacted_into_snapshot(self):
+        self.game.enableAutosave(self.path, compact_every=2)
+        for i in range(4):
+            self.widget.colour = f"colour {i}"
+            self.game.turnMain("look")
+
+        self.assertEqual(len(self._records()), 1)
+        game, replayed = self._recover()
+        self.assertEqual(replayed, 1)
+        self.assertEqual(game.ifp_objects[self.widget.ix].colour, "colour 3")
+
+    def test_partly_written_record_is_not_replayed(self):
+        self.game.enableAutosave(self.path)
+        self.widget.colour = "red"
+        self.game.turnMain("look")
+        self.widget.colour = "blue"
+        self.game.turnMain("look")
+        self._wait()
+        journal = journal_path(self.path)
+        with open(journal, "r+b") as f:
+            f.truncate(os.path.getsize(journal) - 3)
+
+        game, replayed = self._recover()
+
+        self.assertEqual(replayed, 1)
+        self.assertEqual(game.ifp_objects[self.widget.ix].colour, "red")
+
+    def test_journal_for_another_snapshot_is_ignored(self):
+        self.game.enableAutosave(self.path)
+        self.widget.colour = "red"
+        self.game.turnMain("look")
+        self.game.stopAutosave()
+        SaveGame(self.game, self.path)
+
+        self.assertEqual(self._records(), [])
+        game, replayed = self._recover()
+        self.assertEqual(replayed, 0)
+
+    def test_undo_saves_new_snapshot(self):
+        self.game.enableUndo()
+        self.game.enableAutosave(self.path)
+        self.game.turnMain("get widget")
+        self.game.turnMain("undo")
+
+        self.assertEqual(self._records(), [])
+        game, replayed = self._recover()
+        widget = game.ifp_objects[self.widget.ix]
+        self.assertIs(widget.location, game.ifp_objects[self.room.ix])
+
+    def test_loading_saves_new_snapshot(self):
+        other = self.path[:-4] + "_other.sav"
+        self.addCleanup(os.remove, other)
+        SaveGame(self.game, other)
+        self.game.enableAutosave(self.path)
+        self.game.turnMain("get widget")
+
+        l = LoadGame(self.game, other, lazy=False)
+        self.assertTrue(l.is_valid())
+        l.load()
+        self.game.turnMain("look")
+
+        self.assertEqual(self._records(), [])
+        game, replayed = self._recover()
+        widget = game.ifp_objects[self.widget.ix]
+        self.assertIs(widget.location, game.ifp_objects[self.room.ix])
+
+    def test_save_loaded_lazily_becomes_the_snapshot(self):
+        other = self.path[:-4] + "_other.sav"
+        self.addCleanup(os.remove, other)
+        self.widget.colour = "red"
+        SaveGame(self.game, other)
+        self.widget.colour = "blue"
+        self.game.enableAutosave(self.path)
+        self.game.turnMain("look")
+
+        l = LoadGame(self.game, other)
+        self.assertTrue(l.is_valid())
+        l.load()
+        self.box.colour = "green"
+        self.game.turnMain("wait")
+        self._wait()
+
+        # the snapshot is the save file, so the widget has not been decoded
+        self.assertIn(self.widget, self.game.deferred)
+        with open(self.path, "rb") as f, open(other, "rb") as saved:
+            self.assertEqual(f.read(), saved.read())
+        game, replayed = self._recover()
+        self.assertEqual(replayed, 1)
+        self.assertEqual(game.ifp_objects[self.widget.ix].colour, "red")
+        self.assertEqual(game.ifp_objects[self.box.ix].colour, "green")
+
+    def test_record_keeps_the_state_of_its_turn(self):
+        self.game.enableAutosave(self.path)
+        self.widget.colour = "red"
+        self.game.turnMain("look")
+        self.widget.colour = "blue"
+
+        game, replayed = self._recover()
+
+        self.assertEqual(replayed, 1)
+        self.assertEqual(game.ifp_objects[self.widget.ix].colour, "red")
+
+    def test_record_that_cannot_be_written_saves_new_snapshot(self):
+        self.game.enableAutosave(self.path)
+        autosave = self.game.autosave
+        append = autosave.append
+
+        def fail(encoded):
+            raise OSError("disk full")
+
+        autosave.append = fail
+        self.widget.colour = "red"
+        self.game.turnMain("look")
+        self._wait()
+        self.assertTrue(autosave.needs_snapshot)
+        self.assertIsInstance(autosave.error, OSError)
+
+        autosave.append = append
+        self.game.turnMain("look")
+
+        self.assertEqual(self._records(), [])
+        game, replayed = self._recover()
+        self.assertEqual(game.ifp_objects[self.widget.ix].colour, "red")
+
+    def test_nothing_to_recover(self):
+        game, replayed = self._recover()
+        self.assertIsNone(replayed)
@@ -0,0 +1,134 @@
+from intficpy.ifp_game import IFPGame
+from intficpy.room import Room
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .helpers import IFPTestCase
+
+
+class TestChangeTracking(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.box = Container(self.game, "box")
+        self.widget = Thing(self.game, "widget")
+        self.widget.invItem = True
+        self.start_room.addThing(self.box)
+        self.start_room.addThing(self.widget)
+        self.game.trackChanges()
+        self.addCleanup(self.game.stopTrackingChanges)
+        self.turn = self.game.daemons.turn
+
+    def test_changes_since_raises_when_not_tracking(self):
+        self.game.stopTrackingChanges()
+        with self.assertRaises(ValueError):
+            self.game.changesSince(self.turn)
+
+    def test_changes_since_raises_for_turn_before_tracking_started(self):
+        with self.assertRaises(ValueError):
+            self.game.changesSince(self.turn - 1)
+
+    def test_setting_attribute_is_recorded(self):
+        self.box.colour = "red"
+        self.assertIn((self.box, "colour"), self.game.changesSince(self.turn))
+
+    def test_deleting_attribute_is_recorded(self):
+        self.box.colour = "red"
+        self.game.turnMain("look")
+        turn = self.game.daemons.turn
+        del self.box.colour
+        self.assertIn((self.box, "colour"), self.game.changesSince(turn))
+
+    def test_changes_since_checkpoint(self):
+        self.box.colour = "red"
+        checkpoint = self.game.changes.checkpoint()
+        self.widget.colour = "blue"
+        self.game.turnMain("look")
+        self.box.size = 3
+
+        changes = self.game.changes.sinceCheckpoint(checkpoint)
+        self.assertNotIn((self.box, "colour"), changes)
+        self.assertIn((self.widget, "colour"), changes)
+        self.assertIn((self.box, "size"), changes)
+
+    def test_moving_thing_records_location_and_contents(self):
+        self.start_room.removeThing(self.widget)
+        self.box.addThing(self.widget)
+        changes = self.game.changesSince(self.turn)
+        self.assertIn((self.widget, "location"), changes)
+        self.assertIn((self.start_room, "contains"), changes)
+        self.assertIn((self.box, "contains"), changes)
+
+    def test_changes_are_recorded_by_turn(self):
+        self.box.colour = "red"
+        self.game.turnMain("get widget")
+        after_first = self.game.daemons.turn
+        self.game.turnMain("look")
+
+        self.assertIn((self.widget, "location"), self.game.changesSince(self.turn))
+        self.assertIn((self.me, "contains"), self.game.changesSince(self.turn))
+        self.assertNotIn((self.box, "colour"), self.game.changesSince(after_first))
+        self.assertNotIn((self.widget, "location"), self.game.changesSince(after_first))
+        self.assertEqual(self.game.changesSince(self.game.daemons.turn), set())
+
+    def test_forget_discards_earlier_turns(self):
+        self.box.colour = "red"
+        self.game.turnMain("look")
+        self.game.changes.forget(self.game.daemons.turn)
+        with self.assertRaises(ValueError):
+            self.game.changesSince(self.turn)
+        self.assertEqual(self.game.changesSince(self.game.daemons.turn), set())
+
+    def test_turns_older_than_change_turns_are_forgotten(self):
+        self.game.change_turns = 3
+        self.game.enableUndo(5)
+        for i in range(20):
+            self.game.turnMain("look")
+
+        self.assertLessEqual(len(self.game.changes.turns), 6)
+        self.game.changesSince(self.game.daemons.turn - 5)
+        with self.assertRaises(ValueError):
+            self.game.changesSince(self.game.daemons.turn - 6)
+
+    def test_untracked_game_records_nothing(self):
+        other = IFPGame(type(self.app)(), main=__name__)
+        Room(other, "room", "desc").colour = "red"
+        self.assertIsNone(other.changes)
+
+
+class TestTrackedObjects(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.box = Container(self.game, "box")
+        self.other = IFPGame(type(self.app)(), main=__name__)
+        self.room = Room(self.other, "room", "desc")
+
+    def test_other_games_keep_their_classes(self):
+        self.game.trackChanges()
+        self.addCleanup(self.game.stopTrackingChanges)
+
+        self.assertIs(type(self.room), Room)
+        self.assertIsNot(type(self.box), Container)
+        self.assertIsInstance(self.box, Container)
+        self.assertEqual(type(self.box).__name__, "Container")
+
+    def test_stopping_gives_objects_back_their_classes(self):
+        copy = self.box.copyThing()
+        self.game.trackChanges()
+        self.game.stopTrackingChanges()
+
+        self.assertIs(type(self.box), Container)
+        self.assertIs(type(copy), Container)
+
+    def test_objects_created_and_copied_while_tracking_are_tracked(self):
+        self.game.trackChanges()
+        self.addCleanup(self.game.stopTrackingChanges)
+        widget = Thing(self.game, "widget")
+        copy = self.box.copyThing()
+        turn = self.game.daemons.turn
+
+        widget.colour = "red"
+        copy.colour = "blue"
+
+        changes = self.game.changesSince(turn)
+        self.assertIn((widget, "colour"), changes)
+        self.assertIn((copy, "colour"), changes)
@@ -0,0 +1,170 @@
+import os
+import uuid
+
+from intficpy.daemons import Daemon
+from intficpy.serializer import SaveGame, LoadGame
+from intficpy.things import LightSource
+
+from .helpers import IFPTestCase
+
+
+class TestDaemonScheduling(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.runs = []
+        self.daemon = Daemon(self.game, self._daemon_func)
+
+    def _daemon_func(self, game):
+        self.runs.append(game.daemons.turn)
+
+    def _takeTurns(self, n):
+        for _ in range(n):
+            self.game.turnMain("wait")
+
+    def test_daemon_runs_every_turn_by_default(self):
+        start = self.game.daemons.turn
+        self.game.daemons.add(self.daemon)
+        self._takeTurns(3)
+        self.assertEqual(self.runs, [start + 1, start + 2, start + 3])
+
+    def test_daemon_runs_every_n_turns(self):
+        start = self.game.daemons.turn
+        self.game.daemons.add(self.daemon, every=3)
+        self._takeTurns(7)
+        self.assertEqual(self.runs, [start + 1, start + 4, start + 7])
+
+    def test_daemon_runs_once_at_turn(self):
+        at = self.game.daemons.turn + 3
+        self.game.daemons.runAt(self.daemon, at)
+        self._takeTurns(5)
+        self.assertEqual(self.runs, [at])
+        self.assertNotIn(self.daemon, self.game.daemons)
+
+    def test_daemon_runs_once_after_delay(self):
+        start = self.game.daemons.turn
+        self.game.daemons.runAfter(self.daemon, 2)
+        self._takeTurns(5)
+        self.assertEqual(self.runs, [start + 2])
+
+    def test_cannot_run_at_past_turn(self):
+        with self.assertRaises(ValueError):
+            self.game.daemons.runAt(self.daemon, self.game.daemons.turn)
+
+    def test_daemon_runs_when_condition_is_met(self):
+        self.game.daemons.addWhen(self.daemon, lambda game: game.daemons.turn % 2)
+        self._takeTurns(4)
+        self.assertEqual(len(self.runs), 2)
+        self.assertTrue(all(turn % 2 for turn in self.runs))
+
+    def test_removed_daemon_does_not_run(self):
+        self.game.daemons.add(self.daemon, every=2)
+        self.game.daemons.remove(self.daemon)
+        self._takeTurns(4)
+        self.assertEqual(self.runs, [])
+        self.assertNotIn(self.daemon, self.game.daemons)
+
+    def test_readded_daemon_runs_once_per_turn(self):
+        self.game.daemons.add(self.daemon)
+        self.game.daemons.remove(self.daemon)
+        self.game.daemons.add(self.daemon)
+        self._takeTurns(1)
+        self.assertEqual(len(self.runs), 1)
+
+    def test_daemons_due_on_same_turn_run_in_order_added(self):
+        order = []
+        first = Daemon(self.game, lambda game: order.append("first"))
+        second = Daemon(self.game, lambda game: order.append("second"))
+        self.game.daemons.runAfter(second, 2)
+        self.game.daemons.add(first, every=2)
+
+        self._takeTurns(2)
+
+        self.assertEqual(order, ["first", "second"])
+
+    def test_daemon_can_remove_itself(self):
+        removed = []
+        self.daemon.func = lambda game: game.daemons.remove(self.daemon)
+        self.daemon.onRemove = lambda: removed.append(True)
+        self.game.daemons.add(self.daemon)
+
+        self._takeTurns(2)
+
+        self.assertEqual(removed, [True])
+        self.assertNotIn(self.daemon, self.game.daemons)
+
+
+class TestConsumableLightSource(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.light = LightSource(self.game, "lamp")
+        self.light.consumable = True
+        self.light.turns_left = 7
+        self.game.me.addThing(self.light)
+
+    def test_light_warns_and_burns_out(self):
+        self.light.light(self.game)
+        self.game.turnMain("wait")
+        self.game.turnMain("wait")
+        self.assertEqual(self.light.turns_left, 5)
+        self.assertIn("5 turns left", self.app.print_stack[-1])
+
+        for _ in range(4):
+            self.game.turnMain("wait")
+        self.assertEqual(self.light.turns_left, 1)
+        self.assertTrue(self.light.is_lit)
+
+        self.game.turnMain("wait")
+        self.assertEqual(self.light.turns_left, 0)
+        self.assertFalse(self.light.is_lit)
+        self.assertNotIn(self.light.consumeLightSourceDaemon, self.game.daemons)
+
+    def test_light_is_not_run_between_warnings(self):
+        self.light.turns_left = 20
+        self.light.light(self.game)
+        self.game.turnMain("wait")
+        self.assertEqual(self.light.turns_left, 20)
+        self.assertIn(self.light.consumeLightSourceDaemon, self.game.daemons)
+
+    def test_extinguishing_light_keeps_turns_left(self):
+        self.light.turns_left = 20
+        self.light.light(self.game)
+        self.game.turnMain("wait")
+        self.game.turnMain("wait")
+
+        self.light.extinguish(self.game)
+
+        self.assertEqual(self.light.turns_left, 18)
+        self.assertNotIn(self.light.consumeLightSourceDaemon, self.game.daemons)
+
+
+class TestSaveLoadScheduledDaemon(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        FILENAME = f"_ifp_tests_saveload__{uuid.uuid4()}.sav"
+
+        path = os.path.dirname(os.path.realpath(__file__))
+        self.path = os.path.join(path, FILENAME)
+
+        self.runs = []
+        self.daemon = Daemon(self.game, lambda game: self.runs.append(True))
+        self.game.daemons.runAfter(self.daemon, 3)
+        self.due = self.game.daemons.turn + 3
+
+        SaveGame(self.game, self.path)
+        self.game.daemons.remove(self.daemon)
+
+    def test_load_restores_schedule(self):
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        l.load()
+
+        self.assertIn(self.daemon, self.game.daemons)
+        while self.game.daemons.turn < self.due - 1:
+            self.game.turnMain("wait")
+        self.assertEqual(self.runs, [])
+        self.game.turnMain("wait")
+        self.assertEqual(self.runs, [True])
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.path)
@@ -0,0 +1,281 @@
+import contextlib
+import gc
+import io
+import os
+import runpy
+import shutil
+import tempfile
+import weakref
+from unittest import TestCase
+
+from intficpy.actor import Player
+from intficpy.exceptions import UnknownSession
+from intficpy.ifp_game import IFPGame
+from intficpy.room import Room
+from intficpy.sequence import Sequence
+from intficpy.server import SessionApp, SessionManager
+from intficpy.thing_base import Thing
+
+from .test_server import text
+
+TESTGAME = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+    "examples",
+    "testgame.py",
+)
+
+
+def build(app):
+    game = IFPGame(app, main=__name__)
+    me = Player(game)
+    room = Room(game, "room", "A plain room. ")
+    room.addThing(me)
+    game.setPlayer(me)
+    for colour in ("red", "blue"):
+        ball = Thing(game, "ball")
+        ball.setAdjectives([colour])
+        ball.invItem = True
+        room.addThing(ball)
+    return game
+
+
+def build_with_sequence(app):
+    game = build(app)
+    sequence = Sequence(
+        game,
+        [
+            "Pick a drink. ",
+            {"tea": ["Tea it is. "], "coffee": ["Coffee it is. "]},
+            {"cake": ["Cake it is. "], "biscuit": ["Biscuit it is. "]},
+            "That is all. ",
+        ],
+    )
+    game.gameOpening = lambda game: game.getObject(sequence).start()
+    return game
+
+
+def build_testgame(app):
+    game = runpy.run_path(TESTGAME, run_name="testgame")["game"]
+    game.app = app
+    app.game = game
+    return game
+
+
+def world(game):
+    """
+    The objects of a game, the noun dictionary and the contents of each location,
+    by ix, telling copies from originals
+    """
+
+    def ref(obj):
+        return obj.ix, game.ifp_objects.get(obj.ix) is obj
+
+    def contents(obj):
+        return sorted(
+            (ref(item), contents(item))
+            for items in obj.contains.values()
+            for item in items
+        )
+
+    return (
+        {ix: type(obj).__name__ for ix, obj in game.ifp_objects.items()},
+        {
+            word: sorted(ref(thing) for thing in things)
+            for word, things in game.nouns.items()
+        },
+        {
+            ix: contents(obj)
+            for ix, obj in game.ifp_objects.items()
+            if hasattr(obj, "contains")
+        },
+    )
+
+
+class TestSessionEviction(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.sessions = SessionManager(build, max_resident=2, evict_dir=self.dir)
+        self.addCleanup(self.sessions.closeAll)
+
+    def _evict(self, session_id):
+        """Open sessions until the session's game is evicted"""
+        while self.sessions.session(session_id).game is not None:
+            self.sessions.open()
+
+    def test_least_recently_used_games_are_evicted(self):
+        first, _ = self.sessions.open()
+        second, _ = self.sessions.open()
+        self.sessions.turn(first, "look")
+
+        third, _ = self.sessions.open()
+
+        self.assertIsNone(self.sessions.session(second).game)
+        self.assertTrue(os.path.exists(self.sessions.session(second).evicted))
+        self.assertIsNotNone(self.sessions.session(first).game)
+        self.assertEqual(list(self.sessions.resident), [first, third])
+        self.assertEqual(len(self.sessions), 3)
+
+    def test_evicted_game_is_rehydrated_on_next_turn(self):
+        session_id, _ = self.sessions.open()
+        self.sessions.turn(session_id, "take red ball")
+        self._evict(session_id)
+        path = self.sessions.session(session_id).evicted
+
+        events = self.sessions.turn(session_id, "inventory")
+
+        self.assertIn("You have a red ball. ", text(events))
+        self.assertIsNotNone(self.sessions.session(session_id).game)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(len(self.sessions.resident), 2)
+
+    def test_evicted_game_is_freed(self):
+        session_id, _ = self.sessions.open()
+        game = weakref.ref(self.sessions.session(session_id).game)
+
+        self._evict(session_id)
+        gc.collect()
+
+        self.assertIsNone(game())
+
+    def test_disambiguation_survives_eviction(self):
+        session_id, _ = self.sessions.open()
+        events = self.sessions.turn(session_id, "take ball")
+        self.assertIn(
+            "Do you mean the red ball (1), or the blue ball (2)?", text(events)
+        )
+        self._evict(session_id)
+
+        events = self.sessions.turn(session_id, "blue")
+
+        self.assertIn("You take the blue ball. ", text(events))
+
+    def test_sequence_position_survives_eviction(self):
+        sessions = SessionManager(
+            build_with_sequence, max_resident=1, evict_dir=self.dir
+        )
+        self.addCleanup(sessions.closeAll)
+        session_id, events = sessions.open()
+        self.assertIn("Pick a drink. ", text(events))
+        self.assertIn("Tea it is. ", text(sessions.turn(session_id, "tea")))
+        sessions.open()
+        self.assertIsNone(sessions.session(session_id).game)
+
+        events = sessions.turn(session_id, "cake")
+
+        self.assertIn("Cake it is. ", text(events))
+        self.assertIn("That is all. ", text(events))
+
+    def test_get_game_rehydrates(self):
+        session_id, _ = self.sessions.open()
+        self._evict(session_id)
+
+        game = self.sessions.getGame(session_id)
+
+        self.assertIs(self.sessions.session(session_id).game, game)
+        self.assertIs(game.app, self.sessions.session(session_id).app)
+
+    def test_close_removes_evicted_files(self):
+        session_id, _ = self.sessions.open()
+        self._evict(session_id)
+        path = self.sessions.session(session_id).evicted
+
+        self.sessions.close(session_id)
+
+        self.assertFalse(os.path.exists(path))
+        with self.assertRaises(UnknownSession):
+            self.sessions.turn(session_id, "look")
+
+    def test_game_being_played_is_not_evicted(self):
+        session_id, _ = self.sessions.open()
+        session = self.sessions.session(session_id)
+
+        with session.lock:
+            self.sessions._evict(session)
+
+        self.assertIsNotNone(session.game)
+
+    def test_game_used_again_before_it_is_evicted_is_kept(self):
+        session_id, _ = self.sessions.open()
+        session = self.sessions.session(session_id)
+
+        # chosen to be evicted, but played again before it was written
+        self.sessions._evict(session)
+
+        self.assertIsNotNone(session.game)
+        self.assertIn(session_id, self.sessions.resident)
+
+    def test_game_that_cannot_be_evicted_is_kept(self):
+        first, _ = self.sessions.open()
+        second, _ = self.sessions.open()
+        self.sessions.evict_dir = os.path.join(self.dir, "missing")
+
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr):
+            third, _ = self.sessions.open()
+            # a turn that fails to evict another game still returns its events
+            events = self.sessions.turn(first, "look")
+
+        self.assertIn("<b>room</b>", text(events))
+        self.assertIn("FileNotFoundError", stderr.getvalue())
+        self.assertIsNotNone(self.sessions.session(first).game)
+        self.assertIsNone(self.sessions.session(first).evicted)
+        self.assertEqual(list(self.sessions.resident), [second, third, first])
+        self.assertEqual(os.listdir(self.dir), [])
+        self.assertEqual(self.sessions.metrics()["evictions"], 0)
+
+    def test_metrics(self):
+        session_id, _ = self.sessions.open()
+        self.sessions.turn(session_id, "look")
+        self._evict(session_id)
+        self.sessions.turn(session_id, "look")
+
+        metrics = self.sessions.metrics()
+
+        self.assertEqual(metrics["hits"], 1)
+        self.assertEqual(metrics["misses"], 1)
+        self.assertEqual(metrics["hit_rate"], 0.5)
+        self.assertGreaterEqual(metrics["evictions"], 1)
+        self.assertEqual(metrics["resident"], 2)
+        self.assertGreater(metrics["rehydrate_ms_p50"], 0)
+        self.assertGreater(metrics["evict_ms_max"], 0)
+
+    def test_budget_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            SessionManager(build, max_resident=0)
+
+
+class TestExampleGameEviction(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, True)
+        self.sessions = SessionManager(
+            build_testgame, max_resident=1, evict_dir=self.dir
+        )
+        self.addCleanup(self.sessions.closeAll)
+
+    def test_rehydrated_game_is_the_game_evicted(self):
+        # a game kept in memory, played alongside
+        played = self.sessions.getPrototype().instantiate(SessionApp())
+        session_id, _ = self.sessions.open()
+        other, _ = self.sessions.open()
+        for command in (
+            "look",
+            "u",
+            "d",
+            "look under bench",
+            "take box",
+            "x door",
+            "u",
+            "d",
+            "sit on bench",
+            "stand",
+        ):
+            played.turnMain(command)
+            events = self.sessions.turn(session_id, command)
+            # evicts the game, to be rehydrated by the next turn
+            self.sessions.turn(other, "look")
+            self.assertIsNone(self.sessions.session(session_id).game)
+
+            self.assertNotIn("Do you mean", text(events))
+            self.assertEqual(world(self.sessions.getGame(session_id)), world(played))
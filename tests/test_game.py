@@ -1,4 +1,13 @@
-from .helpers import IFPTestCase
+import subprocess
+import sys
+import unittest
+
+from .helpers import IFPTestCase, TestApp
+
+from intficpy.actor import Player
+from intficpy.ifp_game import IFPGame
+from intficpy.room import Room
+from intficpy.verb import LookVerb, get_base_verbset
 
 
 class TestAddText(IFPTestCase):
@@ -15,3 +24,93 @@ class TestAddText(IFPTestCase):
         self.game.turnMain("l")
 
         self.assertIn(text, self.app.print_stack)
+
+
+class TestBaseline(unittest.TestCase):
+    def _game(self, delta_saves):
+        game = IFPGame(TestApp(), main=__name__)
+        game.delta_saves = delta_saves
+        me = Player(game)
+        Room(game, "room", "desc").addThing(me)
+        game.setPlayer(me)
+        game.initGame()
+        return game
+
+    def test_baseline_is_not_taken_by_default(self):
+        self.assertIsNone(self._game(False).baseline)
+
+    def test_baseline_is_taken_if_delta_saves_is_set(self):
+        game = self._game(True)
+        self.assertEqual(len(game.baseline), len(game.ifp_objects))
+
+
+class TestVerbMap(IFPTestCase):
+    class WaveVerb(LookVerb):
+        word = "wave"
+        synonyms = ["look"]
+        syntax = [["wave"], ["look", "wave"]]
+
+    def test_added_verb_does_not_leak_into_other_games(self):
+        other_game = IFPGame(TestApp(), main=__name__)
+
+        self.game.addVerb(self.WaveVerb)
+
+        self.assertIn("wave", self.game.verbs)
+        self.assertIn(self.WaveVerb, self.game.verbs["look"])
+        self.assertNotIn("wave", other_game.verbs)
+        self.assertNotIn(self.WaveVerb, other_game.verbs["look"])
+        self.assertNotIn(self.WaveVerb, get_base_verbset()["look"])
+
+    def test_base_verbset_is_shared_and_read_only(self):
+        self.assertIs(get_base_verbset(), get_base_verbset())
+        with self.assertRaises(TypeError):
+            get_base_verbset()["wave"] = (self.WaveVerb,)
+
+    def test_verb_list_can_be_changed_in_place_for_one_game(self):
+        other_game = IFPGame(TestApp(), main=__name__)
+
+        self.game.verbs["look"].append(self.WaveVerb)
+
+        self.assertIn(self.WaveVerb, self.game.verbs["look"])
+        self.assertNotIn(self.WaveVerb, other_game.verbs["look"])
+        self.assertNotIn(self.WaveVerb, get_base_verbset()["look"])
+
+    def test_deleting_base_verb_word_only_affects_current_game(self):
+        other_game = IFPGame(TestApp(), main=__name__)
+
+        del self.game.verbs["jump"]
+
+        self.assertNotIn("jump", self.game.verbs)
+        self.assertNotIn("jump", list(self.game.verbs))
+        self.assertIn("jump", other_game.verbs)
+
+
+class TestLazyImports(unittest.TestCase):
+    def _modulesAfter(self, code):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                code + "\nimport sys\nprint(' '.join(sorted(sys.modules)))",
+            ],
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            check=True,
+        )
+        return result.stdout.split()
+
+    def test_importing_game_does_not_import_heavy_modules(self):
+        modules = self._modulesAfter("import intficpy.ifp_game")
+        for name in ("intficpy.verb", "intficpy.serializer", "intficpy.travel"):
+            self.assertNotIn(name, modules)
+
+    def test_verbs_are_imported_on_first_use(self):
+        modules = self._modulesAfter(
+            "from types import SimpleNamespace\n"
+            "from intficpy.ifp_game import IFPGame\n"
+            "game = IFPGame(SimpleNamespace())\n"
+            "import sys\n"
+            "assert 'intficpy.verb' not in sys.modules\n"
+            "game.verbs['look']"
+        )
+        self.assertIn("intficpy.verb", modules)
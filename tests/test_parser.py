@@ -4,6 +4,7 @@ from intficpy.ifp_game import IFPGame
 from intficpy.thing_base import Thing
 from intficpy.things import Surface, UnderSpace
 from intficpy.actor import Actor, SpecialTopic
+from intficpy.grammar import VerbSyntaxIndex
 from intficpy.verb import (
     IndirectObjectVerb,
     GetVerb,
@@ -11,6 +12,7 @@ from intficpy.verb import (
     SetOnVerb,
     LeadDirVerb,
     JumpOverVerb,
+    JumpInVerb,
     GiveVerb,
     ExamineVerb,
     GetAllVerb,
@@ -117,6 +119,79 @@ class TestAdjacentStrObj(IFPTestCase):
         )
 
 
+class TestVerbSyntaxIndex(IFPTestCase):
+    # subclasses of built in verbs are not registered automatically, so
+    # PolishVerb is only known to games that add it with addVerb
+    class PolishVerb(ExamineVerb):
+        word = "polish"
+        synonyms = ["buff", "shine"]
+        syntax = [["polish", "<dobj>"], ["buff", "<dobj>"], ["shine", "<dobj>"]]
+        dscope = "near"
+
+        def verbFunc(self, game, dobj, skip=False):
+            game.addTextToEvent("turn", f"You polish {dobj.lowNameArticle(True)}. ")
+            return True
+
+    def test_matches_form_for_synonym(self):
+        self.game.addVerb(self.PolishVerb)
+        item = Thing(self.game, "vase")
+        self.start_room.addThing(item)
+
+        self.game.turnMain("buff vase")
+
+        self.assertIs(self.game.parser.command.verb, self.PolishVerb)
+        self.assertEqual(self.game.parser.command.verb_form, ["buff", "<dobj>"])
+        self.assertIs(self.game.parser.command.dobj.target, item)
+
+    def test_index_is_recompiled_when_verb_added_after_first_parse(self):
+        item = Thing(self.game, "vase")
+        self.start_room.addThing(item)
+        self.game.turnMain("shine vase")
+        self.assertIsNot(self.game.parser.command.verb, self.PolishVerb)
+
+        self.game.addVerb(self.PolishVerb)
+        self.game.turnMain("shine vase")
+
+        self.assertIs(self.game.parser.command.verb, self.PolishVerb)
+
+    def test_index_is_recompiled_when_verb_syntax_is_replaced(self):
+        class RubVerb(self.PolishVerb):
+            word = "rub"
+            synonyms = []
+            syntax = [["rub", "<dobj>"]]
+
+        self.game.addVerb(RubVerb)
+        index = VerbSyntaxIndex()
+        verbs = self.game.verbs["rub"]
+        self.assertEqual(
+            index.match(verbs, verbs, ["rub", "down", "vase"]),
+            [(RubVerb, ["rub", "<dobj>"])],
+        )
+
+        RubVerb.syntax = [["rub", "<dobj>"], ["rub", "down", "<dobj>"]]
+
+        self.assertIn(
+            (RubVerb, ["rub", "down", "<dobj>"]),
+            index.match(verbs, verbs, ["rub", "down", "vase"]),
+        )
+
+    def test_compiled_indexes_are_not_shared_between_games(self):
+        self.game.turnMain("look")
+        other = VerbSyntaxIndex()
+        self.assertEqual(other._compiled, {})
+        self.assertNotEqual(self.game.parser.syntax_index._compiled, {})
+
+    def test_match_returns_forms_whose_literals_are_all_present(self):
+        index = VerbSyntaxIndex()
+        matches = index.match(
+            self.game.verbs["jump"],
+            self.game.verbs["jump"],
+            ["jump", "over", "fence"],
+        )
+        self.assertIn((JumpOverVerb, ["jump", "over", "<dobj>"]), matches)
+        self.assertNotIn((JumpInVerb, ["jump", "in", "<dobj>"]), matches)
+
+
 class TestGetThing(IFPTestCase):
     def test_get_thing(self):
         noun = self._get_unique_noun()
@@ -0,0 +1,101 @@
+import os
+import unittest
+from unittest import TestCase
+
+from intficpy.exceptions import UnknownSession, WorkerError
+from intficpy.prefork import WorkerPool
+
+from .test_server import build, text
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "WorkerPool needs os.fork")
+class TestWorkerPool(TestCase):
+    def setUp(self):
+        self.pool = WorkerPool(build, workers=2)
+        self.addCleanup(self.pool.shutdown)
+
+    def _ids_in_each_worker(self):
+        ids = {}
+        i = 0
+        while len(ids) < 2:
+            session_id = f"player-{i}"
+            ids.setdefault(self.pool.workerFor(session_id), session_id)
+            i += 1
+        return ids[0], ids[1]
+
+    def test_open_returns_opening_events(self):
+        session_id, events = self.pool.open()
+
+        self.assertIn("Welcome. ", text(events))
+
+    def test_turn_returns_events(self):
+        session_id, _ = self.pool.open()
+
+        events = self.pool.turn(session_id, "take coin")
+
+        self.assertIn("You take the coin. ", text(events))
+
+    def test_sessions_in_each_worker_play_their_own_games(self):
+        first, second = self._ids_in_each_worker()
+        self.pool.open(first)
+        self.pool.open(second)
+        third = next(
+            f"other-{i}" for i in range(100) if self.pool.workerFor(f"other-{i}") == 0
+        )
+        self.pool.open(third)
+
+        self.pool.turn(first, "take coin")
+
+        for session_id in (second, third):
+            self.assertIn(
+                "You take the coin. ", text(self.pool.turn(session_id, "take coin"))
+            )
+        self.assertIn(
+            "You already have the coin. ", text(self.pool.turn(first, "take coin"))
+        )
+
+    def test_worker_is_chosen_by_session_id(self):
+        self.assertEqual(
+            self.pool.workerFor("player-1"), self.pool.workerFor("player-1")
+        )
+        self.assertEqual(
+            {self.pool.workerFor(f"player-{i}") for i in range(20)}, {0, 1}
+        )
+
+    def test_errors_are_raised_in_the_parent(self):
+        self.pool.open("player-1")
+
+        with self.assertRaises(ValueError):
+            self.pool.open("player-1")
+        with self.assertRaises(UnknownSession):
+            self.pool.turn("nobody", "look")
+
+    def test_closed_session_cannot_play(self):
+        session_id, _ = self.pool.open()
+
+        self.pool.close(session_id)
+
+        with self.assertRaises(UnknownSession):
+            self.pool.turn(session_id, "look")
+
+    def test_shutdown_stops_the_workers(self):
+        session_id, _ = self.pool.open()
+
+        self.pool.shutdown()
+
+        for worker in self.pool.workers:
+            with self.assertRaises(ChildProcessError):
+                os.waitpid(worker.pid, os.WNOHANG)
+        with self.assertRaises(WorkerError):
+            self.pool.turn(session_id, "look")
+
+    def test_stopped_worker_raises(self):
+        first, second = self._ids_in_each_worker()
+        self.pool.open(second)
+        worker = self.pool.workers[0]
+        os.kill(worker.pid, 9)
+        os.waitpid(worker.pid, 0)
+
+        with self.assertRaises(WorkerError):
+            self.pool.open(first)
+        self.assertIn("You take the coin. ", text(self.pool.turn(second, "take coin")))
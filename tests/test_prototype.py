@@ -0,0 +1,161 @@
+import os
+import uuid
+
+from intficpy.actor import Player
+from intficpy.changes import tracked_class
+from intficpy.ifp_game import IFPGame
+from intficpy.prototype import READ_LIMIT, Prototype, is_shell
+from intficpy.room import Room
+from intficpy.serializer import SaveGame, LoadGame
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+from intficpy.verb import ExamineVerb
+
+from .helpers import IFPTestCase, TestApp
+
+
+class TestPrototype(IFPTestCase):
+    def setUp(self):
+        # the world is built before initGame is called, as a game would build it
+        self.world = IFPGame(TestApp(), main=__name__)
+        me = Player(self.world)
+        room = Room(self.world, "room", "desc")
+        room.addThing(me)
+        self.world.setPlayer(me)
+        self.world_box = Container(self.world, "box")
+        self.world_coin = Thing(self.world, "coin")
+        self.world_coin.invItem = True
+        self.world_coin.colour = "silver"
+        room.addThing(self.world_box)
+        self.world_box.addThing(self.world_coin)
+        self.world.undo_turns = 20
+        self.world.initGame()
+        self.prototype = Prototype(self.world)
+
+        self.app = TestApp()
+        self.game = self.prototype.instantiate(self.app)
+        self.box = self.game.getObject(self.world_box)
+        self.coin = self.game.getObject(self.world_coin)
+
+    def test_objects_start_out_shared(self):
+        self.assertTrue(is_shell(self.coin))
+        self.assertIsNot(self.coin, self.world_coin)
+        self.assertIsInstance(self.coin, Thing)
+        self.assertEqual(type(self.coin).__name__, "Thing")
+        self.assertEqual(self.coin.ix, self.world_coin.ix)
+        self.assertEqual(self.coin.colour, "silver")
+        self.assertIs(self.coin.game, self.game)
+        self.assertIs(self.app.game, self.game)
+        self.assertEqual(self.game.prototype.materialized(), 0)
+
+    def test_references_are_to_the_games_own_objects(self):
+        self.assertIs(self.coin.location, self.box)
+        self.assertItemIn(self.coin, self.box.contains, "box contents")
+        self.assertIn(self.coin, self.game.nouns["coin"])
+        self.assertIs(self.game.me, self.game.getObject(self.world.me))
+        self.assertIs(self.box.location, self.game.me.location)
+        # reading a list or dict copies it, but not the object it belongs to
+        self.assertTrue(is_shell(self.box))
+
+    def test_playing_copies_only_what_changes(self):
+        self.game.turnMain("take coin")
+
+        self.assertIs(self.coin.location, self.game.me)
+        self.assertFalse(is_shell(self.coin))
+        self.assertIs(self.world_coin.location, self.world_box)
+        self.assertIn(self.world_coin.ix, self.world_box.contains)
+        self.assertLess(
+            self.game.prototype.materialized(), len(self.game.ifp_objects) // 2
+        )
+
+    def test_games_do_not_share_changes(self):
+        other = self.prototype.instantiate(TestApp())
+        self.game.turnMain("take coin")
+        self.coin.colour = "gold"
+
+        other_coin = other.getObject(self.world_coin)
+        self.assertEqual(other_coin.colour, "silver")
+        self.assertIs(other_coin.location, other.getObject(self.world_box))
+        other.turnMain("take coin")
+        self.assertIs(other_coin.location, other.me)
+
+    def test_set_attribute_copies_object(self):
+        self.coin.colour = "gold"
+
+        self.assertFalse(is_shell(self.coin))
+        self.assertEqual(self.coin.colour, "gold")
+        self.assertEqual(self.world_coin.colour, "silver")
+        self.assertIs(self.coin.location, self.box)
+        self.assertEqual(self.coin.__dict__.keys(), self.world_coin.__dict__.keys())
+
+    def test_object_read_often_is_copied(self):
+        for i in range(READ_LIMIT + 1):
+            self.assertEqual(self.coin.colour, "silver")
+
+        self.assertFalse(is_shell(self.coin))
+        self.assertNotIn("_prototype_reads", self.coin.__dict__)
+        self.assertEqual(self.coin.__dict__.keys(), self.world_coin.__dict__.keys())
+
+    def test_looking_up_verb_overrides_does_not_copy_object(self):
+        verb = ExamineVerb.instance()
+        for i in range(READ_LIMIT + 1):
+            verb._getTargetAttr(self.game, self.coin, verb.dobj_override_name)
+
+        self.assertTrue(is_shell(self.coin))
+
+    def test_change_in_place_copies_object_without_change_tracking(self):
+        self.game.stopTrackingChanges()
+
+        self.coin.setAdjectives(["shiny"])
+
+        self.assertFalse(is_shell(self.coin))
+        self.assertEqual(self.coin.adjectives, ["shiny"])
+        self.assertNotIn("shiny", self.world_coin.adjectives)
+
+    def test_copy_thing(self):
+        copied = self.coin.copyThing()
+
+        self.assertIsNot(copied, self.coin)
+        # the game keeps undo history, so its objects are tracked
+        self.assertIs(type(copied), tracked_class(Thing))
+        self.assertEqual(copied.colour, "silver")
+
+    def test_undo(self):
+        self.game.turnMain("take coin")
+
+        self.assertEqual(self.game.undo(), 1)
+
+        self.assertIs(self.coin.location, self.box)
+        self.assertItemIn(self.coin, self.box.contains, "box contents")
+
+    def test_delta_save_stores_what_has_changed(self):
+        path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            f"_ifp_tests_saveload__{uuid.uuid4()}.sav",
+        )
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        self.game.turnMain("take coin")
+
+        save = SaveGame(self.game, path)
+        other = self.prototype.instantiate(TestApp())
+        l = LoadGame(other, path)
+        self.assertTrue(l.is_valid())
+        l.load()
+
+        self.assertIn(self.coin.ix, save.changed)
+        self.assertLess(len(save.changed), len(self.game.ifp_objects) // 2)
+        other_coin = other.getObject(self.world_coin)
+        self.assertIs(other_coin.location, other.me)
+        self.assertItemNotIn(
+            other_coin, other.getObject(self.world_box).contains, "box"
+        )
+        self.assertIs(self.world_coin.location, self.world_box)
+
+    def test_get_object_of_built_game(self):
+        self.assertIs(self.world.getObject(self.world_coin), self.world_coin)
+
+    def test_cannot_fork_or_make_prototype_from_game_made_from_prototype(self):
+        with self.assertRaises(ValueError):
+            self.game.fork(TestApp())
+        with self.assertRaises(ValueError):
+            Prototype(self.game)
@@ -0,0 +1,327 @@
+import datetime
+import os
+import uuid
+
+from intficpy import save_format
+from intficpy.compression import LZMA, ZLIB
+from intficpy.exceptions import DeserializationError
+from intficpy.serializer import SaveGame, LoadGame, BINARY, PICKLE
+from intficpy.thing_base import Thing
+from intficpy.things import Container
+
+from .helpers import IFPTestCase
+
+
+class TestBinaryEncoding(IFPTestCase):
+    def _roundTrip(self, data):
+        return save_format.decode(save_format.encode(data, []))[1]
+
+    def test_values_round_trip(self):
+        data = {
+            "none": None,
+            "true": True,
+            "false": False,
+            "zero": 0,
+            "int": 300,
+            "negative": -7,
+            "big": 2**80,
+            "float": 2.5,
+            "unicode": "caf\u00e9 \u2603",
+            "empty": "",
+            "list": [1, "two", [3.0, None]],
+            4: {"nested": {"dict": []}},
+            "complex": 1 + 2j,
+            "reference": (3,),
+        }
+        self.assertEqual(self._roundTrip(data), data)
+
+    def test_object_section_round_trips_in_order(self):
+        data = {
+            "ifp_objects": {
+                "Thing__1": {"name": "bead", "location": (1,)},
+                "Room__2": {"name": "room", "location": None},
+                "Thing__3": {"name": "cup", "desc": "A cup. "},
+            },
+            "locations": {},
+            "active_sequence": None,
+        }
+
+        out = self._roundTrip(data)
+
+        self.assertEqual(out, data)
+        self.assertEqual(list(out), list(data))
+        self.assertEqual(list(out["ifp_objects"]), list(data["ifp_objects"]))
+
+    def test_object_ixs_round_trip(self):
+        raw = save_format.encode({}, ["Thing__1", "Room__2"])
+        self.assertEqual(save_format.decode(raw)[0], ["Thing__1", "Room__2"])
+
+    def test_interned_strings_are_stored_once(self):
+        string = "a fairly long string"
+        raw = save_format.encode([string] * 100, [])
+        self.assertEqual(raw.count(string.encode()), 1)
+
+    def test_detects_binary_save(self):
+        raw = save_format.encode({}, [])
+        self.assertTrue(save_format.is_binary_save(raw))
+        self.assertFalse(save_format.is_binary_save(b"(dp0\n"))
+
+    def test_unknown_version_raises(self):
+        raw = bytearray(save_format.encode({}, []))
+        raw[len(save_format.MAGIC)] = save_format.VERSION + 1
+        with self.assertRaises(DeserializationError):
+            save_format.decode(bytes(raw))
+
+    def test_truncated_file_raises(self):
+        raw = save_format.encode({"key": [1, 2, 3]}, [])
+        with self.assertRaises(DeserializationError):
+            save_format.decode(raw[:-2])
+
+    def test_damaged_block_raises(self):
+        data = {"ifp_objects": {"Thing__1": {"name": "bead"}}}
+        raw = bytearray(save_format.encode(data, []))
+        raw[raw.index(b"bead")] = ord("r")
+        with self.assertRaises(DeserializationError):
+            save_format.decode(bytes(raw))
+
+    def test_eager_attributes_are_stored_in_the_index(self):
+        data = {
+            "ifp_objects": {
+                "Thing__1": {"name": "bead", "adjectives": ["blue"]},
+                "Thing__2": {"name": "cup"},
+            }
+        }
+        raw = save_format.encode(data, [], frozenset(["adjectives"]))
+
+        object_ixs, shapes, entries, index_data = save_format.read_index(raw)
+
+        self.assertEqual(entries["Thing__1"][3], {"adjectives": ["blue"]})
+        self.assertIsNone(entries["Thing__2"][3])
+        self.assertEqual(shapes[entries["Thing__1"][2]], ("name",))
+        self.assertEqual(save_format.decode(raw)[1], data)
+
+    def test_objects_are_encoded_as_they_are_iterated_over(self):
+        object_ixs = []
+        encoded = []
+
+        def objects():
+            for ix in ("Thing__1", "Thing__2"):
+                # a reference found while serializing the object
+                object_ixs.append(ix)
+                yield ix, {"name": ix, "location": (len(object_ixs) - 1,)}
+
+        for chunk in save_format.iter_encode({}, object_ixs, objects=objects()):
+            encoded.append(chunk)
+            if len(encoded) == 2:
+                # the first block is encoded before the second object is serialized
+                self.assertEqual(object_ixs, ["Thing__1"])
+
+        out_ixs, data = save_format.decode(b"".join(encoded))
+        self.assertEqual(out_ixs, ["Thing__1", "Thing__2"])
+        self.assertEqual(data["ifp_objects"]["Thing__2"]["location"], (1,))
+
+
+class TestSaveFileMap(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        FILENAME = f"_ifp_tests_saveload__{uuid.uuid4()}.sav"
+        path = os.path.dirname(os.path.realpath(__file__))
+        self.path = os.path.join(path, FILENAME)
+
+    def _write(self, raw):
+        with open(self.path, "wb") as f:
+            f.write(raw)
+
+    def test_reads_each_block_on_its_own(self):
+        data = {
+            "ifp_objects": {
+                "Thing__1": {"name": "bead", "adjectives": ["blue"]},
+                "Thing__2": {"name": "cup", "desc": "A cup. "},
+            },
+            "locations": {},
+        }
+        self._write(save_format.encode(data, ["Thing__1"], frozenset(["adjectives"])))
+
+        save_map = save_format.SaveFileMap(self.path)
+        save_map.check()
+
+        self.assertEqual(save_map.object_ixs, ["Thing__1"])
+        self.assertEqual(save_map.data["locations"], {})
+        self.assertEqual(save_map.names("Thing__2"), ("name", "desc"))
+        self.assertEqual(save_map.read("Thing__2"), {"name": "cup", "desc": "A cup. "})
+        # attributes stored in the index are not read with the block
+        self.assertEqual(save_map.read("Thing__1"), {"name": "bead"})
+        save_map.close()
+
+    def test_reads_contents_already_read(self):
+        data = {"ifp_objects": {"Thing__1": {"name": "bead"}}}
+
+        save_map = save_format.SaveFileMap(
+            self.path, save_format.encode(data, ["Thing__1"])
+        )
+
+        self.assertEqual(save_map.read("Thing__1"), {"name": "bead"})
+        save_map.close()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_empty_file_raises(self):
+        self._write(b"")
+        with self.assertRaises(DeserializationError):
+            save_format.SaveFileMap(self.path)
+
+    def test_unknown_version_raises(self):
+        raw = bytearray(save_format.encode({}, []))
+        raw[len(save_format.MAGIC)] = save_format.VERSION + 1
+        self._write(bytes(raw))
+        with self.assertRaises(DeserializationError):
+            save_format.SaveFileMap(self.path)
+
+    def tearDown(self):
+        super().tearDown()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class TestSaveFormats(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        FILENAME = f"_ifp_tests_saveload__{uuid.uuid4()}.sav"
+
+        path = os.path.dirname(os.path.realpath(__file__))
+        self.path = os.path.join(path, FILENAME)
+
+        self.box = Container(self.game, "box")
+        self.bead = Thing(self.game, "bead")
+        self.box.addThing(self.bead)
+        self.start_room.addThing(self.box)
+
+    def _saveAndMove(self, save_format):
+        SaveGame(self.game, self.path, save_format=save_format)
+        self.box.removeThing(self.bead)
+        self.game.me.addThing(self.bead)
+        self.bead.setAdjectives(["blue"])
+
+    def _load(self):
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        l.load()
+        return l
+
+    def test_load_binary_save(self):
+        self._saveAndMove(BINARY)
+
+        l = self._load()
+
+        self.assertEqual(l.save_format, BINARY)
+        self.assertIs(self.bead.location, self.box)
+        self.assertEqual(self.bead.adjectives, [])
+
+    def test_load_pickle_save(self):
+        self._saveAndMove(PICKLE)
+
+        l = self._load()
+
+        self.assertEqual(l.save_format, PICKLE)
+        self.assertIs(self.bead.location, self.box)
+        self.assertEqual(self.bead.adjectives, [])
+
+    def test_binary_save_is_smaller(self):
+        SaveGame(self.game, self.path, save_format=PICKLE)
+        pickle_size = os.path.getsize(self.path)
+        SaveGame(self.game, self.path, save_format=BINARY)
+        binary_size = os.path.getsize(self.path)
+
+        self.assertLess(binary_size, pickle_size)
+
+    def test_repeated_strings_are_written_once_per_object(self):
+        # each object's attributes are stored in a block that can be decoded on its
+        # own, so strings are only shared within a block
+        desc = "A small blue bead, with a hole bored through the middle. "
+        for i in range(10):
+            bead = Thing(self.game, "bead")
+            bead.inscription = desc[:-1] + " "
+            bead.engraving = desc[:-1] + " "
+            self.box.addThing(bead)
+
+        SaveGame(self.game, self.path)
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read().count(desc.encode()), 10)
+
+    def test_reference_to_missing_object_is_invalid(self):
+        SaveGame(self.game, self.path)
+        del self.game.ifp_objects[self.box.ix]
+
+        l = LoadGame(self.game, self.path)
+
+        self.assertFalse(l.is_valid())
+
+    def test_values_binary_format_cannot_store_are_skipped(self):
+        self.bead.found_on = datetime.date(2020, 1, 1)
+        self._saveAndMove(BINARY)
+        self.bead.found_on = None
+
+        self._load()
+
+        self.assertIsNone(self.bead.found_on)
+
+    def test_unknown_save_format_raises(self):
+        with self.assertRaises(ValueError):
+            SaveGame(self.game, self.path, save_format="yaml")
+
+    def test_load_compressed_save(self):
+        for save_format_ in (BINARY, PICKLE):
+            for compression in (ZLIB, LZMA):
+                for lazy in (True, False):
+                    with self.subTest(
+                        save_format=save_format_, compression=compression, lazy=lazy
+                    ):
+                        self.bead.setAdjectives([])
+                        self.game.me.removeThing(self.bead)
+                        self.box.addThing(self.bead)
+                        SaveGame(
+                            self.game,
+                            self.path,
+                            save_format=save_format_,
+                            compression=compression,
+                        )
+                        self.box.removeThing(self.bead)
+                        self.game.me.addThing(self.bead)
+                        self.bead.setAdjectives(["blue"])
+
+                        l = LoadGame(self.game, self.path, lazy=lazy)
+                        self.assertTrue(l.is_valid())
+                        l.load()
+
+                        self.assertEqual(l.save_format, save_format_)
+                        self.assertEqual(l.compression, compression)
+                        self.assertIs(self.bead.location, self.box)
+                        self.assertEqual(self.bead.adjectives, [])
+
+    def test_compressed_save_is_smaller(self):
+        for i in range(20):
+            self.box.addThing(Thing(self.game, "bead"))
+        SaveGame(self.game, self.path, delta=False)
+        size = os.path.getsize(self.path)
+        SaveGame(self.game, self.path, delta=False, compression=ZLIB)
+
+        self.assertLess(os.path.getsize(self.path), size / 2)
+
+    def test_truncated_compressed_save_raises(self):
+        SaveGame(self.game, self.path, delta=False, compression=ZLIB)
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        with open(self.path, "wb") as f:
+            f.write(raw[:-10])
+
+        with self.assertRaises(DeserializationError):
+            LoadGame(self.game, self.path)
+
+    def test_unknown_compression_raises(self):
+        with self.assertRaises(ValueError):
+            SaveGame(self.game, self.path, compression="zip")
+
+    def tearDown(self):
+        super().tearDown()
+        if os.path.exists(self.path):
+            os.remove(self.path)
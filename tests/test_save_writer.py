@@ -0,0 +1,135 @@
+import os
+import threading
+import uuid
+
+from intficpy.serializer import SaveGame, LoadGame
+from intficpy.save_writer import SaveWriter
+from intficpy.thing_base import Thing
+
+from .helpers import IFPTestCase
+
+
+class TestSaveWriter(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.directory = os.path.dirname(os.path.realpath(__file__))
+        self.path = os.path.join(
+            self.directory, f"_ifp_tests_saveload__{uuid.uuid4()}.sav"
+        )
+        self.addCleanup(self._remove, self.path)
+        self.coin = Thing(self.game, "coin")
+        self.start_room.addThing(self.coin)
+
+    def _remove(self, path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _temp_files(self):
+        name = os.path.basename(self.path)
+        return [f for f in os.listdir(self.directory) if f.startswith(f".{name}.")]
+
+    def _load(self):
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid())
+        l.load()
+
+    def test_state_is_copied_when_the_save_is_created(self):
+        self.coin.colour = "red"
+        save = SaveGame(self.game, self.path, write=False)
+        self.assertFalse(os.path.exists(self.path))
+
+        self.coin.colour = "blue"
+        save.write()
+        self._load()
+
+        self.assertEqual(self.coin.colour, "red")
+
+    def test_failed_write_leaves_previous_file(self):
+        self.coin.colour = "red"
+        SaveGame(self.game, self.path)
+        with open(self.path, "rb") as f:
+            before = f.read()
+
+        self.coin.colour = "blue"
+        save = SaveGame(self.game, self.path, write=False)
+
+        def fail():
+            # fail part way through writing the file
+            yield b"IFPSAV"
+            raise OSError("disk full")
+
+        save.iter_encoded = fail
+        with self.assertRaises(OSError):
+            save.write()
+
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(), before)
+        self.assertFalse(self._temp_files())
+
+    def test_background_save_calls_callback(self):
+        finished = []
+        writer = SaveWriter()
+        self.addCleanup(writer.close)
+
+        save = SaveGame(self.game, self.path, write=False)
+        self.assertTrue(writer.submit(save, lambda s, e: finished.append((s, e))))
+        writer.wait()
+
+        self.assertEqual(finished, [(save, None)])
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(self._temp_files())
+
+    def test_background_save_reports_error(self):
+        finished = []
+        writer = SaveWriter()
+        self.addCleanup(writer.close)
+        save = SaveGame(self.game, self.path, write=False)
+
+        def fail():
+            # fail part way through writing the file
+            yield b"IFPSAV"
+            raise OSError("disk full")
+
+        save.iter_encoded = fail
+        writer.submit(save, lambda s, e: finished.append(e))
+        writer.wait()
+
+        self.assertIsInstance(finished[0], OSError)
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_saves_beyond_queue_size_are_turned_away(self):
+        writer = SaveWriter(max_pending=1)
+        self.addCleanup(writer.close)
+        release = threading.Event()
+        started = threading.Event()
+
+        def block(save, error):
+            started.set()
+            release.wait(5)
+
+        self.assertTrue(
+            writer.submit(SaveGame(self.game, self.path, write=False), block)
+        )
+        started.wait(5)
+        # one save is being written, and one can wait
+        self.assertTrue(writer.submit(SaveGame(self.game, self.path, write=False)))
+        self.assertFalse(writer.submit(SaveGame(self.game, self.path, write=False)))
+
+        release.set()
+        writer.wait()
+        self.assertTrue(writer.submit(SaveGame(self.game, self.path, write=False)))
+
+    def test_save_in_background_tells_app(self):
+        finished = []
+        self.app.saveFinished = lambda filename, error: finished.append(
+            (filename, error)
+        )
+        self.coin.colour = "red"
+
+        self.assertTrue(self.game.saveInBackground(self.path))
+        self.game.saves.close()
+
+        self.assertEqual(finished, [(self.path, None)])
+        self.coin.colour = "blue"
+        self._load()
+        self.assertEqual(self.coin.colour, "red")
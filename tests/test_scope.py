@@ -0,0 +1,96 @@
+from .helpers import IFPTestCase
+
+from intficpy.thing_base import Thing
+from intficpy.things import Container, Clothing
+from intficpy.room import Room
+
+
+class TestScopeResolver(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.scope = self.game.parser.scope
+        self.item = Thing(self.game, "item")
+        self.start_room.addThing(self.item)
+
+    def test_item_in_room_is_in_room_scope_but_not_inventory(self):
+        self.assertTrue(self.scope.inRoom(self.item))
+        self.assertTrue(self.scope.isNear(self.item))
+        self.assertFalse(self.scope.inInventory(self.item))
+
+    def test_scope_is_updated_when_item_moves(self):
+        self.assertTrue(self.scope.inRoom(self.item))
+
+        self.item.moveTo(self.me)
+
+        self.assertFalse(self.scope.inRoom(self.item))
+        self.assertTrue(self.scope.inInventory(self.item))
+        self.assertTrue(self.scope.isNear(self.item))
+
+    def test_scope_is_updated_when_player_moves(self):
+        other_room = Room(self.game, "other", "desc")
+        self.assertTrue(self.scope.inRoom(self.item))
+
+        self.me.moveTo(other_room)
+
+        self.assertFalse(self.scope.inRoom(self.item))
+        self.assertIs(self.scope.out_loc, other_room)
+
+    def test_nested_item_leaves_scope_when_container_is_hidden(self):
+        box = Container(self.game, "box")
+        box.moveTo(self.start_room)
+        self.item.moveTo(box)
+        self.assertTrue(self.scope.inRoom(self.item))
+
+        box.revealed = False
+
+        self.assertFalse(self.scope.inRoom(self.item))
+
+    def test_room_scope_respects_darkness_changed_without_moving_anything(self):
+        self.assertTrue(self.scope.inRoom(self.item))
+
+        self.start_room.dark = True
+
+        self.assertFalse(self.scope.inRoom(self.item))
+        self.assertFalse(self.scope.isNear(self.item))
+
+    def test_worn_item_is_in_worn_scope(self):
+        hat = Clothing(self.game, "hat")
+        self.me.addThing(hat)
+        self.assertFalse(self.scope.isWorn(hat))
+
+        self.me.makeWearing(hat)
+
+        self.assertTrue(self.scope.isWorn(hat))
+        self.assertFalse(self.scope.inInventory(hat))
+
+    def test_item_made_known_is_in_known_scope(self):
+        thing = Thing(self.game, "idea")
+        self.assertFalse(self.scope.isKnown(thing))
+
+        thing.makeKnown(self.me)
+
+        self.assertTrue(self.scope.isKnown(thing))
+
+    def test_known_scope_is_updated_when_entry_is_replaced(self):
+        thing = Thing(self.game, "idea")
+        other = Thing(self.game, "notion")
+        thing.makeKnown(self.me)
+        self.assertTrue(self.scope.isKnown(thing))
+
+        index = self.me.knows_about.index(thing.known_ix)
+        self.me.knows_about[index] = other.known_ix
+        self.game.knowledge_epoch += 1
+
+        self.assertFalse(self.scope.isKnown(thing))
+        self.assertTrue(self.scope.isKnown(other))
+
+    def test_making_item_known_increments_knowledge_epoch(self):
+        thing = Thing(self.game, "idea")
+        epoch = self.game.knowledge_epoch
+        thing.makeKnown(self.me)
+        self.assertGreater(self.game.knowledge_epoch, epoch)
+
+    def test_moving_item_increments_containment_epoch(self):
+        epoch = self.game.containment_epoch
+        self.item.moveTo(self.me)
+        self.assertGreater(self.game.containment_epoch, epoch)
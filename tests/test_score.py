@@ -99,3 +99,51 @@ class TestHints(IFPTestCase):
         self.assertIn("no hint", self.app.print_stack.pop())
 
         self.assertNotIn(node2, self.game.hints.pending)
+
+    def test_pending_node_waits_for_required_node(self):
+        hint3 = Hint(self.game, "Eagles in the roof")
+        node2 = HintNode(self.game, [hint3])
+        node2.open_require_nodes_complete = [self.node]
+
+        self.game.hints.addPending(self.game, node2)
+        self.game.turnMain("wait")
+
+        self.assertIn(node2, self.game.hints.pending)
+        self.assertIsNot(self.game.hints.cur_node, node2)
+        self.assertNotIn(self.game.hints.pending_daemon, self.game.daemons.active)
+
+        self.game.hints.closeNode(self.game, self.node)
+        self.assertIn(self.game.hints.pending_daemon, self.game.daemons.active)
+        self.game.turnMain("wait")
+
+        self.assertNotIn(node2, self.game.hints.pending)
+        self.assertIs(self.game.hints.cur_node, node2)
+        self.assertNotIn(self.game.hints.pending_daemon, self.game.daemons.active)
+
+    def test_pending_node_waits_for_required_achievement(self):
+        self.node.open_require_achievements = [self.ach]
+
+        self.game.hints.addPending(self.game, self.node)
+        self.game.turnMain("wait")
+
+        self.assertIn(self.node, self.game.hints.pending)
+        self.assertIsNone(self.game.hints.cur_node)
+
+        self.ach.award(self.game)
+        self.game.turnMain("wait")
+
+        self.assertNotIn(self.node, self.game.hints.pending)
+        self.assertIs(self.game.hints.cur_node, self.node)
+
+    def test_unrelated_node_completion_does_not_recheck_pending_node(self):
+        other = HintNode(self.game, [Hint(self.game, "Try the window")])
+        node2 = HintNode(self.game, [Hint(self.game, "Eagles in the roof")])
+        node2.open_require_nodes_complete = [self.node]
+
+        self.game.hints.addPending(self.game, node2)
+        self.game.turnMain("wait")
+
+        other.complete = True
+
+        self.assertEqual(self.game.hints.changed, [])
+        self.assertNotIn(self.game.hints.pending_daemon, self.game.daemons.active)
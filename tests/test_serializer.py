@@ -2,10 +2,11 @@ import os
 import pickle
 import uuid
 
-from intficpy.serializer import SaveGame, LoadGame
+from intficpy.serializer import SaveGame, LoadGame, BINARY, PICKLE
 from intficpy.daemons import Daemon
 from intficpy.thing_base import Thing
-from intficpy.things import Surface, Container
+from intficpy.room import Room
+from intficpy.things import Surface, Container, LightSource
 
 from .helpers import IFPTestCase
 
@@ -28,7 +29,7 @@ class TestSaveLoadOneRoomWithPlayer(IFPTestCase):
         initial_obj = None
 
         for i in range(0, 5):
-            SaveGame(self.game, self.path)
+            SaveGame(self.game, self.path, save_format=PICKLE)
             size.append(os.path.getsize(self.path))
             l = LoadGame(self.game, self.path)
             self.assertTrue(l.is_valid())
@@ -111,6 +112,27 @@ class TestSaveLoadOneRoomWithPlayer(IFPTestCase):
             initial_obj, latest_obj, "Initial and final loaded data did not match."
         )
 
+    def test_binary_save_file_size_does_not_grow(self):
+        size = []
+        loaded = []
+
+        for i in range(0, 5):
+            SaveGame(self.game, self.path)
+            size.append(os.path.getsize(self.path))
+            l = LoadGame(self.game, self.path)
+            self.assertEqual(l.save_format, BINARY)
+            self.assertTrue(l.is_valid())
+            loaded.append(l.validated_data)
+            l.load()
+
+        self.assertTrue(
+            size[-1] - size[0] < 300,
+            f"Save files appear to be growing in size. Sizes: {size}",
+        )
+        self.assertEqual(
+            loaded[0], loaded[-1], "Initial and final loaded data did not match."
+        )
+
     def tearDown(self):
         super().tearDown()
         os.remove(self.path)
@@ -173,6 +195,42 @@ class TestSaveLoadNested(IFPTestCase):
         os.remove(self.path)
 
 
+class TestSaveLoadLightSource(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        FILENAME = f"_ifp_tests_saveload__{uuid.uuid4()}.sav"
+
+        path = os.path.dirname(os.path.realpath(__file__))
+        self.path = os.path.join(path, FILENAME)
+
+        self.start_room.dark = True
+        self.box = Container(self.game, "box")
+        self.lamp = LightSource(self.game, "lamp")
+        self.box.addThing(self.lamp)
+        self.start_room.addThing(self.box)
+        self.lamp.light(self.game)
+
+        SaveGame(self.game, self.path)
+        self.lamp.extinguish(self.game)
+        self.start_room.removeThing(self.box)
+
+    def test_load_restores_lit_count(self):
+        self.assertFalse(self.start_room.resolveDarkness(self.game))
+
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        l.load()
+
+        self.assertTrue(self.lamp.is_lit)
+        self.assertEqual(self.box.lit_count, 1)
+        self.assertEqual(self.start_room.lit_count, 1)
+        self.assertTrue(self.start_room.resolveDarkness(self.game))
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.path)
+
+
 class TestSaveLoadComplexAttribute(IFPTestCase):
     def setUp(self):
         super().setUp()
@@ -185,7 +243,10 @@ class TestSaveLoadComplexAttribute(IFPTestCase):
         self.item2 = Container(self.game, "box")
 
         self.EXPECTED_ATTR = {
-            "data": {"sarah_has_seen": True, "containers": [self.item1],},
+            "data": {
+                "sarah_has_seen": True,
+                "containers": [self.item1],
+            },
             "owner": self.me,
         }
 
@@ -269,3 +330,389 @@ class TestSaveLoadDaemon(IFPTestCase):
     def tearDown(self):
         super().tearDown()
         os.remove(self.path)
+
+
+class TestDeltaSave(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        FILENAME = f"_ifp_tests_saveload__{uuid.uuid4()}.sav"
+
+        path = os.path.dirname(os.path.realpath(__file__))
+        self.path = os.path.join(path, FILENAME)
+
+        self.hall = Room(self.game, "hall", "desc")
+        self.cellar = Room(self.game, "cellar", "desc")
+        self.box = Container(self.game, "box")
+        self.coin = Thing(self.game, "coin")
+        self.marble = Thing(self.game, "marble")
+        self.box.colour = "red"
+        self.hall.addThing(self.marble)
+        self.start_room.addThing(self.box)
+        self.start_room.addThing(self.coin)
+        self.game.takeBaseline()
+
+    def _save_and_read(self, **kwargs):
+        SaveGame(self.game, self.path, **kwargs)
+        # read eagerly, to see every saved attribute
+        l = LoadGame(self.game, self.path, lazy=False)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        return l
+
+    def test_unchanged_game_saves_no_objects_or_locations(self):
+        l = self._save_and_read()
+        self.assertEqual(l.validated_data["ifp_objects"], {})
+        self.assertEqual(l.validated_data["locations"], {})
+        self.assertEqual(l.validated_data["baseline"], len(self.game.ifp_objects))
+
+    def test_only_changed_attributes_are_saved(self):
+        self.box.colour = "blue"
+        l = self._save_and_read()
+        self.assertEqual(
+            l.validated_data["ifp_objects"], {self.box.ix: {"colour": "blue"}}
+        )
+
+    def test_only_changed_locations_are_saved(self):
+        self.start_room.removeThing(self.coin)
+        self.hall.addThing(self.coin)
+        l = self._save_and_read()
+        self.assertEqual(
+            set(l.validated_data["locations"]), {self.start_room.ix, self.hall.ix}
+        )
+        self.assertEqual(
+            set(l.validated_data["ifp_objects"][self.coin.ix]), {"location"}
+        )
+
+    def test_full_save_stores_every_object(self):
+        l = self._save_and_read(delta=False)
+        self.assertNotIn("baseline", l.validated_data)
+        self.assertEqual(
+            set(l.validated_data["ifp_objects"]), set(self.game.ifp_objects)
+        )
+
+    def test_load_puts_back_state_that_was_unchanged_when_saved(self):
+        self.start_room.removeThing(self.coin)
+        self.box.addThing(self.coin)
+        self.box.colour = "blue"
+        SaveGame(self.game, self.path)
+
+        self.box.removeThing(self.coin)
+        self.cellar.addThing(self.coin)
+        self.start_room.removeThing(self.box)
+        self.hall.addThing(self.box)
+        self.box.colour = "green"
+        self.coin.weight = 3
+
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        l.load()
+
+        self.assertItemExactlyOnceIn(self.box, self.start_room.contains, "box")
+        self.assertItemExactlyOnceIn(self.coin, self.box.contains, "coin")
+        self.assertItemNotIn(self.box, self.hall.contains, "box")
+        self.assertItemNotIn(self.coin, self.cellar.contains, "coin")
+        self.assertIs(self.box.location, self.start_room)
+        self.assertIs(self.coin.location, self.box)
+        self.assertEqual(self.box.colour, "blue")
+        self.assertNotIn("weight", self.coin.__dict__)
+
+    def test_load_places_copy_when_original_is_in_unsaved_location(self):
+        copy = self.marble.copyThing()
+        self.box.addThing(copy)
+        SaveGame(self.game, self.path)
+        self.box.removeThing(copy)
+
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        self.assertNotIn(self.hall.ix, l.validated_data["locations"])
+        l.load()
+
+        self.assertItemExactlyOnceIn(self.marble, self.hall.contains, "marble")
+        self.assertEqual(len(self.box.contains[self.marble.ix]), 1)
+        self.assertIsNot(self.box.contains[self.marble.ix][0], self.marble)
+
+    def test_delta_save_is_invalid_for_a_different_baseline(self):
+        SaveGame(self.game, self.path)
+        Thing(self.game, "pebble")
+        self.game.takeBaseline()
+        l = LoadGame(self.game, self.path)
+        self.assertFalse(l.is_valid())
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.path)
+
+
+class TestLoadIsAtomic(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        FILENAME = f"_ifp_tests_saveload__{uuid.uuid4()}.sav"
+
+        path = os.path.dirname(os.path.realpath(__file__))
+        self.path = os.path.join(path, FILENAME)
+
+        self.box = Container(self.game, "box")
+        self.coin = Thing(self.game, "coin")
+        self.start_room.addThing(self.box)
+        self.start_room.addThing(self.coin)
+        self.game.enableUndo()
+        self.game.turnMain("look")
+
+    def test_failed_load_puts_game_back(self):
+        self.box.colour = "red"
+        SaveGame(self.game, self.path)
+
+        self.box.colour = "blue"
+        self.start_room.removeThing(self.coin)
+        self.box.addThing(self.coin)
+        self.game.turnMain("look")
+
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        populate_contains = l.populate_contains
+
+        def fail_part_way(*args):
+            populate_contains(*args)
+            raise RuntimeError("failed part way through loading")
+
+        l.populate_contains = fail_part_way
+        with self.assertRaises(RuntimeError):
+            l.load()
+
+        self.assertEqual(self.box.colour, "blue")
+        self.assertIs(self.coin.location, self.box)
+        self.assertItemExactlyOnceIn(self.coin, self.box.contains, "coin")
+        self.assertItemNotIn(self.coin, self.start_room.contains, "coin")
+        self.assertItemIn(self.coin, self.start_room.sub_contains, "coin")
+
+        # the turns before the failed load can still be undone
+        self.assertEqual(self.game.undo(), 1)
+        self.assertIs(self.coin.location, self.start_room)
+
+    def test_save_with_unknown_object_in_contents_is_invalid(self):
+        SaveGame(self.game, self.path, delta=False)
+        l = LoadGame(self.game, self.path)
+        tree = l.data["locations"][self.start_room.ix]
+        tree["contains"][self.box.ix][0]["contains"]["Thing__missing"] = [
+            {"ix": "Thing__missing", "contains": {}, "placed": False}
+        ]
+        self.assertFalse(l.is_valid())
+
+    def test_load_leaves_locations_already_as_saved(self):
+        SaveGame(self.game, self.path, delta=False)
+        contents = self.start_room.contains[self.coin.ix]
+
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        l.load()
+
+        self.assertIs(self.start_room.contains[self.coin.ix], contents)
+        self.assertItemExactlyOnceIn(self.coin, self.start_room.contains, "coin")
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.path)
+
+
+class TestLazyLoad(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        FILENAME = f"_ifp_tests_saveload__{uuid.uuid4()}.sav"
+
+        path = os.path.dirname(os.path.realpath(__file__))
+        self.path = os.path.join(path, FILENAME)
+
+        self.hall = Room(self.game, "hall", "desc")
+        self.box = Container(self.game, "box")
+        self.pebble = Thing(self.game, "pebble")
+        self.start_room.addThing(self.box)
+        self.hall.addThing(self.pebble)
+        self.game.takeBaseline()
+
+        self.pebble.colour = "grey"
+        SaveGame(self.game, self.path)
+        self.pebble.colour = "green"
+
+    def _load(self):
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        l.load()
+        return l
+
+    def test_attributes_are_decoded_when_first_used(self):
+        self._load()
+
+        self.assertIn(self.pebble, self.game.deferred.pending)
+        self.assertIs(type(self.pebble), Thing)
+        self.assertNotIn("colour", self.pebble.__dict__)
+
+        self.assertEqual(self.pebble.colour, "grey")
+        self.assertNotIn(self.pebble, self.game.deferred.pending)
+        self.assertIs(type(self.pebble), Thing)
+
+    def test_save_file_is_closed_once_loaded(self):
+        l = self._load()
+
+        self.assertTrue(l.save_map.map.closed)
+        self.assertEqual(self.pebble.colour, "grey")
+
+    def test_attributes_defined_by_the_class_are_loaded_straight_away(self):
+        self.pebble.name = "stone"
+        SaveGame(self.game, self.path)
+        self.pebble.name = "pebble"
+
+        self._load()
+
+        self.assertEqual(self.pebble.__dict__["name"], "stone")
+
+    def test_missing_attribute_is_still_an_attribute_error(self):
+        self._load()
+
+        with self.assertRaises(AttributeError):
+            self.pebble.not_an_attribute
+        self.assertEqual(self.pebble.colour, "grey")
+
+    def test_attribute_set_before_it_is_decoded_is_kept(self):
+        self._load()
+
+        self.pebble.colour = "blue"
+
+        self.assertEqual(self.pebble.colour, "blue")
+        self.game.deferred.decodeAll()
+        self.assertEqual(self.pebble.colour, "blue")
+
+    def test_snapshot_only_decodes_the_objects_changed(self):
+        self.box.colour = "brown"
+        self.pebble.colour = "grey"
+        SaveGame(self.game, self.path)
+        self.box.colour = "red"
+        self.pebble.colour = "green"
+        self._load()
+        snapshot = self.game.snapshot()
+        self.assertIn(self.pebble, self.game.deferred.pending)
+        self.pebble.colour = "blue"
+
+        snapshot.restore()
+
+        self.assertIn(self.box, self.game.deferred.pending)
+        self.assertEqual(self.pebble.colour, "grey")
+        self.assertEqual(self.box.colour, "brown")
+
+    def test_undo_only_decodes_the_objects_changed(self):
+        self.box.colour = "brown"
+        self.pebble.colour = "grey"
+        SaveGame(self.game, self.path)
+        self.box.colour = "red"
+        self.pebble.colour = "green"
+        self.game.enableUndo()
+        self._load()
+
+        self.box.colour = "blue"
+
+        self.assertIn(self.pebble, self.game.deferred.pending)
+        self.assertNotIn(self.box, self.game.deferred.pending)
+
+    def test_loading_again_replaces_attributes_waiting(self):
+        self._load()
+        self.pebble.colour = "blue"
+        SaveGame(self.game, self.path)
+        self.pebble.colour = "red"
+        self.assertNotIn(self.pebble, self.game.deferred.pending)
+
+        self._load()
+
+        self.assertEqual(self.pebble.colour, "blue")
+
+    def test_objects_not_used_are_not_decoded(self):
+        self._load()
+
+        self.game.turnMain("look")
+
+        self.assertIn(self.pebble, self.game.deferred.pending)
+
+    def test_adjectives_are_loaded_straight_away(self):
+        self.pebble.setAdjectives(["round"])
+        SaveGame(self.game, self.path)
+        self.pebble.setAdjectives(["flat"])
+
+        self._load()
+
+        self.assertIn(self.pebble, self.game.adjectives["round"])
+        self.assertNotIn("flat", self.game.adjectives)
+        self.assertEqual(self.pebble.adjectives, ["round"])
+
+    def test_copy_of_pending_object_has_loaded_attributes(self):
+        self._load()
+
+        copy = self.pebble.copyThing()
+
+        self.assertIs(type(copy), Thing)
+        self.assertIs(type(self.pebble), Thing)
+        self.assertEqual(copy.colour, "grey")
+
+    def test_saving_decodes_every_pending_object(self):
+        l = self._load()
+
+        SaveGame(self.game, self.path)
+
+        self.assertEqual(len(self.game.deferred), 0)
+        self.assertTrue(l.save_map.map.closed)
+        self.assertEqual(self.pebble.__dict__["colour"], "grey")
+        l = LoadGame(self.game, self.path, lazy=False)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+        self.assertEqual(
+            l.validated_data["ifp_objects"][self.pebble.ix]["colour"], "grey"
+        )
+
+    def test_undo_keeps_the_loaded_attributes(self):
+        self.game.enableUndo()
+        self._load()
+        self.game.turnMain("look")
+        self.pebble.colour = "blue"
+        self.game.turnMain("look")
+
+        self.game.undo()
+
+        self.assertEqual(self.pebble.colour, "grey")
+
+    def test_failed_load_leaves_objects_undecoded(self):
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+
+        def fail(*args):
+            raise RuntimeError("failed part way through loading")
+
+        l.load_locations = fail
+        with self.assertRaises(RuntimeError):
+            l.load()
+
+        self.assertIs(type(self.pebble), Thing)
+        self.assertEqual(self.pebble.colour, "green")
+        self.assertTrue(l.save_map.map.closed)
+
+    def test_failed_load_keeps_attributes_waiting_from_earlier_save(self):
+        self._load()
+        l = LoadGame(self.game, self.path)
+        self.assertTrue(l.is_valid(), "Save file invalid. Cannot proceed.")
+
+        def fail(*args):
+            raise RuntimeError("failed part way through loading")
+
+        l.load_locations = fail
+        with self.assertRaises(RuntimeError):
+            l.load()
+
+        self.assertIn(self.pebble, self.game.deferred.pending)
+        self.assertEqual(self.pebble.colour, "grey")
+
+    def test_damaged_file_is_invalid(self):
+        with open(self.path, "r+b") as f:
+            f.seek(-len(self.pebble.ix) - 20, os.SEEK_END)
+            f.write(b"\xff")
+
+        l = LoadGame(self.game, self.path)
+
+        self.assertFalse(l.is_valid())
+
+    def tearDown(self):
+        super().tearDown()
+        os.remove(self.path)
@@ -0,0 +1,160 @@
+import threading
+from unittest import TestCase
+
+from intficpy.actor import Player
+from intficpy.exceptions import UnknownSession
+from intficpy.ifp_game import IFPGame
+from intficpy.room import Room
+from intficpy.server import SessionApp, SessionManager
+from intficpy.thing_base import Thing
+
+
+def build(app):
+    game = IFPGame(app, main=__name__)
+    me = Player(game)
+    room = Room(game, "room", "A plain room. ")
+    room.addThing(me)
+    game.setPlayer(me)
+    coin = Thing(game, "coin")
+    coin.invItem = True
+    room.addThing(coin)
+    game.gameOpening = lambda game: game.addText("Welcome. ")
+    return game
+
+
+class LineApp:
+    def __init__(self):
+        self.game = None
+        self.lines = []
+
+    def printEventText(self, event):
+        self.lines.extend(event.text)
+
+    def takeEvents(self):
+        lines = self.lines
+        self.lines = []
+        return lines
+
+
+def text(events):
+    return [t for event in events for t in event["text"]]
+
+
+class TestSessionManager(TestCase):
+    def setUp(self):
+        self.builds = []
+        self.sessions = SessionManager(self._build)
+        self.addCleanup(self.sessions.closeAll)
+
+    def _build(self, app):
+        self.builds.append(app)
+        return build(app)
+
+    def _coin(self, session_id):
+        game = self.sessions.session(session_id).game
+        return game.nouns["coin"][0]
+
+    def test_open_returns_opening_events(self):
+        session_id, events = self.sessions.open()
+
+        self.assertIn(session_id, self.sessions)
+        self.assertIn("Welcome. ", text(events))
+        self.assertIn("A plain room. ", "".join(text(events)))
+
+    def test_world_is_built_once(self):
+        for i in range(3):
+            self.sessions.open()
+
+        self.assertEqual(len(self.builds), 1)
+        self.assertEqual(len(self.sessions), 3)
+
+    def test_turn_returns_events(self):
+        session_id, _ = self.sessions.open()
+
+        events = self.sessions.turn(session_id, "take coin")
+
+        self.assertIn("You take the coin. ", text(events))
+        self.assertEqual(self.sessions.turn(session_id, ""), [])
+
+    def test_sessions_play_their_own_games(self):
+        first, _ = self.sessions.open()
+        second, _ = self.sessions.open()
+
+        self.sessions.turn(first, "take coin")
+
+        first_game = self.sessions.session(first).game
+        second_game = self.sessions.session(second).game
+        self.assertIs(self._coin(first).location, first_game.me)
+        self.assertIsNot(self._coin(second).location, second_game.me)
+        self.assertIn(
+            "You take the coin. ", text(self.sessions.turn(second, "take coin"))
+        )
+
+    def test_open_with_session_id(self):
+        session_id, _ = self.sessions.open("player-1")
+        self.assertEqual(session_id, "player-1")
+
+        with self.assertRaises(ValueError):
+            self.sessions.open("player-1")
+
+    def test_open_with_app(self):
+        app = LineApp()
+
+        session_id, events = self.sessions.open(app=app)
+
+        self.assertIs(self.sessions.session(session_id).app, app)
+        self.assertIn("Welcome. ", events)
+
+    def test_app_class_formats_events(self):
+        class TextApp(SessionApp):
+            def formatEvent(self, event):
+                return "".join(event.text)
+
+        sessions = SessionManager(build, TextApp)
+        session_id, _ = sessions.open()
+
+        self.assertEqual(
+            sessions.turn(session_id, "take coin"), ["take coin", "You take the coin. "]
+        )
+
+    def test_unknown_session_raises(self):
+        with self.assertRaises(UnknownSession):
+            self.sessions.turn("nobody", "look")
+        with self.assertRaises(UnknownSession):
+            self.sessions.close("nobody")
+
+    def test_closed_session_cannot_play(self):
+        session_id, _ = self.sessions.open()
+
+        self.sessions.close(session_id)
+
+        self.assertNotIn(session_id, self.sessions)
+        with self.assertRaises(UnknownSession):
+            self.sessions.turn(session_id, "look")
+
+    def test_file_verbs_are_turned_away(self):
+        session_id, _ = self.sessions.open()
+
+        events = self.sessions.turn(session_id, "save")
+
+        self.assertIn("Could not save game.", text(events))
+
+    def test_turns_on_one_session_are_played_one_at_a_time(self):
+        session_id, _ = self.sessions.open()
+        game = self.sessions.session(session_id).game
+        game.enableUndo()
+        start = game.daemons.turn
+        turns = 20
+
+        def play():
+            for i in range(turns):
+                self.sessions.turn(session_id, "look")
+
+        threads = [threading.Thread(target=play) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(game.daemons.turn, start + 4 * turns)
+        self.assertEqual(len(game.changes.journal), game.changes.journal.max_turns)
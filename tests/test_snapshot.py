@@ -0,0 +1,202 @@
+from intficpy.baseline import Baseline
+from intficpy.daemons import Daemon
+from intficpy.sequence import Sequence
+from intficpy.thing_base import Thing
+from intficpy.things import Container, LightSource
+
+from .helpers import IFPTestCase, TestApp
+
+
+def game_state(game):
+    """Everything a snapshot keeps, for comparing games"""
+    return {
+        "objects": {
+            ix: Baseline.copy_attributes(obj) for ix, obj in game.ifp_objects.items()
+        },
+        "nouns": {word: list(things) for word, things in game.nouns.items()},
+        "adjectives": {word: set(things) for word, things in game.adjectives.items()},
+        "next_obj_ix": game.next_obj_ix,
+        "me": game.me,
+        "turn_list": list(game.turn_list),
+        "parser_turns": game.parser.turns,
+        "previous_input": game.parser.previous_command.input_string,
+        "sequence": game.parser.previous_command.sequence,
+    }
+
+
+class TestSnapshot(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.box = Container(self.game, "box")
+        self.coin = Thing(self.game, "coin")
+        self.coin.invItem = True
+        self.lamp = LightSource(self.game, "lamp")
+        self.start_room.addThing(self.box)
+        self.start_room.addThing(self.coin)
+        self.box.addThing(self.lamp)
+        self.runs = []
+        self.daemon = Daemon(self.game, lambda game: self.runs.append(game))
+        self.game.enableUndo()
+        self.game.turnMain("look")
+
+    def _play(self):
+        """Change a bit of everything a snapshot keeps"""
+        self.game.turnMain("take coin")
+        self.game.me.removeThing(self.coin)
+        self.box.addThing(self.coin)
+        self.lamp.light(self.game)
+        self.coin.colour = "gold"
+        self.coin.addSynonym("penny")
+        self.coin.setAdjectives(["shiny"])
+        self.game.daemons.runAfter(self.daemon, 2)
+        self.game.turnMain("look")
+        self.created = Thing(self.game, "pebble")
+        self.start_room.addThing(self.created)
+        Sequence(self.game, ["It begins", {"go on": ["It ends"]}]).start()
+        self.game.turnMain("look")
+
+    def test_restore_puts_everything_back(self):
+        before = game_state(self.game)
+        snapshot = self.game.snapshot()
+
+        self._play()
+        self.assertNotEqual(game_state(self.game), before)
+        self.game.restore(snapshot)
+
+        self.assertEqual(game_state(self.game), before)
+        self.assertNotIn(self.created.ix, self.game.ifp_objects)
+        self.assertIs(self.coin.location, self.start_room)
+        self.assertItemNotIn(self.coin, self.box.contains, "box contents")
+        self.assertItemIn(self.lamp, self.start_room.sub_contains, "room contents")
+        self.assertItemNotIn(
+            self.created, self.start_room.sub_contains, "room contents"
+        )
+        self.assertFalse(self.start_room.lit_count)
+
+    def test_restored_game_plays_on_as_before(self):
+        snapshot = self.game.snapshot()
+        self.game.turnMain("take coin")
+        self.game.daemons.runAfter(self.daemon, 1)
+
+        self.game.restore(snapshot)
+        self.game.turnMain("look")
+
+        self.assertEqual(self.runs, [])
+        self.assertIs(self.coin.location, self.start_room)
+        self.game.turnMain("take coin")
+        self.assertIs(self.coin.location, self.me)
+
+    def test_snapshot_shares_copies_of_unchanged_objects(self):
+        first = self.game.snapshot()
+        self.coin.colour = "gold"
+
+        second = self.game.snapshot()
+
+        self.assertIs(second.objects[self.box], first.objects[self.box])
+        self.assertIsNot(second.objects[self.coin], first.objects[self.coin])
+        self.assertEqual(second.objects[self.coin]["colour"], "gold")
+        self.assertIs(second.nouns, first.nouns)
+
+    def test_restore_each_of_several_snapshots(self):
+        snapshots = []
+        states = []
+        for command in ("take coin", "put coin in box", "light lamp", "drop coin"):
+            states.append(game_state(self.game))
+            snapshots.append(self.game.snapshot())
+            self.game.turnMain(command)
+
+        for i in (1, 3, 0, 2, 2):
+            self.game.restore(snapshots[i])
+            self.assertEqual(game_state(self.game), states[i], i)
+
+    def test_restore_without_change_tracking(self):
+        self.game.stopTrackingChanges()
+        before = game_state(self.game)
+        snapshot = self.game.snapshot()
+
+        self._play()
+        self.game.restore(snapshot)
+
+        self.assertEqual(game_state(self.game), before)
+
+    def test_restore_after_undo(self):
+        before = game_state(self.game)
+        snapshot = self.game.snapshot()
+        self.game.turnMain("take coin")
+        self.game.turnMain("drop coin")
+        self.game.undo()
+
+        self.game.restore(snapshot)
+
+        self.assertEqual(game_state(self.game), before)
+
+    def test_restore_cannot_be_undone(self):
+        snapshot = self.game.snapshot()
+        self.game.turnMain("take coin")
+
+        self.game.restore(snapshot)
+
+        self.assertEqual(self.game.undo(), 0)
+        self.assertIs(self.coin.location, self.start_room)
+
+    def test_restore_snapshot_of_another_game_raises(self):
+        other = self.game.fork(TestApp())
+        with self.assertRaises(ValueError):
+            self.game.restore(other.snapshot())
+
+
+class TestFork(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.box = Container(self.game, "box")
+        self.coin = Thing(self.game, "coin")
+        self.coin.invItem = True
+        self.start_room.addThing(self.box)
+        self.box.addThing(self.coin)
+        self.game.enableUndo()
+        self.game.turnMain("look")
+
+    def test_fork_copies_world(self):
+        app = TestApp()
+        fork = self.game.fork(app)
+
+        self.assertIs(fork.app, app)
+        self.assertIs(app.game, fork)
+        self.assertIs(self.app.game, self.game)
+        fork_coin = fork.ifp_objects[self.coin.ix]
+        self.assertIsNot(fork_coin, self.coin)
+        self.assertIs(fork_coin.game, fork)
+        self.assertIs(fork_coin.location, fork.ifp_objects[self.box.ix])
+        self.assertIn(fork_coin, fork.nouns["coin"])
+        self.assertIs(fork.me, fork.ifp_objects[self.me.ix])
+
+        self.assertEqual(fork_coin.contains, {})
+        self.assertEqual(fork.ifp_objects.keys(), self.game.ifp_objects.keys())
+        self.assertEqual(fork.next_obj_ix, self.game.next_obj_ix)
+        self.assertEqual(fork.daemons.turn, self.game.daemons.turn)
+
+    def test_fork_plays_on_its_own(self):
+        fork = self.game.fork(TestApp())
+
+        fork.turnMain("take coin")
+
+        self.assertIs(fork.ifp_objects[self.coin.ix].location, fork.me)
+        self.assertIs(self.coin.location, self.box)
+        self.assertIn("You take the coin. ", fork.app.print_stack)
+        self.assertNotIn("You take the coin. ", self.app.print_stack)
+
+    def test_fork_can_undo_and_save_deltas(self):
+        self.game.takeBaseline()
+        fork = self.game.fork(TestApp())
+        fork_coin = fork.ifp_objects[self.coin.ix]
+
+        fork.turnMain("take coin")
+        self.assertIs(fork_coin.location, fork.me)
+        self.assertEqual(fork.undo(), 1)
+
+        self.assertIs(fork_coin.location, fork.ifp_objects[self.box.ix])
+        self.assertIs(fork.baseline.game, fork)
+        self.assertEqual(
+            fork.baseline.changed_objects().keys(),
+            self.game.baseline.changed_objects().keys(),
+        )
@@ -0,0 +1,172 @@
+import os
+import uuid
+
+from intficpy.actor import Actor, Topic
+from intficpy.daemons import Daemon
+from intficpy.serializer import SaveGame, LoadGame
+from intficpy.thing_base import Thing
+from intficpy.things import Container, LightSource
+
+from .helpers import IFPTestCase
+
+
+class TestUndo(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.game.enableUndo()
+        self.box = Container(self.game, "box")
+        self.coin = Thing(self.game, "coin")
+        self.start_room.addThing(self.box)
+        self.start_room.addThing(self.coin)
+        self._endTurn()
+
+    def _endTurn(self):
+        self.game.turnMain("look")
+
+    def test_undo_restores_attributes(self):
+        self.box.colour = "red"
+        self._endTurn()
+        self.box.colour = "blue"
+        self.box.weight_in_grams = 3
+        self._endTurn()
+
+        self.assertEqual(self.game.undo(), 1)
+
+        self.assertEqual(self.box.colour, "red")
+        self.assertFalse(hasattr(self.box, "weight_in_grams"))
+
+    def test_undo_restores_deleted_attribute(self):
+        self.box.colour = "red"
+        self._endTurn()
+        del self.box.colour
+        self._endTurn()
+
+        self.game.undo()
+
+        self.assertEqual(self.box.colour, "red")
+
+    def test_undo_restores_moves_and_nested_contents(self):
+        self.start_room.removeThing(self.coin)
+        self.box.addThing(self.coin)
+        self._endTurn()
+
+        self.game.undo()
+
+        self.assertIs(self.coin.location, self.start_room)
+        self.assertItemNotIn(self.coin, self.box.contains, "coin")
+        self.assertItemNotIn(self.coin, self.start_room.sub_contains, "coin")
+        self.assertItemExactlyOnceIn(self.coin, self.start_room.contains, "coin")
+
+    def test_undo_restores_noun_and_adjective_indexes(self):
+        self.coin.addSynonym("penny")
+        self.coin.setAdjectives(["shiny"])
+        self._endTurn()
+
+        self.game.undo()
+
+        self.assertNotIn("penny", self.game.nouns)
+        self.assertNotIn("penny", self.coin.synonyms)
+        self.assertNotIn("shiny", self.game.adjectives)
+
+    def test_undo_removes_things_created_during_the_turn(self):
+        pebble = Thing(self.game, "pebble")
+        self.start_room.addThing(pebble)
+        self._endTurn()
+
+        self.game.undo()
+
+        self.assertNotIn(pebble.ix, self.game.ifp_objects)
+        self.assertNotIn("pebble", self.game.nouns)
+        self.assertItemNotIn(pebble, self.start_room.contains, "pebble")
+
+    def test_undo_restores_daemons(self):
+        daemon = Daemon(self.game, lambda game: None)
+        self.game.daemons.add(daemon)
+        self._endTurn()
+        self.game.daemons.remove(daemon)
+        self._endTurn()
+
+        self.game.undo()
+        self.assertIn(daemon, self.game.daemons)
+
+        self.game.undo()
+        self.assertNotIn(daemon, self.game.daemons)
+
+    def test_undo_restores_lit_count(self):
+        self.start_room.dark = True
+        lamp = LightSource(self.game, "lamp")
+        self.box.addThing(lamp)
+        self._endTurn()
+        lamp.light(self.game)
+        self._endTurn()
+        self.assertTrue(self.start_room.resolveDarkness(self.game))
+
+        self.game.undo()
+
+        self.assertFalse(lamp.is_lit)
+        self.assertEqual(self.start_room.lit_count, 0)
+        self.assertFalse(self.start_room.resolveDarkness(self.game))
+
+    def test_undo_restores_things_changed_in_place(self):
+        actor = Actor(self.game, "clerk")
+        handle = Thing(self.game, "handle")
+        self.start_room.addThing(actor)
+        self._endTurn()
+        actor.addTopic("ask", Topic(self.game, "Mine. "), self.box)
+        self.box.addComposite(handle)
+        self._endTurn()
+
+        self.game.undo()
+
+        self.assertEqual(actor.ask_topics, {})
+        self.assertEqual(self.box.children, [])
+        self.assertEqual(self.box.child_Things, [])
+
+    def test_undo_stops_at_oldest_turn_kept(self):
+        self.game.changes.journal.max_turns = 2
+        for colour in ("red", "green", "blue"):
+            self.box.colour = colour
+            self._endTurn()
+
+        self.assertEqual(len(self.game.changes.journal), 2)
+        self.assertEqual(self.game.undo(5), 2)
+        self.assertEqual(self.box.colour, "red")
+
+    def test_journal_size_is_capped(self):
+        journal = self.game.changes.journal
+        journal.max_size = 1000
+        for i in range(50):
+            setattr(self.box, f"attr{i}", i)
+            self._endTurn()
+
+        self.assertLessEqual(journal.size, 1000)
+        self.assertLess(len(journal), 50)
+
+    def test_undo_updates_tracked_changes(self):
+        turn = self.game.daemons.turn
+        self.box.colour = "red"
+        self._endTurn()
+        self.assertIn((self.box, "colour"), self.game.changesSince(turn))
+
+        self.game.undo()
+
+        self.assertEqual(self.game.daemons.turn, turn)
+        self.assertNotIn((self.box, "colour"), self.game.changesSince(turn))
+
+    def test_loading_clears_undo_history(self):
+        path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            f"_ifp_tests_saveload__{uuid.uuid4()}.sav",
+        )
+        self.addCleanup(os.remove, path)
+        self.box.colour = "red"
+        self._endTurn()
+        SaveGame(self.game, path)
+
+        l = LoadGame(self.game, path)
+        self.assertTrue(l.is_valid())
+        l.load()
+
+        self.assertEqual(len(self.game.changes.journal), 0)
+        self.assertEqual(self.game.undo(), 0)
+        self.assertEqual(self.box.colour, "red")
@@ -29,3 +29,24 @@ class TestCopyThingUniqueIx(IFPTestCase):
         replica = orig.copyThingUniqueIx()
         self.assertFalse(replica.contains)
         self.assertFalse(replica.sub_contains)
+
+
+class NotSearched(list):
+    def __contains__(self, item):
+        raise AssertionError("the noun list was searched")
+
+
+class TestCopyNounIndex(IFPTestCase):
+    def test_copies_are_added_to_nouns_without_searching_the_list(self):
+        # searching the list for every copy made building many copies quadratic
+        orig = Thing(self.app.game, "coin")
+        orig.addSynonym("money")
+        self.app.game.nouns["coin"] = NotSearched(self.app.game.nouns["coin"])
+        self.app.game.nouns["money"] = NotSearched(self.app.game.nouns["money"])
+
+        replica = orig.copyThing()
+        unique = orig.copyThingUniqueIx()
+        made = Thing(self.app.game, "coin")
+
+        self.assertEqual(self.app.game.nouns["coin"], [orig, replica, unique, made])
+        self.assertEqual(self.app.game.nouns["money"], [orig, replica, unique])
@@ -1,5 +1,5 @@
 from ..helpers import IFPTestCase
-from intficpy.things import LightSource, Thing
+from intficpy.things import Container, LightSource, Surface, Thing
 
 
 class TestDarkness(IFPTestCase):
@@ -60,3 +60,103 @@ class TestLightSource(IFPTestCase):
         self.light.light(self.game)
         self.light.extinguish(self.game)
         self.assertIn(self.light.not_lit_desc, self.light.desc)
+
+
+class TestLitCount(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.start_room.dark = True
+        self.light = LightSource(self.game, "light")
+        self.light.light(self.game)
+
+    def test_lit_light_in_room_lights_room(self):
+        self.start_room.addThing(self.light)
+        self.assertEqual(self.start_room.lit_count, 1)
+        self.assertTrue(self.start_room.resolveDarkness(self.game))
+
+    def test_extinguishing_light_darkens_room(self):
+        self.start_room.addThing(self.light)
+        self.light.extinguish(self.game)
+        self.assertEqual(self.start_room.lit_count, 0)
+        self.assertFalse(self.start_room.resolveDarkness(self.game))
+
+    def test_removing_light_darkens_room(self):
+        self.start_room.addThing(self.light)
+        self.start_room.removeThing(self.light)
+        self.assertEqual(self.start_room.lit_count, 0)
+        self.assertFalse(self.start_room.resolveDarkness(self.game))
+
+    def test_light_carried_by_player_lights_room(self):
+        self.game.me.addThing(self.light)
+        self.assertEqual(self.game.me.lit_count, 1)
+        self.assertTrue(self.start_room.resolveDarkness(self.game))
+
+    def test_light_in_container_carried_by_player_lights_room(self):
+        bag = Container(self.game, "bag")
+        bag.addThing(self.light)
+        self.game.me.addThing(bag)
+        self.assertEqual(self.game.me.lit_count, 1)
+        self.assertTrue(self.start_room.resolveDarkness(self.game))
+
+    def test_light_nested_in_open_container_lights_room(self):
+        box = Container(self.game, "box")
+        shelf = Surface(self.game, "shelf")
+        box.addThing(self.light)
+        shelf.addThing(box)
+        self.start_room.addThing(shelf)
+
+        self.assertEqual(self.start_room.lit_count, 1)
+        self.assertTrue(self.start_room.resolveDarkness(self.game))
+
+        self.light.extinguish(self.game)
+        self.assertEqual(self.start_room.lit_count, 0)
+        self.assertEqual(box.lit_count, 0)
+        self.assertFalse(self.start_room.resolveDarkness(self.game))
+
+    def test_light_in_closed_container_does_not_light_room(self):
+        box = Container(self.game, "box")
+        box.giveLid()
+        box.addThing(self.light)
+        self.start_room.addThing(box)
+
+        self.assertEqual(box.lit_count, 1)
+        self.assertEqual(self.start_room.lit_count, 0)
+        self.assertFalse(self.start_room.resolveDarkness(self.game))
+
+        box.makeOpen()
+        self.assertEqual(self.start_room.lit_count, 1)
+        self.assertTrue(self.start_room.resolveDarkness(self.game))
+
+    def test_lighting_light_in_closed_container_does_not_light_room(self):
+        box = Container(self.game, "box")
+        box.giveLid()
+        self.light.extinguish(self.game)
+        box.addThing(self.light)
+        self.start_room.addThing(box)
+
+        self.light.light(self.game)
+
+        self.assertEqual(box.lit_count, 1)
+        self.assertEqual(self.start_room.lit_count, 0)
+
+    def test_expired_light_darkens_room(self):
+        self.light.extinguish(self.game)
+        self.light.consumable = True
+        self.light.turns_left = 1
+        self.game.me.addThing(self.light)
+        self.light.light(self.game)
+        self.assertTrue(self.start_room.resolveDarkness(self.game))
+
+        self.game.turnMain("wait")
+
+        self.assertFalse(self.light.is_lit)
+        self.assertEqual(self.game.me.lit_count, 0)
+        self.assertFalse(self.start_room.resolveDarkness(self.game))
+
+    def test_describe_dark_uses_nested_light(self):
+        box = Container(self.game, "box")
+        box.addThing(self.light)
+        self.start_room.addThing(box)
+
+        self.assertFalse(self.start_room.describeDark(self.game))
+        self.assertIn(self.light.room_lit_msg, self.game.next_events["turn"].text)
@@ -52,3 +52,78 @@ class TestUnderSpace(IFPTestCase):
             self.start_room.sub_contains,
             "Sub contents not shown after reveal",
         )
+
+
+class TestSubContainsIndex(IFPTestCase):
+    def _computed_sub_contains(self, entity):
+        ret = {}
+        for item in entity.topLevelContentsList:
+            for sub in self._computed_visible_nested(item):
+                ret.setdefault(sub.ix, []).append(sub)
+        return ret
+
+    def _computed_visible_nested(self, entity):
+        if not entity.revealed:
+            return []
+        ret = entity.topLevelContentsList
+        for item in entity.topLevelContentsList:
+            ret += self._computed_visible_nested(item)
+        return ret
+
+    def assertIndexConsistent(self, entity):
+        expected = self._computed_sub_contains(entity)
+        self.assertEqual(
+            {ix: set(map(id, items)) for ix, items in expected.items()},
+            {ix: set(map(id, items)) for ix, items in entity.sub_contains.items()},
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.box = Container(self.game, "box")
+        self.box.giveLid()
+        self.box.makeOpen()
+        self.bag = Container(self.game, "bag")
+        self.widget = Thing(self.game, "widget")
+        self.glitter = Thing(self.game, "glitter")
+        self.glitter.moveTo(self.widget)
+        self.widget.moveTo(self.bag)
+        self.bag.moveTo(self.box)
+        self.box.moveTo(self.start_room)
+
+    def test_moving_nested_item_updates_all_ancestors(self):
+        self.assertItemIn(self.glitter, self.start_room.sub_contains, "before move")
+        self.assertItemIn(self.glitter, self.box.sub_contains, "before move")
+
+        self.widget.moveTo(self.me)
+
+        self.assertItemNotIn(self.glitter, self.box.sub_contains, "box")
+        self.assertItemNotIn(self.widget, self.bag.sub_contains, "bag")
+        self.assertItemIn(self.glitter, self.me.sub_contains, "player")
+        self.assertItemIn(self.glitter, self.start_room.sub_contains, "player in room")
+        for entity in (self.start_room, self.box, self.bag, self.me):
+            self.assertIndexConsistent(entity)
+
+    def test_hiding_and_revealing_contents_updates_ancestors(self):
+        self.box.makeClosed()
+        self.box.revealed = False
+        self.assertItemNotIn(self.widget, self.start_room.sub_contains, "hidden")
+        self.assertItemIn(self.widget, self.box.sub_contains, "box sees own nested")
+        self.assertIndexConsistent(self.start_room)
+
+        self.box.makeOpen()
+        self.assertItemIn(self.glitter, self.start_room.sub_contains, "revealed")
+        self.assertIndexConsistent(self.start_room)
+
+    def test_adding_to_hidden_container_does_not_reveal(self):
+        self.box.makeClosed()
+        self.box.revealed = False
+        coin = Thing(self.game, "coin")
+        coin.moveTo(self.bag)
+        self.assertItemNotIn(coin, self.start_room.sub_contains, "hidden")
+        self.assertItemIn(coin, self.box.sub_contains, "box")
+        self.assertIndexConsistent(self.start_room)
+
+    def test_copied_thing_starts_with_empty_index(self):
+        copy = self.bag.copyThing()
+        self.assertEqual(copy.sub_contains, {})
+        self.assertItemIn(self.glitter, self.bag.sub_contains, "original")
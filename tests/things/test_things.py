@@ -341,3 +341,54 @@ class TestMoveTo(IFPTestCase):
 
 
 add_thing_instantiation_tests()
+
+
+class TestAdjectiveIndex(IFPTestCase):
+    def test_set_adjectives_updates_index(self):
+        item = Thing(self.game, "coin")
+        item.setAdjectives(["shiny", "gold"])
+        self.assertIn(item, self.game.adjectives["shiny"])
+        self.assertIn(item, self.game.adjectives["gold"])
+
+        item.setAdjectives(["dull"])
+
+        self.assertNotIn(item, self.game.adjectives.get("shiny", ()))
+        self.assertNotIn(item, self.game.adjectives.get("gold", ()))
+        self.assertIn(item, self.game.adjectives["dull"])
+
+    def test_copy_thing_is_indexed_under_adjectives(self):
+        item = Thing(self.game, "coin")
+        item.setAdjectives(["shiny"])
+        copy = item.copyThing()
+        self.assertIn(item, self.game.adjectives["shiny"])
+        self.assertIn(copy, self.game.adjectives["shiny"])
+
+    def test_make_proper_indexes_new_adjectives(self):
+        actor = Actor(self.game, "woman")
+        actor.makeProper("Lisa Smith")
+        self.assertIn(actor, self.game.adjectives["lisa"])
+
+    def test_set_from_prototype_reindexes_adjectives(self):
+        item = Thing(self.game, "coin")
+        item.setAdjectives(["dull"])
+        prototype = Thing(self.game, "coin")
+        prototype.setAdjectives(["shiny"])
+
+        item.setFromPrototype(prototype)
+
+        self.assertNotIn(item, self.game.adjectives.get("dull", ()))
+        self.assertIn(item, self.game.adjectives["shiny"])
+
+    def test_parser_narrows_many_copies_by_adjective(self):
+        dull = Thing(self.game, "coin")
+        dull.setAdjectives(["dull", "copper"])
+        self.start_room.addThing(dull)
+        for i in range(20):
+            self.start_room.addThing(dull.copyThing())
+        shiny = Thing(self.game, "coin")
+        shiny.setAdjectives(["shiny", "gold"])
+        self.start_room.addThing(shiny)
+
+        self.game.turnMain("x shiny gold coin")
+
+        self.assertIs(self.game.parser.command.dobj.target, shiny)
@@ -0,0 +1,69 @@
+import os
+import uuid
+
+from ..helpers import IFPTestCase
+
+from intficpy.thing_base import Thing
+
+
+class TestSaveLoadVerbs(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            f"_ifp_tests_saveload__{uuid.uuid4()}.sav",
+        )
+        self.addCleanup(self._remove)
+        self.app.saveFilePrompt = lambda *args: self.path
+        self.app.openFilePrompt = lambda *args: self.path
+        self.widget = Thing(self.game, "widget")
+        self.widget.invItem = True
+        self.start_room.addThing(self.widget)
+
+    def _remove(self):
+        if self.game.saves:
+            self.game.saves.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def test_save_then_load_restores_game(self):
+        self.game.turnMain("save")
+        self.assertIn("Saving game.", self.app.print_stack)
+
+        self.game.turnMain("get widget")
+        self.assertIs(self.widget.location, self.me)
+
+        self.game.turnMain("load")
+        self.assertIn("Game loaded.", self.app.print_stack)
+        self.assertIs(self.widget.location, self.start_room)
+        self.assertItemExactlyOnceIn(self.widget, self.start_room.contains, "widget")
+
+    def test_app_is_told_when_save_is_written(self):
+        finished = []
+        self.app.saveFinished = lambda filename, error: finished.append(
+            (filename, error)
+        )
+
+        self.game.turnMain("save")
+        self.game.saves.wait()
+
+        self.assertEqual(finished, [(self.path, None)])
+
+    def test_failed_save_is_reported_on_next_turn(self):
+        missing = os.path.join(os.path.dirname(self.path), f"missing_{uuid.uuid4()}")
+        self.app.saveFilePrompt = lambda *args: os.path.join(missing, "game.sav")
+
+        self.game.turnMain("save")
+        self.game.saves.wait()
+        self.assertFalse(any("Could not save" in t for t in self.app.print_stack))
+        self.game.turnMain("look")
+
+        self.assertTrue(any("Could not save game" in t for t in self.app.print_stack))
+
+    def test_load_damaged_file_is_refused(self):
+        with open(self.path, "wb") as f:
+            f.write(b"IFPSVZ\x01 not a zlib stream")
+
+        self.game.turnMain("load")
+
+        self.assertIn("Cannot load game file.", self.app.print_stack)
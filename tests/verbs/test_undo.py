@@ -0,0 +1,86 @@
+from ..helpers import IFPTestCase
+
+from intficpy.ifp_game import IFPGame
+from intficpy.thing_base import Thing
+
+
+class TestUndoVerb(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.game.enableUndo()
+        self.widget = Thing(self.game, "widget")
+        self.widget.invItem = True
+        self.start_room.addThing(self.widget)
+        self.game.turnMain("look")
+
+    def test_undo_undoes_last_turn(self):
+        self.game.turnMain("get widget")
+        self.assertIs(self.widget.location, self.me)
+
+        self.game.turnMain("undo")
+
+        self.assertIn("Previous turn undone. ", self.app.print_stack)
+        self.assertIs(self.widget.location, self.start_room)
+        self.assertItemExactlyOnceIn(self.widget, self.start_room.contains, "widget")
+        self.assertItemNotIn(self.widget, self.me.contains, "widget")
+
+    def test_undo_does_not_take_a_turn(self):
+        turn = self.game.daemons.turn
+        self.game.turnMain("get widget")
+        self.game.turnMain("undo")
+        self.assertEqual(self.game.daemons.turn, turn)
+
+    def test_undo_twice_undoes_two_turns(self):
+        self.game.turnMain("get widget")
+        self.game.turnMain("drop widget")
+        self.game.turnMain("get widget")
+
+        self.game.turnMain("undo")
+        self.assertIs(self.widget.location, self.start_room)
+        self.game.turnMain("undo")
+        self.assertIs(self.widget.location, self.me)
+
+    def test_undo_number_undoes_that_many_turns(self):
+        self.game.turnMain("get widget")
+        self.game.turnMain("drop widget")
+        self.game.turnMain("get widget")
+
+        self.game.turnMain("undo 3")
+
+        self.assertIn("3 turns undone. ", self.app.print_stack)
+        self.assertIs(self.widget.location, self.start_room)
+
+    def test_undo_puts_back_question_asked_by_parser(self):
+        other = Thing(self.game, "widget")
+        other.setAdjectives(["blue"])
+        self.start_room.addThing(other)
+        self.game.turnMain("x widget")
+        self.assertTrue(self.game.parser.command.ambiguous)
+        self.game.turnMain("look")
+
+        self.game.turnMain("undo")
+        self.game.turnMain("blue")
+
+        self.assertIs(self.game.parser.command.dobj.target, other)
+
+    def test_undo_with_nothing_to_undo(self):
+        self.game.changes.journal.clear()
+        self.game.turnMain("undo")
+        self.assertIn("There is nothing to undo. ", self.app.print_stack)
+
+    def test_undo_without_a_number(self):
+        self.game.turnMain("undo lots")
+        self.assertIn(
+            "Give a number of turns to undo, for instance UNDO 3. ",
+            self.app.print_stack,
+        )
+
+    def test_undo_when_undo_is_off(self):
+        game = IFPGame(self.app, main=__name__)
+        game.setPlayer(type(self.me)(game))
+        type(self.start_room)(game, "room", "desc").addThing(game.me)
+        game.initGame()
+
+        game.turnMain("undo")
+
+        self.assertIn("Undo is not available in this game. ", self.app.print_stack)
@@ -0,0 +1,112 @@
+import gc
+import weakref
+
+from ..helpers import IFPTestCase
+
+from intficpy.thing_base import Thing
+from intficpy.verb import GetVerb, ExamineVerb, LookVerb, registry
+
+
+class TestVerbRegistry(IFPTestCase):
+    def test_instance_is_shared(self):
+        self.assertIs(GetVerb.instance(), GetVerb.instance())
+        self.assertIs(registry.instance(GetVerb), GetVerb.instance())
+        self.assertIsInstance(GetVerb.instance(), GetVerb)
+
+    def test_each_verb_class_has_own_instance(self):
+        self.assertIsNot(GetVerb.instance(), LookVerb.instance())
+
+    def test_subclass_has_own_instance(self):
+        class QuickGetVerb(GetVerb):
+            pass
+
+        GetVerb.instance()
+        self.assertIsInstance(QuickGetVerb.instance(), QuickGetVerb)
+
+    def test_verb_class_and_instance_are_freed(self):
+        class WaveVerb(LookVerb):
+            word = "wave"
+
+        instance = weakref.ref(WaveVerb.instance())
+        del WaveVerb
+        gc.collect()
+
+        self.assertIsNone(instance())
+
+    def test_override_names_are_precomputed(self):
+        verb = ExamineVerb.instance()
+        self.assertEqual(verb.dobj_override_name, "examineVerbDobj")
+        self.assertEqual(verb.iobj_override_name, "examineVerbIobj")
+
+    def test_parser_uses_shared_instance(self):
+        calls = []
+
+        class CountingLookVerb(LookVerb):
+            def verbFunc(self, game):
+                calls.append(self)
+                return super().verbFunc(game)
+
+        self.game.verbs["look"] = [CountingLookVerb]
+        self.game.turnMain("look")
+        self.game.turnMain("look")
+
+        self.assertEqual(len(calls), 2)
+        self.assertIs(calls[0], calls[1])
+
+
+class TestOverrideDispatchCache(IFPTestCase):
+    def setUp(self):
+        super().setUp()
+        self.item = Thing(self.game, "statue")
+        self.start_room.addThing(self.item)
+
+    def test_instance_override_added_after_first_lookup_is_found(self):
+        self.game.turnMain("x statue")
+        self.assertIn("nothing remarkable", self.app.print_stack[-1])
+
+        def examineVerbDobj(game):
+            game.addTextToEvent("turn", "The statue winks. ")
+            return True
+
+        self.item.examineVerbDobj = examineVerbDobj
+        self.game.turnMain("x statue")
+
+        self.assertIn("The statue winks. ", self.app.print_stack)
+
+    def test_class_override_is_found(self):
+        class WinkingStatue(Thing):
+            def examineVerbDobj(self, game):
+                game.addTextToEvent("turn", "The statue winks. ")
+                return True
+
+        statue = WinkingStatue(self.game, "bust")
+        self.start_room.addThing(statue)
+
+        self.game.turnMain("x bust")
+
+        self.assertIn("The statue winks. ", self.app.print_stack)
+
+    def test_class_override_added_later_is_found_by_a_new_game(self):
+        class Bust(Thing):
+            pass
+
+        bust = Bust(self.game, "bust")
+        self.start_room.addThing(bust)
+        self.game.turnMain("x bust")
+        self.assertNotIn("The bust winks. ", self.app.print_stack)
+
+        def examineVerbDobj(self, game):
+            game.addTextToEvent("turn", "The bust winks. ")
+            return True
+
+        Bust.examineVerbDobj = examineVerbDobj
+        IFPTestCase.setUp(self)
+        bust = Bust(self.game, "bust")
+        self.start_room.addThing(bust)
+        self.game.turnMain("x bust")
+
+        self.assertIn("The bust winks. ", self.app.print_stack)
+
+    def test_text_target_has_no_overrides(self):
+        verb = ExamineVerb.instance()
+        self.assertIsNone(verb._getTargetAttr(self.game, "hello", "examineVerbDobj"))